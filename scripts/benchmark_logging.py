@@ -0,0 +1,107 @@
+# !python
+"""
+PURPOSE: measure the time spent checking files with logging disabled, with
+all loggers at DEBUG, and with the structured trace enabled, to show that
+logging costs nothing on the hot path when it is disabled.
+
+USAGE: benchmark_logging.py [DIRECTORY] [BASE_PACKAGE] [REPEAT]
+
+TO RUN:
+poetry run python scripts/benchmark_logging.py example_repos/my_base_module my_base_module 200
+"""
+import io
+import logging
+import sys
+import time
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from contextlib import contextmanager
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Iterator
+
+from flake8_custom_import_rules.api import check_files
+from flake8_custom_import_rules.defaults import Settings
+from flake8_custom_import_rules.utils.trace_utils import disable_trace
+from flake8_custom_import_rules.utils.trace_utils import enable_trace
+
+
+@contextmanager
+def debug_logging() -> Iterator[None]:
+    """Enable every logger at DEBUG, discarding the records."""
+    root = logging.getLogger()
+    handler = logging.NullHandler()
+    level = root.level
+    root.addHandler(handler)
+    root.setLevel(logging.DEBUG)
+    try:
+        yield
+    finally:
+        root.removeHandler(handler)
+        root.setLevel(level)
+
+
+@contextmanager
+def trace() -> Iterator[None]:
+    """Enable the structured trace, discarding the events."""
+    handler = enable_trace(io.StringIO())
+    try:
+        yield
+    finally:
+        disable_trace(handler)
+
+
+def benchmark(
+    directory: Path,
+    settings: Settings,
+    repeat: int,
+    mode: Callable[[], AbstractContextManager],
+) -> tuple[int, float]:
+    """
+    Check the files of a directory repeatedly.
+
+    Parameters
+    ----------
+    directory : Path
+        The directory to check.
+    settings : Settings
+        The checker settings.
+    repeat : int
+        The number of times the directory is checked.
+    mode : Callable[[], AbstractContextManager]
+        The logging mode the directory is checked in.
+
+    Returns
+    -------
+    tuple[int, float]
+        The number of files checked and the time spent, in seconds.
+    """
+    files = 0
+    with mode():
+        start = time.perf_counter()
+        for _ in range(repeat):
+            files += sum(1 for _ in check_files([directory], settings))
+        return files, time.perf_counter() - start
+
+
+def main() -> None:
+    """Print the time spent per file in each logging mode."""
+    directory = Path(sys.argv[1] if len(sys.argv) > 1 else "example_repos/my_base_module")
+    base_package = sys.argv[2] if len(sys.argv) > 2 else "my_base_module"
+    repeat = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+    sys.path.insert(0, str(directory.resolve()))
+    settings = Settings(BASE_PACKAGES=[base_package])
+
+    # Warm up the module name and import type caches
+    benchmark(directory, settings, 1, nullcontext)
+    for name, mode in (
+        ("logging disabled", nullcontext),
+        ("debug logging", debug_logging),
+        ("trace", trace),
+    ):
+        files, seconds = benchmark(directory, settings, repeat, mode)
+        print(f"{name:>16}: {seconds / files * 1e6:9.1f} us per file ({files} files)")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,336 @@
 Main CLI module.
 """
 
+from __future__ import annotations
+
+import sys
+from collections.abc import Iterable
+from enum import Enum
+from pathlib import Path
+from typing import Optional
+
+import typer
+
+from flake8_custom_import_rules.api import FileResult
+from flake8_custom_import_rules.api import check_cached_import_facts
+from flake8_custom_import_rules.api import check_files
+from flake8_custom_import_rules.api import check_graph_rules
+from flake8_custom_import_rules.api import load_rule_profile
+from flake8_custom_import_rules.core.baseline import DEFAULT_BASELINE
+from flake8_custom_import_rules.core.baseline import Baseline
+from flake8_custom_import_rules.export import DEFAULT_CHUNK_SIZE
+from flake8_custom_import_rules.export import ColumnarFactsWriter
+from flake8_custom_import_rules.export import JsonLinesFactsWriter
+from flake8_custom_import_rules.export import export_import_facts
+from flake8_custom_import_rules.facts_cache import DEFAULT_FACTS_CACHE
+from flake8_custom_import_rules.facts_cache import FactsCache
+from flake8_custom_import_rules.metrics import check_labels
+from flake8_custom_import_rules.metrics import write_metrics
+from flake8_custom_import_rules.reporters import Reporter
+from flake8_custom_import_rules.reporters import write_report
+from flake8_custom_import_rules.shards import ShardWriter
+from flake8_custom_import_rules.shards import check_shard_headers
+from flake8_custom_import_rules.shards import merge_shard_outputs
+from flake8_custom_import_rules.shards import parse_shard
+from flake8_custom_import_rules.shards import shard_files
+from flake8_custom_import_rules.spool import build_import_graph_from_spools
+from flake8_custom_import_rules.stats import RunStats
+from flake8_custom_import_rules.utils.trace_utils import enable_trace
+
+app = typer.Typer(help="Check the import rules of a project without running flake8.")
+
+
+class OutputFormat(str, Enum):
+    """Output formats of the reports."""
+
+    TEXT = "text"
+    JSONL = "jsonl"
+    SARIF = "sarif"
+
+
+class ExportFormat(str, Enum):
+    """Formats of the exports of import facts."""
+
+    COLUMNAR = "columnar"
+    JSONL = "jsonl"
+
+
+@app.callback()
+def callback() -> None:
+    """Check the import rules of a project without running flake8."""
+
+
+def parse_labels(metrics_labels: list[str]) -> dict[str, str]:
+    """Parse the NAME=VALUE labels of the metrics."""
+    labels = {}
+    for metrics_label in metrics_labels:
+        name, separator, value = metrics_label.partition("=")
+        if not separator:
+            raise typer.BadParameter(f"Expected NAME=VALUE, got {metrics_label!r}")
+        labels[name.strip()] = value.strip()
+    try:
+        check_labels(labels)
+    except ValueError as e:
+        raise typer.BadParameter(str(e)) from e
+    return labels
+
+
+def parse_shard_option(shard: str) -> tuple[int, int]:
+    """Parse the INDEX/COUNT shard of the run."""
+    try:
+        return parse_shard(shard)
+    except ValueError as e:
+        raise typer.BadParameter(str(e)) from e
+
+
+def report(
+    results: Iterable[FileResult], output: Path | None, output_format: OutputFormat
+) -> Reporter:
+    """Write the report to the output file, or to stdout."""
+    if output is None:
+        return write_report(results, sys.stdout, output_format.value)
+    with output.open("w", encoding="utf-8") as stream:
+        return write_report(results, stream, output_format.value)
+
+
+@app.command()
+def check(
+    paths: list[Path] = typer.Argument(..., help="Files or directories to check."),
+    output_format: OutputFormat = typer.Option(
+        OutputFormat.TEXT, "--format", help="The format of the report."
+    ),
+    output: Optional[Path] = typer.Option(
+        None, "--output", "-o", help="Write the report to a file instead of stdout."
+    ),
+    config: Optional[Path] = typer.Option(
+        None,
+        "--config",
+        exists=True,
+        dir_okay=False,
+        help="The flake8 configuration file with the import rules.",
+    ),
+    read_ahead: int = typer.Option(
+        0,
+        "--read-ahead",
+        min=0,
+        help="Read and hash this many files in a thread pool ahead of the file being checked.",
+    ),
+    show_stats: bool = typer.Option(
+        False, "--stats", help="Write the statistics of the run to stderr."
+    ),
+    metrics: Optional[Path] = typer.Option(
+        None,
+        "--metrics",
+        help="Write the statistics of the run to a Prometheus textfile (e.g., checks.prom).",
+    ),
+    metrics_labels: Optional[list[str]] = typer.Option(
+        None,
+        "--metrics-label",
+        help="A NAME=VALUE label added to every metric, e.g., repo=my_project. Repeatable.",
+    ),
+    trace: bool = typer.Option(
+        False, "--trace", help="Write one JSON trace event per file checked to stderr."
+    ),
+    baseline: Optional[Path] = typer.Option(
+        None, "--baseline", help="A baseline file of known violations, which are not reported."
+    ),
+    shard: Optional[str] = typer.Option(
+        None,
+        "--shard",
+        help=(
+            "Only check the files of shard INDEX/COUNT (e.g., 2/4), partitioned by file size "
+            "and module name. Merge the shard outputs with the merge command."
+        ),
+    ),
+    shard_output: Optional[Path] = typer.Option(
+        None,
+        "--shard-output",
+        help=(
+            "The mergeable results and import graph fragment of the shard, by default "
+            "import-rules-shard-INDEX-of-COUNT.jsonl."
+        ),
+    ),
+) -> None:
+    """Check files, writing the errors of each file as soon as it is checked."""
+    labels = parse_labels(metrics_labels or [])
+    shard_index, shards = parse_shard_option(shard) if shard is not None else (1, 1)
+    if trace:
+        enable_trace()
+    rule_profile = load_rule_profile(config)
+    stats = RunStats()
+    known_violations = Baseline.load(baseline) if baseline is not None else None
+    if shard is None:
+        results = check_files(
+            paths,
+            read_ahead=read_ahead,
+            stats=stats,
+            baseline=known_violations,
+            rule_profile=rule_profile,
+        )
+        reporter = report(results, output, output_format)
+    else:
+        shard_output = shard_output or Path(f"import-rules-shard-{shard_index}-of-{shards}.jsonl")
+        with shard_output.open("w", encoding="utf-8") as shard_stream:
+            writer = ShardWriter(shard_stream, shard_index, shards)
+            results = check_files(
+                shard_files(paths, shard_index, shards, rule_profile=rule_profile),
+                read_ahead=read_ahead,
+                stats=stats,
+                baseline=known_violations,
+                collect_facts=True,
+                rule_profile=rule_profile,
+            )
+            reporter = report(map(writer.write, results), output, output_format)
+    if show_stats:
+        sys.stderr.write(stats.format())
+    if metrics is not None:
+        write_metrics(stats, metrics, labels)
+    if reporter.failed:
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def merge(
+    shard_outputs: list[Path] = typer.Argument(..., help="The outputs of every shard."),
+    output_format: OutputFormat = typer.Option(
+        OutputFormat.TEXT, "--format", help="The format of the report."
+    ),
+    output: Optional[Path] = typer.Option(
+        None, "--output", "-o", help="Write the report to a file instead of stdout."
+    ),
+    config: Optional[Path] = typer.Option(
+        None,
+        "--config",
+        exists=True,
+        dir_okay=False,
+        help="The flake8 configuration file with the import rules.",
+    ),
+    baseline: Optional[Path] = typer.Option(
+        None, "--baseline", help="A baseline file of known violations, which are not reported."
+    ),
+) -> None:
+    """Merge the shard outputs, then check import cycles and transitive restrictions once."""
+    # the results are merged as the report is written, so the outputs are checked beforehand
+    try:
+        check_shard_headers(shard_outputs)
+    except (OSError, ValueError) as e:
+        raise typer.BadParameter(str(e)) from e
+    results = merge_shard_outputs(
+        list(shard_outputs),
+        baseline=Baseline.load(baseline) if baseline is not None else None,
+        rule_profile=load_rule_profile(config),
+    )
+    if report(results, output, output_format).failed:
+        raise typer.Exit(code=1)
+
+
+@app.command("reduce")
+def reduce_spools(
+    spool_directory: Path = typer.Argument(
+        ...,
+        exists=True,
+        file_okay=False,
+        help="The spool directory of a flake8 run with --import-facts-spool.",
+    ),
+    output_format: OutputFormat = typer.Option(
+        OutputFormat.TEXT, "--format", help="The format of the report."
+    ),
+    output: Optional[Path] = typer.Option(
+        None, "--output", "-o", help="Write the report to a file instead of stdout."
+    ),
+    config: Optional[Path] = typer.Option(
+        None,
+        "--config",
+        exists=True,
+        dir_okay=False,
+        help="The flake8 configuration file with the import rules.",
+    ),
+    baseline: Optional[Path] = typer.Option(
+        None, "--baseline", help="A baseline file of known violations, which are not reported."
+    ),
+) -> None:
+    """Build the import graph from the spools of a flake8 run, then check its rules."""
+    graph = build_import_graph_from_spools(spool_directory)
+    results = check_graph_rules(
+        graph,
+        load_rule_profile(config),
+        baseline=Baseline.load(baseline) if baseline is not None else None,
+    )
+    if report(results, output, output_format).failed:
+        raise typer.Exit(code=1)
+
+
+@app.command("baseline")
+def write_baseline(
+    paths: list[Path] = typer.Argument(..., help="Files or directories to check."),
+    output: Path = typer.Option(
+        Path(DEFAULT_BASELINE), "--output", "-o", help="The baseline file to write."
+    ),
+    config: Optional[Path] = typer.Option(
+        None,
+        "--config",
+        exists=True,
+        dir_okay=False,
+        help="The flake8 configuration file with the import rules.",
+    ),
+    facts_cache: Path = typer.Option(
+        Path(DEFAULT_FACTS_CACHE),
+        "--facts-cache",
+        help="The cache of the import facts of each file. Only the files that changed are parsed.",
+    ),
+) -> None:
+    """Write a baseline of the current violations, checked from the facts cache."""
+    cache = FactsCache.load(facts_cache)
+    results = check_cached_import_facts(paths, cache, rule_profile=load_rule_profile(config))
+    known_violations = Baseline.from_errors(
+        (result.module_name or result.filename, error)
+        for result in results
+        for error in result.errors
+    )
+    known_violations.write(output)
+    cache.save()
+    sys.stderr.write(
+        f"Wrote {len(known_violations)} known violations to {output} "
+        f"({cache.hits} files from the facts cache, {cache.misses} parsed)\n"
+    )
+
+
+@app.command("export")
+def export_facts(
+    paths: list[Path] = typer.Argument(..., help="Files or directories to export."),
+    output: Path = typer.Option(..., "--output", "-o", help="The export file to write."),
+    export_format: ExportFormat = typer.Option(
+        ExportFormat.COLUMNAR,
+        "--format",
+        help="Columnar binary with dictionary-encoded strings, or JSON Lines.",
+    ),
+    config: Optional[Path] = typer.Option(
+        None,
+        "--config",
+        exists=True,
+        dir_okay=False,
+        help="The flake8 configuration file with the import rules.",
+    ),
+    chunk_size: int = typer.Option(
+        DEFAULT_CHUNK_SIZE, "--chunk-size", min=1, help="The rows of each columnar chunk."
+    ),
+) -> None:
+    """Export one row per import of each file, written as the files are visited."""
+    settings = load_rule_profile(config).settings
+    if export_format is ExportFormat.COLUMNAR:
+        with output.open("wb") as binary_stream:
+            rows = export_import_facts(
+                paths, ColumnarFactsWriter(binary_stream, chunk_size), settings
+            )
+    else:
+        with output.open("w", encoding="utf-8") as stream:
+            rows = export_import_facts(paths, JsonLinesFactsWriter(stream), settings)
+    sys.stderr.write(f"Exported {rows} import facts to {output}\n")
+
 
 def main() -> None:
     """Main function."""
-    print("Hello World!")
+    app()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,849 @@
+""" Library API for checking many files with a shared compiled rule profile. """
+
+from __future__ import annotations
+
+import itertools
+import logging
+import os
+import time
+from collections import deque
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+
+from attrs import define
+from attrs import field
+from flake8.main.application import Application
+
+from flake8_custom_import_rules.codes.error_codes import ErrorCode
+from flake8_custom_import_rules.core.baseline import Baseline
+from flake8_custom_import_rules.core.error_messages import ErrorMessage
+from flake8_custom_import_rules.core.import_facts import ImportFact
+from flake8_custom_import_rules.core.import_facts import import_facts_from_visitor
+from flake8_custom_import_rules.core.import_facts import nodes_from_import_facts
+from flake8_custom_import_rules.core.import_graph import ImportCycle
+from flake8_custom_import_rules.core.import_graph import ImportGraph
+from flake8_custom_import_rules.core.import_graph import graph_imports_from_facts
+from flake8_custom_import_rules.core.import_rules import CustomImportRules
+from flake8_custom_import_rules.core.nodes import ALL_NODE_KINDS
+from flake8_custom_import_rules.core.nodes import IMPORT_NODE_TYPES
+from flake8_custom_import_rules.core.nodes import NodeKind
+from flake8_custom_import_rules.core.rule_profile import RuleProfile
+from flake8_custom_import_rules.core.rules_checker import CustomImportRulesChecker
+from flake8_custom_import_rules.core.transitive_rules import TRANSITIVE_CODES
+from flake8_custom_import_rules.core.transitive_rules import TransitiveViolation
+from flake8_custom_import_rules.core.transitive_rules import check_transitive_restrictions
+from flake8_custom_import_rules.defaults import STDIN_IDENTIFIERS
+from flake8_custom_import_rules.defaults import Settings
+from flake8_custom_import_rules.facts_cache import FactsCache
+from flake8_custom_import_rules.flake8_plugin import Plugin
+from flake8_custom_import_rules.stats import RunStats
+from flake8_custom_import_rules.utils.node_utils import get_package_names
+from flake8_custom_import_rules.utils.node_utils import root_package_name
+from flake8_custom_import_rules.utils.source_utils import SourceBuffer
+
+logger = logging.getLogger(__name__)
+
+# The filename, the module name (if given) and the buffer of a file or in-memory source
+ReadSource = tuple[str, str | None, SourceBuffer]
+
+# Reading files is I/O bound, so more threads than files read ahead are not needed
+MAX_READER_THREADS = 32
+
+
+@define(slots=True, frozen=True)
+class Source:
+    """In-memory source code to check.
+
+    Attributes
+    ----------
+    source : str
+        The source code.
+    filename : str
+        The name reported in the results, by default "stdin".
+    module_name : str | None
+        The module name of the source. Custom import rules (CIR) that depend
+        on the location of the module within the project are only checked
+        when the module name is known.
+    """
+
+    source: str
+    filename: str = "stdin"
+    module_name: str | None = None
+
+
+@define(slots=True)
+class FileResult:
+    """Result of checking a single file.
+
+    Attributes
+    ----------
+    filename : str
+        The name of the file that was checked.
+    module_name : str | None
+        The module name of the file, if it could be resolved.
+    errors : list[ErrorMessage]
+        The import rule violations found in the file.
+    syntax_error : SyntaxError | None
+        The syntax error raised while parsing the file, if any.
+    content_hash : str | None
+        The SHA-256 hash of the source, computed from the buffer the source
+        was parsed from.
+    facts : list[ImportFact] | None
+        The import facts of the file, if they were collected.
+    """
+
+    filename: str
+    module_name: str | None = None
+    errors: list[ErrorMessage] = field(factory=list)
+    syntax_error: SyntaxError | None = None
+    content_hash: str | None = None
+    facts: list[ImportFact] | None = None
+
+
+def load_rule_profile(config: str | os.PathLike | None = None) -> RuleProfile:
+    """
+    Load the rule profile from the flake8 configuration of the project.
+
+    The configuration is parsed by flake8 itself, so the profile is the one
+    the plugin uses when running ``flake8``: the same settings, and only the
+    error codes flake8 reports (from its ``select`` and ``ignore`` options).
+
+    Parameters
+    ----------
+    config : str | os.PathLike | None
+        The flake8 configuration file. By default, flake8 looks for a
+        ``setup.cfg``, ``tox.ini`` or ``.flake8`` file in the current
+        directory.
+
+    Returns
+    -------
+    RuleProfile
+    """
+    # Parsing the options sets the options of the plugin, which are restored
+    # so that loading the profile does not change the plugin.
+    plugin_options = Plugin._options
+    try:
+        # the CLI does not spool import facts, so the spools of a flake8 run are kept
+        argv = ["--import-facts-spool="]
+        Application().initialize(
+            [*argv, "--config", os.fspath(config)] if config is not None else argv
+        )
+        rule_profile = Plugin._options["rule_profile"]
+    finally:
+        Plugin._options = plugin_options
+    assert isinstance(rule_profile, RuleProfile)
+    return rule_profile
+
+
+def iter_python_files(paths_or_sources: Iterable[str | os.PathLike | Source]) -> Iterator:
+    """
+    Expand directories into the Python files they contain.
+
+    Parameters
+    ----------
+    paths_or_sources : Iterable[str | os.PathLike | Source]
+        Files, directories or in-memory sources.
+
+    Yields
+    ------
+    str | Source
+        File paths and in-memory sources, in order.
+    """
+    for path_or_source in paths_or_sources:
+        if isinstance(path_or_source, Source):
+            yield path_or_source
+            continue
+
+        path = os.fspath(path_or_source)
+        if not os.path.isdir(path):
+            yield path
+            continue
+
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            yield from (
+                os.path.join(dirpath, filename)
+                for filename in sorted(filenames)
+                if filename.endswith(".py")
+            )
+
+
+def read_source_buffer(path_or_source: str | Source) -> ReadSource:
+    """
+    Read a file or in-memory source into a single buffer.
+
+    Files are read once (memory mapped if they are large), and the buffer is
+    used to hash, parse and look up the lines of the source.
+
+    Parameters
+    ----------
+    path_or_source : str | Source
+        The file path or in-memory source to read.
+
+    Returns
+    -------
+    tuple[str, str | None, SourceBuffer]
+        The filename, the module name (if given) and the source buffer.
+    """
+    if isinstance(path_or_source, Source):
+        source = SourceBuffer.from_text(path_or_source.source)
+        return path_or_source.filename, path_or_source.module_name, source
+    return path_or_source, None, SourceBuffer.from_file(path_or_source)
+
+
+def get_checker(
+    rule_profile: RuleProfile,
+    path_or_source: str | Source,
+    read: ReadSource | None = None,
+    node_kinds: NodeKind | None = None,
+    baseline: Baseline | None = None,
+) -> CustomImportRulesChecker | FileResult:
+    """
+    Parse a file or in-memory source into a checker.
+
+    Parameters
+    ----------
+    rule_profile : RuleProfile
+        The compiled rule profile.
+    path_or_source : str | Source
+        The file path or in-memory source to parse.
+    read : ReadSource | None
+        The file or in-memory source, if it was already read.
+    node_kinds : NodeKind | None
+        The kinds of nodes the visitor builds, by default the kinds the
+        rules of the profile need.
+    baseline : Baseline | None
+        The known violations, which are not reported.
+
+    Returns
+    -------
+    CustomImportRulesChecker | FileResult
+        The checker, or the result of the file if it cannot be parsed.
+    """
+    filename, module_name, source = read or read_source_buffer(path_or_source)
+    try:
+        tree = source.parse()
+    except SyntaxError as e:
+        return FileResult(
+            filename=filename,
+            module_name=module_name,
+            syntax_error=e,
+            content_hash=source.content_hash,
+        )
+
+    return CustomImportRulesChecker.from_rule_profile(
+        rule_profile,
+        tree=tree,
+        filename=filename,
+        module_name=module_name,
+        source=source,
+        node_kinds=node_kinds,
+        baseline=baseline,
+    )
+
+
+def get_module_name(rule_profile: RuleProfile, path_or_source: str | Source) -> str | None:
+    """
+    Get the module name of a file or in-memory source, without reading it.
+
+    Parameters
+    ----------
+    rule_profile : RuleProfile
+        The compiled rule profile, which caches the module names of files.
+    path_or_source : str | Source
+        The file path or in-memory source.
+
+    Returns
+    -------
+    str | None
+        The module name, or None for in-memory sources read from stdin.
+    """
+    if isinstance(path_or_source, Source):
+        if path_or_source.module_name is not None:
+            return path_or_source.module_name
+        filename = path_or_source.filename
+    else:
+        filename = path_or_source
+    return None if filename in STDIN_IDENTIFIERS else rule_profile.module_name(filename)
+
+
+def takes_fast_exit(
+    rule_profile: RuleProfile, path_or_source: str | Source, collect_facts: bool = False
+) -> bool:
+    """
+    Get whether a file has no applicable rule, so it is checked without being read.
+
+    Parameters
+    ----------
+    rule_profile : RuleProfile
+        The compiled rule profile.
+    path_or_source : str | Source
+        The file path or in-memory source.
+    collect_facts : bool
+        Whether the import facts of the file are collected, which needs the
+        file to be read, by default False.
+
+    Returns
+    -------
+    bool
+    """
+    if collect_facts or rule_profile.project_level_restrictions:
+        return False
+    return not rule_profile.has_applicable_rules(get_module_name(rule_profile, path_or_source))
+
+
+def check_source(
+    rule_profile: RuleProfile,
+    path_or_source: str | Source,
+    read: ReadSource | None = None,
+    stats: RunStats | None = None,
+    baseline: Baseline | None = None,
+    collect_facts: bool = False,
+) -> FileResult:
+    """
+    Check a single file or in-memory source against a compiled rule profile.
+
+    Files without any applicable rule (see ``RuleProfile.has_applicable_rules``)
+    return an empty result immediately, without being read (unless they were
+    already read), parsed or visited, unless their import facts are collected.
+
+    Parameters
+    ----------
+    rule_profile : RuleProfile
+        The compiled rule profile.
+    path_or_source : str | Source
+        The file path or in-memory source to check.
+    read : ReadSource | None
+        The file or in-memory source, if it was already read.
+    stats : RunStats | None
+        The statistics of the run, updated with the files that take the fast
+        exit, the time spent in each phase, and the imports and errors found.
+    baseline : Baseline | None
+        The known violations, which are not reported.
+    collect_facts : bool
+        Whether to collect the import facts of the file, with every node
+        kind (whichever rules are enabled), by default False.
+
+    Returns
+    -------
+    FileResult
+    """
+    stats = stats if stats is not None else RunStats()
+    if takes_fast_exit(rule_profile, path_or_source, collect_facts):
+        stats.fast_exits += 1
+        filename = path_or_source.filename if isinstance(path_or_source, Source) else path_or_source
+        content_hash = None
+        if read is not None:
+            with read[2] as source:
+                content_hash = source.content_hash
+        return FileResult(
+            filename=filename,
+            module_name=get_module_name(rule_profile, path_or_source),
+            content_hash=content_hash,
+        )
+
+    if read is None:
+        start = time.perf_counter()
+        read = read_source_buffer(path_or_source)
+        stats.read_seconds += time.perf_counter() - start
+
+    # Closing the buffer releases the memory map of large files
+    with read[2]:
+        start = time.perf_counter()
+        checker = get_checker(
+            rule_profile,
+            path_or_source,
+            read,
+            node_kinds=ALL_NODE_KINDS if collect_facts else None,
+            baseline=baseline,
+        )
+        parsed = time.perf_counter()
+        stats.parse_seconds += parsed - start
+        if isinstance(checker, FileResult):
+            return checker
+
+        if checker.has_applicable_rules:
+            stats.imports += sum(isinstance(node, IMPORT_NODE_TYPES) for node in checker.nodes)
+        visited = time.perf_counter()
+        stats.visit_seconds += visited - parsed
+
+        errors = list(checker.check_custom_import_rules())
+        stats.check_seconds += time.perf_counter() - visited
+        stats.record_errors(error.code for error in errors)
+
+        return FileResult(
+            filename=str(checker.filename),
+            module_name=checker.visitor.file_identifier,
+            errors=errors,
+            content_hash=checker.source.content_hash if checker.source is not None else None,
+            facts=import_facts_from_visitor(checker.visitor) if collect_facts else None,
+        )
+
+
+def _read_and_hash(path_or_source: str | Source) -> tuple[ReadSource, float]:
+    """Read and hash a file in a reader thread, returning the time it took."""
+    start = time.perf_counter()
+    read = read_source_buffer(path_or_source)
+    _ = read[2].content_hash
+    return read, time.perf_counter() - start
+
+
+def read_ahead_sources(
+    paths_or_sources: Iterable[str | Source],
+    read_ahead: int,
+    stats: RunStats,
+    skip_read: Callable[[str | Source], bool] | None = None,
+) -> Iterator[tuple[str | Source, ReadSource | None]]:
+    """
+    Read and hash files in a thread pool, ahead of the file being checked.
+
+    At most ``read_ahead`` files are queued to be checked, so the files
+    read ahead are a bounded queue, and the files are yielded in the order
+    they are given. Reading overlaps with parsing and checking, which hides
+    the latency of opening and reading files (e.g., on network file systems).
+
+    Parameters
+    ----------
+    paths_or_sources : Iterable[str | Source]
+        The files and in-memory sources, in order.
+    read_ahead : int
+        The number of files to read ahead.
+    stats : RunStats
+        The statistics the queue depth and the stalls are recorded in.
+    skip_read : Callable[[str | Source], bool] | None
+        Whether a file is checked without being read (e.g., it takes the
+        fast exit), by default every file is read.
+
+    Yields
+    ------
+    tuple[str | Source, ReadSource | None]
+        Each file or in-memory source, with its filename, module name and
+        source buffer, or None if it is not read.
+    """
+    paths_or_sources = iter(paths_or_sources)
+    queue: deque[tuple[str | Source, Future | None]] = deque()
+
+    def submit(path_or_source: str | Source) -> None:
+        """Queue a file, reading it in the thread pool unless it is skipped."""
+        if skip_read is not None and skip_read(path_or_source):
+            queue.append((path_or_source, None))
+        else:
+            queue.append((path_or_source, executor.submit(_read_and_hash, path_or_source)))
+
+    with ThreadPoolExecutor(
+        max_workers=min(read_ahead, MAX_READER_THREADS), thread_name_prefix="read-ahead"
+    ) as executor:
+        for path_or_source in itertools.islice(paths_or_sources, read_ahead):
+            submit(path_or_source)
+
+        while queue:
+            path_or_source, future = queue.popleft()
+            if future is None:
+                for next_path_or_source in itertools.islice(paths_or_sources, 1):
+                    submit(next_path_or_source)
+                yield path_or_source, None
+                continue
+
+            stats.record_queue_depth(
+                sum(queued.done() for _, queued in queue if queued is not None) + future.done()
+            )
+            if not future.done():
+                stats.stalls += 1
+                start = time.perf_counter()
+                wait([future])
+                stats.stall_seconds += time.perf_counter() - start
+            read, read_seconds = future.result()
+            stats.read_seconds += read_seconds
+
+            for next_path_or_source in itertools.islice(paths_or_sources, 1):
+                submit(next_path_or_source)
+            yield path_or_source, read
+
+
+def check_files(
+    paths_or_sources: Iterable[str | os.PathLike | Source],
+    settings: Settings | None = None,
+    read_ahead: int = 0,
+    stats: RunStats | None = None,
+    baseline: Baseline | None = None,
+    collect_facts: bool = False,
+    rule_profile: RuleProfile | None = None,
+) -> Iterator[FileResult]:
+    """
+    Check many files against the custom import rules.
+
+    The settings are compiled once into a rule profile, so the module name
+    resolver, the import type classifier and the restricted identifiers
+    index are shared by every file. Results are streamed back one file at a
+    time, in the order the files are given.
+
+    Parameters
+    ----------
+    paths_or_sources : Iterable[str | os.PathLike | Source]
+        Files, directories (checked recursively for ``.py`` files) or
+        in-memory sources.
+    settings : Settings | None
+        The checker settings, by default the default settings. Ignored when
+        a rule profile is given.
+    read_ahead : int
+        The number of files read and hashed in a thread pool ahead of the
+        file being checked, by default 0 (files are read when they are checked).
+    stats : RunStats | None
+        The statistics of the run, updated as files are checked.
+    baseline : Baseline | None
+        The known violations, which are not reported.
+    collect_facts : bool
+        Whether to collect the import facts of each file, by default False.
+    rule_profile : RuleProfile | None
+        A compiled rule profile, e.g., from ``load_rule_profile``.
+
+    Yields
+    ------
+    FileResult
+        The result for each file.
+
+    Examples
+    --------
+    >>> from flake8_custom_import_rules.api import Source
+    >>> from flake8_custom_import_rules.api import check_files
+    >>> [str(error) for result in check_files([Source("from os import *")])
+    ...  for error in result.errors]
+    ['1:0: PIR107 Wildcard Imports are disabled for this project.']
+    """
+    rule_profile = rule_profile or RuleProfile.from_settings(settings)
+    stats = stats if stats is not None else RunStats()
+    stats.read_ahead = read_ahead
+    try:
+        if read_ahead > 0:
+            # Files that take the fast exit are not read ahead, since they are not read at all
+            sources = read_ahead_sources(
+                iter_python_files(paths_or_sources),
+                read_ahead,
+                stats,
+                skip_read=lambda path_or_source: takes_fast_exit(
+                    rule_profile, path_or_source, collect_facts
+                ),
+            )
+            for path_or_source, read in sources:
+                stats.files += 1
+                yield check_source(
+                    rule_profile, path_or_source, read, stats, baseline, collect_facts
+                )
+            return
+
+        for path_or_source in iter_python_files(paths_or_sources):
+            stats.files += 1
+            yield check_source(
+                rule_profile,
+                path_or_source,
+                stats=stats,
+                baseline=baseline,
+                collect_facts=collect_facts,
+            )
+    finally:
+        stats.record_cache_stats(rule_profile.cache_stats())
+
+
+def check_import_facts(
+    module_name: str,
+    facts: Iterable[ImportFact],
+    settings: Settings | None = None,
+    rule_profile: RuleProfile | None = None,
+) -> FileResult:
+    """
+    Check import facts extracted ahead of time against the custom import rules.
+
+    The facts are checked without reading or parsing the source, so facts
+    extracted by another tool (or cached from a previous run) can be checked
+    against the full set of custom (CIR) and project (PIR) import rules.
+    ``noqa`` comments are not considered, since the source lines are not
+    available.
+
+    Parameters
+    ----------
+    module_name : str
+        The module name of the file the facts were extracted from.
+    facts : Iterable[ImportFact]
+        The import facts of the file.
+    settings : Settings | None
+        The checker settings, by default the default settings. Ignored when
+        a rule profile is given.
+    rule_profile : RuleProfile | None
+        A compiled rule profile to share between calls.
+
+    Returns
+    -------
+    FileResult
+        The result, reported under the module name.
+
+    Examples
+    --------
+    >>> from flake8_custom_import_rules.api import check_import_facts
+    >>> from flake8_custom_import_rules.core.import_facts import ImportFact
+    >>> result = check_import_facts("my_package.file", [ImportFact("os", name="*")])
+    >>> [str(error) for error in result.errors]
+    ['1:0: PIR107 Wildcard Imports are disabled for this project.']
+    """
+    rule_profile = rule_profile or RuleProfile.from_settings(settings)
+    file_packages = get_package_names(module_name)
+    import_rules = CustomImportRules(
+        nodes=nodes_from_import_facts(facts, rule_profile.classify, module_name),
+        restricted_identifiers=rule_profile.restricted_identifiers(file_packages),
+        checker_settings=rule_profile.settings,
+        filename=module_name,
+        file_identifier=module_name,
+        file_root_package_name=root_package_name(module_name),
+        file_packages=file_packages,
+        layer_ranks=rule_profile.layer_ranks,
+        standard_restrictions=rule_profile.standard_restrictions,
+        file_rule_index=rule_profile.file_rule_index,
+        codes_to_check=rule_profile.active_codes,
+    )
+    return FileResult(
+        filename=module_name,
+        module_name=module_name,
+        errors=list(import_rules.check_import_rules()),
+    )
+
+
+def check_cached_import_facts(
+    paths_or_sources: Iterable[str | os.PathLike | Source],
+    facts_cache: FactsCache,
+    settings: Settings | None = None,
+    rule_profile: RuleProfile | None = None,
+) -> Iterator[FileResult]:
+    """
+    Check files against their cached import facts.
+
+    Each file is read and hashed, and only the files that changed since
+    their facts were cached are parsed. The facts are checked like in
+    ``check_import_facts``, so ``noqa`` comments are not considered.
+
+    Parameters
+    ----------
+    paths_or_sources : Iterable[str | os.PathLike | Source]
+        Files, directories (checked recursively for ``.py`` files) or
+        in-memory sources.
+    facts_cache : FactsCache
+        The cached facts, updated with the facts of the files that changed.
+    settings : Settings | None
+        The checker settings, by default the default settings. Ignored when
+        a rule profile is given.
+    rule_profile : RuleProfile | None
+        A compiled rule profile, e.g., from ``load_rule_profile``.
+
+    Yields
+    ------
+    FileResult
+        The result for each file.
+    """
+    rule_profile = rule_profile or RuleProfile.from_settings(settings)
+    for path_or_source in iter_python_files(paths_or_sources):
+        read = read_source_buffer(path_or_source)
+        filename, module_name, source = read
+        module_name = module_name or get_module_name(rule_profile, path_or_source)
+        if module_name is None:
+            # Facts are checked under their module name, so stdin is checked from its source
+            yield check_source(rule_profile, path_or_source, read)
+            continue
+
+        with source:
+            facts = facts_cache.get(filename, source.content_hash)
+            if facts is None:
+                # The facts hold every import, whichever rules are enabled
+                checker = get_checker(rule_profile, path_or_source, read, node_kinds=ALL_NODE_KINDS)
+                if isinstance(checker, FileResult):
+                    yield checker
+                    continue
+                facts = import_facts_from_visitor(checker.visitor)
+                facts_cache.set(filename, source.content_hash, facts)
+
+        result = check_import_facts(module_name, facts, rule_profile=rule_profile)
+        result.filename = filename
+        result.content_hash = source.content_hash
+        yield result
+
+
+def build_import_graph(
+    paths_or_sources: Iterable[str | os.PathLike | Source],
+    settings: Settings | None = None,
+    graph: ImportGraph | None = None,
+) -> ImportGraph:
+    """
+    Build the first-party import graph of the files.
+
+    Parameters
+    ----------
+    paths_or_sources : Iterable[str | os.PathLike | Source]
+        Files, directories (checked recursively for ``.py`` files) or
+        in-memory sources. Files without a module name are skipped.
+    settings : Settings | None
+        The checker settings, by default the default settings.
+    graph : ImportGraph | None
+        An existing graph to update. Only the import cycles affected by
+        the files that changed are recomputed.
+
+    Returns
+    -------
+    ImportGraph
+    """
+    rule_profile = RuleProfile.from_settings(settings)
+    graph = graph if graph is not None else ImportGraph()
+    for path_or_source in iter_python_files(paths_or_sources):
+        read = read_source_buffer(path_or_source)
+        with read[2]:
+            # The graph holds every import, whichever rules are enabled
+            checker = get_checker(rule_profile, path_or_source, read, node_kinds=ALL_NODE_KINDS)
+            if isinstance(checker, FileResult):
+                logger.warning("Cannot parse %s: %s", checker.filename, checker.syntax_error)
+                continue
+
+            visitor = checker.visitor
+            if visitor.file_identifier is None:
+                continue
+            facts = import_facts_from_visitor(visitor)
+        graph.set_module_imports(
+            visitor.file_identifier,
+            graph_imports_from_facts(facts, visitor.file_identifier),
+            filename=str(checker.filename),
+        )
+    return graph
+
+
+def find_import_cycles(
+    paths_or_sources: Iterable[str | os.PathLike | Source],
+    settings: Settings | None = None,
+) -> list[ImportCycle]:
+    """
+    Find the import cycles between first-party modules.
+
+    Each cycle is reported once, with its shortest import path.
+
+    Parameters
+    ----------
+    paths_or_sources : Iterable[str | os.PathLike | Source]
+        Files, directories (checked recursively for ``.py`` files) or
+        in-memory sources.
+    settings : Settings | None
+        The checker settings, by default the default settings.
+
+    Returns
+    -------
+    list[ImportCycle]
+
+    Examples
+    --------
+    >>> from flake8_custom_import_rules.api import Source
+    >>> from flake8_custom_import_rules.api import find_import_cycles
+    >>> sources = [
+    ...     Source("import pkg.b", module_name="pkg.a"),
+    ...     Source("from pkg.a import name", module_name="pkg.b"),
+    ... ]
+    >>> [str(cycle) for cycle in find_import_cycles(sources)]
+    ['pkg.a -> pkg.b -> pkg.a']
+    """
+    return build_import_graph(paths_or_sources, settings).cycles()
+
+
+def find_transitive_violations(
+    paths_or_sources: Iterable[str | os.PathLike | Source],
+    settings: Settings | None = None,
+    graph: ImportGraph | None = None,
+) -> list[TransitiveViolation]:
+    """
+    Find the restricted packages and imports reached through other modules.
+
+    The restricted packages and custom restrictions of each module are also
+    enforced on the modules it imports, directly or indirectly, so a module
+    cannot use a restricted package through another first-party module.
+    Restricted imports made directly by a module are reported by the
+    flake8 checks, and are not reported again.
+
+    Parameters
+    ----------
+    paths_or_sources : Iterable[str | os.PathLike | Source]
+        Files, directories (checked recursively for ``.py`` files) or
+        in-memory sources.
+    settings : Settings | None
+        The checker settings, by default the default settings.
+    graph : ImportGraph | None
+        An existing graph to update. The reachable modules are cached on
+        the graph, and only recomputed for the modules affected by the
+        files that changed.
+
+    Returns
+    -------
+    list[TransitiveViolation]
+
+    Examples
+    --------
+    >>> from flake8_custom_import_rules.api import Source
+    >>> from flake8_custom_import_rules.api import find_transitive_violations
+    >>> from flake8_custom_import_rules.defaults import Settings
+    >>> sources = [
+    ...     Source("import my_base_module.helpers", module_name="my_base_module.common"),
+    ...     Source("import my_base_module.app", module_name="my_base_module.helpers"),
+    ...     Source("app = None", module_name="my_base_module.app"),
+    ... ]
+    >>> settings = Settings(
+    ...     BASE_PACKAGES=["my_base_module"],
+    ...     CUSTOM_RESTRICTIONS=["my_base_module.common:my_base_module.app"],
+    ... )
+    >>> [str(violation) for violation in find_transitive_violations(sources, settings)]
+    ['my_base_module.common -> my_base_module.helpers -> my_base_module.app']
+    """
+    graph = build_import_graph(paths_or_sources, settings, graph=graph)
+    return check_transitive_restrictions(graph, RuleProfile.from_settings(settings))
+
+
+def check_graph_rules(
+    graph: ImportGraph, rule_profile: RuleProfile, baseline: Baseline | None = None
+) -> Iterator[FileResult]:
+    """
+    Check the rules of the whole import graph: import cycles and transitive restrictions.
+
+    Only the error codes of the rule profile are checked, so the graph
+    rules a project does not select are not reported (nor computed).
+    Transitive restrictions are opt-in, with the ``TRANSITIVE_RESTRICTIONS``
+    setting.
+
+    Parameters
+    ----------
+    graph : ImportGraph
+        The project import graph.
+    rule_profile : RuleProfile
+        The compiled rule profile, with the error codes to check.
+    baseline : Baseline | None
+        The known violations, which are not reported.
+
+    Yields
+    ------
+    FileResult
+        The graph errors of each file, in the order they are found.
+    """
+    active_codes = rule_profile.active_codes
+    errors: dict[str, tuple[str, list[ErrorMessage]]] = {}
+    violations: list[tuple[str, str | None, ErrorMessage]] = []
+    if ErrorCode.PIR401.name in active_codes:
+        violations.extend(
+            (cycle.modules[0], cycle.filename, cycle.error) for cycle in graph.cycles()
+        )
+    if rule_profile.settings.TRANSITIVE_RESTRICTIONS and not active_codes.isdisjoint(
+        TRANSITIVE_CODES
+    ):
+        violations.extend(
+            (violation.module, violation.filename, violation.error)
+            for violation in check_transitive_restrictions(graph, rule_profile)
+        )
+    for module, filename, error in violations:
+        if error.code not in active_codes:
+            continue
+        if baseline is not None and baseline.contains(module, error):
+            continue
+        errors.setdefault(filename or module, (module, []))[1].append(error)
+    for filename, (module, file_errors) in errors.items():
+        yield FileResult(filename=filename, module_name=module, errors=file_errors)
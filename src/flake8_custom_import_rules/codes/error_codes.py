@@ -15,7 +15,7 @@ class ErrorCodeMeta(EnumMeta):
     def __contains__(self, item: Any) -> bool:
         """Determine if the given item is present in the error code enumeration."""
         if isinstance(item, str):
-            return item in (member.value.split(" ")[0] for member in self)  # type: ignore
+            return item in ERROR_CODE_MEMBERS
         elif isinstance(item, Enum):
             return item.name in self._member_map_
         else:
@@ -30,9 +30,8 @@ class ErrorCodeMeta(EnumMeta):
                 return super().__call__(input_value, *args, **kwargs)
             except ValueError as e:
                 raise ErrorCodeTypeError(f"{input_value} is not a valid {cls.__name__} type") from e
-        for member in cls:  # type: ignore
-            if member.value.split(" ")[0] == input_value:
-                return member
+        if (member := ERROR_CODE_MEMBERS.get(input_value)) is not None:
+            return member
         raise ErrorCodeError(f"{input_value} is not a valid {cls.__name__}")
 
 
@@ -52,6 +51,9 @@ class ErrorCode(Enum, metaclass=ErrorCodeMeta):
     # Restricted package: For example the high level package can `app` is restricted
     CIR106 = "CIR106 Restricted Package Violation. Restricted project import."
     CIR107 = "CIR107 Restricted Package Violation. Restricted project `from import`."
+    # Transitive restrictions: The restricted import is reached through other project modules
+    CIR108 = "CIR108 Restricted Package Violation. Restricted package imported transitively."
+    CIR109 = "CIR109 Import Restriction Violation. Restricted import imported transitively."
 
     # Project only imports. No packages and modules from outside your project
     # (i.e. No Third Party Imports)
@@ -77,6 +79,10 @@ class ErrorCode(Enum, metaclass=ErrorCodeMeta):
     CIR501 = "CIR501 Non-third party package import."
     CIR502 = "CIR502 Non-third party module import."
 
+    # Layers: Packages can only import from their own layer or lower layers
+    CIR601 = "CIR601 Layer Violation. Upward project import."
+    CIR602 = "CIR602 Layer Violation. Upward project `from import`."
+
     # Project Level Import Rules and Restrictions
     PIR101 = "PIR101 Only top level imports are permitted in the project."
     PIR102 = "PIR102 Relative Imports are disabled for this project."
@@ -104,6 +110,9 @@ class ErrorCode(Enum, metaclass=ErrorCodeMeta):
     PIR301 = "PIR301 Potential dynamic import failed confirmation checks."
     PIR302 = "PIR302 Attempt to parse dynamic value string failed"
 
+    # Project Import Graph Rules
+    PIR401 = "PIR401 Import cycle between first-party modules."
+
     # conditions = {
     #     CIR101: lambda node: "__init__" in node.module,
     #     CIR102: lambda node: "restricted_package" in node.module,
@@ -123,8 +132,8 @@ class ErrorCode(Enum, metaclass=ErrorCodeMeta):
 
     @property
     def message(self) -> str:
-        """Get error code."""
-        return self.value.split(f"{self.name} ")[1]
+        """Get error message."""
+        return ERROR_CODE_MESSAGES[self.name]
 
     @property
     def full_message(self) -> str:
@@ -154,7 +163,7 @@ class ErrorCode(Enum, metaclass=ErrorCodeMeta):
     @classmethod
     def get_all_error_codes(cls) -> list[str]:
         """Get all error codes."""
-        return [error_code.name for error_code in cls]
+        return list(cls._member_names_)
 
     @classmethod
     def get_all_project_import_rule_codes(cls) -> list[str]:
@@ -167,6 +176,14 @@ class ErrorCode(Enum, metaclass=ErrorCodeMeta):
         return [code for code in cls.get_all_error_codes() if code.startswith("CIR")]
 
 
+# Lookup tables computed once at import time, so that resolving a code or its
+# message is a single dict access instead of a scan over every member.
+ERROR_CODE_MEMBERS: dict[str, ErrorCode] = {member.name: member for member in ErrorCode}
+ERROR_CODE_MESSAGES: dict[str, str] = {
+    member.name: member.value.split(" ", 1)[1] for member in ErrorCode
+}
+
+
 @singledispatch
 def _get_error_code_dispatcher(error_code: Any) -> str:
     """Get error code dispatcher."""
@@ -180,7 +197,7 @@ def _(error_code: str) -> str:
         error_code = error_code.split(".")[1]
     if error_code.startswith("CIR") or error_code.startswith("PIR"):
         error_code = error_code.split(" ")[0]
-    if error_code in ErrorCode.get_all_error_codes():
+    if error_code in ERROR_CODE_MEMBERS:
         return error_code
     raise ValueError(f"Invalid error code: {error_code}")
 
@@ -200,17 +217,15 @@ def _get_error_message_dispatcher(error_code: Any) -> str:
 @_get_error_message_dispatcher.register
 def _(error_code: str) -> str:
     """Get error message."""
-    if error_code in ErrorCode.get_all_error_codes():
-        error_code = ErrorCode(error_code).value
-    else:
+    if (message := ERROR_CODE_MESSAGES.get(error_code)) is None:
         raise ValueError(f"Invalid error code: {error_code}")
-    return " ".join(error_code.split(" ")[1:])
+    return message
 
 
 @_get_error_message_dispatcher.register
 def _(error_code: ErrorCode) -> str:
     """Get error message."""
-    return " ".join(error_code.value.split(" ")[1:])
+    return ERROR_CODE_MESSAGES[error_code.name]
 
 
 AllErrorCodes = ErrorCode.get_all_error_codes()
@@ -0,0 +1,312 @@
+""" Hierarchical per-directory configuration of the import rules. """
+
+from __future__ import annotations
+
+import configparser
+import logging
+import os
+from collections.abc import Mapping
+from typing import Any
+
+from attrs import define
+from attrs import field
+from flake8.utils import parse_comma_separated_list
+
+from flake8_custom_import_rules.core.rule_profile import RuleProfile
+from flake8_custom_import_rules.defaults import DEFAULT_CHECKER_SETTINGS
+from flake8_custom_import_rules.defaults import OPTION_KEYS
+from flake8_custom_import_rules.defaults import FrozenSettings
+from flake8_custom_import_rules.defaults import Settings
+from flake8_custom_import_rules.utils.option_utils import check_conflicts
+from flake8_custom_import_rules.utils.option_utils import get_bool_value
+
+try:
+    import tomllib
+except ImportError:  # pragma: no cover
+    try:
+        import tomli as tomllib  # type: ignore[no-redef]
+    except ImportError:
+        tomllib = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# The section of the nested ini configurations (setup.cfg, tox.ini, .flake8)
+CONFIG_SECTION = "flake8:custom-import-rules"
+# The table of the nested pyproject.toml configurations, under [tool]
+PYPROJECT_TABLE = "flake8-custom-import-rules"
+# The configuration files of a directory, the first one with a section is read
+INI_CONFIG_FILES = ("setup.cfg", "tox.ini", ".flake8")
+PYPROJECT_CONFIG_FILE = "pyproject.toml"
+
+# The options that are enabled or disabled, instead of listing packages
+BOOL_OPTION_KEYS = frozenset(
+    option_key
+    for option_key in OPTION_KEYS
+    if isinstance(DEFAULT_CHECKER_SETTINGS.get_settings_value(option_key), bool)
+)
+
+
+def get_option_values(values: Mapping[str, Any]) -> dict[str, Any]:
+    """
+    Get the import rules options from the values of a configuration section.
+
+    Option names are read like in the flake8 configuration, e.g.,
+    ``base-packages`` or ``base_packages``. Other options are left out.
+
+    Parameters
+    ----------
+    values : Mapping[str, Any]
+        The values of the section, by option name.
+
+    Returns
+    -------
+    dict[str, Any]
+        The unparsed option values, by option key.
+    """
+    option_values = {}
+    for name, value in values.items():
+        option_key = name.replace("-", "_").upper()
+        if option_key in OPTION_KEYS:
+            option_values[option_key] = value
+    return option_values
+
+
+def parse_option_values(option_values: Mapping[str, Any]) -> dict[str, Any]:
+    """
+    Parse the option values of a configuration section like the flake8 options.
+
+    Lists are separated by commas or whitespace, and restrictions are read
+    as booleans. TOML configurations may give lists and booleans directly.
+
+    Parameters
+    ----------
+    option_values : Mapping[str, Any]
+        The unparsed option values, by option key.
+
+    Returns
+    -------
+    dict[str, Any]
+        The option values, to pass to ``Settings``.
+    """
+    options: dict[str, Any] = {}
+    for option_key, value in option_values.items():
+        if option_key in BOOL_OPTION_KEYS:
+            options[option_key] = get_bool_value(value)
+        elif isinstance(value, (list, tuple)):
+            options[option_key] = [
+                item for element in value for item in parse_comma_separated_list(str(element))
+            ]
+        else:
+            options[option_key] = parse_comma_separated_list(str(value))
+    return options
+
+
+def read_ini_config(path: str) -> dict[str, Any] | None:
+    """
+    Read the import rules section of an ini configuration file.
+
+    Parameters
+    ----------
+    path : str
+        The configuration file.
+
+    Returns
+    -------
+    dict[str, Any] | None
+        The unparsed option values, or None if the file has no section.
+    """
+    config = configparser.RawConfigParser()
+    try:
+        config.read(path, encoding="utf-8")
+    except configparser.Error as error:
+        logger.warning("Cannot read %s: %s", path, error)
+        return None
+    if not config.has_section(CONFIG_SECTION):
+        return None
+    return get_option_values(dict(config.items(CONFIG_SECTION)))
+
+
+def read_pyproject_config(path: str) -> dict[str, Any] | None:
+    """
+    Read the import rules table of a pyproject.toml file.
+
+    Parameters
+    ----------
+    path : str
+        The pyproject.toml file.
+
+    Returns
+    -------
+    dict[str, Any] | None
+        The unparsed option values, or None if the file has no table or no
+        TOML parser is available (Python < 3.11 without ``tomli``).
+    """
+    if tomllib is None:
+        logger.warning("Cannot read %s: install tomli to read pyproject.toml", path)
+        return None
+    try:
+        with open(path, "rb") as stream:
+            pyproject = tomllib.load(stream)
+    except (OSError, tomllib.TOMLDecodeError) as error:
+        logger.warning("Cannot read %s: %s", path, error)
+        return None
+    table = pyproject.get("tool", {}).get(PYPROJECT_TABLE)
+    return get_option_values(table) if isinstance(table, Mapping) else None
+
+
+def read_directory_config(directory: str) -> dict[str, Any]:
+    """
+    Read the import rules configuration of a directory.
+
+    The ini configuration files are read first, then ``pyproject.toml``;
+    the first file with an import rules section is used.
+
+    Parameters
+    ----------
+    directory : str
+        The directory.
+
+    Returns
+    -------
+    dict[str, Any]
+        The unparsed option values, empty if the directory has no
+        configuration.
+    """
+    for config_file in INI_CONFIG_FILES:
+        path = os.path.join(directory, config_file)
+        if os.path.isfile(path) and (option_values := read_ini_config(path)) is not None:
+            return option_values
+    path = os.path.join(directory, PYPROJECT_CONFIG_FILE)
+    if os.path.isfile(path) and (option_values := read_pyproject_config(path)) is not None:
+        return option_values
+    return {}
+
+
+def overlay_settings(settings: FrozenSettings, option_values: Mapping[str, Any]) -> FrozenSettings:
+    """
+    Overlay the options of a nested configuration on the settings of its parent.
+
+    Parameters
+    ----------
+    settings : FrozenSettings
+        The settings of the parent directory.
+    option_values : Mapping[str, Any]
+        The unparsed option values of the nested configuration.
+
+    Returns
+    -------
+    FrozenSettings
+    """
+    overlaid_settings = Settings(**{**settings.field_map, **parse_option_values(option_values)})
+    if conflicts := check_conflicts(overlaid_settings.dict):
+        logger.warning(" ".join(conflicts))
+    return overlaid_settings.freeze()
+
+
+def is_relative_to(directory: str, root: str) -> bool:
+    """Return whether a directory is the root or one of its subdirectories."""
+    try:
+        return os.path.commonpath((root, directory)) == root
+    except ValueError:
+        # The paths are on different drives
+        return False
+
+
+@define(slots=True)
+class ConfigResolver:
+    """Resolve the rule profile of each file from the nested configurations.
+
+    A directory below the project root may hold a ``[flake8:custom-import-
+    rules]`` section (or a ``[tool.flake8-custom-import-rules]`` table in
+    ``pyproject.toml``) that overrides the options of its parent directory.
+    The effective settings are resolved once per directory, and a profile is
+    compiled once per distinct effective settings, so every file beneath a
+    directory shares the same compiled profile and its caches.
+
+    Attributes
+    ----------
+    rule_profile : RuleProfile
+        The profile of the project configuration, used for the files outside
+        of the project root, and within it unless overridden (including by a
+        section in the project root itself).
+    root : str
+        The project root, by default the current working directory.
+    """
+
+    rule_profile: RuleProfile
+    root: str = field(factory=os.getcwd, converter=os.path.abspath)
+
+    _settings: dict[str, FrozenSettings] = field(init=False, factory=dict, repr=False)
+    _directory_profiles: dict[str, RuleProfile] = field(init=False, factory=dict, repr=False)
+    _profiles: dict[str, RuleProfile] = field(init=False, factory=dict, repr=False)
+
+    def __attrs_post_init__(self) -> None:
+        """Share the project profile with the directories without overrides."""
+        self._profiles[self.rule_profile.settings.content_hash] = self.rule_profile
+        settings = self.rule_profile.settings
+        # The section of the project root overrides the project configuration, like any other
+        if option_values := read_directory_config(self.root):
+            settings = overlay_settings(settings, option_values)
+        self._settings[self.root] = settings
+
+    @property
+    def profiles(self) -> list[RuleProfile]:
+        """Return the distinct profiles compiled so far."""
+        return list(self._profiles.values())
+
+    def settings_for(self, directory: str) -> FrozenSettings:
+        """
+        Resolve the effective settings of a directory below the project root.
+
+        Parameters
+        ----------
+        directory : str
+            The absolute path of the directory.
+
+        Returns
+        -------
+        FrozenSettings
+        """
+        try:
+            return self._settings[directory]
+        except KeyError:
+            pass
+
+        parent_settings = self.settings_for(os.path.dirname(directory))
+        if option_values := read_directory_config(directory):
+            settings = overlay_settings(parent_settings, option_values)
+        else:
+            settings = parent_settings
+        self._settings[directory] = settings
+        return settings
+
+    def profile_for(self, filename: str) -> RuleProfile:
+        """
+        Get the compiled rule profile of a file.
+
+        Parameters
+        ----------
+        filename : str
+            The file being checked.
+
+        Returns
+        -------
+        RuleProfile
+        """
+        directory = os.path.dirname(os.path.abspath(filename))
+        try:
+            return self._directory_profiles[directory]
+        except KeyError:
+            pass
+
+        if not is_relative_to(directory, self.root):
+            rule_profile = self.rule_profile
+        else:
+            settings = self.settings_for(directory)
+            try:
+                rule_profile = self._profiles[settings.content_hash]
+            except KeyError:
+                rule_profile = RuleProfile.from_settings(settings, self.rule_profile.active_codes)
+                self._profiles[settings.content_hash] = rule_profile
+        self._directory_profiles[directory] = rule_profile
+        return rule_profile
@@ -0,0 +1,146 @@
+""" Baseline of known violations, fingerprinted without their location. """
+
+from __future__ import annotations
+
+import hashlib
+import os
+from collections.abc import Iterable
+
+from attrs import define
+from attrs import field
+
+from flake8_custom_import_rules.core.error_messages import ErrorMessage
+
+# The first line of a baseline file
+BASELINE_HEADER = "# flake8-custom-import-rules baseline"
+# The default baseline file of the standalone CLI
+DEFAULT_BASELINE = "import-rules-baseline.txt"
+# The size of a fingerprint, in bytes. Collisions are negligible below millions of violations.
+FINGERPRINT_SIZE = 8
+
+
+def fingerprint(module: str, code: str, identifier: str) -> str:
+    """
+    Fingerprint a violation without its location.
+
+    Line numbers are left out, so the fingerprint of a violation does not
+    change when lines are added or removed above it.
+
+    Parameters
+    ----------
+    module : str
+        The module the violation is reported in (the filename, if the
+        module name is not known).
+    code : str
+        The error code.
+    identifier : str
+        The identifier of the import the violation is reported on.
+
+    Returns
+    -------
+    str
+        The fingerprint, as a hexadecimal string.
+
+    Examples
+    --------
+    >>> fingerprint("my_package.module", "CIR102", "my_package.other")
+    '5709e01cc296a6ef'
+    """
+    key = f"{module}\0{code}\0{identifier}".encode()
+    return hashlib.blake2b(key, digest_size=FINGERPRINT_SIZE).hexdigest()
+
+
+def error_fingerprint(module: str, error: ErrorMessage) -> str:
+    """Fingerprint an error reported in a module."""
+    return fingerprint(module, error.code, error.identifier)
+
+
+@define(slots=True, frozen=True)
+class Baseline:
+    """Fingerprints of the known violations of a project.
+
+    Known violations are filtered out in-process, before their messages are
+    formatted, so adopting stricter rules on a legacy codebase only reports
+    the violations introduced since the baseline was written. The baseline
+    is loaded once per run into a hash set, so each error is filtered with a
+    single hash and a set lookup.
+
+    Attributes
+    ----------
+    fingerprints : frozenset[str]
+        The fingerprints of the known violations.
+    """
+
+    fingerprints: frozenset[str] = field(factory=frozenset)
+
+    def __len__(self) -> int:
+        """Return the number of known violations."""
+        return len(self.fingerprints)
+
+    def contains(self, module: str, error: ErrorMessage) -> bool:
+        """
+        Return whether an error is a known violation.
+
+        Parameters
+        ----------
+        module : str
+            The module the error is reported in (the filename, if the module
+            name is not known).
+        error : ErrorMessage
+            The error.
+
+        Returns
+        -------
+        bool
+        """
+        return error_fingerprint(module, error) in self.fingerprints
+
+    @classmethod
+    def from_errors(cls, errors: Iterable[tuple[str, ErrorMessage]]) -> Baseline:
+        """
+        Create a baseline of errors.
+
+        Parameters
+        ----------
+        errors : Iterable[tuple[str, ErrorMessage]]
+            The module each error is reported in, and the error.
+
+        Returns
+        -------
+        Baseline
+        """
+        return cls(frozenset(error_fingerprint(module, error) for module, error in errors))
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> Baseline:
+        """
+        Load a baseline file, with one fingerprint per line.
+
+        Parameters
+        ----------
+        path : str | os.PathLike
+            The baseline file.
+
+        Returns
+        -------
+        Baseline
+        """
+        with open(path, encoding="utf-8") as stream:
+            return cls(
+                frozenset(
+                    line for line in map(str.strip, stream) if line and not line.startswith("#")
+                )
+            )
+
+    def write(self, path: str | os.PathLike) -> None:
+        """
+        Write the baseline file, with the fingerprints sorted so that it diffs well.
+
+        Parameters
+        ----------
+        path : str | os.PathLike
+            The baseline file.
+        """
+        with open(path, "w", encoding="utf-8") as stream:
+            stream.write(f"{BASELINE_HEADER}\n")
+            stream.writelines(f"{fp}\n" for fp in sorted(self.fingerprints))
@@ -1,15 +1,40 @@
 """ Error messages for custom import rules. """
 
 from attrs import define
+from attrs import field
 
+from flake8_custom_import_rules.codes.error_codes import ERROR_CODE_MESSAGES
 from flake8_custom_import_rules.codes.error_codes import ErrorCode
+from flake8_custom_import_rules.core.nodes import ParsedDynamicImport
+from flake8_custom_import_rules.core.nodes import ParsedIfImport
 from flake8_custom_import_rules.core.nodes import ParsedNode
 
+USING_IMPORT_EXPLANATION = "Using '{}'."
+STANDALONE_IMPORT_EXPLANATION = (
+    "Using '{}'. Standalone module '{}' cannot import from project packages."
+)
+RESTRICTED_PACKAGE_EXPLANATION = (
+    "Using '{}'. Restricted package cannot be imported into module '{}'."
+)
+IMPORT_RESTRICTION_EXPLANATION = (
+    "Using '{}'. Restricted package/module cannot be imported into module '{}'."
+)
+TRANSITIVE_RESTRICTION_EXPLANATION = (
+    "Using '{}' through '{}'. Restricted package/module cannot be imported into module '{}'."
+)
+IMPORT_CYCLE_EXPLANATION = "Cycle: '{}'."
+LAYER_EXPLANATION = "Using '{}'. Layer '{}' cannot be imported into module '{}' in layer '{}'."
+
 
 @define(slots=True)
 class ErrorMessage:
     """Error message
 
+    The error message only stores what is needed to identify the error. The
+    text shown to the user is rendered from the error code and the explanation
+    template when it is requested, so errors that are later dropped (e.g.,
+    by a ``noqa`` comment) are never formatted.
+
     Attributes
     ----------
     lineno : int
@@ -18,32 +43,68 @@ class ErrorMessage:
         The column offset of the error.
     code : str
         The error code.
-    message : str
-        The error message to show to the user.
-    custom_explanation : str | None
-        Custom explanation to add to the error message.
+    explanation : str | None
+        Explanation template to add to the error message.
+    explanation_args : tuple
+        Arguments used to format the explanation template.
+    identifier : str
+        The identifier of the import the error is reported on (e.g.,
+        ``my_package.module.name``), used to fingerprint the error without
+        its location.
     """
 
     lineno: int
     col_offset: int
     code: str
-    message: str
-    custom_explanation: str | None = None
-
-    def __attrs_post_init__(self) -> None:
-        """Post init."""
-        self.custom_explanation = self.custom_explanation or ""
-        self.message = f"{self.message} {self.custom_explanation}".strip()
+    explanation: str | None = None
+    explanation_args: tuple = ()
+    identifier: str = field(default="", eq=False)
+
+    @property
+    def custom_explanation(self) -> str:
+        """Return the rendered custom explanation."""
+        if self.explanation is None:
+            return ""
+        return self.explanation.format(*self.explanation_args)
+
+    @property
+    def message(self) -> str:
+        """Return the error message to show to the user."""
+        return f"{ERROR_CODE_MESSAGES[self.code]} {self.custom_explanation}".strip()
 
     def __str__(self) -> str:
         """Return the error message."""
         return f"{self.lineno}:{self.col_offset}: {self.code} {self.message}"
 
 
+def node_identifier(node: ParsedNode) -> str:
+    """
+    Return the identifier of the import a node reports on.
+
+    Parameters
+    ----------
+    node : ParsedNode
+        The node that caused the error.
+
+    Returns
+    -------
+    str
+        The imported identifier, the import statement of local and
+        conditional imports, or the imported module of dynamic imports.
+    """
+    if isinstance(node, ParsedDynamicImport):
+        return node.values[0] if node.values else node.identifier
+    if isinstance(node, ParsedIfImport):
+        return node.sub_node
+    identifier = getattr(node, "identifier", "")
+    return identifier or getattr(node, "import_statement", "")
+
+
 def standard_error_message(
     node: ParsedNode,
     error_code: ErrorCode,
-    custom_explanation: str | None = None,
+    explanation: str | None = None,
+    *explanation_args: str | None,
 ) -> ErrorMessage:
     """
     Generate error message from node.
@@ -54,8 +115,10 @@ def standard_error_message(
         The node that caused the error.
     error_code : ErrorCode
         The error code.
-    custom_explanation : str | None
-        Custom explanation to add to the error message.
+    explanation : str | None
+        Explanation template to add to the error message.
+    explanation_args : str | None
+        Arguments used to format the explanation template.
 
     Returns
     -------
@@ -64,9 +127,10 @@ def standard_error_message(
     return ErrorMessage(
         lineno=node.lineno,
         col_offset=node.col_offset,
-        code=error_code.code,
-        message=error_code.message,
-        custom_explanation=custom_explanation,
+        code=error_code.name,
+        explanation=explanation,
+        explanation_args=explanation_args,
+        identifier=node_identifier(node),
     )
 
 
@@ -76,11 +140,9 @@ def standalone_imports_error(
     file_identifier: str,
 ) -> ErrorMessage:
     """Generate error message for standalone imports."""
-    custom_explanation = (
-        f"Using '{node.import_statement}'. Standalone module '{file_identifier}' "
-        f"cannot import from project packages."
+    return standard_error_message(
+        node, error_code, STANDALONE_IMPORT_EXPLANATION, node.import_statement, file_identifier
     )
-    return standard_error_message(node, error_code, custom_explanation)
 
 
 def std_lib_only_error(
@@ -101,11 +163,7 @@ def std_lib_only_error(
     -------
     ErrorMessage
     """
-    custom_explanation = (
-        f"Using '{node.import_statement}'."
-        # f"which is not a Python standard library."
-    )
-    return standard_error_message(node, error_code, custom_explanation)
+    return standard_error_message(node, error_code, USING_IMPORT_EXPLANATION, node.import_statement)
 
 
 def third_party_only_error(
@@ -126,11 +184,7 @@ def third_party_only_error(
     -------
     ErrorMessage
     """
-    custom_explanation = (
-        f"Using '{node.import_statement}'."
-        # f"which is not a third-party library."
-    )
-    return standard_error_message(node, error_code, custom_explanation)
+    return standard_error_message(node, error_code, USING_IMPORT_EXPLANATION, node.import_statement)
 
 
 def first_party_only_error(
@@ -150,11 +204,7 @@ def first_party_only_error(
     -------
     ErrorMessage
     """
-    custom_explanation = (
-        f"Using '{node.import_statement}'."
-        # f"which is not a first-party library."
-    )
-    return standard_error_message(node, error_code, custom_explanation)
+    return standard_error_message(node, error_code, USING_IMPORT_EXPLANATION, node.import_statement)
 
 
 def restricted_package_error(
@@ -177,11 +227,9 @@ def restricted_package_error(
     -------
     ErrorMessage
     """
-    custom_explanation = (
-        f"Using '{node.import_statement}'. Restricted package "
-        f"cannot be imported into module '{file_identifier}'."
+    return standard_error_message(
+        node, error_code, RESTRICTED_PACKAGE_EXPLANATION, node.import_statement, file_identifier
     )
-    return standard_error_message(node, error_code, custom_explanation)
 
 
 def import_restriction_error(
@@ -204,8 +252,43 @@ def import_restriction_error(
     -------
     ErrorMessage
     """
-    custom_explanation = (
-        f"Using '{node.import_statement}'. Restricted package/module "
-        f"cannot be imported into module '{file_identifier}'."
+    return standard_error_message(
+        node, error_code, IMPORT_RESTRICTION_EXPLANATION, node.import_statement, file_identifier
+    )
+
+
+def layer_error(
+    node: ParsedNode,
+    error_code: ErrorCode,
+    file_identifier: str,
+    file_layer: str,
+    import_layer: str,
+) -> ErrorMessage:
+    """Generate error message for upward imports between layers.
+
+    Parameters
+    ----------
+    node : ParsedNode
+        The node that caused the error.
+    error_code : ErrorCode
+        The error code.
+    file_identifier : str
+        The file identifier.
+    file_layer : str
+        The layer of the file.
+    import_layer : str
+        The layer of the imported package or module.
+
+    Returns
+    -------
+    ErrorMessage
+    """
+    return standard_error_message(
+        node,
+        error_code,
+        LAYER_EXPLANATION,
+        node.import_statement,
+        import_layer,
+        file_identifier,
+        file_layer,
     )
-    return standard_error_message(node, error_code, custom_explanation)
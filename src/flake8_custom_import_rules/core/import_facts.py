@@ -0,0 +1,300 @@
+""" Lightweight import facts that custom import rules can be evaluated against. """
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable
+from collections.abc import Sequence
+from enum import Enum
+from typing import Callable
+
+from attrs import define
+
+from flake8_custom_import_rules.core.import_rules import is_confirmed_dynamic_import
+from flake8_custom_import_rules.core.node_visitor import CustomImportRulesVisitor
+from flake8_custom_import_rules.core.nodes import ImportType
+from flake8_custom_import_rules.core.nodes import ParsedDynamicImport
+from flake8_custom_import_rules.core.nodes import ParsedFromImport
+from flake8_custom_import_rules.core.nodes import ParsedIfImport
+from flake8_custom_import_rules.core.nodes import ParsedLocalImport
+from flake8_custom_import_rules.core.nodes import ParsedNode
+from flake8_custom_import_rules.core.nodes import ParsedStraightImport
+from flake8_custom_import_rules.utils.node_utils import check_private_module_import
+from flake8_custom_import_rules.utils.node_utils import get_package_names
+from flake8_custom_import_rules.utils.node_utils import resolve_relative_module
+from flake8_custom_import_rules.utils.node_utils import root_package_name
+
+# The module, name, level, line number, column offset, alias and scope of an import fact
+ImportFactRow = tuple[str, "str | None", int, int, int, "str | None", str]
+
+
+class ImportScope(Enum):
+    """Scope an import is made in."""
+
+    TOP_LEVEL = "TOP_LEVEL"
+    LOCAL = "LOCAL"
+    CONDITIONAL = "CONDITIONAL"
+    DYNAMIC = "DYNAMIC"
+
+
+@define(slots=True, frozen=True)
+class ImportFact:
+    """A single imported name, as extracted by the visitor or another tool.
+
+    Attributes
+    ----------
+    module : str
+        The imported module. For `from` imports, the module the names are
+        imported from (without the leading dots of relative imports). For
+        dynamic imports, the module passed to the dynamic import function.
+    name : str | None
+        The imported name for `from` imports, None for straight imports.
+    level : int
+        The level of relative `from` imports.
+    lineno : int
+        The line number of the import statement.
+    col_offset : int
+        The column offset of the import statement.
+    asname : str | None
+        The alias of the import, if any.
+    scope : ImportScope
+        The scope the import is made in.
+    """
+
+    module: str
+    name: str | None = None
+    level: int = 0
+    lineno: int = 1
+    col_offset: int = 0
+    asname: str | None = None
+    scope: ImportScope = ImportScope.TOP_LEVEL
+
+    @property
+    def is_from_import(self) -> bool:
+        """Return whether the fact is a `from` import."""
+        return self.name is not None
+
+    def to_row(self) -> ImportFactRow:
+        """Return the fact as a row of plain values, e.g., to serialize it to JSON."""
+        return (
+            self.module,
+            self.name,
+            self.level,
+            self.lineno,
+            self.col_offset,
+            self.asname,
+            self.scope.value,
+        )
+
+    @classmethod
+    def from_row(cls, row: Sequence) -> ImportFact:
+        """Return the fact of a row returned by ``to_row``."""
+        module, name, level, lineno, col_offset, asname, scope = row
+        return cls(module, name, level, lineno, col_offset, asname, ImportScope(scope))
+
+
+def _alias_string(name: str, asname: str | None) -> str:
+    """Return the alias as it is written in the import statement."""
+    return f"{name} as {asname}" if asname else name
+
+
+def render_import_statements(facts: Iterable[ImportFact]) -> dict[ImportFact, str]:
+    """
+    Render the import statement of each fact.
+
+    Facts that share a line, a column offset and a module are imported by the
+    same statement, so they are rendered together, matching ``ast.unparse``.
+
+    Parameters
+    ----------
+    facts : Iterable[ImportFact]
+        The import facts.
+
+    Returns
+    -------
+    dict[ImportFact, str]
+        The import statement of each fact.
+    """
+    statements: defaultdict[tuple, list[ImportFact]] = defaultdict(list)
+    for fact in facts:
+        if fact.is_from_import:
+            statements[(fact.lineno, fact.col_offset, fact.level, fact.module)].append(fact)
+        else:
+            statements[(fact.lineno, fact.col_offset)].append(fact)
+
+    rendered: dict[ImportFact, str] = {}
+    for statement_facts in statements.values():
+        first = statement_facts[0]
+        if first.is_from_import:
+            names = ", ".join(_alias_string(str(f.name), f.asname) for f in statement_facts)
+            statement = f"from {'.' * first.level}{first.module} import {names}"
+        else:
+            names = ", ".join(_alias_string(f.module, f.asname) for f in statement_facts)
+            statement = f"import {names}"
+        rendered |= {fact: statement for fact in statement_facts}
+    return rendered
+
+
+def _scope_node(fact: ImportFact, import_statement: str) -> ParsedLocalImport | ParsedIfImport:
+    """Return the node marking a local or conditional import statement."""
+    if fact.scope == ImportScope.LOCAL:
+        return ParsedLocalImport(
+            lineno=fact.lineno,
+            col_offset=fact.col_offset,
+            local_node_type=fact.scope.value,
+            import_statement=import_statement,
+        )
+    return ParsedIfImport(lineno=fact.lineno, col_offset=fact.col_offset, sub_node=import_statement)
+
+
+def nodes_from_import_facts(
+    facts: Iterable[ImportFact],
+    classify: Callable[[list[str]], ImportType],
+    module_name: str | None = None,
+) -> list[ParsedNode]:
+    """
+    Build the parsed nodes the visitor would produce for the import facts.
+
+    Parameters
+    ----------
+    facts : Iterable[ImportFact]
+        The import facts.
+    classify : Callable[[list[str]], ImportType]
+        Classifies the import type of a list of package names.
+    module_name : str | None
+        The module name of the file the facts were extracted from, used to
+        resolve relative imports. Relative imports are not resolved if None.
+
+    Returns
+    -------
+    list[ParsedNode]
+        The parsed nodes.
+    """
+    facts = list(facts)
+    import_statements = render_import_statements(
+        fact for fact in facts if fact.scope != ImportScope.DYNAMIC
+    )
+
+    nodes: list[ParsedNode] = []
+    scoped_statements: set[tuple[int, int]] = set()
+    for fact in facts:
+        if fact.scope == ImportScope.DYNAMIC:
+            nodes.append(
+                ParsedDynamicImport(
+                    lineno=fact.lineno,
+                    col_offset=fact.col_offset,
+                    dynamic_import=fact.module,
+                    identifier=fact.module,
+                    confirmed=True,
+                    values=[fact.module],
+                )
+            )
+            continue
+
+        import_statement = import_statements[fact]
+        statement_key = (fact.lineno, fact.col_offset)
+        if fact.scope != ImportScope.TOP_LEVEL and statement_key not in scoped_statements:
+            # The visitor reports local and conditional imports once per statement
+            scoped_statements.add(statement_key)
+            nodes.append(_scope_node(fact, import_statement))
+
+        if fact.is_from_import:
+            resolved_module = (
+                resolve_relative_module(module_name, fact.module, fact.level)
+                if fact.level > 0 and module_name is not None
+                else None
+            )
+            module = fact.module if resolved_module is None else resolved_module
+            package_names = get_package_names(module) or []
+            nodes.append(
+                ParsedFromImport(
+                    import_type=(
+                        ImportType.RELATIVE
+                        if fact.level > 0 and resolved_module is None
+                        else classify(package_names)
+                    ),
+                    module=fact.module,
+                    name=str(fact.name),
+                    asname=fact.asname,
+                    lineno=fact.lineno,
+                    col_offset=fact.col_offset,
+                    node_col_offset=fact.col_offset,
+                    alias_col_offset=fact.col_offset,
+                    level=fact.level,
+                    package=root_package_name(module),
+                    package_names=package_names,
+                    private_identifier_import=check_private_module_import(str(fact.name)),
+                    private_module_import=check_private_module_import(fact.module),
+                    import_statement=import_statement,
+                    resolved_module=resolved_module,
+                )
+            )
+        else:
+            package_names = get_package_names(fact.module) or []
+            nodes.append(
+                ParsedStraightImport(
+                    import_type=classify(package_names),
+                    module=fact.module,
+                    asname=fact.asname,
+                    lineno=fact.lineno,
+                    col_offset=fact.col_offset,
+                    node_col_offset=fact.col_offset,
+                    alias_col_offset=fact.col_offset,
+                    package=str(root_package_name(fact.module)),
+                    package_names=package_names,
+                    private_identifier_import=False,
+                    private_module_import=check_private_module_import(fact.module),
+                    import_statement=import_statement,
+                )
+            )
+    return nodes
+
+
+def import_facts_from_visitor(visitor: CustomImportRulesVisitor) -> list[ImportFact]:
+    """
+    Extract the import facts from a visitor that has visited a file.
+
+    Parameters
+    ----------
+    visitor : CustomImportRulesVisitor
+        The visitor.
+
+    Returns
+    -------
+    list[ImportFact]
+        The import facts, in the order they were visited.
+    """
+    scopes = {
+        (node.lineno, node.col_offset): (
+            ImportScope.LOCAL if isinstance(node, ParsedLocalImport) else ImportScope.CONDITIONAL
+        )
+        for node in visitor.nodes
+        if isinstance(node, (ParsedLocalImport, ParsedIfImport))
+    }
+
+    facts = []
+    for node in visitor.nodes:
+        if isinstance(node, (ParsedStraightImport, ParsedFromImport)):
+            facts.append(
+                ImportFact(
+                    module=node.module,
+                    name=node.name if isinstance(node, ParsedFromImport) else None,
+                    level=node.level if isinstance(node, ParsedFromImport) else 0,
+                    lineno=node.lineno,
+                    col_offset=node.col_offset,
+                    asname=node.asname,
+                    scope=scopes.get((node.lineno, node.col_offset), ImportScope.TOP_LEVEL),
+                )
+            )
+        elif isinstance(node, ParsedDynamicImport) and is_confirmed_dynamic_import(
+            node, visitor.identifiers, visitor.dynamic_nodes
+        ):
+            facts.append(
+                ImportFact(
+                    module=node.values[0] if node.values else node.identifier,
+                    lineno=node.lineno,
+                    col_offset=node.col_offset,
+                    scope=ImportScope.DYNAMIC,
+                )
+            )
+    return facts
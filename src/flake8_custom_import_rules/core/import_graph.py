@@ -0,0 +1,664 @@
+""" First-party import graph of a project, with incremental import cycle detection. """
+
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from collections import deque
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Mapping
+
+from attrs import define
+from attrs import field
+
+from flake8_custom_import_rules.codes.error_codes import ErrorCode
+from flake8_custom_import_rules.core.error_messages import IMPORT_CYCLE_EXPLANATION
+from flake8_custom_import_rules.core.error_messages import ErrorMessage
+from flake8_custom_import_rules.core.import_facts import ImportFact
+from flake8_custom_import_rules.core.import_facts import ImportScope
+from flake8_custom_import_rules.utils.node_utils import resolve_relative_module
+
+logger = logging.getLogger(__name__)
+
+Location = tuple[int, int]
+
+
+def strongly_connected_components(
+    nodes: Iterable[str], successors: Callable[[str], Iterable[str]]
+) -> list[list[str]]:
+    """
+    Find the strongly connected components of a graph with Tarjan's algorithm.
+
+    The algorithm is iterative, so deep import chains do not hit the
+    recursion limit. Components are returned in reverse topological order
+    (i.e., a component is returned before the components that import it).
+
+    Parameters
+    ----------
+    nodes : Iterable[str]
+        The nodes of the graph.
+    successors : Callable[[str], Iterable[str]]
+        Returns the successors of a node. Successors must be nodes of the
+        graph.
+
+    Returns
+    -------
+    list[list[str]]
+        The strongly connected components.
+    """
+    index: dict[str, int] = {}
+    lowlink: dict[str, int] = {}
+    on_stack: set[str] = set()
+    stack: list[str] = []
+    components: list[list[str]] = []
+
+    for root in nodes:
+        if root in index:
+            continue
+
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(successors(root)))]
+
+        while work:
+            node, node_successors = work[-1]
+            for successor in node_successors:
+                if successor not in index:
+                    index[successor] = lowlink[successor] = len(index)
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, iter(successors(successor))))
+                    break
+                if successor in on_stack and index[successor] < lowlink[node]:
+                    lowlink[node] = index[successor]
+            else:
+                work.pop()
+                node_lowlink = lowlink[node]
+                if work and node_lowlink < lowlink[work[-1][0]]:
+                    lowlink[work[-1][0]] = node_lowlink
+                if node_lowlink == index[node]:
+                    if stack[-1] == node:
+                        # Most modules are not part of a cycle
+                        stack.pop()
+                        on_stack.discard(node)
+                        components.append([node])
+                        continue
+                    position = len(stack) - 1
+                    while stack[position] != node:
+                        position -= 1
+                    component = stack[position:]
+                    del stack[position:]
+                    on_stack.difference_update(component)
+                    components.append(component)
+
+    return components
+
+
+def graph_imports_from_facts(
+    facts: Iterable[ImportFact], module_name: str | None = None
+) -> dict[str, Location]:
+    """
+    Get the imports of a module that are followed when the module is imported.
+
+    Local and dynamic imports only run when the enclosing code runs, so they
+    cannot create an import cycle and are left out. Relative imports are
+    resolved from the module name, and left out if it is not given.
+
+    Parameters
+    ----------
+    facts : Iterable[ImportFact]
+        The import facts of the module.
+    module_name : str | None
+        The module name, used to resolve relative imports. Packages are
+        named after their ``__init__`` module, e.g., ``my_package.__init__``.
+
+    Returns
+    -------
+    dict[str, Location]
+        The imported identifiers, and the location of the first import of
+        each identifier.
+    """
+    imports: dict[str, Location] = {}
+    for fact in facts:
+        if fact.scope in {ImportScope.LOCAL, ImportScope.DYNAMIC}:
+            continue
+        module: str | None = fact.module
+        if fact.level > 0:
+            module = (
+                resolve_relative_module(module_name, fact.module, fact.level)
+                if module_name is not None
+                else None
+            )
+            if module is None:
+                continue
+        identifier = f"{module}.{fact.name}" if fact.is_from_import else str(module)
+        imports.setdefault(identifier, (fact.lineno, fact.col_offset))
+    return imports
+
+
+@define(slots=True, frozen=True)
+class ImportCycle:
+    """A cycle of first-party imports.
+
+    Attributes
+    ----------
+    modules : tuple[str, ...]
+        The modules of the cycle, starting and ending with the same module.
+    locations : tuple[Location, ...]
+        The location of each import of the cycle, in the importing module.
+    filename : str | None
+        The file of the first module of the cycle, if known.
+    """
+
+    modules: tuple[str, ...]
+    locations: tuple[Location, ...]
+    filename: str | None = None
+
+    @property
+    def edges(self) -> list[tuple[str, str]]:
+        """Return the (importing module, imported module) edges of the cycle."""
+        return list(zip(self.modules, self.modules[1:]))
+
+    @property
+    def error(self) -> ErrorMessage:
+        """Return the error reported at the first import of the cycle."""
+        lineno, col_offset = self.locations[0]
+        return ErrorMessage(
+            lineno=lineno,
+            col_offset=col_offset,
+            code=ErrorCode.PIR401.name,
+            explanation=IMPORT_CYCLE_EXPLANATION,
+            explanation_args=(str(self),),
+            identifier=str(self),
+        )
+
+    def __str__(self) -> str:
+        """Return the cycle as a path of modules."""
+        return " -> ".join(self.modules)
+
+
+@define(slots=True)
+class ImportGraph:
+    """First-party import graph of a project.
+
+    The graph keeps the strongly connected components of the imports up to
+    date. When the imports of a module change, only the components that can
+    be affected by the change are recomputed: the old component of the
+    module, and the modules that are both reachable from and can reach the
+    module. When more than half of the modules are affected, or a module is
+    added or removed (which can change how imports are resolved), every
+    component is recomputed instead.
+
+    The modules reachable from each component are kept as a bitset (a
+    Python int with one bit per module) computed over the condensation of
+    the graph, so whether a module can reach a package is a single bitwise
+    AND. Bitsets are computed when they are first needed, and only the
+    bitsets of the modules that can reach a changed module are dropped
+    when the graph changes.
+
+    Imports are resolved to the most specific module of the graph they
+    import, so ``from my_package.module import name`` is an edge to
+    ``my_package.module``, and imports of modules outside of the graph
+    (i.e., standard library and third party imports) are ignored. Packages
+    are named after their ``__init__`` module, so ``import my_package`` is
+    an edge to ``my_package.__init__``.
+
+    Attributes
+    ----------
+    filenames : dict[str, str]
+        The file of each module, if known.
+    """
+
+    filenames: dict[str, str] = field(factory=dict)
+
+    _imports: dict[str, dict[str, Location]] = field(init=False, factory=dict)
+    _edges: dict[str, dict[str, Location]] = field(init=False, factory=dict)
+    _predecessors: defaultdict[str, set[str]] = field(init=False, factory=lambda: defaultdict(set))
+    _components: dict[str, int] = field(init=False, factory=dict)
+    _members: dict[int, list[str]] = field(init=False, factory=dict)
+    _cycles: dict[int, ImportCycle] = field(init=False, factory=dict)
+    _next_component: int = field(init=False, default=0)
+    _resolved: dict[str, str] = field(init=False, factory=dict)
+    _index: dict[str, int] = field(init=False, factory=dict)
+    _reach: dict[int, int] = field(init=False, factory=dict)
+    _package_bits: dict[str, int] = field(init=False, factory=dict)
+    _importer_bits: dict[str, int] = field(init=False, factory=dict)
+    _has_predecessors: bool = field(init=False, default=False)
+    _dirty: set[str] = field(init=False, factory=set)
+    _modules_changed: bool = field(init=False, default=False)
+
+    def __len__(self) -> int:
+        """Return the number of modules in the graph."""
+        return len(self._imports)
+
+    def __contains__(self, module: object) -> bool:
+        """Return whether a module is in the graph."""
+        return module in self._imports
+
+    @property
+    def modules(self) -> list[str]:
+        """Return the modules of the graph."""
+        return list(self._imports)
+
+    def set_module_imports(
+        self,
+        module: str,
+        imports: Mapping[str, Location] | Iterable[str],
+        filename: str | None = None,
+    ) -> None:
+        """
+        Add a module to the graph, or replace the imports of a module.
+
+        Parameters
+        ----------
+        module : str
+            The module name.
+        imports : Mapping[str, Location] | Iterable[str]
+            The identifiers imported by the module, with the location of
+            each import if known.
+        filename : str | None
+            The file of the module.
+        """
+        if not isinstance(imports, Mapping):
+            imports = dict.fromkeys(imports, (1, 0))
+        if module not in self._imports:
+            self._modules_changed = True
+        elif self._imports[module] == imports:
+            return
+        self._imports[module] = dict(imports)
+        self._dirty.add(module)
+        if filename is not None:
+            self.filenames[module] = filename
+
+    def remove_module(self, module: str) -> None:
+        """
+        Remove a module from the graph.
+
+        Parameters
+        ----------
+        module : str
+            The module name.
+        """
+        if self._imports.pop(module, None) is not None:
+            self.filenames.pop(module, None)
+            self._modules_changed = True
+
+    def successors(self, module: str) -> dict[str, Location]:
+        """
+        Get the modules imported by a module.
+
+        Parameters
+        ----------
+        module : str
+            The module name.
+
+        Returns
+        -------
+        dict[str, Location]
+            The imported modules, and the location of each import.
+        """
+        self._update()
+        return self._edges.get(module, {})
+
+    def components(self) -> list[list[str]]:
+        """
+        Get the strongly connected components of the graph.
+
+        Returns
+        -------
+        list[list[str]]
+            The strongly connected components, with more than one module.
+        """
+        self._update()
+        return [sorted(members) for members in self._members.values() if len(members) > 1]
+
+    def cycles(self) -> list[ImportCycle]:
+        """
+        Get the import cycles of the graph.
+
+        Each strongly connected component is reported once, with the shortest
+        cycle through its first module (by name).
+
+        Returns
+        -------
+        list[ImportCycle]
+            The import cycles, sorted by module.
+        """
+        self._update()
+        for component, members in self._members.items():
+            if len(members) > 1 and component not in self._cycles:
+                self._cycles[component] = self._shortest_cycle(members)
+        return sorted(self._cycles.values(), key=lambda cycle: cycle.modules)
+
+    def reachable(self, module: str) -> int:
+        """
+        Get the modules reachable from a module through one or more imports.
+
+        Parameters
+        ----------
+        module : str
+            The module name.
+
+        Returns
+        -------
+        int
+            The reachable modules, as a bitset.
+        """
+        self._update()
+        component = self._components[module]
+        reach = self._component_reach(component)
+        if len(self._members[component]) > 1:
+            return reach
+        # A module only reaches itself through an import cycle
+        return reach ^ 1 << self._index[module]
+
+    def module_bit(self, module: str) -> int:
+        """
+        Get the bit of a module in the bitsets of the graph.
+
+        Parameters
+        ----------
+        module : str
+            The module name.
+
+        Returns
+        -------
+        int
+            The module, as a bitset.
+        """
+        self._update()
+        return 1 << self._index[module]
+
+    def package_bits(self, package: str) -> int:
+        """
+        Get the modules of a package (or a single module), as a bitset.
+
+        Parameters
+        ----------
+        package : str
+            The package or module name.
+
+        Returns
+        -------
+        int
+            The modules of the package, as a bitset.
+        """
+        self._update()
+        try:
+            return self._package_bits[package]
+        except KeyError:
+            prefix = f"{package}."
+            bits = 0
+            for module, index in self._index.items():
+                if module == package or module.startswith(prefix):
+                    bits |= 1 << index
+            self._package_bits[package] = bits
+            return bits
+
+    def importer_bits(self, identifier: str) -> int:
+        """
+        Get the modules importing an identifier (or any identifier under it).
+
+        Parameters
+        ----------
+        identifier : str
+            The imported package, module or name.
+
+        Returns
+        -------
+        int
+            The importing modules, as a bitset.
+        """
+        self._update()
+        try:
+            return self._importer_bits[identifier]
+        except KeyError:
+            prefix = f"{identifier}."
+            bits = 0
+            for module, imports in self._imports.items():
+                if any(
+                    imported == identifier or imported.startswith(prefix) for imported in imports
+                ):
+                    bits |= 1 << self._index[module]
+            self._importer_bits[identifier] = bits
+            return bits
+
+    def shortest_path(self, source: str, targets: int) -> list[str] | None:
+        """
+        Find the shortest import path from a module to any of the targets.
+
+        Parameters
+        ----------
+        source : str
+            The module the path starts from.
+        targets : int
+            The target modules, as a bitset.
+
+        Returns
+        -------
+        list[str] | None
+            The modules of the path, or None if no target can be reached.
+        """
+        self._update()
+        index = self._index
+        parents: dict[str, str] = {}
+        queue = deque([source])
+        while queue:
+            module = queue.popleft()
+            for successor in sorted(self._edges[module]):
+                if successor in parents:
+                    continue
+                parents[successor] = module
+                if targets >> index[successor] & 1:
+                    path = [successor]
+                    while module != source:
+                        path.append(module)
+                        module = parents[module]
+                    path.append(source)
+                    return path[::-1]
+                queue.append(successor)
+        return None
+
+    def _component_bits(self, component: int) -> int:
+        """Get the members of a component, as a bitset."""
+        bits = 0
+        for member in self._members[component]:
+            bits |= 1 << self._index[member]
+        return bits
+
+    def _component_successors(self, component: int) -> set[int]:
+        """Get the components imported by the members of a component."""
+        components = self._components
+        return {
+            components[successor]
+            for member in self._members[component]
+            for successor in self._edges[member]
+        } - {component}
+
+    def _component_reach(self, component: int) -> int:
+        """Get the modules reachable from a component, including its members."""
+        reach = self._reach
+        stack = [component]
+        while stack:
+            current = stack[-1]
+            if current in reach:
+                stack.pop()
+                continue
+            successors = self._component_successors(current)
+            pending = [successor for successor in successors if successor not in reach]
+            if pending:
+                stack.extend(pending)
+                continue
+            bits = self._component_bits(current)
+            for successor in successors:
+                bits |= reach[successor]
+            reach[current] = bits
+            stack.pop()
+        return reach[component]
+
+    def _build_predecessors(self) -> None:
+        """Build the reverse edges of the graph."""
+        if not self._has_predecessors:
+            # Only needed to update the graph, so they are not built with it
+            for importer, edges in self._edges.items():
+                for imported in edges:
+                    self._predecessors[imported].add(importer)
+            self._has_predecessors = True
+
+    def _resolve_edges(self, module: str) -> None:
+        """Resolve the imports of a module into edges of the graph."""
+        predecessors = self._predecessors if self._has_predecessors else None
+        for imported in self._edges.pop(module, {}):
+            if predecessors is not None:
+                predecessors[imported].discard(module)
+        if module not in self._imports:
+            return
+
+        modules = self._imports
+        resolved = self._resolved
+        edges: dict[str, Location] = {}
+        for identifier, location in modules[module].items():
+            try:
+                successor = resolved[identifier]
+            except KeyError:
+                # Resolve to the most specific module of the graph
+                successor = identifier
+                while successor and successor not in modules:
+                    if (package := f"{successor}.__init__") in modules:
+                        successor = package
+                        break
+                    successor = successor.rpartition(".")[0]
+                resolved[identifier] = successor
+            if successor and successor != module and successor not in edges:
+                edges[successor] = location
+                if predecessors is not None:
+                    predecessors[successor].add(module)
+        self._edges[module] = edges
+
+    def _update(self) -> None:
+        """Recompute the components affected by changes to the graph."""
+        if self._modules_changed:
+            self._resolved.clear()
+            self._edges.clear()
+            self._predecessors.clear()
+            self._has_predecessors = False
+            self._index = {module: index for index, module in enumerate(self._imports)}
+            self._package_bits.clear()
+            for module in self._imports:
+                self._resolve_edges(module)
+            self._rebuild_components()
+        elif self._dirty:
+            affected: set[str] = set()
+            for module in self._dirty:
+                affected.update(self._members.get(self._components.get(module, -1), ()))
+                self._resolve_edges(module)
+            cycle_members: set[str] = set()
+            for module in self._dirty:
+                if module not in cycle_members and not self._mostly_affected(affected):
+                    cycle_members.update(self._cycle_members(module))
+                    affected.update(cycle_members)
+            if self._mostly_affected(affected):
+                # Recomputing most of the graph is slower than rebuilding it
+                self._rebuild_components()
+                logger.debug("Rebuilt the components of %d modules", len(self._imports))
+            else:
+                for component in {self._components[module] for module in affected}:
+                    del self._members[component]
+                    self._cycles.pop(component, None)
+                    self._reach.pop(component, None)
+                self._assign_components(
+                    sorted(affected),
+                    lambda module: [m for m in self._edges[module] if m in affected],
+                )
+                logger.debug("Recomputed components of %d modules", len(affected))
+                self._importer_bits.clear()
+                if self._reach:
+                    self._drop_reach(affected)
+
+        self._dirty.clear()
+        self._modules_changed = False
+
+    def _mostly_affected(self, affected: set[str]) -> bool:
+        """Return whether more than half of the modules are affected by a change."""
+        return 2 * len(affected) > len(self._imports)
+
+    def _rebuild_components(self) -> None:
+        """Recompute the components of the whole graph."""
+        self._components.clear()
+        self._members.clear()
+        self._cycles.clear()
+        self._reach.clear()
+        self._importer_bits.clear()
+        self._assign_components(list(self._imports), self._edges.__getitem__)
+
+    def _drop_reach(self, modules: set[str]) -> None:
+        """Drop the reachable modules of every module that can reach the modules."""
+        ancestors = set(modules)
+        queue = deque(modules)
+        while queue:
+            for predecessor in self._predecessors[queue.popleft()]:
+                if predecessor not in ancestors:
+                    ancestors.add(predecessor)
+                    queue.append(predecessor)
+        for component in {self._components[module] for module in ancestors}:
+            self._reach.pop(component, None)
+
+    def _cycle_members(self, module: str) -> set[str]:
+        """Get the modules that are reachable from, and can reach, a module."""
+        self._build_predecessors()
+        reachable = {module}
+        queue = deque([module])
+        while queue:
+            for successor in self._edges[queue.popleft()]:
+                if successor not in reachable:
+                    reachable.add(successor)
+                    queue.append(successor)
+
+        members = {module}
+        queue = deque([module])
+        while queue:
+            for predecessor in self._predecessors[queue.popleft()]:
+                if predecessor in reachable and predecessor not in members:
+                    members.add(predecessor)
+                    queue.append(predecessor)
+        return members
+
+    def _assign_components(
+        self, modules: list[str], successors: Callable[[str], Iterable[str]]
+    ) -> None:
+        """Compute the components of the subgraph induced by the modules."""
+        for members in strongly_connected_components(modules, successors):
+            component = self._next_component
+            self._next_component += 1
+            self._members[component] = members
+            for member in members:
+                self._components[member] = component
+
+    def _shortest_cycle(self, members: list[str]) -> ImportCycle:
+        """Find the shortest cycle through the first module of a component."""
+        start = min(members)
+        component = self._components[start]
+        parents: dict[str, str] = {}
+        queue = deque([start])
+        while queue:
+            module = queue.popleft()
+            for successor in sorted(self._edges[module]):
+                if successor == start:
+                    path = [module]
+                    while path[-1] != start:
+                        path.append(parents[path[-1]])
+                    modules = (*reversed(path), start)
+                    return ImportCycle(
+                        modules=modules,
+                        locations=tuple(
+                            self._edges[importer][imported]
+                            for importer, imported in zip(modules, modules[1:])
+                        ),
+                        filename=self.filenames.get(start),
+                    )
+                if successor not in parents and self._components[successor] == component:
+                    parents[successor] = module
+                    queue.append(successor)
+        raise ValueError(f"Component of {start} does not contain a cycle.")
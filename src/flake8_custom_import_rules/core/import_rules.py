@@ -4,6 +4,10 @@ from __future__ import annotations
 
 import logging
 from collections import defaultdict
+from collections.abc import Collection
+from enum import IntFlag
+from enum import auto
+from itertools import chain
 from typing import Callable
 from typing import Generator
 
@@ -14,14 +18,19 @@ from flake8_custom_import_rules.codes.error_codes import ErrorCode
 from flake8_custom_import_rules.core.error_messages import ErrorMessage
 from flake8_custom_import_rules.core.error_messages import first_party_only_error
 from flake8_custom_import_rules.core.error_messages import import_restriction_error
+from flake8_custom_import_rules.core.error_messages import layer_error
 from flake8_custom_import_rules.core.error_messages import restricted_package_error
 from flake8_custom_import_rules.core.error_messages import standalone_imports_error
 from flake8_custom_import_rules.core.error_messages import standard_error_message
 from flake8_custom_import_rules.core.error_messages import std_lib_only_error
 from flake8_custom_import_rules.core.error_messages import third_party_only_error
+from flake8_custom_import_rules.core.layers import compile_layer_ranks
+from flake8_custom_import_rules.core.layers import get_layer_rank
+from flake8_custom_import_rules.core.layers import is_upward_import
 from flake8_custom_import_rules.core.nodes import DynamicStringFromImport
 from flake8_custom_import_rules.core.nodes import DynamicStringStraightImport
 from flake8_custom_import_rules.core.nodes import ImportType
+from flake8_custom_import_rules.core.nodes import NodeKind
 from flake8_custom_import_rules.core.nodes import ParsedDynamicImport
 from flake8_custom_import_rules.core.nodes import ParsedFromImport
 from flake8_custom_import_rules.core.nodes import ParsedIfImport
@@ -37,6 +46,77 @@ from flake8_custom_import_rules.utils.parse_utils import retrieve_custom_rule_ma
 
 logger = logging.getLogger(__name__)
 
+StandardRestriction = tuple[tuple[type[ParsedNode], ...], str]
+
+# The project level restrictions: the setting that enables the restriction,
+# the node types it applies to and the name of the method that checks it.
+STANDARD_RESTRICTIONS: tuple[tuple[str, tuple[type[ParsedNode], ...], str], ...] = (
+    # ("TOP_LEVEL_ONLY_IMPORTS", (ParsedStraightImport, ParsedFromImport), "_check_for_pir101"),
+    ("RESTRICT_RELATIVE_IMPORTS", (ParsedFromImport,), "_check_for_pir102"),
+    ("RESTRICT_LOCAL_SCOPE_IMPORTS", (ParsedLocalImport,), "_check_for_pir103"),
+    ("RESTRICT_CONDITIONAL_IMPORTS", (ParsedIfImport,), "_check_for_pir104"),
+    ("RESTRICT_DYNAMIC_IMPORTS", (ParsedDynamicImport,), "_check_for_pir105"),
+    ("RESTRICT_PRIVATE_IMPORTS", (ParsedStraightImport, ParsedFromImport), "_check_for_pir106"),
+    ("RESTRICT_WILDCARD_IMPORTS", (ParsedStraightImport, ParsedFromImport), "_check_for_pir107"),
+    ("RESTRICT_ALIASED_IMPORTS", (ParsedStraightImport, ParsedFromImport), "_check_for_pir108"),
+    ("RESTRICT_FUTURE_IMPORTS", (ParsedStraightImport, ParsedFromImport), "_check_for_pir109"),
+)
+# The project level restriction special cases, checked after the standard
+# restrictions and dispatched from the same table.
+SPECIAL_CASE_RESTRICTIONS: tuple[tuple[str, tuple[type[ParsedNode], ...], str], ...] = (
+    ("RESTRICT_INIT_IMPORTS", (ParsedStraightImport,), "_check_for_pir207"),
+    ("RESTRICT_INIT_IMPORTS", (ParsedFromImport,), "_check_for_pir208"),
+    ("RESTRICT_MAIN_IMPORTS", (ParsedStraightImport,), "_check_for_pir209"),
+    ("RESTRICT_MAIN_IMPORTS", (ParsedFromImport,), "_check_for_pir210"),
+    ("RESTRICT_TEST_IMPORTS", (ParsedStraightImport,), "_check_for_pir201"),
+    ("RESTRICT_TEST_IMPORTS", (ParsedStraightImport,), "_check_for_pir203"),
+    ("RESTRICT_TEST_IMPORTS", (ParsedStraightImport,), "_check_for_pir205"),
+    ("RESTRICT_TEST_IMPORTS", (ParsedFromImport,), "_check_for_pir202"),
+    ("RESTRICT_TEST_IMPORTS", (ParsedFromImport,), "_check_for_pir204"),
+    ("RESTRICT_TEST_IMPORTS", (ParsedFromImport,), "_check_for_pir206"),
+)
+
+# The node kinds the visitor builds for the restrictions that check them
+RESTRICTION_NODE_KINDS: dict[str, NodeKind] = {
+    "_check_for_pir103": NodeKind.LOCAL_IMPORTS,
+    "_check_for_pir104": NodeKind.CONDITIONAL_IMPORTS,
+    "_check_for_pir105": NodeKind.DYNAMIC_IMPORTS,
+}
+
+# Every error code, the codes checked when no selection is given
+ALL_CODES: frozenset[str] = frozenset(ErrorCode.get_all_error_codes())
+CUSTOM_RESTRICTION_CODES = frozenset({"CIR102", "CIR103", "CIR104", "CIR105"})
+RESTRICTED_PACKAGE_CODES = frozenset({"CIR106", "CIR107"})
+LAYER_CODES = frozenset({"CIR601", "CIR602"})
+
+
+class FileRule(IntFlag):
+    """The custom import rules that apply to the files of the packages they
+    list. Each rule is named after the setting that lists its packages."""
+
+    PROJECT_ONLY = auto()
+    BASE_PACKAGE_ONLY = auto()
+    FIRST_PARTY_ONLY = auto()
+    STANDALONE_MODULES = auto()
+    STD_LIB_ONLY = auto()
+    THIRD_PARTY_ONLY = auto()
+    RESTRICTED_PACKAGES = auto()
+
+
+NO_FILE_RULES = FileRule(0)
+FileRuleIndex = dict[str, FileRule]
+
+# The error codes reported by the custom import rules that restrict the
+# imports of the files they apply to
+FILE_RULE_CODES: dict[FileRule, frozenset[str]] = {
+    FileRule.PROJECT_ONLY: frozenset({"CIR201", "CIR202"}),
+    FileRule.BASE_PACKAGE_ONLY: frozenset({"CIR203", "CIR204"}),
+    FileRule.FIRST_PARTY_ONLY: frozenset({"CIR205", "CIR206"}),
+    FileRule.STANDALONE_MODULES: frozenset({"CIR301", "CIR302", "CIR303", "CIR304"}),
+    FileRule.STD_LIB_ONLY: frozenset({"CIR401", "CIR402"}),
+    FileRule.THIRD_PARTY_ONLY: frozenset({"CIR501", "CIR502"}),
+}
+
 
 def filename_not_in_stdin_identifiers(
     filename: str,
@@ -176,6 +256,225 @@ def get_standalone_package_rule(option_key: str) -> Callable[[CustomImportRules]
     return standalone_package
 
 
+def get_active_file_rules(codes: Collection[str]) -> FileRule:
+    """
+    Get the custom import rules that can report one of the active codes.
+
+    Parameters
+    ----------
+    codes : Collection[str]
+        The active error codes.
+
+    Returns
+    -------
+    FileRule
+        The active rules. Restricted packages are always active, since they
+        are also used to find the restricted identifiers of a file.
+    """
+    active_file_rules = FileRule.RESTRICTED_PACKAGES
+    for file_rule, file_rule_codes in FILE_RULE_CODES.items():
+        if not file_rule_codes.isdisjoint(codes):
+            active_file_rules |= file_rule
+    return active_file_rules
+
+
+def compile_file_rule_index(
+    settings: Settings, codes: Collection[str] = ALL_CODES
+) -> FileRuleIndex:
+    """
+    Compile the index of the custom import rules that apply to each package.
+
+    Each package listed in a custom import rule is indexed with the rules
+    that list it or any of its parent packages, so the rules of a file are
+    the rules of the deepest indexed package of the file. Rules that cannot
+    report an active code are left out of the index.
+
+    Parameters
+    ----------
+    settings : Settings
+        The checker settings.
+    codes : Collection[str]
+        The active error codes, by default every error code.
+
+    Returns
+    -------
+    FileRuleIndex
+        The rules that apply to each package listed in a custom import rule.
+    """
+    index: defaultdict[str, FileRule] = defaultdict(lambda: NO_FILE_RULES)
+    active_file_rules = get_active_file_rules(codes)
+    for file_rule in FileRule:
+        if file_rule not in active_file_rules:
+            continue
+        packages = getattr(settings, str(file_rule.name)) or ()
+        for package in [packages] if isinstance(packages, str) else packages:
+            if package := package.strip():
+                index[package] |= file_rule
+
+    # Parents are indexed before their subpackages, so they already hold
+    # the rules of their own parents
+    for package in sorted(index, key=lambda name: name.count(".")):
+        parent = package
+        while "." in parent:
+            parent = parent.rpartition(".")[0]
+            if parent in index:
+                index[package] |= index[parent]
+                break
+    return dict(index)
+
+
+def get_file_rules(file_packages: list[str] | None, index: FileRuleIndex) -> FileRule:
+    """
+    Get the custom import rules that apply to a file.
+
+    Parameters
+    ----------
+    file_packages : list[str] | None
+        The module and parent packages of the file, from the least to the
+        most specific.
+    index : FileRuleIndex
+        The index compiled with ``compile_file_rule_index``.
+
+    Returns
+    -------
+    FileRule
+        The rules of the deepest package of the file in the index.
+    """
+    for package in reversed(file_packages or ()):
+        if (file_rules := index.get(package)) is not None:
+            return file_rules
+    return NO_FILE_RULES
+
+
+def get_check_code(check_name: str) -> str:
+    """Get the error code reported by a check method, e.g., PIR102 for ``_check_for_pir102``."""
+    return check_name.rpartition("_")[2].upper()
+
+
+def compile_standard_restrictions(
+    settings: Settings, codes: Collection[str] = ALL_CODES
+) -> tuple[StandardRestriction, ...]:
+    """
+    Compile the dispatch table of the project level restrictions.
+
+    Only the restrictions enabled in the settings whose error code is
+    active are kept, so checking a node does not look up the settings again
+    and deselected checks are never run.
+
+    Parameters
+    ----------
+    settings : Settings
+        The checker settings.
+    codes : Collection[str]
+        The active error codes, by default every error code.
+
+    Returns
+    -------
+    tuple[StandardRestriction, ...]
+        The node types and the name of the check method of each enabled
+        restriction.
+    """
+    return tuple(
+        (node_types, check_name)
+        for option_key, node_types, check_name in chain(
+            STANDARD_RESTRICTIONS, SPECIAL_CASE_RESTRICTIONS
+        )
+        if getattr(settings, option_key) and get_check_code(check_name) in codes
+    )
+
+
+def compile_node_kinds(standard_restrictions: tuple[StandardRestriction, ...]) -> NodeKind:
+    """
+    Compile the node kinds the visitor builds for the dispatched restrictions.
+
+    Import statements are always built. Definitions and the identifiers by
+    line number are not read by any rule, so they are never built.
+
+    Parameters
+    ----------
+    standard_restrictions : tuple[StandardRestriction, ...]
+        The dispatch table of the project level restrictions.
+
+    Returns
+    -------
+    NodeKind
+    """
+    node_kinds = NodeKind(0)
+    for _, check_name in standard_restrictions:
+        node_kinds |= RESTRICTION_NODE_KINDS.get(check_name, NodeKind(0))
+    return node_kinds
+
+
+def get_dynamic_import_nodes(
+    node: ParsedDynamicImport, dynamic_nodes: defaultdict[str, list]
+) -> list[ParsedNode]:
+    """
+    Retrieve dynamic import nodes.
+
+    This function retrieves all dynamic import nodes from the list of dynamic
+    nodes associated with the line number of the given node. It filters out
+    nodes that are instances of DynamicStringStraightImport or
+    DynamicStringFromImport.
+
+    Parameters
+    ----------
+    node : ParsedDynamicImport
+        The parsed node representing a dynamic import statement.
+    dynamic_nodes : defaultdict[str, list]
+        The nodes parsed from dynamic strings, by line number.
+
+    Returns
+    -------
+    list[ParsedNode]
+        A list of dynamic import nodes.
+    """
+    return [
+        dynamic_node
+        for dynamic_node in dynamic_nodes[str(node.lineno)]
+        if isinstance(dynamic_node, (DynamicStringStraightImport, DynamicStringFromImport))
+    ]
+
+
+def is_confirmed_dynamic_import(
+    node: ParsedDynamicImport,
+    identifiers: defaultdict[str, dict],
+    dynamic_nodes: defaultdict[str, list],
+) -> bool:
+    """
+    Determine if a node represents a dynamic import.
+
+    This function checks if the given `node` is a dynamic import by verifying
+    the package the dynamic import function was imported from, or, for
+    `eval` and `exec`, whether the parsed string contains an import. The
+    `confirmed` attribute of the node is updated with the result.
+
+    Parameters
+    ----------
+    node : ParsedDynamicImport
+        The parsed node representing a dynamic import statement.
+    identifiers : defaultdict[str, dict]
+        The identifiers imported in the file.
+    dynamic_nodes : defaultdict[str, list]
+        The nodes parsed from dynamic strings, by line number.
+
+    Returns
+    -------
+    bool
+        True if the node represents a dynamic import, False otherwise.
+    """
+    if not node.confirmed and check_string(node.identifier, substring_match="modules"):
+        node.confirmed = identifiers["modules"]["package"] == "sys"
+    if not node.confirmed and check_string(
+        node.identifier, substring_match=["get_loader", "iter_modules"]
+    ):
+        node.confirmed = identifiers["get_loader"]["package"] == "pkgutil"
+
+    if not node.confirmed and check_string(node.identifier, substring_match=["eval", "exec"]):
+        node.confirmed = bool(get_dynamic_import_nodes(node, dynamic_nodes))
+
+    return bool(node.confirmed)
+
+
 @define(slots=True)
 class CustomImportRules:
     """Custom Import Rules for flake8 & Python Projects
@@ -223,9 +522,9 @@ class CustomImportRules:
         The package names of the file being checked.
         Used to check if imports are within allowed packages.
 
-    codes_to_check : set[ErrorCode]
-        The error codes to check for in this file, based on the command
-        line options.
+    codes_to_check : frozenset[str]
+        The error codes to check for in this file, based on the selected
+        and ignored codes of the flake8 options.
 
     check_custom_import_rules : bool
         Whether to check custom import rules at all for this file, based
@@ -265,6 +564,24 @@ class CustomImportRules:
 
     standalone_package : bool
         Whether this package is standalone.
+
+    layer_ranks : dict[str, int] | None
+        The layer rank of each package in the layers, compiled from the
+        configuration settings if not given.
+
+    file_layer_rank : int | None
+        The layer rank of the file being checked, if it is in a layer.
+
+    standard_restrictions : tuple[StandardRestriction, ...] | None
+        The dispatch table of the enabled project level restrictions,
+        compiled from the configuration settings if not given.
+
+    file_rule_index : FileRuleIndex | None
+        The custom import rules that apply to each package, compiled from
+        the configuration settings if not given.
+
+    file_rules : FileRule
+        The custom import rules that apply to the file being checked.
     """
 
     nodes: list[ParsedNode] = field(factory=list)
@@ -279,7 +596,7 @@ class CustomImportRules:
     file_root_package_name: str = field(default=None)
     file_packages: list = field(default=None)
 
-    codes_to_check: set[ErrorCode] = set(ErrorCode.get_all_error_codes())
+    codes_to_check: frozenset[str] = field(default=ALL_CODES, converter=frozenset)
     # Can only check CIR codes if not stdin
     check_custom_import_rules: bool = field(default=filename_not_in_stdin_identifiers(filename))
 
@@ -288,7 +605,11 @@ class CustomImportRules:
     restricted_packages: list[str] = field(factory=list)
     file_in_restricted_packages: bool = field(default=False)
     file_in_tests: bool = field(default=False)
+    layer_ranks: dict[str, int] | None = field(default=None)
+    standard_restrictions: tuple[StandardRestriction, ...] | None = field(default=None)
+    file_rule_index: FileRuleIndex | None = field(default=None)
 
+    file_rules: FileRule = field(default=NO_FILE_RULES, init=False)
     project_only: bool = field(default=False, init=False)
     base_package_only: bool = field(default=False, init=False)
     first_party_only: bool = field(default=False, init=False)
@@ -296,34 +617,46 @@ class CustomImportRules:
     standalone_package: bool = field(default=False, init=False)
     std_lib_only: bool = field(default=False, init=False)
     third_party_only: bool = field(default=False, init=False)
+    file_layer_rank: int | None = field(default=None, init=False)
 
     def __attrs_post_init__(self) -> None:
         """Post init CustomImportRules."""
-        logging.debug(f"file_identifier: {self.file_identifier}")
         self.nodes = sorted(self.nodes, key=lambda element: element.lineno)
 
         # for these restrictions, we want to match a file identifier
         # because the import rules correspond to an ImportType
-        self.project_only = get_file_matches_custom_rule("PROJECT_ONLY")(self)
-        self.base_package_only = get_file_matches_custom_rule("BASE_PACKAGE_ONLY")(self)
-        self.first_party_only = get_file_matches_custom_rule("FIRST_PARTY_ONLY")(self)
-        self.standalone_module = get_file_matches_custom_rule("STANDALONE_MODULES")(self)
+        if self.file_rule_index is None:
+            self.file_rule_index = compile_file_rule_index(
+                self.checker_settings, self.codes_to_check
+            )
+        file_rules = self.file_rules = get_file_rules(self.file_packages, self.file_rule_index)
+        self.project_only = FileRule.PROJECT_ONLY in file_rules
+        self.base_package_only = FileRule.BASE_PACKAGE_ONLY in file_rules
+        self.first_party_only = FileRule.FIRST_PARTY_ONLY in file_rules
+        self.standalone_module = FileRule.STANDALONE_MODULES in file_rules
         self.standalone_package = get_standalone_package_rule("STANDALONE_MODULES")(self)
-        self.std_lib_only = get_file_matches_custom_rule("STD_LIB_ONLY")(self)
-        self.third_party_only = get_file_matches_custom_rule("THIRD_PARTY_ONLY")(self)
-        self.file_in_restricted_packages = get_file_matches_custom_rule("RESTRICTED_PACKAGES")(self)
+        self.std_lib_only = FileRule.STD_LIB_ONLY in file_rules
+        self.third_party_only = FileRule.THIRD_PARTY_ONLY in file_rules
+        self.file_in_restricted_packages = FileRule.RESTRICTED_PACKAGES in file_rules
         self.file_in_tests = (
             self.file_identifier.startswith("tests") if self.file_identifier is not None else False
         )
 
         self.top_level_only_imports = self.checker_settings.TOP_LEVEL_ONLY_IMPORTS
-        self.custom_restrictions = self.checker_settings.CUSTOM_RESTRICTIONS
-        self.restricted_packages = self.checker_settings.RESTRICTED_PACKAGES
-
-        logger.debug(f"File packages: {self.file_packages}")
-        logger.debug(f"Restricted packages: {self.restricted_packages}")
-        logger.info(f"Restricted identifiers: {self.restricted_identifiers}")
-        logger.debug(f"Restricted identifiers keys: {list(self.restricted_identifiers.keys())}")
+        # rules that cannot report an active code are not checked at all
+        codes_to_check = self.codes_to_check
+        if not CUSTOM_RESTRICTION_CODES.isdisjoint(codes_to_check):
+            self.custom_restrictions = self.checker_settings.CUSTOM_RESTRICTIONS
+        if not RESTRICTED_PACKAGE_CODES.isdisjoint(codes_to_check):
+            self.restricted_packages = self.checker_settings.RESTRICTED_PACKAGES
+        if self.layer_ranks is None:
+            self.layer_ranks = compile_layer_ranks(self.checker_settings.LAYERS)
+        if not LAYER_CODES.isdisjoint(codes_to_check):
+            self.file_layer_rank = get_layer_rank(self.file_identifier, self.layer_ranks)
+        if self.standard_restrictions is None:
+            self.standard_restrictions = compile_standard_restrictions(
+                self.checker_settings, codes_to_check
+            )
 
     def check_import_rules(self) -> Generator[ErrorMessage, None, None]:
         """Check imports"""
@@ -373,6 +706,19 @@ class CustomImportRules:
         yield from self._check_third_party_only_imports(node)
         yield from self._check_restricted_imports(node)
         yield from self._check_custom_restrictions(node)
+        yield from self._check_layers(node)
+
+    def _check_layers(
+        self,
+        node: ParsedNode,
+    ) -> Generator[ErrorMessage, None, None]:
+        """Check layers"""
+        if self.file_layer_rank is not None:
+            if isinstance(node, ParsedStraightImport):
+                yield from self._check_for_cir601(node)
+
+            elif isinstance(node, ParsedFromImport):
+                yield from self._check_for_cir602(node)
 
     def _check_custom_restrictions(
         self,
@@ -527,121 +873,14 @@ class CustomImportRules:
     ) -> Generator[ErrorMessage, None, None]:
         """Check project level restrictions"""
         yield from self.check_standard_import_restrictions(node)
-        yield from self.check_special_cases_import_restrictions(node)
 
     def check_standard_import_restrictions(
         self, node: ParsedNode
     ) -> Generator[ErrorMessage, None, None]:
-        """Check standard import restrictions"""
-        restrictions = [
-            # (
-            #     self.checker_settings.TOP_LEVEL_ONLY_IMPORTS,
-            #     [ParsedStraightImport, ParsedFromImport],
-            #     self._check_for_pir101,
-            # ),
-            (
-                self.checker_settings.RESTRICT_RELATIVE_IMPORTS,
-                [ParsedFromImport],
-                self._check_for_pir102,
-            ),
-            (
-                self.checker_settings.RESTRICT_LOCAL_SCOPE_IMPORTS,
-                [ParsedLocalImport],
-                self._check_for_pir103,
-            ),
-            (
-                self.checker_settings.RESTRICT_CONDITIONAL_IMPORTS,
-                [ParsedIfImport],
-                self._check_for_pir104,
-            ),
-            (
-                self.checker_settings.RESTRICT_DYNAMIC_IMPORTS,
-                [ParsedDynamicImport],
-                self._check_for_pir105,
-            ),
-            (
-                self.checker_settings.RESTRICT_PRIVATE_IMPORTS,
-                [ParsedStraightImport, ParsedFromImport],
-                self._check_for_pir106,
-            ),
-            (
-                self.checker_settings.RESTRICT_WILDCARD_IMPORTS,
-                [ParsedStraightImport, ParsedFromImport],
-                self._check_for_pir107,
-            ),
-            (
-                self.checker_settings.RESTRICT_ALIASED_IMPORTS,
-                [ParsedStraightImport, ParsedFromImport],
-                self._check_for_pir108,
-            ),
-            (
-                self.checker_settings.RESTRICT_FUTURE_IMPORTS,
-                [ParsedStraightImport, ParsedFromImport],
-                self._check_for_pir109,
-            ),
-        ]
-
-        for is_restriction_active, node_types, check_func in restrictions:
-            if is_restriction_active and any(
-                isinstance(node, node_type) for node_type in node_types
-            ):
-                yield from check_func(node)
-
-    def check_special_cases_import_restrictions(
-        self, node: ParsedNode
-    ) -> Generator[ErrorMessage, None, None]:
-        """
-        Check special case import restrictions.
-
-        This method checks for special case import restrictions based on the
-        checker settings. It iterates over a list of restrictions, each defined
-        by a tuple containing a flag indicating if the restriction is active,
-        a list of node types the restriction applies to, and a function to
-        call to check the restriction.
-
-        If the restriction is active and the node is of a type the restriction
-        applies to, it yields from the check function.
-
-        Parameters
-        ----------
-        node : ParsedNode
-            The parsed node representing an import statement.
-
-        Yields
-        ------
-        Generator[ErrorMessage, None, None]
-            A generator that yields ErrorMessage objects if the restriction is
-            active and the node is of a type the restriction applies to.
-        """
-
-        if self.checker_settings.RESTRICT_INIT_IMPORTS:
-            if isinstance(node, ParsedStraightImport):
-                yield from self._check_for_pir207(node)
-            elif isinstance(node, ParsedFromImport):
-                yield from self._check_for_pir208(node)
-
-        if self.checker_settings.RESTRICT_MAIN_IMPORTS:
-            if isinstance(node, ParsedStraightImport):
-                yield from self._check_for_pir209(node)
-            elif isinstance(node, ParsedFromImport):
-                yield from self._check_for_pir210(node)
-
-        if self.checker_settings.RESTRICT_TEST_IMPORTS:
-            yield from self._check_test_custom_restrictions(node)
-
-    def _check_test_custom_restrictions(
-        self, node: ParsedNode
-    ) -> Generator[ErrorMessage, None, None]:
-        """Check test import restrictions"""
-        if isinstance(node, ParsedStraightImport):
-            yield from self._check_for_pir201(node)
-            yield from self._check_for_pir203(node)
-            yield from self._check_for_pir205(node)
-
-        elif isinstance(node, ParsedFromImport):
-            yield from self._check_for_pir202(node)
-            yield from self._check_for_pir204(node)
-            yield from self._check_for_pir206(node)
+        """Check standard and special case import restrictions"""
+        for node_types, check_name in self.standard_restrictions or ():
+            if isinstance(node, node_types):
+                yield from getattr(self, check_name)(node)
 
     def _check_for_cir101(self, node: ParsedNode) -> Generator[ErrorMessage, None, None]:
         """Check for CIR101."""
@@ -697,10 +936,9 @@ class CustomImportRules:
         ErrorMessage
             Error message indicating the import restriction error.
         """
-        condition = (
+        if ErrorCode.CIR102.code in self.codes_to_check and (
             node.import_type == ImportType.FIRST_PARTY and self._check_if_import_restriction(node)
-        )
-        if ErrorCode.CIR102.code in self.codes_to_check and condition:
+        ):
             yield import_restriction_error(node, ErrorCode.CIR102, self.file_identifier)
 
     def _check_for_cir103(self, node: ParsedNode) -> Generator[ErrorMessage, None, None]:
@@ -722,10 +960,9 @@ class CustomImportRules:
         ErrorMessage
             Error message indicating the import restriction error.
         """
-        condition = (
+        if ErrorCode.CIR103.code in self.codes_to_check and (
             node.import_type == ImportType.FIRST_PARTY and self._check_if_import_restriction(node)
-        )
-        if ErrorCode.CIR103.code in self.codes_to_check and condition:
+        ):
             yield import_restriction_error(node, ErrorCode.CIR103, self.file_identifier)
 
     def _check_for_cir104(self, node: ParsedNode) -> Generator[ErrorMessage, None, None]:
@@ -747,10 +984,9 @@ class CustomImportRules:
         ErrorMessage
             Error message indicating the import restriction error.
         """
-        condition = (
+        if ErrorCode.CIR104.code in self.codes_to_check and (
             node.import_type != ImportType.FIRST_PARTY and self._check_if_import_restriction(node)
-        )
-        if ErrorCode.CIR104.code in self.codes_to_check and condition:
+        ):
             yield import_restriction_error(node, ErrorCode.CIR104, self.file_identifier)
 
     def _check_for_cir105(self, node: ParsedNode) -> Generator[ErrorMessage, None, None]:
@@ -772,10 +1008,9 @@ class CustomImportRules:
         ErrorMessage
             Error message indicating the import restriction error.
         """
-        condition = (
+        if ErrorCode.CIR105.code in self.codes_to_check and (
             node.import_type != ImportType.FIRST_PARTY and self._check_if_import_restriction(node)
-        )
-        if ErrorCode.CIR105.code in self.codes_to_check and condition:
+        ):
             yield import_restriction_error(node, ErrorCode.CIR105, self.file_identifier)
 
     def _check_if_restricted_package(self, node: ParsedNode) -> bool:
@@ -795,11 +1030,6 @@ class CustomImportRules:
         bool
             True if the package is restricted, False otherwise.
         """
-        logging.debug(
-            f"Node import_statement: `{node.import_statement}`, "
-            f"import_type: {node.import_type}, "
-            f"module: `{node.module}`,"
-        )
         if not does_import_match_custom_import_restriction(
             node.identifier, list(self.restricted_identifiers.keys())
         ):
@@ -814,14 +1044,12 @@ class CustomImportRules:
 
     def _check_for_cir106(self, node: ParsedStraightImport) -> Generator[ErrorMessage, None, None]:
         """Check for CIR106."""
-        condition = self._check_if_restricted_package(node)
-        if ErrorCode.CIR106.code in self.codes_to_check and condition:
+        if ErrorCode.CIR106.code in self.codes_to_check and self._check_if_restricted_package(node):
             yield restricted_package_error(node, ErrorCode.CIR106, self.file_identifier)
 
     def _check_for_cir107(self, node: ParsedFromImport) -> Generator[ErrorMessage, None, None]:
         """Check for CIR107."""
-        condition = self._check_if_restricted_package(node)
-        if ErrorCode.CIR107.code in self.codes_to_check and condition:
+        if ErrorCode.CIR107.code in self.codes_to_check and self._check_if_restricted_package(node):
             yield restricted_package_error(node, ErrorCode.CIR107, self.file_identifier)
 
     @staticmethod
@@ -920,38 +1148,42 @@ class CustomImportRules:
 
     def _check_for_cir201(self, node: ParsedStraightImport) -> Generator[ErrorMessage, None, None]:
         """Check for CIR201."""
-        condition = self._check_if_project_imports(node)
-        if ErrorCode.CIR201.code in self.codes_to_check and condition:
+        if ErrorCode.CIR201.code in self.codes_to_check and self._check_if_project_imports(node):
             yield first_party_only_error(node, ErrorCode.CIR201)
 
     def _check_for_cir202(self, node: ParsedFromImport) -> Generator[ErrorMessage, None, None]:
         """Check for CIR202."""
-        condition = self._check_if_project_imports(node)
-        if ErrorCode.CIR202.code in self.codes_to_check and condition:
+        if ErrorCode.CIR202.code in self.codes_to_check and self._check_if_project_imports(node):
             yield first_party_only_error(node, ErrorCode.CIR202)
 
     def _check_for_cir203(self, node: ParsedStraightImport) -> Generator[ErrorMessage, None, None]:
         """Check for CIR203."""
-        condition = self._check_if_project_base_package_imports(node)
-        if ErrorCode.CIR203.code in self.codes_to_check and condition:
+        if (
+            ErrorCode.CIR203.code in self.codes_to_check
+            and self._check_if_project_base_package_imports(node)
+        ):
             yield first_party_only_error(node, ErrorCode.CIR203)
 
     def _check_for_cir204(self, node: ParsedFromImport) -> Generator[ErrorMessage, None, None]:
         """Check for CIR204."""
-        condition = self._check_if_project_base_package_imports(node)
-        if ErrorCode.CIR204.code in self.codes_to_check and condition:
+        if (
+            ErrorCode.CIR204.code in self.codes_to_check
+            and self._check_if_project_base_package_imports(node)
+        ):
             yield first_party_only_error(node, ErrorCode.CIR204)
 
     def _check_for_cir205(self, node: ParsedStraightImport) -> Generator[ErrorMessage, None, None]:
         """Check for CIR205."""
-        condition = self._check_if_non_first_party_imports(node)
-        if ErrorCode.CIR205.code in self.codes_to_check and condition:
+        if ErrorCode.CIR205.code in self.codes_to_check and self._check_if_non_first_party_imports(
+            node
+        ):
             yield first_party_only_error(node, ErrorCode.CIR205)
 
     def _check_for_cir206(self, node: ParsedFromImport) -> Generator[ErrorMessage, None, None]:
         """Check for CIR206."""
-        condition = self._check_if_non_first_party_imports(node)
-        if ErrorCode.CIR206.code in self.codes_to_check and condition:
+        if ErrorCode.CIR206.code in self.codes_to_check and self._check_if_non_first_party_imports(
+            node
+        ):
             yield first_party_only_error(node, ErrorCode.CIR206)
 
     def _check_standalone_imports(self, node: ParsedStraightImport | ParsedFromImport) -> bool:
@@ -993,60 +1225,89 @@ class CustomImportRules:
 
     def _check_for_cir301(self, node: ParsedStraightImport) -> Generator[ErrorMessage, None, None]:
         """Check for CIR301, check if standalone package."""
-        condition = self._check_standalone_imports(node)
-        if ErrorCode.CIR301.code in self.codes_to_check and condition:
+        if ErrorCode.CIR301.code in self.codes_to_check and self._check_standalone_imports(node):
             yield standalone_imports_error(node, ErrorCode.CIR301, self.file_identifier)
 
     def _check_for_cir302(self, node: ParsedFromImport) -> Generator[ErrorMessage, None, None]:
         """Check for CIR302, check if standalone module."""
-        condition = self._check_standalone_imports(node)
-        if ErrorCode.CIR302.code in self.codes_to_check and condition:
+        if ErrorCode.CIR302.code in self.codes_to_check and self._check_standalone_imports(node):
             yield standalone_imports_error(node, ErrorCode.CIR302, self.file_identifier)
 
     def _check_for_cir303(self, node: ParsedStraightImport) -> Generator[ErrorMessage, None, None]:
         """Check for CIR303, check if standalone package."""
-        condition = self._check_standalone_imports(node)
-        if ErrorCode.CIR303.code in self.codes_to_check and condition:
+        if ErrorCode.CIR303.code in self.codes_to_check and self._check_standalone_imports(node):
             yield standalone_imports_error(node, ErrorCode.CIR303, self.file_identifier)
 
     def _check_for_cir304(self, node: ParsedFromImport) -> Generator[ErrorMessage, None, None]:
         """Check for CIR304, check if standalone module."""
-        condition = self._check_standalone_imports(node)
-        if ErrorCode.CIR304.code in self.codes_to_check and condition:
+        if ErrorCode.CIR304.code in self.codes_to_check and self._check_standalone_imports(node):
             yield standalone_imports_error(node, ErrorCode.CIR304, self.file_identifier)
 
     def _check_for_cir401(self, node: ParsedStraightImport) -> Generator[ErrorMessage, None, None]:
         """Check for CIR401."""
-        condition = node.import_type not in {ImportType.FUTURE, ImportType.STDLIB}
-        if ErrorCode.CIR401.code in self.codes_to_check and condition:
+        if ErrorCode.CIR401.code in self.codes_to_check and node.import_type not in {
+            ImportType.FUTURE,
+            ImportType.STDLIB,
+        }:
             yield std_lib_only_error(node, ErrorCode.CIR401)
 
     def _check_for_cir402(self, node: ParsedFromImport) -> Generator[ErrorMessage, None, None]:
         """Check for CIR402."""
-        condition = node.import_type not in {ImportType.FUTURE, ImportType.STDLIB}
-        if ErrorCode.CIR402.code in self.codes_to_check and condition:
+        if ErrorCode.CIR402.code in self.codes_to_check and node.import_type not in {
+            ImportType.FUTURE,
+            ImportType.STDLIB,
+        }:
             yield std_lib_only_error(node, ErrorCode.CIR402)
 
     def _check_for_cir501(self, node: ParsedStraightImport) -> Generator[ErrorMessage, None, None]:
         """Check for CIR501 Non-third party package import."""
-        condition = node.import_type not in {
+        if ErrorCode.CIR501.code in self.codes_to_check and node.import_type not in {
             ImportType.FUTURE,
             ImportType.STDLIB,
             ImportType.THIRD_PARTY,
-        }
-        if ErrorCode.CIR501.code in self.codes_to_check and condition:
+        }:
             yield third_party_only_error(node, ErrorCode.CIR501)
 
     def _check_for_cir502(self, node: ParsedFromImport) -> Generator[ErrorMessage, None, None]:
         """Check for CIR502 Non-third party module import."""
-        condition = node.import_type not in {
+        if ErrorCode.CIR502.code in self.codes_to_check and node.import_type not in {
             ImportType.FUTURE,
             ImportType.STDLIB,
             ImportType.THIRD_PARTY,
-        }
-        if ErrorCode.CIR502.code in self.codes_to_check and condition:
+        }:
             yield third_party_only_error(node, ErrorCode.CIR502)
 
+    def _get_import_layer_rank(self, node: ParsedNode) -> int | None:
+        """Get the layer rank of the imported package or module."""
+        if node.import_type == ImportType.RELATIVE:
+            return None
+        return get_layer_rank(node.identifier, self.layer_ranks or {})
+
+    def _layer_error(self, node: ParsedNode, error_code: ErrorCode) -> ErrorMessage:
+        """Generate the layer error message for an upward import."""
+        layers = self.checker_settings.LAYERS
+        return layer_error(
+            node,
+            error_code,
+            self.file_identifier,
+            layers[self.file_layer_rank],
+            layers[self._get_import_layer_rank(node)],
+        )
+
+    def _check_for_cir601(self, node: ParsedStraightImport) -> Generator[ErrorMessage, None, None]:
+        """Check for CIR601 upward project import between layers."""
+        if ErrorCode.CIR601.code in self.codes_to_check and is_upward_import(
+            self.file_layer_rank, self._get_import_layer_rank(node)
+        ):
+            yield self._layer_error(node, ErrorCode.CIR601)
+
+    def _check_for_cir602(self, node: ParsedFromImport) -> Generator[ErrorMessage, None, None]:
+        """Check for CIR602 upward project `from import` between layers."""
+        if ErrorCode.CIR602.code in self.codes_to_check and is_upward_import(
+            self.file_layer_rank, self._get_import_layer_rank(node)
+        ):
+            yield self._layer_error(node, ErrorCode.CIR602)
+
     def _check_for_pir101(self, node: ParsedNode) -> Generator[ErrorMessage, None, None]:
         """Check for PIR101, only top level imports are permitted."""
         if ErrorCode.PIR101.code in self.codes_to_check:
@@ -1054,14 +1315,12 @@ class CustomImportRules:
 
     def _check_for_pir102(self, node: ParsedFromImport) -> Generator[ErrorMessage, None, None]:
         """Check for PIR102, relative import restrictions."""
-        condition = node.level > 0
-        if ErrorCode.PIR102.code in self.codes_to_check and condition:
+        if ErrorCode.PIR102.code in self.codes_to_check and node.level > 0:
             yield standard_error_message(node, ErrorCode.PIR102)
 
     def _check_for_pir103(self, node: ParsedLocalImport) -> Generator[ErrorMessage, None, None]:
         """Check for PIR103, local import restrictions."""
-        condition = isinstance(node, ParsedLocalImport)
-        if ErrorCode.PIR103.code in self.codes_to_check and condition:
+        if ErrorCode.PIR103.code in self.codes_to_check and isinstance(node, ParsedLocalImport):
             yield standard_error_message(node, ErrorCode.PIR103)
 
     def _check_for_pir104(self, node: ParsedIfImport) -> Generator[ErrorMessage, None, None]:
@@ -1069,38 +1328,10 @@ class CustomImportRules:
         if ErrorCode.PIR104.code in self.codes_to_check:
             yield standard_error_message(node, ErrorCode.PIR104)
 
-    def _get_dynamic_import_nodes(self, node: ParsedDynamicImport) -> list[ParsedNode]:
-        """
-        Retrieve dynamic import nodes.
-
-        This method retrieves all dynamic import nodes from the list of dynamic nodes
-        associated with the line number of the given node. It filters out nodes that are
-        instances of DynamicStringStraightImport or DynamicStringFromImport.
-
-        Parameters
-        ----------
-        node : ParsedDynamicImport
-            The parsed node representing a dynamic import statement.
-
-        Returns
-        -------
-        list[ParsedNode]
-            A list of dynamic import nodes.
-        """
-        return [
-            dynamic_node
-            for dynamic_node in self.dynamic_nodes[str(node.lineno)]
-            if isinstance(dynamic_node, (DynamicStringStraightImport, DynamicStringFromImport))
-        ]
-
     def _dynamic_import_check(self, node: ParsedDynamicImport) -> bool:
         """
         Determine if a node represents a dynamic import.
 
-        This method checks if the given `node` is a dynamic import by verifying
-        if it matches any of the custom import restrictions. If a match is found,
-        it checks if the corresponding package is restricted.
-
         Parameters
         ----------
         node : ParsedDynamicImport
@@ -1111,23 +1342,11 @@ class CustomImportRules:
         bool
             True if the node represents a dynamic import, False otherwise.
         """
-        if not node.confirmed and check_string(node.identifier, substring_match="modules"):
-            node.confirmed = self.identifiers["modules"]["package"] == "sys"
-        if not node.confirmed and check_string(
-            node.identifier, substring_match=["get_loader", "iter_modules"]
-        ):
-            node.confirmed = self.identifiers["get_loader"]["package"] == "pkgutil"
-
-        if not node.confirmed and check_string(node.identifier, substring_match=["eval", "exec"]):
-            dynamic_nodes = self._get_dynamic_import_nodes(node)
-            node.confirmed = bool(dynamic_nodes)
-
-        return bool(node.confirmed)
+        return is_confirmed_dynamic_import(node, self.identifiers, self.dynamic_nodes)
 
     def _check_for_pir105(self, node: ParsedDynamicImport) -> Generator[ErrorMessage, None, None]:
         """Check for PIR105, dynamic import restrictions."""
-        condition = self._dynamic_import_check(node)
-        if ErrorCode.PIR105.code in self.codes_to_check and condition:
+        if ErrorCode.PIR105.code in self.codes_to_check and self._dynamic_import_check(node):
             yield standard_error_message(node, ErrorCode.PIR105)
         # if ErrorCode.PIR301.code in self.codes_to_check and not condition:
         #     yield standard_error_message(node, ErrorCode.PIR301)
@@ -1136,98 +1355,104 @@ class CustomImportRules:
         self, node: ParsedStraightImport | ParsedFromImport
     ) -> Generator[ErrorMessage, None, None]:
         """Check for PIR106, private import restrictions."""
-        condition = node.private_identifier_import or node.private_module_import
-        if ErrorCode.PIR106.code in self.codes_to_check and condition:
+        if ErrorCode.PIR106.code in self.codes_to_check and (
+            node.private_identifier_import or node.private_module_import
+        ):
             yield standard_error_message(node, ErrorCode.PIR106)
 
     def _check_for_pir107(
         self, node: ParsedStraightImport | ParsedFromImport
     ) -> Generator[ErrorMessage, None, None]:
         """Check for PIR107, wildcard or star import restrictions (i.e., from * imports)."""
-        condition = check_string(node.identifier, substring_match="*")
-        if ErrorCode.PIR107.code in self.codes_to_check and condition:
+        if ErrorCode.PIR107.code in self.codes_to_check and check_string(
+            node.identifier, substring_match="*"
+        ):
             yield standard_error_message(node, ErrorCode.PIR107)
 
     def _check_for_pir108(
         self, node: ParsedStraightImport | ParsedFromImport
     ) -> Generator[ErrorMessage, None, None]:
         """Check for PIR108, aliased import restrictions."""
-        condition = hasattr(node, "asname") and node.asname is not None
-        if ErrorCode.PIR108.code in self.codes_to_check and condition:
+        if (
+            ErrorCode.PIR108.code in self.codes_to_check
+            and hasattr(node, "asname")
+            and node.asname is not None
+        ):
             yield standard_error_message(node, ErrorCode.PIR108)
 
     def _check_for_pir109(
         self, node: ParsedStraightImport | ParsedFromImport
     ) -> Generator[ErrorMessage, None, None]:
         """Check for PIR109, __future__ import restrictions."""
-        condition = node.import_type == ImportType.FUTURE
-        if ErrorCode.PIR109.code in self.codes_to_check and condition:
+        if ErrorCode.PIR109.code in self.codes_to_check and node.import_type == ImportType.FUTURE:
             yield standard_error_message(node, ErrorCode.PIR109)
 
     def _check_for_pir201(self, node: ParsedStraightImport) -> Generator[ErrorMessage, None, None]:
         """Check for PIR201, import test_*/*_test modules is restricted."""
-        condition = (
+        if ErrorCode.PIR201.code in self.codes_to_check and (
             check_string(node.identifier, prefix="test_", suffix="_test") and not self.file_in_tests
-        )
-        if ErrorCode.PIR201.code in self.codes_to_check and condition:
+        ):
             yield standard_error_message(node, ErrorCode.PIR201)
 
     def _check_for_pir202(self, node: ParsedFromImport) -> Generator[ErrorMessage, None, None]:
         """Check for PIR202, import from test_*/*_test modules is restricted."""
-        condition = (
+        if ErrorCode.PIR202.code in self.codes_to_check and (
             check_string(node.identifier, prefix="test_", suffix="_test") and not self.file_in_tests
-        )
-        if ErrorCode.PIR202.code in self.codes_to_check and condition:
+        ):
             yield standard_error_message(node, ErrorCode.PIR202)
 
     def _check_for_pir203(self, node: ParsedStraightImport) -> Generator[ErrorMessage, None, None]:
         """Check for PIR203, import conftest is restricted."""
-        condition = check_string(node.identifier, substring_match="conftest")
-        if ErrorCode.PIR203.code in self.codes_to_check and condition:
+        if ErrorCode.PIR203.code in self.codes_to_check and check_string(
+            node.identifier, substring_match="conftest"
+        ):
             yield standard_error_message(node, ErrorCode.PIR203)
 
     def _check_for_pir204(self, node: ParsedFromImport) -> Generator[ErrorMessage, None, None]:
         """Check for PIR204, import from conftest is restricted."""
-        condition = check_string(node.identifier, substring_match="conftest")
-        if ErrorCode.PIR204.code in self.codes_to_check and condition:
+        if ErrorCode.PIR204.code in self.codes_to_check and check_string(
+            node.identifier, substring_match="conftest"
+        ):
             yield standard_error_message(node, ErrorCode.PIR204)
 
     def _check_for_pir205(self, node: ParsedStraightImport) -> Generator[ErrorMessage, None, None]:
         """Check for PIR205 import tests directory is restricted."""
-        condition = (
+        if ErrorCode.PIR205.code in self.codes_to_check and (
             check_string(node.identifier, substring_match="tests") and not self.file_in_tests
-        )
-        if ErrorCode.PIR205.code in self.codes_to_check and condition:
+        ):
             yield standard_error_message(node, ErrorCode.PIR205)
 
     def _check_for_pir206(self, node: ParsedFromImport) -> Generator[ErrorMessage, None, None]:
         """Check for PIR206, import from tests directory is restricted."""
-        condition = (
+        if ErrorCode.PIR206.code in self.codes_to_check and (
             check_string(node.identifier, substring_match="tests") and not self.file_in_tests
-        )
-        if ErrorCode.PIR206.code in self.codes_to_check and condition:
+        ):
             yield standard_error_message(node, ErrorCode.PIR206)
 
     def _check_for_pir207(self, node: ParsedStraightImport) -> Generator[ErrorMessage, None, None]:
         """Check for PIR207, import __init__."""
-        condition = check_string(node.identifier, substring_match="__init__")
-        if ErrorCode.PIR207.code in self.codes_to_check and condition:
+        if ErrorCode.PIR207.code in self.codes_to_check and check_string(
+            node.identifier, substring_match="__init__"
+        ):
             yield standard_error_message(node, ErrorCode.PIR207)
 
     def _check_for_pir208(self, node: ParsedFromImport) -> Generator[ErrorMessage, None, None]:
         """Check for PIR208, from __init__ imports."""
-        condition = check_string(node.identifier, substring_match="__init__")
-        if ErrorCode.PIR208.code in self.codes_to_check and condition:
+        if ErrorCode.PIR208.code in self.codes_to_check and check_string(
+            node.identifier, substring_match="__init__"
+        ):
             yield standard_error_message(node, ErrorCode.PIR208)
 
     def _check_for_pir209(self, node: ParsedStraightImport) -> Generator[ErrorMessage, None, None]:
         """Check for PIR209 import __main__."""
-        condition = check_string(node.identifier, substring_match="__main__")
-        if ErrorCode.PIR209.code in self.codes_to_check and condition:
+        if ErrorCode.PIR209.code in self.codes_to_check and check_string(
+            node.identifier, substring_match="__main__"
+        ):
             yield standard_error_message(node, ErrorCode.PIR209)
 
     def _check_for_pir210(self, node: ParsedFromImport) -> Generator[ErrorMessage, None, None]:
         """Check for PIR210 for from __main__ imports."""
-        condition = check_string(node.identifier, substring_match="__main__")
-        if ErrorCode.PIR210.code in self.codes_to_check and condition:
+        if ErrorCode.PIR210.code in self.codes_to_check and check_string(
+            node.identifier, substring_match="__main__"
+        ):
             yield standard_error_message(node, ErrorCode.PIR210)
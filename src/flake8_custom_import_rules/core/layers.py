@@ -0,0 +1,86 @@
+""" Layered architecture contracts compiled to package ranks. """
+
+from __future__ import annotations
+
+import sys
+
+LAYER_SEPARATOR = "|"
+
+
+def compile_layer_ranks(layers: list[str]) -> dict[str, int]:
+    """
+    Compile the ordered layers into a rank per package.
+
+    Layers are ordered from the highest layer to the lowest layer, so the
+    rank of a package is the index of its layer. Packages within the same
+    layer are separated by a ``|`` and share the same rank.
+
+    Parameters
+    ----------
+    layers : list[str]
+        The ordered layers (e.g., ``["app", "services|api", "utils"]``).
+
+    Returns
+    -------
+    dict[str, int]
+        The rank of each package in the layers.
+
+    Examples
+    --------
+    >>> compile_layer_ranks(["app", "services|api", "utils"])
+    {'app': 0, 'services': 1, 'api': 1, 'utils': 2}
+    """
+    return {
+        sys.intern(package.strip()): rank
+        for rank, layer in enumerate(layers)
+        for package in layer.split(LAYER_SEPARATOR)
+        if package.strip()
+    }
+
+
+def get_layer_rank(module: str | None, layer_ranks: dict[str, int]) -> int | None:
+    """
+    Get the rank of the most specific layer package a module belongs to.
+
+    Parameters
+    ----------
+    module : str | None
+        The module, or the identifier imported from a module.
+    layer_ranks : dict[str, int]
+        The compiled layer ranks.
+
+    Returns
+    -------
+    int | None
+        The layer rank, or None if the module is not in any layer.
+
+    Examples
+    --------
+    >>> get_layer_rank("services.users.models", {"app": 0, "services": 1})
+    1
+    """
+    if not layer_ranks:
+        return None
+    while module:
+        if (rank := layer_ranks.get(module)) is not None:
+            return rank
+        module = module.rpartition(".")[0]
+    return None
+
+
+def is_upward_import(importer_rank: int | None, imported_rank: int | None) -> bool:
+    """
+    Return whether an import goes from a lower layer to a higher layer.
+
+    Parameters
+    ----------
+    importer_rank : int | None
+        The layer rank of the importing module.
+    imported_rank : int | None
+        The layer rank of the imported module.
+
+    Returns
+    -------
+    bool
+    """
+    return importer_rank is not None and imported_rank is not None and imported_rank < importer_rank
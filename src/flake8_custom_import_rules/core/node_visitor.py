@@ -4,17 +4,21 @@ from __future__ import annotations
 
 import ast
 import logging
-import sys
 from collections import defaultdict
+from collections.abc import Callable
+from functools import lru_cache
 from pathlib import Path
+from typing import Any
 
 from attrs import define
 from attrs import field
 
+from flake8_custom_import_rules.core.nodes import ALL_NODE_KINDS
 from flake8_custom_import_rules.core.nodes import DynamicStringFromImport
 from flake8_custom_import_rules.core.nodes import DynamicStringParseSyntaxFailure
 from flake8_custom_import_rules.core.nodes import DynamicStringStraightImport
 from flake8_custom_import_rules.core.nodes import ImportType
+from flake8_custom_import_rules.core.nodes import NodeKind
 from flake8_custom_import_rules.core.nodes import ParsedClassDef
 from flake8_custom_import_rules.core.nodes import ParsedDynamicImport
 from flake8_custom_import_rules.core.nodes import ParsedFromImport
@@ -23,6 +27,9 @@ from flake8_custom_import_rules.core.nodes import ParsedIfImport
 from flake8_custom_import_rules.core.nodes import ParsedLocalImport
 from flake8_custom_import_rules.core.nodes import ParsedNode
 from flake8_custom_import_rules.core.nodes import ParsedStraightImport
+from flake8_custom_import_rules.core.rule_profile import RuleProfile
+from flake8_custom_import_rules.core.rule_profile import classify_import_type
+from flake8_custom_import_rules.core.rule_profile import get_stdlib_names
 from flake8_custom_import_rules.defaults import POTENTIAL_DYNAMIC_IMPORTS
 from flake8_custom_import_rules.defaults import STDIN_IDENTIFIERS
 from flake8_custom_import_rules.utils.file_utils import get_module_name_from_filename
@@ -30,11 +37,55 @@ from flake8_custom_import_rules.utils.node_utils import generate_identifier_path
 from flake8_custom_import_rules.utils.node_utils import get_module_info_from_import_node
 from flake8_custom_import_rules.utils.node_utils import get_name_info_from_import_node
 from flake8_custom_import_rules.utils.node_utils import get_package_names
+from flake8_custom_import_rules.utils.node_utils import resolve_relative_module
 from flake8_custom_import_rules.utils.node_utils import root_package_name
 from flake8_custom_import_rules.utils.parse_utils import check_string
 
 logger = logging.getLogger(__name__)
 
+# The handler of each AST node type and the node kinds it builds. The
+# handlers of import statements build no optional node kind and are always
+# registered.
+VISIT_HANDLERS: tuple[tuple[type[ast.AST], str, NodeKind], ...] = (
+    (ast.Import, "visit_Import", NodeKind(0)),
+    (ast.ImportFrom, "visit_ImportFrom", NodeKind(0)),
+    (ast.ClassDef, "visit_ClassDef", NodeKind.DEFINITIONS | NodeKind.LOCAL_IMPORTS),
+    (ast.FunctionDef, "visit_FunctionDef", NodeKind.DEFINITIONS | NodeKind.LOCAL_IMPORTS),
+    (
+        ast.AsyncFunctionDef,
+        "visit_AsyncFunctionDef",
+        NodeKind.DEFINITIONS | NodeKind.LOCAL_IMPORTS,
+    ),
+    (ast.Call, "visit_Call", NodeKind.DYNAMIC_IMPORTS),
+    (ast.Assign, "visit_Assign", NodeKind.DYNAMIC_IMPORTS),
+    (ast.If, "visit_If", NodeKind.CONDITIONAL_IMPORTS),
+)
+
+
+@lru_cache(maxsize=None)
+def get_visit_handlers(
+    node_kinds: NodeKind,
+) -> dict[type[ast.AST], Callable[[Any, Any], None]]:
+    """
+    Get the handlers the visitor registers to build the given node kinds.
+
+    Parameters
+    ----------
+    node_kinds : NodeKind
+        The node kinds built in addition to the import statements.
+
+    Returns
+    -------
+    dict[type[ast.AST], Callable[[Any, Any], None]]
+        The unbound handler of each AST node type that is handled. Other
+        node types are only traversed.
+    """
+    return {
+        node_type: getattr(CustomImportRulesVisitor, handler_name)
+        for node_type, handler_name, handler_node_kinds in VISIT_HANDLERS
+        if not handler_node_kinds or handler_node_kinds & node_kinds
+    }
+
 
 @define(slots=True)
 class CustomImportRulesVisitor(ast.NodeVisitor):
@@ -62,26 +113,41 @@ class CustomImportRulesVisitor(ast.NodeVisitor):
         you're importing.
     identifiers_by_lineno : defaultdict[str, list]
         Identifiers by line number
+    module_name : str | None
+        The module name of the file, used instead of resolving the module
+        name from the file name (e.g., for in-memory sources)
+    rule_profile : RuleProfile | None
+        The compiled rule profile shared across files, used to resolve
+        module names and classify imports
     stdlib_names : set | frozenset
         Standard library names for the current Python version
     file_identifier : str | None
         The file identifier (i.e., the module name)
     file_root_package_name : str | None
         The file root package name
+    node_kinds : NodeKind
+        The kinds of nodes built in addition to the import statements, by
+        default every kind. Only the handlers of these kinds are registered.
     """
 
     base_packages: list[str] = field(factory=list)
     filename: str | None = None
     nodes: list = field(factory=list)
-    dynamic_nodes: defaultdict[str, list] = defaultdict(list)
+    dynamic_nodes: defaultdict[str, list] = field(factory=lambda: defaultdict(list))
     file_path: Path | None = None
     resolve_local_scope_imports: bool | None = field(default=False)
-    identifiers: defaultdict[str, dict] = defaultdict(lambda: defaultdict(str))
-    identifiers_by_lineno: defaultdict[str, list] = defaultdict(list)
+    identifiers: defaultdict[str, dict] = field(
+        factory=lambda: defaultdict(lambda: defaultdict(str))
+    )
+    identifiers_by_lineno: defaultdict[str, list] = field(factory=lambda: defaultdict(list))
+    module_name: str | None = None
+    rule_profile: RuleProfile | None = None
+    node_kinds: NodeKind = field(default=ALL_NODE_KINDS)
     stdlib_names: set | frozenset = field(init=False)
     file_identifier: str | None = field(init=False)
     file_root_package_name: str | None = field(init=False)
     file_packages: list | None = field(init=False)
+    _handlers: dict[type[ast.AST], Callable[[Any, Any], None]] = field(init=False, repr=False)
 
     def __attrs_post_init__(self) -> None:
         """Initialize the attributes after object creation.
@@ -91,29 +157,21 @@ class CustomImportRulesVisitor(ast.NodeVisitor):
         self.stdlib_names using stdlib_list. Otherwise, it assigns
         sys.stdlib_module_names to self.stdlib_names.
         """
-        if sys.version_info < (3, 10):
-            # stdlib_list only supports up to Python 3.9
-            from stdlib_list import stdlib_list
-
-            self.stdlib_names = set(
-                stdlib_list(f"{sys.version_info.major}.{sys.version_info.minor}")
-            )
-        else:
-            self.stdlib_names = sys.stdlib_module_names
+        self.stdlib_names = (
+            self.rule_profile.stdlib_names if self.rule_profile else get_stdlib_names()
+        )
 
-        self.resolve_local_scope_imports = self.filename not in STDIN_IDENTIFIERS
+        self.resolve_local_scope_imports = (
+            self.module_name is not None or self.filename not in STDIN_IDENTIFIERS
+        )
 
-        logger.debug(f"Resolve local imports: {self.resolve_local_scope_imports}")
         self.file_path = (
             Path(self.filename).resolve()
             if (self.resolve_local_scope_imports and self.filename)
             else None
         )
-        logger.info(f"Visitor filename: {self.filename}")
         self.file_identifier = (
-            get_module_name_from_filename(str(self.filename))
-            if self.resolve_local_scope_imports
-            else None
+            self._get_file_identifier() if self.resolve_local_scope_imports else None
         )
         self.file_root_package_name = (
             root_package_name(self.file_identifier) if self.resolve_local_scope_imports else None
@@ -121,25 +179,67 @@ class CustomImportRulesVisitor(ast.NodeVisitor):
         self.file_packages = (
             get_package_names(self.file_identifier) if self.resolve_local_scope_imports else None
         )
-        logger.debug(f"File packages: {self.file_packages}")
+        self._handlers = get_visit_handlers(self.node_kinds)
+
+    def visit(self, node: ast.AST) -> None:
+        """Visit a node with its registered handler, or traverse it."""
+        handler = self._handlers.get(type(node))
+        if handler is None:
+            self.generic_visit(node)
+        else:
+            handler(self, node)
+
+    def _get_file_identifier(self) -> str | None:
+        """Get the module name of the file being visited."""
+        if self.module_name is not None:
+            return self.module_name
+        if self.rule_profile is not None:
+            return self.rule_profile.module_name(str(self.filename))
+        return get_module_name_from_filename(str(self.filename))
 
     def get_all_nodes(self) -> list[ParsedNode]:
         """Get all nodes."""
         return self.nodes + list(self.dynamic_nodes.values())
 
-    def _resolve_local_scope_import(self, module: str, node_level: int) -> Path | None:
-        """Resolve a local import."""
-        # parent = self.file_path.parents[node_level - 1] if self.file_path else None
-        # return parent / f"{module}.py" if parent else None
-        raise NotImplementedError("This method is not implemented yet.")
+    def _resolve_local_scope_import(self, module: str, node_level: int) -> str | None:
+        """
+        Resolve the module of a relative import from the module name of the file.
+
+        Parameters
+        ----------
+        module : str
+            The module of the import, without the leading dots.
+        node_level : int
+            The level of the import.
+
+        Returns
+        -------
+        str | None
+            The absolute module name, or None if the module name of the file
+            is unknown (e.g., stdin) or the import goes beyond the top level
+            package.
+        """
+        if self.file_identifier is None:
+            return None
+        is_package = self.file_path is not None and self.file_path.name == "__init__.py"
+        return resolve_relative_module(self.file_identifier, module, node_level, is_package)
+
+    def resolve_relative_import(self, relative_import: str) -> str | None:
+        """
+        Resolve a relative import to its absolute form.
 
-    def resolve_relative_import(self, relative_import: str) -> str:
-        """Resolve a relative import to its absolute form."""
-        # Remove leading dots from the relative import
+        Parameters
+        ----------
+        relative_import : str
+            The relative module, with its leading dots, e.g., ``..module``.
 
-        # relative_import = relative_import.lstrip('.')
-        # return f"{self}.{relative_import}"
-        raise NotImplementedError("This method is not implemented yet.")
+        Returns
+        -------
+        str | None
+            The absolute module name, or None if it cannot be resolved.
+        """
+        module = relative_import.lstrip(".")
+        return self._resolve_local_scope_import(module, len(relative_import) - len(module))
 
     @staticmethod
     def _get_straight_import_node(module_info: dict) -> ParsedStraightImport:
@@ -173,6 +273,7 @@ class CustomImportRulesVisitor(ast.NodeVisitor):
     def visit_Import(self, node: ast.Import) -> None:
         """Visit an Import node."""
         parsed_imports_dict = get_module_info_from_import_node(node)
+        by_lineno = NodeKind.IDENTIFIERS_BY_LINENO in self.node_kinds
 
         # pprint.pprint("\nParsed import dict:")
         # pprint.pprint(parsed_imports_dict)
@@ -183,7 +284,8 @@ class CustomImportRulesVisitor(ast.NodeVisitor):
             parsed_import = self._get_straight_import_node(module_info)
 
             self.nodes.append(parsed_import)
-            self.identifiers_by_lineno[str(node.lineno)].append(module_info)
+            if by_lineno:
+                self.identifiers_by_lineno[str(node.lineno)].append(module_info)
             self.identifiers[parsed_import.identifier].update(module_info)
             self.identifiers[alias.name].update(module_info)
 
@@ -236,24 +338,39 @@ class CustomImportRulesVisitor(ast.NodeVisitor):
             private_identifier_import=name_info["private_identifier_import"],
             private_module_import=name_info["private_module_import"],
             import_statement=name_info["import_statement"],
+            resolved_module=name_info.get("resolved_module"),
         )
 
     def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
         """Visit an Import From node."""
         parsed_from_imports_dict = get_name_info_from_import_node(node)
+        resolved_module = (
+            self._resolve_local_scope_import(node.module or "", node.level)
+            if node.level > 0
+            else None
+        )
+        by_lineno = NodeKind.IDENTIFIERS_BY_LINENO in self.node_kinds
 
         # pprint.pprint("\nParsed from import dict:")
         # pprint.pprint(parsed_from_imports_dict)
 
         for alias in node.names:
             name_info = parsed_from_imports_dict[alias.name]
-            name_info["import_type"] = self._get_from_import_type(
-                name_info["level"], name_info["package_names"]
-            )
+            if resolved_module is not None:
+                # Relative imports are checked like the absolute import they resolve to
+                name_info["resolved_module"] = resolved_module
+                name_info["package"] = root_package_name(resolved_module)
+                name_info["package_names"] = get_package_names(resolved_module)
+                name_info["import_type"] = self._classify_type(name_info["package_names"])
+            else:
+                name_info["import_type"] = self._get_from_import_type(
+                    name_info["level"], name_info["package_names"]
+                )
             parsed_from_import = self._get_from_import_node(name_info)
 
             self.nodes.append(parsed_from_import)
-            self.identifiers_by_lineno[str(node.lineno)].append(name_info)
+            if by_lineno:
+                self.identifiers_by_lineno[str(node.lineno)].append(name_info)
             self.identifiers[parsed_from_import.identifier].update(name_info)
             self.identifiers[alias.name].update(name_info)
 
@@ -278,35 +395,32 @@ class CustomImportRulesVisitor(ast.NodeVisitor):
 
     def visit_ClassDef(self, node: ast.ClassDef) -> None:
         """Visit a ClassDef node."""
-        parsed_class = ParsedClassDef(
-            name=node.name,
-            lineno=node.lineno,
-            col_offset=node.col_offset,
-        )
-        self.nodes.append(parsed_class)
-        self._check_local_scope_import(node)
+        if NodeKind.DEFINITIONS in self.node_kinds:
+            self.nodes.append(
+                ParsedClassDef(name=node.name, lineno=node.lineno, col_offset=node.col_offset)
+            )
+        if NodeKind.LOCAL_IMPORTS in self.node_kinds:
+            self._check_local_scope_import(node)
         self.generic_visit(node)
 
     def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
         """Visit a FunctionDef node."""
-        parsed_function = ParsedFunctionDef(
-            name=node.name,
-            lineno=node.lineno,
-            col_offset=node.col_offset,
-        )
-        self.nodes.append(parsed_function)
-        self._check_local_scope_import(node)
+        if NodeKind.DEFINITIONS in self.node_kinds:
+            self.nodes.append(
+                ParsedFunctionDef(name=node.name, lineno=node.lineno, col_offset=node.col_offset)
+            )
+        if NodeKind.LOCAL_IMPORTS in self.node_kinds:
+            self._check_local_scope_import(node)
         self.generic_visit(node)
 
     def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
         """Visit a AsyncFunctionDef node."""
-        parsed_async_function = ParsedFunctionDef(
-            name=node.name,
-            lineno=node.lineno,
-            col_offset=node.col_offset,
-        )
-        self.nodes.append(parsed_async_function)
-        self._check_local_scope_import(node)
+        if NodeKind.DEFINITIONS in self.node_kinds:
+            self.nodes.append(
+                ParsedFunctionDef(name=node.name, lineno=node.lineno, col_offset=node.col_offset)
+            )
+        if NodeKind.LOCAL_IMPORTS in self.node_kinds:
+            self._check_local_scope_import(node)
         self.generic_visit(node)
 
     def _get_dynamic_string_visitor(self, lineno: int, col_offset: int) -> DynamicStringVisitor:
@@ -324,7 +438,9 @@ class CustomImportRulesVisitor(ast.NodeVisitor):
             node = ast.parse(value)
 
         except (SyntaxError, TypeError, ValueError):
-            logger.warning(f"Parsing error in string {value} at line {lineno}, column {col_offset}")
+            logger.warning(
+                "Parsing error in string %s at line %s, column %s", value, lineno, col_offset
+            )
             dynamic_node_failure = DynamicStringParseSyntaxFailure(
                 lineno=lineno, col_offset=col_offset, value=value
             )
@@ -592,15 +708,9 @@ class CustomImportRulesVisitor(ast.NodeVisitor):
         -------
         ImportType
         """
-        for package in reversed(package_names):
-            if package == "__future__":
-                return ImportType.FUTURE
-            elif package in self.base_packages:
-                return ImportType.FIRST_PARTY
-            elif package in self.stdlib_names:
-                return ImportType.STDLIB
-
-        return ImportType.THIRD_PARTY
+        if self.rule_profile is not None:
+            return self.rule_profile.classify(package_names)
+        return classify_import_type(package_names, self.base_packages, self.stdlib_names)
 
 
 @define(slots=True)
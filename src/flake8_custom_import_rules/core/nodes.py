@@ -1,6 +1,8 @@
 """Parsed Node Classes to store library and module info to check custom import rules."""
 
 from enum import Enum
+from enum import IntFlag
+from enum import auto
 
 from attrs import define
 from attrs import field
@@ -17,6 +19,26 @@ class ImportType(Enum):
     DYNAMIC = "DYNAMIC"
 
 
+class NodeKind(IntFlag):
+    """The kinds of nodes the visitor builds in addition to the import
+    statements, which are always built."""
+
+    DEFINITIONS = auto()
+    LOCAL_IMPORTS = auto()
+    CONDITIONAL_IMPORTS = auto()
+    DYNAMIC_IMPORTS = auto()
+    IDENTIFIERS_BY_LINENO = auto()
+
+
+ALL_NODE_KINDS = (
+    NodeKind.DEFINITIONS
+    | NodeKind.LOCAL_IMPORTS
+    | NodeKind.CONDITIONAL_IMPORTS
+    | NodeKind.DYNAMIC_IMPORTS
+    | NodeKind.IDENTIFIERS_BY_LINENO
+)
+
+
 @define(slots=True)
 class ParsedStraightImport:
     """Parsed import statement"""
@@ -58,11 +80,13 @@ class ParsedFromImport:
     private_identifier_import: bool
     private_module_import: bool
     import_statement: str
+    resolved_module: str | None = None
     identifier: str = field(init=False)
 
     def __attrs_post_init__(self) -> None:
         """Post init hook."""
-        self.identifier = f"{self.module}.{self.name}"
+        module = self.module if self.resolved_module is None else self.resolved_module
+        self.identifier = f"{module}.{self.name}"
 
 
 @define(slots=True)
@@ -169,3 +193,7 @@ ParsedNode = (
     | DynamicStringStraightImport
     | DynamicStringFromImport
 )
+
+# The nodes of import statements and dynamic imports, as opposed to the
+# nodes of the scope they are in
+IMPORT_NODE_TYPES = (ParsedStraightImport, ParsedFromImport, ParsedDynamicImport)
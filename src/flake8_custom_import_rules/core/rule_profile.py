@@ -0,0 +1,470 @@
+""" Compiled rule profile shared by every file checked in a run. """
+
+from __future__ import annotations
+
+import logging
+import sys
+from collections import Counter
+from collections import defaultdict
+from collections.abc import Collection
+from itertools import chain
+
+from attrs import define
+from attrs import field
+
+from flake8_custom_import_rules.core.import_rules import ALL_CODES
+from flake8_custom_import_rules.core.import_rules import CUSTOM_RESTRICTION_CODES
+from flake8_custom_import_rules.core.import_rules import LAYER_CODES
+from flake8_custom_import_rules.core.import_rules import RESTRICTED_PACKAGE_CODES
+from flake8_custom_import_rules.core.import_rules import FileRule
+from flake8_custom_import_rules.core.import_rules import FileRuleIndex
+from flake8_custom_import_rules.core.import_rules import StandardRestriction
+from flake8_custom_import_rules.core.import_rules import compile_file_rule_index
+from flake8_custom_import_rules.core.import_rules import compile_node_kinds
+from flake8_custom_import_rules.core.import_rules import compile_standard_restrictions
+from flake8_custom_import_rules.core.import_rules import get_file_rules
+from flake8_custom_import_rules.core.layers import compile_layer_ranks
+from flake8_custom_import_rules.core.layers import get_layer_rank
+from flake8_custom_import_rules.core.nodes import ImportType
+from flake8_custom_import_rules.core.nodes import NodeKind
+from flake8_custom_import_rules.defaults import DEFAULT_CHECKER_SETTINGS
+from flake8_custom_import_rules.defaults import Settings
+from flake8_custom_import_rules.utils.file_utils import get_module_name_from_filename
+from flake8_custom_import_rules.utils.node_utils import get_package_names
+from flake8_custom_import_rules.utils.node_utils import root_package_name
+
+logger = logging.getLogger(__name__)
+
+# The custom import rules that restrict the imports of the files they apply to
+IMPORT_TYPE_RULES = (
+    FileRule.PROJECT_ONLY
+    | FileRule.BASE_PACKAGE_ONLY
+    | FileRule.FIRST_PARTY_ONLY
+    | FileRule.STANDALONE_MODULES
+    | FileRule.STD_LIB_ONLY
+    | FileRule.THIRD_PARTY_ONLY
+)
+
+# The caches of a profile are filled while checking files, and are not pickled
+CACHE_FIELDS = (
+    "_module_names",
+    "_import_types",
+    "_restricted_identifiers",
+    "_applicable_rules",
+)
+PICKLED_FIELDS = (
+    "settings",
+    "active_codes",
+    "base_packages",
+    "stdlib_names",
+    "restricted_packages",
+    "custom_restrictions",
+    "layer_ranks",
+    "standard_restrictions",
+    "file_rule_index",
+    "node_kinds",
+    "project_level_restrictions",
+    "_base_package_set",
+    "_restriction_entries",
+)
+
+
+def get_stdlib_names() -> set | frozenset:
+    """
+    Get the standard library module names for the current Python version.
+
+    Returns
+    -------
+    set | frozenset
+        The standard library module names.
+    """
+    if sys.version_info < (3, 10):
+        # stdlib_list only supports up to Python 3.9
+        from stdlib_list import stdlib_list
+
+        return set(stdlib_list(f"{sys.version_info.major}.{sys.version_info.minor}"))
+    return sys.stdlib_module_names
+
+
+def classify_import_type(
+    package_names: list[str] | tuple[str, ...],
+    base_packages: Collection[str],
+    stdlib_names: set | frozenset,
+) -> ImportType:
+    """
+    Classify the import type.
+
+    Start by walking through package names from most-specific to
+    least-specific, taking the first match found.
+
+    Parameters
+    ----------
+    package_names : list[str] | tuple[str, ...]
+        Package names
+    base_packages : Collection[str]
+        The project base packages.
+    stdlib_names : set | frozenset
+        Standard library names for the current Python version.
+
+    Returns
+    -------
+    ImportType
+    """
+    for package in reversed(package_names):
+        if package == "__future__":
+            return ImportType.FUTURE
+        elif package in base_packages:
+            return ImportType.FIRST_PARTY
+        elif package in stdlib_names:
+            return ImportType.STDLIB
+
+    return ImportType.THIRD_PARTY
+
+
+def get_restriction_entry(restriction: str) -> dict:
+    """
+    Get the restricted identifier entry of a restricted package or module.
+
+    Parameters
+    ----------
+    restriction : str
+        The restricted package or module.
+
+    Returns
+    -------
+    dict
+        The module, root package, package names and import statement of the
+        restriction, as parsed by ``RestrictedImportVisitor``.
+    """
+    return {
+        "module": restriction,
+        "package": root_package_name(restriction),
+        "package_names": get_package_names(restriction),
+        "import_statement": f"import {restriction}",
+    }
+
+
+@define(slots=True, frozen=True, hash=False)
+class RuleProfile:
+    """Rule profile compiled once from the checker settings.
+
+    The profile holds the state that does not depend on the contents of a
+    single file, so that it can be reused across every file checked in a
+    run: the module name resolver, the import type classifier, the
+    restricted identifiers index, the layer ranks and the dispatch table of
+    the project level restrictions.
+
+    The profile is frozen and is compiled when the options are parsed, so
+    ``flake8 -j`` workers forked afterwards share it copy-on-write. It can
+    be pickled for workers that are spawned instead; the caches filled
+    while checking files are not pickled.
+
+    Attributes
+    ----------
+    settings : Settings
+        The checker settings the profile was compiled from, frozen when the
+        profile is compiled with ``from_settings``.
+    active_codes : frozenset[str]
+        The error codes selected and not ignored in the flake8 options. The
+        checks of the other codes are left out of the compiled tables.
+    base_packages : list[str]
+        The project base packages.
+    stdlib_names : set | frozenset
+        Standard library names for the current Python version.
+    restricted_packages : tuple[str, ...]
+        The restricted packages.
+    custom_restrictions : dict[str, tuple[str, ...]]
+        The packages restricted for each package.
+    layer_ranks : dict[str, int]
+        The layer rank of each package in the layers.
+    standard_restrictions : tuple[StandardRestriction, ...]
+        The node types and check method of each enabled project level
+        restriction.
+    file_rule_index : FileRuleIndex
+        The custom import rules that apply to each package listed in a
+        custom import rule, including the rules of its parent packages.
+    node_kinds : NodeKind
+        The kinds of nodes the visitor builds for the dispatched
+        restrictions, in addition to the import statements.
+    project_level_restrictions : bool
+        Whether any project level restriction is enabled. Project level
+        restrictions apply to every file.
+    options : dict
+        The checker options, in the same form as ``Plugin._options``.
+    """
+
+    settings: Settings = field(factory=lambda: DEFAULT_CHECKER_SETTINGS)
+    active_codes: frozenset[str] = field(default=ALL_CODES)
+    base_packages: list[str] = field(init=False)
+    stdlib_names: set | frozenset = field(init=False)
+    restricted_packages: tuple[str, ...] = field(init=False)
+    custom_restrictions: dict[str, tuple[str, ...]] = field(init=False)
+    layer_ranks: dict[str, int] = field(init=False)
+    standard_restrictions: tuple[StandardRestriction, ...] = field(init=False)
+    file_rule_index: FileRuleIndex = field(init=False)
+    node_kinds: NodeKind = field(init=False)
+    project_level_restrictions: bool = field(init=False)
+    options: dict = field(init=False)
+
+    _base_package_set: frozenset[str] = field(init=False)
+    _restriction_entries: dict[str, dict] = field(init=False)
+    _module_names: dict[str, str | None] = field(init=False, factory=dict)
+    _import_types: dict[tuple[str, ...], ImportType] = field(init=False, factory=dict)
+    _restricted_identifiers: dict[tuple[str, ...], defaultdict[str, dict]] = field(
+        init=False, factory=dict
+    )
+    _applicable_rules: dict[tuple[str, ...], bool] = field(init=False, factory=dict)
+    _cache_lookups: Counter[str] = field(init=False, factory=Counter)
+
+    def __attrs_post_init__(self) -> None:
+        """Compile the settings."""
+        settings = self.settings
+        base_packages = [sys.intern(package) for package in settings.BASE_PACKAGES]
+        restricted_packages = tuple(sys.intern(package) for package in settings.RESTRICTED_PACKAGES)
+        custom_restrictions = {
+            sys.intern(package): tuple(sys.intern(restriction) for restriction in restrictions)
+            for package, restrictions in settings.CUSTOM_RESTRICTIONS.items()
+        }
+        restrictions = {*restricted_packages, *chain.from_iterable(custom_restrictions.values())}
+        standard_restrictions = compile_standard_restrictions(settings, self.active_codes)
+        compiled = {
+            "base_packages": base_packages,
+            "stdlib_names": get_stdlib_names(),
+            "restricted_packages": restricted_packages,
+            "custom_restrictions": custom_restrictions,
+            "layer_ranks": compile_layer_ranks(settings.LAYERS),
+            "standard_restrictions": standard_restrictions,
+            "file_rule_index": compile_file_rule_index(settings, self.active_codes),
+            "node_kinds": compile_node_kinds(standard_restrictions),
+            "project_level_restrictions": bool(standard_restrictions),
+            "_base_package_set": frozenset(base_packages),
+            "_restriction_entries": {
+                restriction: get_restriction_entry(restriction) for restriction in restrictions
+            },
+        }
+        # The profile is frozen, so the compiled tables are set once here
+        for name, value in compiled.items():
+            object.__setattr__(self, name, value)
+        self._set_options()
+
+    @property
+    def settings_hash(self) -> str:
+        """Return the content hash of the settings the profile was compiled from."""
+        return self.settings.freeze().content_hash
+
+    def _set_options(self) -> None:
+        """Set the checker options that refer to the profile."""
+        options = {
+            "restricted_packages": self.settings.RESTRICTED_PACKAGES,
+            "custom_restrictions": self.settings.CUSTOM_RESTRICTIONS,
+            "base_packages": self.base_packages,
+            "checker_settings": self.settings,
+            "rule_profile": self,
+            "test_env": False,
+        }
+        object.__setattr__(self, "options", options)
+
+    def __getstate__(self) -> dict:
+        """Get the compiled tables, without the caches or the options."""
+        return {name: getattr(self, name) for name in PICKLED_FIELDS}
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore the compiled tables, with empty caches."""
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+        for name in CACHE_FIELDS:
+            object.__setattr__(self, name, {})
+        object.__setattr__(self, "_cache_lookups", Counter())
+        self._set_options()
+
+    @classmethod
+    def from_settings(
+        cls, settings: Settings | None = None, active_codes: Collection[str] = ALL_CODES
+    ) -> RuleProfile:
+        """
+        Compile a rule profile from the checker settings.
+
+        Parameters
+        ----------
+        settings : Settings | None
+            The checker settings, by default the default settings.
+        active_codes : Collection[str]
+            The error codes to check, by default every error code.
+
+        Returns
+        -------
+        RuleProfile
+        """
+        return cls(
+            settings=(settings or DEFAULT_CHECKER_SETTINGS).freeze(),
+            active_codes=frozenset(active_codes),
+        )
+
+    def module_name(self, filename: str) -> str | None:
+        """
+        Resolve the module name of a file, caching the result for the run.
+
+        Parameters
+        ----------
+        filename : str
+            The file to resolve.
+
+        Returns
+        -------
+        str | None
+            The module name.
+        """
+        self._cache_lookups["module_names"] += 1
+        try:
+            return self._module_names[filename]
+        except KeyError:
+            module_name = get_module_name_from_filename(filename)
+            self._module_names[filename] = module_name
+            return module_name
+
+    def classify(self, package_names: list[str]) -> ImportType:
+        """
+        Classify the import type of a package, caching the result for the run.
+
+        Parameters
+        ----------
+        package_names : list[str]
+            Package names
+
+        Returns
+        -------
+        ImportType
+        """
+        self._cache_lookups["import_types"] += 1
+        key = tuple(package_names)
+        try:
+            return self._import_types[key]
+        except KeyError:
+            import_type = classify_import_type(key, self._base_package_set, self.stdlib_names)
+            self._import_types[key] = import_type
+            return import_type
+
+    def restricted_identifiers(self, file_packages: list[str] | None) -> defaultdict[str, dict]:
+        """
+        Get the restricted identifiers for the packages of a file.
+
+        Files with the same parent packages share the same restrictions, so
+        the restricted identifiers are only computed once per package, from
+        the restrictions compiled with the profile.
+
+        Parameters
+        ----------
+        file_packages : list[str] | None
+            The module and parent packages of the file.
+
+        Returns
+        -------
+        defaultdict[str, dict]
+            The restricted identifiers.
+        """
+        self._cache_lookups["restricted_identifiers"] += 1
+        key = tuple(file_packages or ())
+        try:
+            return self._restricted_identifiers[key]
+        except KeyError:
+            # Same result as ``get_restricted_identifiers``, from the compiled tables
+            restricted_packages = {
+                package for package in self.restricted_packages if package not in key
+            }
+            import_restrictions = {
+                restriction
+                for package in key
+                for restriction in self.custom_restrictions.get(package, ())
+                if restriction not in key
+            }
+            restricted_identifiers: defaultdict[str, dict] = defaultdict(lambda: defaultdict(str))
+            for restriction in sorted(restricted_packages | import_restrictions):
+                restricted_identifiers[restriction].update(self._restriction_entries[restriction])
+                restricted_identifiers[restriction]["restricted_package"] = (
+                    restriction in restricted_packages
+                )
+                restricted_identifiers[restriction]["import_restriction"] = (
+                    restriction in import_restrictions
+                )
+            self._restricted_identifiers[key] = restricted_identifiers
+            return restricted_identifiers
+
+    def has_applicable_rules(self, module_name: str | None) -> bool:
+        """
+        Return whether any rule can report an error in a module.
+
+        Applicability only depends on the module name, so files with no
+        applicable rule can be skipped before they are read, parsed or
+        visited. The result is cached per module for the run.
+
+        Parameters
+        ----------
+        module_name : str | None
+            The module name of the file, None if it is unknown (e.g., stdin).
+
+        Returns
+        -------
+        bool
+            False if no project level restriction is enabled, the module is
+            not in a custom import rule or a layer, and no package or module
+            is restricted for the module. Rules that cannot report an active
+            code do not apply.
+        """
+        if self.project_level_restrictions:
+            return True
+
+        self._cache_lookups["applicable_rules"] += 1
+        key = tuple(get_package_names(module_name) or ()) if module_name else ()
+        try:
+            return self._applicable_rules[key]
+        except KeyError:
+            checks_restrictions = not (
+                CUSTOM_RESTRICTION_CODES | RESTRICTED_PACKAGE_CODES
+            ).isdisjoint(self.active_codes)
+            applicable = (checks_restrictions and bool(self.restricted_identifiers(list(key)))) or (
+                bool(key)
+                and (
+                    (
+                        not LAYER_CODES.isdisjoint(self.active_codes)
+                        and get_layer_rank(module_name, self.layer_ranks) is not None
+                    )
+                    or bool(self.file_rules(list(key)) & IMPORT_TYPE_RULES)
+                )
+            )
+            self._applicable_rules[key] = applicable
+            return applicable
+
+    def file_rules(self, file_packages: list[str] | None) -> FileRule:
+        """
+        Get the custom import rules that apply to the packages of a file.
+
+        Parameters
+        ----------
+        file_packages : list[str] | None
+            The module and parent packages of the file.
+
+        Returns
+        -------
+        FileRule
+            The rules of the deepest package of the file in the index.
+        """
+        return get_file_rules(file_packages, self.file_rule_index)
+
+    def cache_stats(self) -> dict[str, tuple[int, int]]:
+        """
+        Get the number of hits and misses of each cache of the profile.
+
+        Each miss adds one entry to its cache, so only the lookups are counted
+        and the misses are the number of entries.
+
+        Returns
+        -------
+        dict[str, tuple[int, int]]
+            The hits and the misses, by cache name.
+        """
+        stats = {}
+        for field_name in CACHE_FIELDS:
+            name = field_name.lstrip("_")
+            misses = len(getattr(self, field_name))
+            stats[name] = (self._cache_lookups[name] - misses, misses)
+        return stats
@@ -2,6 +2,7 @@
 
 import ast
 import logging
+import time
 from collections import defaultdict
 from typing import Any
 from typing import Generator
@@ -10,15 +11,24 @@ import pycodestyle
 from attrs import define
 from attrs import field
 
+from flake8_custom_import_rules.core.baseline import Baseline
 from flake8_custom_import_rules.core.error_messages import ErrorMessage
+from flake8_custom_import_rules.core.import_rules import ALL_CODES
 from flake8_custom_import_rules.core.import_rules import CustomImportRules
 from flake8_custom_import_rules.core.node_visitor import CustomImportRulesVisitor
+from flake8_custom_import_rules.core.nodes import ALL_NODE_KINDS
+from flake8_custom_import_rules.core.nodes import IMPORT_NODE_TYPES
+from flake8_custom_import_rules.core.nodes import NodeKind
 from flake8_custom_import_rules.core.nodes import ParsedNode
 from flake8_custom_import_rules.core.restricted_import_visitor import get_restricted_identifiers
+from flake8_custom_import_rules.core.rule_profile import RuleProfile
 from flake8_custom_import_rules.defaults import DEFAULT_CHECKER_SETTINGS
 from flake8_custom_import_rules.defaults import STDIN_IDENTIFIERS
 from flake8_custom_import_rules.utils.parse_utils import NOQA_INLINE_REGEXP
 from flake8_custom_import_rules.utils.parse_utils import parse_comma_separated_list
+from flake8_custom_import_rules.utils.source_utils import SourceBuffer
+from flake8_custom_import_rules.utils.trace_utils import trace_enabled
+from flake8_custom_import_rules.utils.trace_utils import trace_event
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +47,7 @@ class CustomImportRulesChecker:
         Abstract syntax tree representation of the code.
     _filename : str
         The name of the file being checked.
-    _lines : list[str]
+    _lines : list[str] | None
         List of code lines.
     _visitor : CustomImportRulesVisitor
         Visitor object for traversing and analyzing the AST.
@@ -49,6 +59,17 @@ class CustomImportRulesChecker:
         Identifiers indexed by line number.
     _restricted_identifiers : defaultdict[str, dict] | None
         Identifiers that are restricted according to the rules.
+    _module_name : str | None
+        The module name of the file, if it cannot be resolved from the
+        filename (e.g., for in-memory sources).
+    _source : SourceBuffer | None
+        The source read into a single buffer, used instead of the lines to
+        parse the tree and to look up noqa comments.
+    _node_kinds : NodeKind | None
+        The kinds of nodes the visitor builds, by default the kinds the
+        rules of the rule profile need (every kind without a profile).
+    _baseline : Baseline | None
+        The known violations, which are not reported.
     _import_rules : CustomImportRules
         Custom import rules to be applied.
     _options : dict[str, list[str] | str | bool]
@@ -57,8 +78,12 @@ class CustomImportRulesChecker:
 
     _tree: ast.AST = field(default=None)
     _filename: str = field(default=None)
-    _lines: list[str] = field(default=None)
+    _lines: list[str] | None = field(default=None)
     _visitor: CustomImportRulesVisitor = field(default=None)
+    _module_name: str | None = field(default=None)
+    _source: SourceBuffer | None = field(default=None)
+    _node_kinds: NodeKind | None = field(default=None)
+    _baseline: Baseline | None = field(default=None)
 
     _nodes: list[ParsedNode] | None = None
     _identifiers: defaultdict[str, dict] | None = None
@@ -73,6 +98,12 @@ class CustomImportRulesChecker:
         Initialize the CustomImportRulesChecker by parsing the code and
         setting up the necessary attributes.
         """
+        if self._source is not None:
+            # Lines are looked up in the buffer, and only split when requested
+            if not self._tree:
+                self._tree = self._source.parse()
+            return
+
         if not self._lines and self._filename is not None:
             if self._filename in STDIN_IDENTIFIERS:
                 self._filename = "stdin"
@@ -87,6 +118,63 @@ class CustomImportRulesChecker:
         if not self._lines:
             self._lines = ast.unparse(self._tree).splitlines(keepends=True)
 
+    @classmethod
+    def from_rule_profile(
+        cls,
+        rule_profile: RuleProfile,
+        tree: ast.AST | None = None,
+        filename: str | None = None,
+        lines: list[str] | None = None,
+        module_name: str | None = None,
+        source: SourceBuffer | None = None,
+        node_kinds: NodeKind | None = None,
+        baseline: Baseline | None = None,
+    ) -> "CustomImportRulesChecker":
+        """
+        Create a checker that uses a compiled rule profile.
+
+        Parameters
+        ----------
+        rule_profile : RuleProfile
+            The rule profile shared across the files checked in a run.
+        tree : ast.AST | None
+            Abstract syntax tree representation of the code.
+        filename : str | None
+            The name of the file being checked.
+        lines : list[str] | None
+            List of code lines.
+        module_name : str | None
+            The module name of the file, if it cannot be resolved from the
+            filename.
+        source : SourceBuffer | None
+            The source of the file, read into a single buffer.
+        node_kinds : NodeKind | None
+            The kinds of nodes the visitor builds, by default the kinds the
+            rules of the profile need.
+        baseline : Baseline | None
+            The known violations, which are not reported.
+
+        Returns
+        -------
+        CustomImportRulesChecker
+        """
+        checker = cls(
+            tree=tree,  # type: ignore[arg-type]
+            filename=filename,  # type: ignore[arg-type]
+            lines=lines,  # type: ignore[arg-type]
+            module_name=module_name,
+            source=source,
+            node_kinds=node_kinds,
+            baseline=baseline,
+        )
+        checker._options = dict(rule_profile.options)
+        return checker
+
+    @property
+    def rule_profile(self) -> RuleProfile | None:
+        """Return the compiled rule profile, if the checker was given one."""
+        return self.options.get("rule_profile")
+
     @property
     def tree(self) -> ast.AST:
         """
@@ -104,7 +192,6 @@ class CustomImportRulesChecker:
         ast.AST
             The Abstract Syntax Tree of the code.
         """
-        logger.debug(f"Tree: {self._tree}")
         return self._tree
 
     @property
@@ -125,7 +212,6 @@ class CustomImportRulesChecker:
         """
         if self._filename in STDIN_IDENTIFIERS:
             self._filename = "stdin"
-        logger.debug(f"Filename: {self._filename}")
         assert self._filename is not None
         return self._filename
 
@@ -145,9 +231,33 @@ class CustomImportRulesChecker:
         list[str]
             The lines of code in the file being checked.
         """
-        logger.debug(f"Lines: {self._lines}")
+        if self._lines is None and self._source is not None:
+            self._lines = self._source.lines
+        assert self._lines is not None
         return self._lines
 
+    @property
+    def source(self) -> SourceBuffer | None:
+        """Return the source buffer, if the checker was given one."""
+        return self._source
+
+    def line(self, lineno: int) -> str:
+        """
+        Return a single line of code, without splitting the source buffer into lines.
+
+        Parameters
+        ----------
+        lineno : int
+            The line number (1-based).
+
+        Returns
+        -------
+        str
+        """
+        if self._lines is None and self._source is not None:
+            return self._source.line(lineno)
+        return self.lines[lineno - 1]
+
     @property
     def nodes(self) -> list[ParsedNode]:
         """
@@ -163,11 +273,8 @@ class CustomImportRulesChecker:
         list[ParsedNode]
             The list of parsed nodes found in the code.
         """
-        # logger.info(f"Nodes: {self._nodes}")
-        logger.debug(f"Options: {self._options}")
         if self._nodes is None:
             self._nodes = self.visitor.nodes
-        # logger.info(f"Nodes after setting visitor: {self._nodes}")
         return self._nodes
 
     @property
@@ -185,12 +292,17 @@ class CustomImportRulesChecker:
         CustomImportRulesVisitor
             The visitor instance used for traversing and analyzing the AST.
         """
-        # logger.info(f"Options: {self._options}")
-        # logger.info(f"Visitor: {self._visitor}")
         if self._visitor is None:
+            rule_profile = self.rule_profile
+            node_kinds = self._node_kinds
+            if node_kinds is None:
+                node_kinds = rule_profile.node_kinds if rule_profile else ALL_NODE_KINDS
             self._visitor = CustomImportRulesVisitor(
                 base_packages=self.options.get("base_packages", []),
                 filename=self.filename,
+                module_name=self._module_name,
+                rule_profile=rule_profile,
+                node_kinds=node_kinds,
             )
             self._visitor.visit(self.tree)
         return self._visitor
@@ -251,7 +363,10 @@ class CustomImportRulesChecker:
         defaultdict[str, dict[Any, Any]] | None
             The dictionary of restricted identifiers found in the code.
         """
-        logger.debug(f"file_packages: {self.visitor.file_packages}")
+        if self._restricted_identifiers is None and self.rule_profile is not None:
+            self._restricted_identifiers = self.rule_profile.restricted_identifiers(
+                self.visitor.file_packages
+            )
         if self._restricted_identifiers is None:
             self._restricted_identifiers = get_restricted_identifiers(
                 base_packages=self.options.get("base_packages", []),
@@ -259,8 +374,6 @@ class CustomImportRulesChecker:
                 custom_restrictions=self.options.get("custom_restrictions", defaultdict(list)),
                 file_packages=self.visitor.file_packages,
             )
-        logger.debug(f"Restricted Identifiers: {self._restricted_identifiers}")
-        logger.debug(f"Restricted Identifiers Keys: {self._restricted_identifiers.keys()}")
         return self._restricted_identifiers
 
     @property
@@ -291,10 +404,38 @@ class CustomImportRulesChecker:
         test_env = self.options.get("test_env", True)
         if not test_env:
             raise ValueError("Cannot update options in a non-test environment.")
-        logger.debug(f"Updated Options: {updated_options}")
+        logger.debug("Updated Options: %s", updated_options)
+        # the compiled rule profile no longer matches the updated options
+        self._options.pop("rule_profile", None)
         for key, value in updated_options.items():
             self._options[key] = value
 
+    @property
+    def has_applicable_rules(self) -> bool:
+        """
+        Return whether any rule of the rule profile applies to the file.
+
+        Applicability is computed from the module name of the file, without
+        visiting the tree, so files without applicable rules are not visited.
+        Checkers without a compiled rule profile check every file.
+
+        Returns
+        -------
+        bool
+        """
+        rule_profile = self.rule_profile
+        if rule_profile is None or rule_profile.project_level_restrictions:
+            return True
+        if self._module_name is not None:
+            module_name = self._module_name
+        elif self._visitor is not None:
+            module_name = self._visitor.file_identifier
+        elif self.filename not in STDIN_IDENTIFIERS:
+            module_name = rule_profile.module_name(self.filename)
+        else:
+            module_name = None
+        return rule_profile.has_applicable_rules(module_name)
+
     @property
     def import_rules(self) -> CustomImportRules:
         """
@@ -324,8 +465,13 @@ class CustomImportRulesChecker:
             file_identifier=visitor.file_identifier,
             file_root_package_name=visitor.file_root_package_name,
             file_packages=visitor.file_packages,
+            layer_ranks=self.rule_profile.layer_ranks if self.rule_profile else None,
+            standard_restrictions=(
+                self.rule_profile.standard_restrictions if self.rule_profile else None
+            ),
+            file_rule_index=self.rule_profile.file_rule_index if self.rule_profile else None,
+            codes_to_check=self.rule_profile.active_codes if self.rule_profile else ALL_CODES,
         )
-        logger.debug(f"Restricted Identifiers: {self.restricted_identifiers}")
         return self._import_rules
 
     def check_custom_import_rules(self) -> Generator[ErrorMessage, None, None]:
@@ -337,12 +483,49 @@ class CustomImportRulesChecker:
         Yields
         ------
         ErrorMessage
+
+        Notes
+        -----
+        When the trace is enabled (see ``utils.trace_utils``), a "file"
+        event is emitted once the file is checked. Nothing is computed for
+        the trace otherwise.
         """
-        import_rules = self.import_rules
+        if not trace_enabled():
+            yield from map(self.error, self._check_custom_import_rules())
+            return
+
+        start = time.perf_counter()
+        errors = []
+        for error in self._check_custom_import_rules():
+            errors.append(error.code)
+            yield self.error(error)
+        trace_event(
+            "file",
+            filename=self.filename,
+            module=self._visitor.file_identifier if self._visitor else self._module_name,
+            applicable=self.has_applicable_rules,
+            imports=sum(isinstance(node, IMPORT_NODE_TYPES) for node in self._nodes or ()),
+            errors=errors,
+            seconds=round(time.perf_counter() - start, 6),
+        )
+
+    def _check_custom_import_rules(self) -> Generator[ErrorMessage, None, None]:
+        """Check the code against the custom import rules, skipping ignored errors."""
+        if not self.has_applicable_rules:
+            return
+
+        baseline = self._baseline
+        if not baseline:
+            for error in self.import_rules.check_import_rules():
+                if not self.error_is_ignored(error):
+                    yield error
+            return
 
-        for error in import_rules.check_import_rules():
-            if not self.error_is_ignored(error):
-                yield self.error(error)
+        # known violations are dropped before their messages are formatted
+        module = self.visitor.file_identifier or self.filename
+        for error in self.import_rules.check_import_rules():
+            if not baseline.contains(module, error) and not self.error_is_ignored(error):
+                yield error
 
     @staticmethod
     def error(error: ErrorMessage) -> ErrorMessage:
@@ -362,7 +545,7 @@ class CustomImportRulesChecker:
         -------
         bool
         """
-        noqa_match = NOQA_INLINE_REGEXP.search(self.lines[error.lineno - 1])
+        noqa_match = NOQA_INLINE_REGEXP.search(self.line(error.lineno))
 
         if noqa_match is None:
             return False
@@ -0,0 +1,174 @@
+""" Transitive restricted package and import restriction checks. """
+
+from __future__ import annotations
+
+from attrs import define
+
+from flake8_custom_import_rules.codes.error_codes import ErrorCode
+from flake8_custom_import_rules.core.error_messages import TRANSITIVE_RESTRICTION_EXPLANATION
+from flake8_custom_import_rules.core.error_messages import ErrorMessage
+from flake8_custom_import_rules.core.import_graph import ImportGraph
+from flake8_custom_import_rules.core.import_graph import Location
+from flake8_custom_import_rules.core.rule_profile import RuleProfile
+from flake8_custom_import_rules.utils.node_utils import get_package_names
+
+# The codes of the restrictions reached through other modules
+TRANSITIVE_CODES = frozenset({ErrorCode.CIR108.name, ErrorCode.CIR109.name})
+
+
+@define(slots=True, frozen=True)
+class TransitiveViolation:
+    """A restricted import reached through other first-party modules.
+
+    Attributes
+    ----------
+    module : str
+        The module the restriction applies to.
+    identifier : str
+        The restricted package or module.
+    path : tuple[str, ...]
+        The shortest import path from the module to the restricted import.
+    location : Location
+        The location of the first import of the path, in the module.
+    error_code : ErrorCode
+        CIR108 for restricted packages, CIR109 for custom restrictions.
+    filename : str | None
+        The file of the module, if known.
+    """
+
+    module: str
+    identifier: str
+    path: tuple[str, ...]
+    location: Location
+    error_code: ErrorCode
+    filename: str | None = None
+
+    @property
+    def error(self) -> ErrorMessage:
+        """Return the error reported at the first import of the path."""
+        lineno, col_offset = self.location
+        return ErrorMessage(
+            lineno=lineno,
+            col_offset=col_offset,
+            code=self.error_code.name,
+            explanation=TRANSITIVE_RESTRICTION_EXPLANATION,
+            explanation_args=(self.identifier, str(self), self.module),
+            identifier=self.identifier,
+        )
+
+    def __str__(self) -> str:
+        """Return the import path of the violation."""
+        return " -> ".join(self.path)
+
+
+def imports_identifier(graph: ImportGraph, module: str, identifier: str) -> bool:
+    """
+    Return whether a module imports an identifier (or any identifier under it) directly.
+
+    Direct imports are already reported by the restricted package and import
+    restriction checks of the module, so they are not reported again.
+
+    Parameters
+    ----------
+    graph : ImportGraph
+        The project import graph.
+    module : str
+        The module name.
+    identifier : str
+        The restricted package or module.
+
+    Returns
+    -------
+    bool
+    """
+    return bool(graph.importer_bits(identifier) & graph.module_bit(module))
+
+
+def check_module_restrictions(
+    graph: ImportGraph, rule_profile: RuleProfile, module: str
+) -> list[TransitiveViolation]:
+    """
+    Find the restricted imports a module reaches through other modules.
+
+    Restricted project packages are matched against the modules of the graph.
+    Restricted packages outside of the graph (e.g., third party packages)
+    are matched against the imports of the modules the module can reach.
+
+    Parameters
+    ----------
+    graph : ImportGraph
+        The project import graph.
+    rule_profile : RuleProfile
+        The compiled rule profile.
+    module : str
+        The module name.
+
+    Returns
+    -------
+    list[TransitiveViolation]
+        One violation per restricted identifier, with its shortest path.
+    """
+    restricted_identifiers = rule_profile.restricted_identifiers(get_package_names(module))
+    if not restricted_identifiers:
+        return []
+
+    reachable = graph.reachable(module)
+    violations = []
+    for identifier in sorted(restricted_identifiers):
+        restriction = restricted_identifiers[identifier]
+        if restriction.get("restricted_package") is True:
+            error_code = ErrorCode.CIR108
+        elif restriction.get("import_restriction") is True:
+            error_code = ErrorCode.CIR109
+        else:
+            continue
+
+        project_targets = graph.package_bits(identifier)
+        targets = project_targets or graph.importer_bits(identifier)
+        if not reachable & targets or imports_identifier(graph, module, identifier):
+            continue
+        path = graph.shortest_path(module, targets)
+        if path is None:
+            continue
+        if not project_targets:
+            path.append(identifier)
+        violations.append(
+            TransitiveViolation(
+                module=module,
+                identifier=identifier,
+                path=tuple(path),
+                location=graph.successors(module)[path[1]],
+                error_code=error_code,
+                filename=graph.filenames.get(module),
+            )
+        )
+    return violations
+
+
+def check_transitive_restrictions(
+    graph: ImportGraph, rule_profile: RuleProfile
+) -> list[TransitiveViolation]:
+    """
+    Find the restricted imports reached through other modules of the graph.
+
+    Each module is checked with a bitwise AND of the modules it can reach and
+    the modules of its restricted packages, so only modules that do reach a
+    restricted package look for the import path to report.
+
+    Parameters
+    ----------
+    graph : ImportGraph
+        The project import graph.
+    rule_profile : RuleProfile
+        The compiled rule profile.
+
+    Returns
+    -------
+    list[TransitiveViolation]
+        The violations, sorted by module.
+    """
+    return [
+        violation
+        for module in sorted(graph.modules)
+        for violation in check_module_restrictions(graph, rule_profile, module)
+    ]
@@ -1,12 +1,17 @@
 """The default settings for the flake8_custom_import_rules plugin."""
 
+import hashlib
+import json
 import optparse
 from collections import defaultdict
+from collections.abc import Mapping
+from types import MappingProxyType
 from typing import Any
 
 from attrs import asdict
 from attrs import define
 from attrs import field
+from attrs import fields
 from flake8.options.manager import OptionManager
 
 POTENTIAL_DYNAMIC_IMPORTS = {
@@ -68,6 +73,11 @@ STANDARD_PROJECT_LEVEL_RESTRICTION_KEYS = [
     "RESTRICT_CONFTEST_IMPORTS",
 ]
 
+# The rules checked on the whole import graph (by the merge and reduce commands)
+GRAPH_RULE_KEYS = [
+    "TRANSITIVE_RESTRICTIONS",
+]
+
 CUSTOM_IMPORT_RULES = [
     "BASE_PACKAGES",
     "CUSTOM_RESTRICTIONS",
@@ -78,6 +88,7 @@ CUSTOM_IMPORT_RULES = [
     "FIRST_PARTY_ONLY",
     "THIRD_PARTY_ONLY",
     "STANDALONE_MODULES",
+    "LAYERS",
 ]
 
 
@@ -88,7 +99,8 @@ def convert_to_list(value: str | list[str] | None) -> list:
     Parameters
     ----------
     value : str | list[str] | None
-        The value to convert to a list.
+        The value to convert to a list. Tuples (e.g., the values of frozen
+        settings) are converted like lists.
 
     Returns
     -------
@@ -99,17 +111,20 @@ def convert_to_list(value: str | list[str] | None) -> list:
         return []
     if isinstance(value, str):
         return [item.strip() for item in value.split(",") if item != ""]
-    return convert_to_list(",".join(value)) if isinstance(value, list) else []
+    return convert_to_list(",".join(value)) if isinstance(value, (list, tuple)) else []
 
 
-def convert_to_dict(value: str | list[str] | None, delimiter: str | None = ":") -> defaultdict:
+def convert_to_dict(
+    value: str | list[str] | Mapping[str, list[str]] | None, delimiter: str | None = ":"
+) -> defaultdict:
     """
     Convert a string to a dict and strip leading and trailing whitespace.
 
     Parameters
     ----------
-    value : str | list[str] | None
-        The value to convert to a dict.
+    value : str | list[str] | Mapping[str, list[str]] | None
+        The value to convert to a dict. Mappings (e.g., the restrictions of
+        other settings) are copied.
     delimiter : str, default=":"
         The delimiter to use to split the string.
 
@@ -120,6 +135,10 @@ def convert_to_dict(value: str | list[str] | None, delimiter: str | None = ":")
     """
     if value is None:
         return defaultdict(list)
+    elif isinstance(value, Mapping):
+        return defaultdict(
+            list, {module.strip(): convert_to_list(list(value[module])) for module in value}
+        )
     elif isinstance(value, str):
         value = [value]
 
@@ -176,6 +195,10 @@ class Settings:
     FIRST_PARTY_ONLY: list = field(factory=list, converter=convert_to_list)
     PROJECT_ONLY: list = field(factory=list, converter=convert_to_list)
     BASE_PACKAGE_ONLY: list = field(factory=list, converter=convert_to_list)
+    LAYERS: list = field(factory=list, converter=convert_to_list)
+
+    # Set Defaults for Graph Rules
+    TRANSITIVE_RESTRICTIONS: bool = False
 
     @property
     def dict(self) -> dict:
@@ -206,7 +229,7 @@ class Settings:
         list
             A list of option keys from the settings dictionary.
         """
-        return [key for key in self.dict.keys() if key.isupper()]
+        return list(OPTION_KEYS)
 
     def get_settings_value(self, key: str) -> Any:
         """
@@ -226,9 +249,150 @@ class Settings:
         Any
             The value of the setting.
         """
-        if not hasattr(self, key):
+        if key not in OPTION_KEYS:
             raise KeyError(f"Settings '{key}' does not exist.")
-        return self.dict[key]
+        return getattr(self, key)
+
+    def freeze(self) -> "FrozenSettings":
+        """
+        Return a frozen copy of the settings.
+
+        Returns
+        -------
+        FrozenSettings
+            The frozen settings, which can be used as a cache key.
+        """
+        if isinstance(self, FrozenSettings):
+            return self
+        return FrozenSettings(**asdict(self))
+
+
+# The option keys are the fields of the settings, in definition order
+OPTION_KEYS: tuple[str, ...] = tuple(
+    attribute.name for attribute in fields(Settings) if attribute.name.isupper()
+)
+
+
+def get_content_hash(field_map: Mapping[str, Any]) -> str:
+    """
+    Get a hash of the settings values that is stable across processes and runs.
+
+    Parameters
+    ----------
+    field_map : Mapping[str, Any]
+        The settings values, by option key.
+
+    Returns
+    -------
+    str
+        The SHA-256 hex digest of the values, serialized as canonical JSON.
+    """
+    # read-only mappings are serialized like the dicts they view
+    content = json.dumps(dict(field_map), sort_keys=True, separators=(",", ":"), default=dict)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def freeze_value(value: Any) -> Any:
+    """Return a read-only copy of a settings value, with tuples for lists and read-only mappings."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze_value(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze_value(item) for item in value)
+    return value
+
+
+def thaw_value(value: Any) -> Any:
+    """Return a mutable copy of a frozen settings value, see ``freeze_value``."""
+    if isinstance(value, Mapping):
+        return {key: thaw_value(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw_value(item) for item in value]
+    return value
+
+
+@define(slots=True, frozen=True, hash=False)
+class FrozenSettings(Settings):
+    """
+    Frozen settings for the flake8_custom_import_rules plugin.
+
+    The values of the settings are frozen too: lists become tuples and the
+    custom restrictions a read-only mapping of tuples, so the settings
+    cannot change once they are hashed. The values are read through a
+    field map computed once, and the settings are hashed by their content,
+    so that the same settings give the same hash in every process and every
+    run. The hash can key the caches of compiled rules, results and
+    restrictions.
+
+    Attributes
+    ----------
+    field_map : Mapping[str, Any]
+        A read-only view of the settings values, by option key.
+    content_hash : str
+        The SHA-256 hex digest of the settings values.
+    """
+
+    _field_map: dict[str, Any] = field(init=False, eq=False, repr=False)
+    content_hash: str = field(init=False, eq=False, repr=False)
+
+    def __attrs_post_init__(self) -> None:
+        """Freeze the values, then compute the field map and the content hash."""
+        field_map = {key: freeze_value(getattr(self, key)) for key in OPTION_KEYS}
+        for key, value in field_map.items():
+            object.__setattr__(self, key, value)
+        object.__setattr__(self, "_field_map", field_map)
+        object.__setattr__(self, "content_hash", get_content_hash(field_map))
+
+    def __hash__(self) -> int:  # type: ignore[override]
+        """Return the hash of the settings content."""
+        return int(self.content_hash[:16], 16)
+
+    def __getstate__(self) -> dict:
+        """Get the settings values, since read-only mappings cannot be pickled."""
+        return self.dict
+
+    def __setstate__(self, state: dict) -> None:
+        """Freeze the unpickled settings values again."""
+        self.__init__(**state)  # type: ignore[misc]
+
+    @property
+    def field_map(self) -> Mapping[str, Any]:
+        """Return a read-only view of the settings values, by option key."""
+        return MappingProxyType(self._field_map)
+
+    @property
+    def dict(self) -> dict:
+        """
+        Return the settings as a dictionary.
+
+        Returns
+        -------
+        dict
+            A mutable copy of the settings, with lists and dicts.
+        """
+        return {key: thaw_value(value) for key, value in self._field_map.items()}
+
+    def get_settings_value(self, key: str) -> Any:
+        """
+        Get the value of a setting given its key.
+
+        Parameters
+        ----------
+        key : str
+            The key of the setting.
+
+        Raises
+        ------
+        KeyError: If the setting does not exist.
+
+        Returns
+        -------
+        Any
+            The value of the setting.
+        """
+        try:
+            return self._field_map[key]
+        except KeyError:
+            raise KeyError(f"Settings '{key}' does not exist.") from None
 
 
 DEFAULT_CHECKER_SETTINGS = Settings()
@@ -314,6 +478,15 @@ HELP_STRINGS = {
         "maintainability and scalability. "
         "Specify standalone-modules using a comma-separated list."
     ),
+    "layers": (
+        "This flag defines a layered architecture for your project. Layers "
+        "are listed from the highest layer to the lowest layer, and a "
+        "package or module can only import from its own layer or from lower "
+        "layers. For example, `app, services, domain, utils` prevents "
+        "`utils` from importing `domain`, `services` or `app`. Packages that "
+        "share a layer are separated by a `|` (e.g., `services|api`). "
+        "Specify layers using a comma-separated list."
+    ),
     # "top-level-only-imports": If set to True, only top-level imports are
     # permitted in the project. (default: True)
     # "restrict-relative-imports": If set to True, relative imports for the
@@ -352,6 +525,8 @@ ERROR_CODES = {
     "first-party-only": "CIR205 and CIR206",
     "third-party-only": "CIR501 and CIR502",
     "standalone-modules": "CIR301 to CIR304",
+    "layers": "CIR601 and CIR602",
+    "transitive-restrictions": "CIR108 and CIR109",
     "top-level-only-imports": "PIR101",
     "restrict-relative-imports": "PIR102",
     "restrict-local-scope-imports": "PIR103",
@@ -0,0 +1,329 @@
+""" Streaming exports of the import facts of a project, for analytics. """
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Iterable
+from collections.abc import Iterator
+from typing import Any
+from typing import BinaryIO
+from typing import TextIO
+
+from attrs import define
+from attrs import field
+
+from flake8_custom_import_rules.api import Source
+from flake8_custom_import_rules.api import check_files
+from flake8_custom_import_rules.core.import_facts import ImportFact
+from flake8_custom_import_rules.defaults import Settings
+
+# The columns of the exports, one row per import fact
+EXPORT_COLUMNS = (
+    "filename",
+    "module_name",
+    "module",
+    "name",
+    "level",
+    "lineno",
+    "col_offset",
+    "asname",
+    "scope",
+)
+# The dictionary-encoded string columns, the other columns are integers
+STRING_COLUMNS = frozenset({"filename", "module_name", "module", "name", "asname", "scope"})
+
+# The columnar format: a header, then chunks of rows until the end of the file
+COLUMNAR_MAGIC = b"IRFACTS\x00"
+COLUMNAR_VERSION = 1
+# magic, version, number of columns, then the length and the name of each column
+COLUMNAR_HEADER = struct.Struct("<8sHH")
+# number of rows, number of strings added to the dictionary by the chunk
+CHUNK_HEADER = struct.Struct("<II")
+STRING_LENGTH = struct.Struct("<I")
+# The code of missing strings (e.g., the name of straight imports)
+NULL_CODE = -1
+# The number of rows buffered before a chunk is written
+DEFAULT_CHUNK_SIZE = 65536
+
+
+def _int32_array(values: Iterable[int] = ()) -> array:
+    """Return a signed 32-bit integer array."""
+    column = array("i", values)
+    assert column.itemsize == 4, "the columnar format needs 32-bit integers"
+    return column
+
+
+def fact_rows(
+    filename: str, module_name: str | None, facts: Iterable[ImportFact]
+) -> Iterator[tuple[Any, ...]]:
+    """Return the import facts of a file as rows of the ``EXPORT_COLUMNS``."""
+    for fact in facts:
+        yield (filename, module_name, *fact.to_row())
+
+
+@define(slots=True)
+class ColumnarFactsWriter:
+    """Write import facts to a columnar binary file, one chunk of rows at a time.
+
+    The file starts with a header of the column names, followed by chunks
+    of up to ``chunk_size`` rows. Strings are dictionary-encoded as 32-bit
+    codes into a single dictionary shared by every string column, and each
+    chunk only holds the strings the earlier chunks did not add, so the
+    codes of every chunk can be concatenated. Only the current chunk and
+    the distinct strings are kept in memory. Every value is a little-endian
+    signed 32-bit integer (``NULL_CODE`` for missing strings), readable
+    with ``struct`` and ``array`` or ``numpy.frombuffer``; see
+    ``read_columnar_facts``.
+
+    Attributes
+    ----------
+    stream : BinaryIO
+        The stream the export is written to.
+    chunk_size : int
+        The number of rows of each chunk, by default ``DEFAULT_CHUNK_SIZE``.
+    rows : int
+        The number of rows written.
+    """
+
+    stream: BinaryIO
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+    rows: int = field(init=False, default=0)
+    _codes: dict[str, int] = field(init=False, factory=dict, repr=False)
+    _new_strings: list[str] = field(init=False, factory=list, repr=False)
+    _columns: list[array] = field(init=False, factory=list, repr=False)
+
+    def __attrs_post_init__(self) -> None:
+        """Write the header of the export."""
+        self.stream.write(
+            COLUMNAR_HEADER.pack(COLUMNAR_MAGIC, COLUMNAR_VERSION, len(EXPORT_COLUMNS))
+        )
+        for column in EXPORT_COLUMNS:
+            name = column.encode()
+            self.stream.write(bytes([len(name)]) + name)
+        self._columns = [_int32_array() for _ in EXPORT_COLUMNS]
+
+    def _encode(self, value: str | None) -> int:
+        """Return the dictionary code of a string."""
+        if value is None:
+            return NULL_CODE
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self._codes)
+            self._new_strings.append(value)
+        return code
+
+    def write(self, filename: str, module_name: str | None, facts: list[ImportFact]) -> None:
+        """
+        Write the import facts of a file, flushing each chunk once it is full.
+
+        Parameters
+        ----------
+        filename : str
+            The file the facts were extracted from.
+        module_name : str | None
+            The module name of the file.
+        facts : list[ImportFact]
+            The import facts of the file.
+        """
+        for row in fact_rows(filename, module_name, facts):
+            for column, name, value in zip(self._columns, EXPORT_COLUMNS, row):
+                column.append(self._encode(value) if name in STRING_COLUMNS else value)
+            if len(self._columns[0]) == self.chunk_size:
+                self._flush()
+
+    def _flush(self) -> None:
+        """Write the buffered rows as a chunk."""
+        rows = len(self._columns[0])
+        if not rows:
+            return
+        self.stream.write(CHUNK_HEADER.pack(rows, len(self._new_strings)))
+        for string in self._new_strings:
+            encoded = string.encode()
+            self.stream.write(STRING_LENGTH.pack(len(encoded)) + encoded)
+        for column in self._columns:
+            if sys.byteorder == "big":
+                column.byteswap()
+            self.stream.write(column.tobytes())
+        self.rows += rows
+        self._new_strings = []
+        self._columns = [_int32_array() for _ in EXPORT_COLUMNS]
+
+    def close(self) -> None:
+        """Write the rows of the last chunk."""
+        self._flush()
+
+
+@define(slots=True)
+class JsonLinesFactsWriter:
+    """Write import facts as JSON Lines, one object of the ``EXPORT_COLUMNS`` per row.
+
+    Attributes
+    ----------
+    stream : TextIO
+        The stream the export is written to.
+    rows : int
+        The number of rows written.
+    """
+
+    stream: TextIO
+    rows: int = field(init=False, default=0)
+
+    def write(self, filename: str, module_name: str | None, facts: list[ImportFact]) -> None:
+        """Write the import facts of a file, one line per fact."""
+        for row in fact_rows(filename, module_name, facts):
+            self.stream.write(f"{json.dumps(dict(zip(EXPORT_COLUMNS, row)))}\n")
+            self.rows += 1
+
+    def close(self) -> None:
+        """Nothing is buffered."""
+
+
+def export_import_facts(
+    paths_or_sources: Iterable[str | os.PathLike | Source],
+    writer: ColumnarFactsWriter | JsonLinesFactsWriter,
+    settings: Settings | None = None,
+) -> int:
+    """
+    Export the import facts of files, writing the facts of each file as soon as it is visited.
+
+    Parameters
+    ----------
+    paths_or_sources : Iterable[str | os.PathLike | Source]
+        Files, directories (expanded recursively to their ``.py`` files) or
+        in-memory sources.
+    writer : ColumnarFactsWriter | JsonLinesFactsWriter
+        The writer of the export.
+    settings : Settings | None
+        The checker settings, which resolve the module names of the files,
+        by default the default settings.
+
+    Returns
+    -------
+    int
+        The number of rows written.
+    """
+    for result in check_files(paths_or_sources, settings, collect_facts=True):
+        if result.facts:
+            writer.write(result.filename, result.module_name, result.facts)
+    writer.close()
+    return writer.rows
+
+
+@define(slots=True)
+class FactColumns:
+    """The columns of a columnar export of import facts.
+
+    Attributes
+    ----------
+    dictionary : list[str]
+        The strings of the export, indexed by their code.
+    columns : dict[str, array]
+        The 32-bit integer array of each column. String columns hold the
+        codes of their strings, or ``NULL_CODE``.
+    """
+
+    dictionary: list[str]
+    columns: dict[str, array]
+
+    def __len__(self) -> int:
+        """Return the number of rows."""
+        return len(self.columns[EXPORT_COLUMNS[0]])
+
+    def decode(self, column: str) -> list[str | None]:
+        """Return the strings of a dictionary-encoded column."""
+        dictionary = self.dictionary
+        return [dictionary[code] if code != NULL_CODE else None for code in self.columns[column]]
+
+    def rows(self) -> Iterator[dict[str, Any]]:
+        """Return the rows of the export, with the strings decoded."""
+        columns = [
+            self.decode(column) if column in STRING_COLUMNS else self.columns[column]
+            for column in EXPORT_COLUMNS
+        ]
+        for row in zip(*columns):
+            yield dict(zip(EXPORT_COLUMNS, row))
+
+    def to_numpy(self) -> dict[str, Any]:
+        """
+        Return the columns as NumPy arrays, without copying them.
+
+        Returns
+        -------
+        dict[str, numpy.ndarray]
+            The ``int32`` array of each column, and the ``dictionary`` as an
+            array of objects, so ``dictionary[codes]`` decodes a column.
+
+        Raises
+        ------
+        ImportError
+            If NumPy is not installed.
+        """
+        try:
+            import numpy
+        except ImportError as e:
+            raise ImportError("Reading the columns as NumPy arrays needs NumPy") from e
+
+        arrays = {
+            column: numpy.frombuffer(values, numpy.int32) for column, values in self.columns.items()
+        }
+        arrays["dictionary"] = numpy.array(self.dictionary, dtype=object)
+        return arrays
+
+
+def _read_exactly(stream: BinaryIO, size: int) -> bytes:
+    """Read a number of bytes, failing on a truncated export."""
+    data = stream.read(size)
+    if len(data) != size:
+        raise ValueError("The columnar export is truncated")
+    return data
+
+
+def read_columnar_facts(path: str | os.PathLike) -> FactColumns:
+    """
+    Read a columnar export of import facts.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        The export, written by ``ColumnarFactsWriter``.
+
+    Returns
+    -------
+    FactColumns
+
+    Raises
+    ------
+    ValueError
+        If the file is not a columnar export of this version, or is truncated.
+    """
+    with open(path, "rb") as stream:
+        magic, version, column_count = COLUMNAR_HEADER.unpack(
+            _read_exactly(stream, COLUMNAR_HEADER.size)
+        )
+        if magic != COLUMNAR_MAGIC or version != COLUMNAR_VERSION:
+            raise ValueError(f"{os.fspath(path)} is not a columnar export of this version")
+        names = []
+        for _ in range(column_count):
+            (length,) = _read_exactly(stream, 1)
+            names.append(_read_exactly(stream, length).decode())
+
+        dictionary: list[str] = []
+        columns = {name: _int32_array() for name in names}
+        while chunk_header := stream.read(CHUNK_HEADER.size):
+            if len(chunk_header) != CHUNK_HEADER.size:
+                raise ValueError("The columnar export is truncated")
+            rows, new_strings = CHUNK_HEADER.unpack(chunk_header)
+            for _ in range(new_strings):
+                (length,) = STRING_LENGTH.unpack(_read_exactly(stream, STRING_LENGTH.size))
+                dictionary.append(_read_exactly(stream, length).decode())
+            for name in names:
+                values = _int32_array()
+                values.frombytes(_read_exactly(stream, rows * values.itemsize))
+                if sys.byteorder == "big":
+                    values.byteswap()
+                columns[name].extend(values)
+    return FactColumns(dictionary, columns)
@@ -0,0 +1,135 @@
+""" Cache of the import facts of each file, keyed by the hash of its source. """
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+
+from attrs import define
+from attrs import field
+
+from flake8_custom_import_rules.core.import_facts import ImportFact
+
+logger = logging.getLogger(__name__)
+
+# The version of the cache format, caches of another version are discarded
+FACTS_CACHE_VERSION = 1
+# The default facts cache of the standalone CLI
+DEFAULT_FACTS_CACHE = ".import-rules-facts.json"
+
+
+@define(slots=True)
+class FactsCache:
+    """Import facts of the files of a project, cached between runs.
+
+    Facts are extracted with every node kind, whichever rules are enabled,
+    so they can be checked against any settings without parsing the file
+    again. Each entry is keyed by the filename and is only used while the
+    content hash of the file matches.
+
+    Attributes
+    ----------
+    path : str | None
+        The cache file, if the cache is persisted.
+    hits : int
+        The number of files whose facts were found in the cache.
+    misses : int
+        The number of files whose facts had to be extracted.
+    """
+
+    path: str | None = None
+    hits: int = 0
+    misses: int = 0
+
+    _files: dict[str, tuple[str, list[ImportFact]]] = field(factory=dict, repr=False)
+    _changed: bool = field(default=False, repr=False)
+
+    def __len__(self) -> int:
+        """Return the number of files cached."""
+        return len(self._files)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> FactsCache:
+        """
+        Load a facts cache, or create an empty one if the file does not exist.
+
+        Parameters
+        ----------
+        path : str | os.PathLike
+            The cache file.
+
+        Returns
+        -------
+        FactsCache
+        """
+        cache = cls(path=os.fspath(path))
+        try:
+            with open(path, encoding="utf-8") as stream:
+                data = json.load(stream)
+        except FileNotFoundError:
+            return cache
+        except (OSError, ValueError) as error:
+            logger.warning("Cannot read the facts cache %s: %s", path, error)
+            return cache
+        if data.get("version") != FACTS_CACHE_VERSION:
+            return cache
+        cache._files = {
+            filename: (content_hash, [ImportFact.from_row(row) for row in rows])
+            for filename, (content_hash, rows) in data["files"].items()
+        }
+        return cache
+
+    def get(self, filename: str, content_hash: str) -> list[ImportFact] | None:
+        """
+        Get the cached facts of a file.
+
+        Parameters
+        ----------
+        filename : str
+            The file.
+        content_hash : str
+            The content hash of the source of the file.
+
+        Returns
+        -------
+        list[ImportFact] | None
+            The facts, or None if the file is not cached or has changed.
+        """
+        cached = self._files.get(filename)
+        if cached is None or cached[0] != content_hash:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return cached[1]
+
+    def set(self, filename: str, content_hash: str, facts: list[ImportFact]) -> None:
+        """
+        Cache the facts of a file.
+
+        Parameters
+        ----------
+        filename : str
+            The file.
+        content_hash : str
+            The content hash of the source of the file.
+        facts : list[ImportFact]
+            The facts extracted from the source.
+        """
+        self._files[filename] = (content_hash, facts)
+        self._changed = True
+
+    def save(self) -> None:
+        """Write the cache file, if any file was added or changed."""
+        if self.path is None or not self._changed:
+            return
+        data = {
+            "version": FACTS_CACHE_VERSION,
+            "files": {
+                filename: (content_hash, [fact.to_row() for fact in facts])
+                for filename, (content_hash, facts) in self._files.items()
+            },
+        }
+        with open(self.path, "w", encoding="utf-8") as stream:
+            json.dump(data, stream, separators=(",", ":"))
+        self._changed = False
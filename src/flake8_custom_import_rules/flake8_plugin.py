@@ -3,26 +3,70 @@
 import ast
 import importlib.metadata
 import logging
+import multiprocessing
+import os
 from argparse import Namespace
 from collections.abc import Generator
 from typing import Any
 
 from flake8.options.manager import OptionManager
+from flake8.style_guide import Decision
+from flake8.style_guide import DecisionEngine
 
+from flake8_custom_import_rules.config import ConfigResolver
+from flake8_custom_import_rules.core.baseline import Baseline
 from flake8_custom_import_rules.core.error_messages import ErrorMessage
+from flake8_custom_import_rules.core.import_facts import import_facts_from_visitor
+from flake8_custom_import_rules.core.import_rules import ALL_CODES
+from flake8_custom_import_rules.core.nodes import ALL_NODE_KINDS
+from flake8_custom_import_rules.core.rule_profile import RuleProfile
 from flake8_custom_import_rules.core.rules_checker import CustomImportRulesChecker
 from flake8_custom_import_rules.defaults import CUSTOM_IMPORT_RULES
 from flake8_custom_import_rules.defaults import DEFAULT_CHECKER_SETTINGS
+from flake8_custom_import_rules.defaults import GRAPH_RULE_KEYS
 from flake8_custom_import_rules.defaults import STANDARD_PROJECT_LEVEL_RESTRICTION_KEYS
 from flake8_custom_import_rules.defaults import Settings
 from flake8_custom_import_rules.defaults import register_opt
 from flake8_custom_import_rules.defaults import register_options
+from flake8_custom_import_rules.spool import FactsSpool
+from flake8_custom_import_rules.spool import clear_spools
 from flake8_custom_import_rules.utils.option_utils import check_conflicts
 from flake8_custom_import_rules.utils.option_utils import get_bool_value
 
 logger = logging.getLogger(__name__)
 
 
+def get_active_codes(parse_options: Namespace) -> frozenset[str]:
+    """
+    Get the error codes flake8 reports, from its select and ignore options.
+
+    The codes are decided like flake8 decides on the errors it reports
+    (``--select``, ``--extend-select``, ``--ignore`` and ``--extend-ignore``,
+    with the longest matching prefix winning), so the checks of the other
+    codes can be left out instead of being computed and discarded.
+
+    Parameters
+    ----------
+    parse_options : Namespace
+        The options parsed by flake8.
+
+    Returns
+    -------
+    frozenset[str]
+        The active error codes. Every error code is active if the options do
+        not select any code (e.g., options not parsed by flake8).
+    """
+    try:
+        decision_engine = DecisionEngine(parse_options)
+    except AttributeError:
+        return ALL_CODES
+    if not decision_engine.selected and not decision_engine.selected_explicitly:
+        return ALL_CODES
+    return frozenset(
+        code for code in ALL_CODES if decision_engine.decision_for(code) is Decision.Selected
+    )
+
+
 class Plugin(CustomImportRulesChecker):
     """flake8 linter for flake8-custom-import-rules.
 
@@ -48,9 +92,17 @@ class Plugin(CustomImportRulesChecker):
     ) -> None:
         """Initialize flake8-custom-import-rules."""
         super().__init__(tree=tree, filename=filename, lines=lines)
-        logger.info(f"filename: {filename}")
-        logger.debug(f"lines: {lines}")
-        logger.debug(f"tree: {tree}")
+        self._baseline = self._options.get("baseline")  # type: ignore[assignment]
+        self._facts_spool = self._options.get("facts_spool")
+        if self._facts_spool is not None:
+            # the spooled facts hold every import, whichever rules are enabled
+            self._node_kinds = ALL_NODE_KINDS
+        config_resolver = self._options.get("config_resolver")
+        if isinstance(config_resolver, ConfigResolver) and self._filename != "stdin":
+            # files below a nested configuration share the profile of its directory
+            rule_profile = config_resolver.profile_for(self.filename)
+            if rule_profile is not self.rule_profile:
+                self._options = rule_profile.options
 
     @classmethod
     def add_options(cls, option_manager: OptionManager) -> None:
@@ -99,6 +151,56 @@ class Plugin(CustomImportRulesChecker):
             option_manager, STANDARD_PROJECT_LEVEL_RESTRICTION_KEYS, is_restriction=True
         )
 
+        # Rules checked on the whole import graph
+        register_opt(
+            option_manager,
+            "--transitive-restrictions",
+            default=DEFAULT_CHECKER_SETTINGS.TRANSITIVE_RESTRICTIONS,
+            action="store",
+            type=str,
+            help=(
+                "This option enforces the restricted packages and custom restrictions of "
+                "each module on the modules it imports, directly or indirectly, when the "
+                "import graph is checked by the merge and reduce commands. If violated, leads "
+                "to error codes CIR108 and CIR109. "
+                f"(default: {DEFAULT_CHECKER_SETTINGS.TRANSITIVE_RESTRICTIONS})"
+            ),
+            parse_from_config=True,
+            comma_separated_list=False,
+            normalize_paths=False,
+        )
+
+        register_opt(
+            option_manager,
+            "--import-rules-baseline",
+            default=None,
+            action="store",
+            type=str,
+            help=(
+                "A baseline file of known import rule violations, which are not "
+                "reported. Write it with `python -m flake8_custom_import_rules baseline`."
+            ),
+            parse_from_config=True,
+            comma_separated_list=False,
+            normalize_paths=True,
+        )
+
+        register_opt(
+            option_manager,
+            "--import-facts-spool",
+            default=None,
+            action="store",
+            type=str,
+            help=(
+                "A directory each worker appends the import facts of the files it checks to. "
+                "Build the import graph from the spool with "
+                "`python -m flake8_custom_import_rules reduce`."
+            ),
+            parse_from_config=True,
+            comma_separated_list=False,
+            normalize_paths=True,
+        )
+
     @classmethod
     def parse_options(
         cls, option_manager: OptionManager, parse_options: Namespace, *args: Any
@@ -115,9 +217,9 @@ class Plugin(CustomImportRulesChecker):
         args : Any
             Additional arguments.
         """
-        logger.debug(f"Option Manager: {option_manager}")
-        logger.debug(f"Options: {parse_options}")
-        logger.debug(f"Args: {args}")
+        logger.debug("Option Manager: %s", option_manager)
+        logger.debug("Options: %s", parse_options)
+        logger.debug("Args: %s", args)
 
         # Parse options for CustomImportRulesChecker
         options: dict = {}
@@ -125,7 +227,7 @@ class Plugin(CustomImportRulesChecker):
         # Update options with the options set in the config or on the command line
         for option_key in DEFAULT_CHECKER_SETTINGS.get_option_keys():
             option_value = getattr(parse_options, option_key.lower())
-            if option_key in STANDARD_PROJECT_LEVEL_RESTRICTION_KEYS:
+            if option_key in STANDARD_PROJECT_LEVEL_RESTRICTION_KEYS + GRAPH_RULE_KEYS:
                 option_value = get_bool_value(option_value)
             if option_value is not None:
                 options[option_key] = option_value
@@ -136,15 +238,35 @@ class Plugin(CustomImportRulesChecker):
         # check for potential setting conflicts
         check_conflicts(checker_settings.dict)
 
-        parsed_options: dict = {
-            "restricted_packages": checker_settings.RESTRICTED_PACKAGES,
-            "custom_restrictions": checker_settings.CUSTOM_RESTRICTIONS,
-            "base_packages": checker_settings.BASE_PACKAGES,
-            "checker_settings": checker_settings,
-            "test_env": False,
-        }
+        # the checks of the codes flake8 would discard are not compiled
+        active_codes = get_active_codes(parse_options)
+        logger.debug("Active Codes: %s", sorted(active_codes))
 
-        logger.debug(f"Parsed Options: {parsed_options}")
+        # compile the rules once, before flake8 forks its workers, so that
+        # every worker shares the compiled profile instead of compiling it per file
+        rule_profile = RuleProfile.from_settings(checker_settings, active_codes)
+        parsed_options = dict(rule_profile.options)
+
+        # nested configurations below the working directory override the
+        # options for the files beneath them
+        parsed_options["config_resolver"] = ConfigResolver(rule_profile)
+
+        # the known violations are loaded once, into a hash set shared by every file
+        baseline_path = getattr(parse_options, "import_rules_baseline", None)
+        if baseline_path:
+            parsed_options["baseline"] = Baseline.load(baseline_path)
+
+        # the workers spool the import facts of their files for the graph rules
+        spool_directory = getattr(parse_options, "import_facts_spool", None)
+        if spool_directory:
+            os.makedirs(spool_directory, exist_ok=True)
+            # the spools of the previous runs are cleared once, by the main process
+            # (workers started with spawn parse the options again)
+            if multiprocessing.parent_process() is None:
+                clear_spools(spool_directory)
+            parsed_options["facts_spool"] = FactsSpool(spool_directory)
+
+        logger.debug("Parsed Options: %s", parsed_options)
         cls._options = parsed_options
 
     def error(self, error: ErrorMessage) -> tuple:
@@ -170,5 +292,19 @@ class Plugin(CustomImportRulesChecker):
     def run(self) -> Generator[tuple[int, int, str, type[Any]], None, None]:
         """Run flake8-custom-import-rules."""
         # Run CustomImportRulesChecker
-        logger.debug(f"Run Options: {self.options}")
         yield from self.check_custom_import_rules()
+        if self._facts_spool is not None:
+            self.spool_import_facts(self._facts_spool)
+
+    def spool_import_facts(self, facts_spool: FactsSpool) -> None:
+        """
+        Append the import facts of the file to the spool of the worker.
+
+        Parameters
+        ----------
+        facts_spool : FactsSpool
+            The spool of the run.
+        """
+        module_name = self.visitor.file_identifier
+        if module_name is not None:
+            facts_spool.append(self.filename, module_name, import_facts_from_visitor(self.visitor))
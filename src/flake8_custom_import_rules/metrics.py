@@ -0,0 +1,217 @@
+""" Prometheus text exposition of the statistics of a run. """
+
+from __future__ import annotations
+
+import os
+import re
+import sys
+import time
+from collections.abc import Iterable
+from collections.abc import Mapping
+
+from flake8_custom_import_rules.codes.error_codes import ErrorCode
+from flake8_custom_import_rules.stats import RunStats
+
+METRIC_PREFIX = "custom_import_rules"
+LABEL_NAME_RE = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
+
+# A sample of a metric: its labels and its value
+Sample = tuple[Mapping[str, str], int | float]
+
+
+def get_peak_rss_bytes() -> int | None:
+    """
+    Get the peak resident set size of the process.
+
+    Returns
+    -------
+    int | None
+        The peak resident set size in bytes, or None if the platform does
+        not report it (e.g., Windows).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak_rss if sys.platform == "darwin" else peak_rss * 1024
+
+
+def escape_label_value(value: str) -> str:
+    """Escape a label value for the text exposition format."""
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def check_labels(labels: Mapping[str, str]) -> None:
+    """
+    Check the names of the labels added to every sample.
+
+    Parameters
+    ----------
+    labels : Mapping[str, str]
+        The labels, by label name.
+
+    Raises
+    ------
+    ValueError
+        If a label name is not a valid Prometheus label name.
+    """
+    for name in labels:
+        if not LABEL_NAME_RE.match(name) or name.startswith("__"):
+            raise ValueError(f"Invalid Prometheus label name: {name!r}")
+
+
+def format_metric(
+    name: str,
+    help_text: str,
+    samples: Iterable[Sample],
+    labels: Mapping[str, str] | None = None,
+) -> str:
+    """
+    Format a gauge metric in the Prometheus text exposition format.
+
+    Parameters
+    ----------
+    name : str
+        The name of the metric, without the metric prefix.
+    help_text : str
+        The description of the metric.
+    samples : Iterable[Sample]
+        The labels and the value of each sample.
+    labels : Mapping[str, str] | None
+        The labels added to every sample.
+
+    Returns
+    -------
+    str
+    """
+    metric_name = f"{METRIC_PREFIX}_{name}"
+    lines = [f"# HELP {metric_name} {help_text}\n", f"# TYPE {metric_name} gauge\n"]
+    for sample_labels, value in samples:
+        all_labels = {**(labels or {}), **sample_labels}
+        label_text = ",".join(
+            f'{label}="{escape_label_value(label_value)}"'
+            for label, label_value in all_labels.items()
+        )
+        label_text = f"{{{label_text}}}" if label_text else ""
+        lines.append(f"{metric_name}{label_text} {value}\n")
+    return "".join(lines)
+
+
+def format_metrics(
+    stats: RunStats,
+    labels: Mapping[str, str] | None = None,
+    timestamp: float | None = None,
+) -> str:
+    """
+    Format the statistics of a run in the Prometheus text exposition format.
+
+    Every metric is a gauge describing the last run. The errors are reported
+    for every error code, including the codes without errors, so that the
+    series do not disappear from dashboards when a code is fixed.
+
+    Parameters
+    ----------
+    stats : RunStats
+        The statistics of the run.
+    labels : Mapping[str, str] | None
+        The labels added to every sample, e.g., the name of the repository.
+    timestamp : float | None
+        The time the run ended, by default the current time.
+
+    Returns
+    -------
+    str
+    """
+    labels = labels or {}
+    check_labels(labels)
+    phases = {
+        "read": stats.read_seconds,
+        "stall": stats.stall_seconds,
+        "parse": stats.parse_seconds,
+        "visit": stats.visit_seconds,
+        "check": stats.check_seconds,
+    }
+    metrics: list[tuple[str, str, list[Sample]]] = [
+        ("files_checked", "The number of files checked.", [({}, stats.files)]),
+        (
+            "imports_processed",
+            "The number of import statements and dynamic imports checked.",
+            [({}, stats.imports)],
+        ),
+        (
+            "errors",
+            "The number of errors reported, by error code.",
+            [
+                ({"code": error_code.code}, stats.errors_by_code.get(error_code.code, 0))
+                for error_code in ErrorCode
+            ],
+        ),
+        (
+            "phase_seconds",
+            "The time spent in each phase of checking files.",
+            [({"phase": phase}, seconds) for phase, seconds in phases.items()],
+        ),
+        (
+            "cache_hits",
+            "The number of lookups found in each cache of the rule profile.",
+            [({"cache": cache}, hits) for cache, hits in sorted(stats.cache_hits.items())],
+        ),
+        (
+            "cache_misses",
+            "The number of lookups computed and added to each cache of the rule profile.",
+            [({"cache": cache}, misses) for cache, misses in sorted(stats.cache_misses.items())],
+        ),
+        (
+            "fast_exits",
+            "The number of files skipped because no rule applies to them.",
+            [({}, stats.fast_exits)],
+        ),
+    ]
+    if (peak_rss_bytes := get_peak_rss_bytes()) is not None:
+        metrics.append(
+            ("peak_rss_bytes", "The peak resident set size of the process.", [({}, peak_rss_bytes)])
+        )
+    metrics.append(
+        (
+            "last_run_timestamp_seconds",
+            "The time the run ended, in seconds since the epoch.",
+            [({}, time.time() if timestamp is None else timestamp)],
+        )
+    )
+    return "".join(
+        format_metric(name, help_text, samples, labels) for name, help_text, samples in metrics
+    )
+
+
+def write_metrics(
+    stats: RunStats,
+    path: str | os.PathLike,
+    labels: Mapping[str, str] | None = None,
+) -> None:
+    """
+    Write the statistics of a run to a Prometheus textfile.
+
+    The file is written next to its final path and then renamed, so that a
+    node exporter textfile collector never reads a partially written file.
+    The collector only reads files with the ``.prom`` extension.
+
+    Parameters
+    ----------
+    stats : RunStats
+        The statistics of the run.
+    path : str | os.PathLike
+        The textfile to write.
+    labels : Mapping[str, str] | None
+        The labels added to every sample, e.g., the name of the repository.
+    """
+    content = format_metrics(stats, labels)
+    path = os.fspath(path)
+    temporary_path = os.path.join(
+        os.path.dirname(path), f".{os.path.basename(path)}.{os.getpid()}.tmp"
+    )
+    with open(temporary_path, "w", encoding="utf-8") as stream:
+        stream.write(content)
+    os.replace(temporary_path, path)
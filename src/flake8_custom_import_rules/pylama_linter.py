@@ -0,0 +1,135 @@
+""" pylama linter for flake8-custom-import-rules. """
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any
+
+from pylama.context import RunContext
+from pylama.lint import LinterV2
+
+from flake8_custom_import_rules.config import get_option_values
+from flake8_custom_import_rules.config import parse_option_values
+from flake8_custom_import_rules.core.rule_profile import RuleProfile
+from flake8_custom_import_rules.core.rules_checker import CustomImportRulesChecker
+from flake8_custom_import_rules.defaults import Settings
+from flake8_custom_import_rules.utils.option_utils import check_conflicts
+
+logger = logging.getLogger(__name__)
+
+LINTER_NAME = "custom_import_rules"
+
+# The option values of a section of the pylama configuration, as a cache key
+LinterParams = tuple[tuple[str, Any], ...]
+
+
+def get_linter_params(params: Mapping[str, Any]) -> LinterParams:
+    """
+    Get the import rules options from the params pylama read for the linter.
+
+    Option names are read like in the flake8 configuration, e.g.,
+    ``base-packages`` or ``base_packages``. The params of pylama itself
+    (e.g., ``select`` and ``ignore``) are left out.
+
+    Parameters
+    ----------
+    params : Mapping[str, Any]
+        The params of the linter, from ``RunContext.get_params``.
+
+    Returns
+    -------
+    LinterParams
+        The option values by option key, sorted and hashable.
+    """
+    option_values = get_option_values(params)
+    return tuple(
+        sorted(
+            (option_key, tuple(value) if isinstance(value, list) else value)
+            for option_key, value in option_values.items()
+        )
+    )
+
+
+def settings_from_params(linter_params: LinterParams) -> Settings:
+    """
+    Parse the import rules options of the pylama configuration into settings.
+
+    Values are parsed like the flake8 options: lists are separated by commas
+    or whitespace, and restrictions are read as booleans.
+
+    Parameters
+    ----------
+    linter_params : LinterParams
+        The option values by option key, from ``get_linter_params``.
+
+    Returns
+    -------
+    Settings
+    """
+    checker_settings = Settings(**parse_option_values(dict(linter_params)))
+    if conflicts := check_conflicts(checker_settings.dict):
+        logger.warning(" ".join(conflicts))
+    return checker_settings
+
+
+@lru_cache(maxsize=None)
+def get_rule_profile(linter_params: LinterParams) -> RuleProfile:
+    """
+    Get the rule profile compiled from the pylama configuration.
+
+    The profile is compiled once per process for each configuration, so
+    every file checked by the process, including the files checked by each
+    worker process in pylama's concurrent mode, shares the compiled rules
+    and the caches filled while checking files.
+
+    Parameters
+    ----------
+    linter_params : LinterParams
+        The option values by option key, from ``get_linter_params``.
+
+    Returns
+    -------
+    RuleProfile
+    """
+    return RuleProfile.from_settings(settings_from_params(linter_params))
+
+
+class Linter(LinterV2):
+    """pylama linter for flake8-custom-import-rules.
+
+    The import rules are configured in the ``[pylama:custom_import_rules]``
+    section of the pylama configuration (or ``[tool.pylama.linter.
+    custom_import_rules]`` in ``pyproject.toml``), with the same option
+    names as the flake8 plugin.
+
+    Attributes
+    ----------
+    name : str
+        The name of the linter.
+    """
+
+    name = LINTER_NAME
+
+    def run_check(self, context: RunContext) -> None:
+        """
+        Check the imports of a file.
+
+        Parameters
+        ----------
+        context : RunContext
+            The context of the file being checked.
+        """
+        rule_profile = get_rule_profile(get_linter_params(context.get_params(self.name)))
+        checker = CustomImportRulesChecker.from_rule_profile(
+            rule_profile, tree=context.ast, filename=context.filename, lines=context.lines
+        )
+        for error in checker.check_custom_import_rules():
+            context.push(
+                lnum=error.lineno,
+                col=error.col_offset + 1,
+                text=error.message,
+                number=error.code,
+                source=self.name,
+            )
@@ -0,0 +1,282 @@
+""" Streaming reporters for the results of the batch API and the CLI. """
+
+from __future__ import annotations
+
+import abc
+import importlib.metadata
+import json
+from collections.abc import Iterable
+from functools import lru_cache
+from types import TracebackType
+from typing import TextIO
+
+from attrs import define
+from attrs import field
+
+from flake8_custom_import_rules.api import FileResult
+from flake8_custom_import_rules.codes.error_codes import ErrorCode
+
+TOOL_NAME = "flake8-custom-import-rules"
+TOOL_URI = "https://github.com/RodrigoGonzalez/flake8-custom-import-rules"
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_VERSION = "2.1.0"
+
+
+@lru_cache(maxsize=None)
+def get_sarif_rules() -> tuple[list[dict], dict[str, int]]:
+    """
+    Get the SARIF rule metadata of every error code.
+
+    The metadata is computed once from ``ErrorCode``, so results only refer
+    to their rule by id and index instead of repeating its description.
+
+    Returns
+    -------
+    tuple[list[dict], dict[str, int]]
+        The SARIF rules, and the index of each rule by error code.
+    """
+    rules = [
+        {
+            "id": error_code.code,
+            "shortDescription": {"text": error_code.message},
+            "helpUri": f"{TOOL_URI}#rule-violation-codes",
+        }
+        for error_code in ErrorCode
+    ]
+    return rules, {rule["id"]: index for index, rule in enumerate(rules)}
+
+
+@define(slots=True)
+class Reporter(abc.ABC):
+    """Write the results of each file as soon as the file is checked.
+
+    Reporters only hold the result of the file being written, so the memory
+    used does not grow with the number of errors reported. Each format
+    implements ``_write_result``.
+
+    Attributes
+    ----------
+    stream : TextIO
+        The stream the report is written to.
+    files : int
+        The number of files reported.
+    errors : int
+        The number of errors reported.
+    syntax_errors : int
+        The number of files reported that could not be parsed.
+    """
+
+    stream: TextIO
+    files: int = 0
+    errors: int = 0
+    syntax_errors: int = 0
+
+    @property
+    def failed(self) -> bool:
+        """Return whether any error was reported, or any file could not be parsed."""
+        return bool(self.errors or self.syntax_errors)
+
+    def start(self) -> None:
+        """Write the start of the report."""
+
+    def report(self, result: FileResult) -> None:
+        """
+        Write the result of a file.
+
+        Parameters
+        ----------
+        result : FileResult
+            The result of the file.
+        """
+        self.files += 1
+        self.errors += len(result.errors)
+        self.syntax_errors += result.syntax_error is not None
+        self._write_result(result)
+
+    def finish(self) -> None:
+        """Write the end of the report."""
+        self.stream.flush()
+
+    @abc.abstractmethod
+    def _write_result(self, result: FileResult) -> None:
+        """Write the errors of a file."""
+
+    def __enter__(self) -> Reporter:
+        """Start the report."""
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Finish the report, so the output is valid even if checking stopped early."""
+        self.finish()
+
+
+@define(slots=True)
+class TextReporter(Reporter):
+    """Write one line per error, in the same format as flake8 (with 1-based columns)."""
+
+    def _write_result(self, result: FileResult) -> None:
+        """Write the errors of a file."""
+        if (syntax_error := result.syntax_error) is not None:
+            self.stream.write(
+                f"{result.filename}:{syntax_error.lineno or 1}:{syntax_error.offset or 1}: "
+                f"E999 {type(syntax_error).__name__}: {syntax_error.msg}\n"
+            )
+        self.stream.writelines(
+            f"{result.filename}:{error.lineno}:{error.col_offset + 1}: "
+            f"{error.code} {error.message}\n"
+            for error in result.errors
+        )
+
+
+@define(slots=True)
+class JsonLinesReporter(Reporter):
+    """Write one JSON object per error, and per file that cannot be parsed."""
+
+    def _write_result(self, result: FileResult) -> None:
+        """Write the errors of a file."""
+        if (syntax_error := result.syntax_error) is not None:
+            record = {
+                "filename": result.filename,
+                "module_name": result.module_name,
+                "line": syntax_error.lineno or 1,
+                "column": syntax_error.offset or 0,
+                "syntax_error": syntax_error.msg,
+            }
+            self.stream.write(f"{json.dumps(record)}\n")
+        self.stream.writelines(
+            f"{json.dumps(record)}\n"
+            for record in (
+                {
+                    "filename": result.filename,
+                    "module_name": result.module_name,
+                    "line": error.lineno,
+                    "column": error.col_offset,
+                    "code": error.code,
+                    "message": error.message,
+                }
+                for error in result.errors
+            )
+        )
+
+
+@define(slots=True)
+class SarifReporter(Reporter):
+    """Write a SARIF 2.1.0 log, with one result per error.
+
+    The rules are written once in the header, and the results are written
+    one at a time between the header and the footer. Files that cannot be
+    parsed are reported as tool execution notifications after the results.
+    """
+
+    _notifications: list[dict] = field(init=False, factory=list)
+    _separator: str = field(init=False, default="")
+
+    def start(self) -> None:
+        """Write the tool, the rules and the start of the results."""
+        rules, _ = get_sarif_rules()
+        driver = {
+            "name": TOOL_NAME,
+            "version": importlib.metadata.version(TOOL_NAME),
+            "informationUri": TOOL_URI,
+            "rules": rules,
+        }
+        header = json.dumps({"$schema": SARIF_SCHEMA, "version": SARIF_VERSION})
+        self.stream.write(f'{header[:-1]}, "runs": [{{"tool": {{"driver": {json.dumps(driver)}}}')
+        self.stream.write(', "results": [')
+
+    def finish(self) -> None:
+        """Write the end of the results and the execution notifications."""
+        invocation = {
+            "executionSuccessful": True,
+            "toolExecutionNotifications": self._notifications,
+        }
+        self.stream.write(f'\n], "invocations": [{json.dumps(invocation)}]}}]}}\n')
+        self.stream.flush()
+
+    def _write_result(self, result: FileResult) -> None:
+        """Write the errors of a file."""
+        if (syntax_error := result.syntax_error) is not None:
+            self._notifications.append(
+                {
+                    "level": "error",
+                    "message": {"text": f"{type(syntax_error).__name__}: {syntax_error.msg}"},
+                    "locations": [_sarif_location(result.filename, syntax_error.lineno or 1, 1)],
+                }
+            )
+        _, rule_index = get_sarif_rules()
+        for error in result.errors:
+            sarif_result = {
+                "ruleId": error.code,
+                "ruleIndex": rule_index[error.code],
+                "level": "error",
+                "message": {"text": error.message},
+                "locations": [_sarif_location(result.filename, error.lineno, error.col_offset + 1)],
+            }
+            self.stream.write(f"{self._separator}\n{json.dumps(sarif_result)}")
+            self._separator = ","
+
+
+def _sarif_location(filename: str, line: int, column: int) -> dict:
+    """Get the SARIF location of a line and (1-based) column of a file."""
+    return {
+        "physicalLocation": {
+            "artifactLocation": {"uri": filename},
+            "region": {"startLine": line, "startColumn": column},
+        }
+    }
+
+
+REPORTERS: dict[str, type[Reporter]] = {
+    "text": TextReporter,
+    "jsonl": JsonLinesReporter,
+    "sarif": SarifReporter,
+}
+
+
+def write_report(
+    results: Iterable[FileResult], stream: TextIO, output_format: str = "text"
+) -> Reporter:
+    """
+    Write the results to a stream as each file is checked.
+
+    Parameters
+    ----------
+    results : Iterable[FileResult]
+        The results, e.g., from ``check_files``.
+    stream : TextIO
+        The stream the report is written to.
+    output_format : str
+        The format of the report: "text", "jsonl" or "sarif".
+
+    Returns
+    -------
+    Reporter
+        The reporter, with the number of files and errors reported.
+
+    Examples
+    --------
+    >>> import sys
+    >>> from flake8_custom_import_rules.api import Source
+    >>> from flake8_custom_import_rules.api import check_files
+    >>> reporter = write_report(
+    ...     check_files([Source("from os import *")]), sys.stdout, "jsonl"
+    ... )  # doctest: +NORMALIZE_WHITESPACE
+    {"filename": "stdin", "module_name": null, "line": 1, "column": 0, "code": "PIR107",
+    "message": "Wildcard Imports are disabled for this project."}
+    >>> reporter.errors
+    1
+    """
+    try:
+        reporter_class = REPORTERS[output_format]
+    except KeyError as e:
+        raise ValueError(f"Unknown output format: {output_format}") from e
+    with reporter_class(stream) as reporter:
+        for result in results:
+            reporter.report(result)
+    return reporter
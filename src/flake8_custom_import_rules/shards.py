@@ -0,0 +1,366 @@
+""" Deterministic sharding of the files checked, with mergeable shard outputs. """
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import json
+import os
+from collections.abc import Iterable
+from collections.abc import Iterator
+from typing import Any
+from typing import TextIO
+
+from attrs import define
+
+from flake8_custom_import_rules.api import FileResult
+from flake8_custom_import_rules.api import Source
+from flake8_custom_import_rules.api import check_graph_rules
+from flake8_custom_import_rules.api import get_module_name
+from flake8_custom_import_rules.api import iter_python_files
+from flake8_custom_import_rules.core.baseline import Baseline
+from flake8_custom_import_rules.core.error_messages import ErrorMessage
+from flake8_custom_import_rules.core.import_graph import ImportGraph
+from flake8_custom_import_rules.core.import_graph import Location
+from flake8_custom_import_rules.core.import_graph import graph_imports_from_facts
+from flake8_custom_import_rules.core.rule_profile import RuleProfile
+from flake8_custom_import_rules.defaults import Settings
+
+# The version of the shard output format, outputs of another version cannot be merged
+SHARD_OUTPUT_VERSION = 1
+# The cost of checking a file besides its size (opening, hashing and visiting it), in bytes
+FILE_WEIGHT_OVERHEAD = 1024
+
+
+def parse_shard(shard: str) -> tuple[int, int]:
+    """
+    Parse a shard given as ``INDEX/COUNT``, e.g., ``2/4``.
+
+    Parameters
+    ----------
+    shard : str
+        The shard, with a 1-based index.
+
+    Returns
+    -------
+    tuple[int, int]
+        The index of the shard and the number of shards.
+
+    Raises
+    ------
+    ValueError
+        If the shard is not a valid ``INDEX/COUNT``.
+    """
+    index, separator, count = shard.partition("/")
+    try:
+        shard_index, shards = int(index), int(count)
+    except ValueError:
+        shard_index = shards = 0
+    if not separator or not 1 <= shard_index <= shards:
+        raise ValueError(f"Expected a shard as INDEX/COUNT, e.g., 1/4, got {shard!r}")
+    return shard_index, shards
+
+
+def stable_hash(name: str) -> int:
+    """Return a hash of a name that is the same in every process and on every machine."""
+    return int.from_bytes(hashlib.blake2b(name.encode(), digest_size=8).digest(), "big")
+
+
+def file_weight(path_or_source: str | Source) -> int:
+    """Return the cost of checking a file, from the size of its source."""
+    if isinstance(path_or_source, Source):
+        size = len(path_or_source.source)
+    else:
+        try:
+            size = os.path.getsize(path_or_source)
+        except OSError:
+            size = 0
+    return size + FILE_WEIGHT_OVERHEAD
+
+
+def partition_files(
+    paths_or_sources: Iterable[str | os.PathLike | Source],
+    shards: int,
+    rule_profile: RuleProfile,
+) -> list[list[str | Source]]:
+    """
+    Partition files into shards of balanced total size.
+
+    Files are assigned largest first to the shard with the smallest total
+    size so far, and files of the same size are ordered by a stable hash of
+    their module name. Every shard computes the same partition from the
+    same files, without coordinating, whatever the order the files are
+    given in.
+
+    Parameters
+    ----------
+    paths_or_sources : Iterable[str | os.PathLike | Source]
+        Files, directories (expanded recursively to their ``.py`` files) or
+        in-memory sources.
+    shards : int
+        The number of shards.
+    rule_profile : RuleProfile
+        The compiled rule profile, which resolves the module names.
+
+    Returns
+    -------
+    list[list[str | Source]]
+        The files of each shard, in the order they are given.
+    """
+    files = list(iter_python_files(paths_or_sources))
+    keys = []
+    for position, path_or_source in enumerate(files):
+        filename = path_or_source.filename if isinstance(path_or_source, Source) else path_or_source
+        module = get_module_name(rule_profile, path_or_source) or filename
+        keys.append((-file_weight(path_or_source), stable_hash(module), filename, position))
+
+    loads = [(0, shard) for shard in range(shards)]
+    positions: list[list[int]] = [[] for _ in range(shards)]
+    for negative_weight, _, _, position in sorted(keys):
+        load, shard = heapq.heappop(loads)
+        positions[shard].append(position)
+        heapq.heappush(loads, (load - negative_weight, shard))
+    return [[files[position] for position in sorted(shard)] for shard in positions]
+
+
+def shard_files(
+    paths_or_sources: Iterable[str | os.PathLike | Source],
+    shard: int,
+    shards: int,
+    settings: Settings | None = None,
+    rule_profile: RuleProfile | None = None,
+) -> list[str | Source]:
+    """
+    Get the files of a shard.
+
+    Parameters
+    ----------
+    paths_or_sources : Iterable[str | os.PathLike | Source]
+        Files, directories (expanded recursively to their ``.py`` files) or
+        in-memory sources.
+    shard : int
+        The 1-based index of the shard.
+    shards : int
+        The number of shards.
+    settings : Settings | None
+        The checker settings, by default the default settings. Ignored when
+        a rule profile is given.
+    rule_profile : RuleProfile | None
+        A compiled rule profile, e.g., from ``load_rule_profile``.
+
+    Returns
+    -------
+    list[str | Source]
+        The files of the shard, see ``partition_files``.
+    """
+    rule_profile = rule_profile or RuleProfile.from_settings(settings)
+    return partition_files(paths_or_sources, shards, rule_profile)[shard - 1]
+
+
+def _error_to_row(error: ErrorMessage) -> list:
+    """Return an error as a row of plain values."""
+    return [
+        error.lineno,
+        error.col_offset,
+        error.code,
+        error.explanation,
+        list(error.explanation_args),
+        error.identifier,
+    ]
+
+
+def _error_from_row(row: list) -> ErrorMessage:
+    """Return the error of a row returned by ``_error_to_row``."""
+    lineno, col_offset, code, explanation, explanation_args, identifier = row
+    return ErrorMessage(lineno, col_offset, code, explanation, tuple(explanation_args), identifier)
+
+
+@define(slots=True)
+class ShardWriter:
+    """Write the results of a shard and its import graph fragment as JSON Lines.
+
+    The first line identifies the shard. Each following line holds the
+    result of a file, with the first-party imports of the module (the
+    fragment of the import graph the shard contributes), so the outputs of
+    every shard can be merged into the results and the graph of the whole
+    project. Results are written as each file is checked.
+
+    Attributes
+    ----------
+    stream : TextIO
+        The stream the shard output is written to.
+    shard : int
+        The 1-based index of the shard.
+    shards : int
+        The number of shards.
+    """
+
+    stream: TextIO
+    shard: int
+    shards: int
+
+    def __attrs_post_init__(self) -> None:
+        """Write the header of the shard output."""
+        header = {"version": SHARD_OUTPUT_VERSION, "shard": self.shard, "shards": self.shards}
+        self.stream.write(f"{json.dumps(header)}\n")
+
+    def write(self, result: FileResult) -> FileResult:
+        """
+        Write the result of a file, collected with its import facts.
+
+        Parameters
+        ----------
+        result : FileResult
+            The result of the file.
+
+        Returns
+        -------
+        FileResult
+            The result, so the writer can be mapped over the results reported.
+        """
+        syntax_error = result.syntax_error
+        imports = (
+            graph_imports_from_facts(result.facts, result.module_name)
+            if result.facts is not None and result.module_name is not None
+            else None
+        )
+        record = {
+            "filename": result.filename,
+            "module_name": result.module_name,
+            "content_hash": result.content_hash,
+            "errors": [_error_to_row(error) for error in result.errors],
+            "syntax_error": (
+                [syntax_error.msg, syntax_error.lineno, syntax_error.offset]
+                if syntax_error is not None
+                else None
+            ),
+            "imports": imports,
+        }
+        self.stream.write(f"{json.dumps(record, separators=(',', ':'))}\n")
+        return result
+
+
+def read_shard_header(path: str | os.PathLike) -> dict[str, Any]:
+    """Read the header of a shard output."""
+    with open(path, encoding="utf-8") as stream:
+        return json.loads(stream.readline() or "{}")
+
+
+def read_shard_output(
+    path: str | os.PathLike,
+) -> Iterator[tuple[FileResult, dict[str, Location] | None]]:
+    """
+    Read the results of a shard output, one file at a time.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        The shard output.
+
+    Yields
+    ------
+    tuple[FileResult, dict[str, Location] | None]
+        The result of each file, and the first-party imports of its module.
+    """
+    with open(path, encoding="utf-8") as stream:
+        stream.readline()
+        for line in stream:
+            record = json.loads(line)
+            syntax_error = record["syntax_error"]
+            result = FileResult(
+                filename=record["filename"],
+                module_name=record["module_name"],
+                errors=[_error_from_row(row) for row in record["errors"]],
+                syntax_error=(
+                    SyntaxError(syntax_error[0], (record["filename"], *syntax_error[1:], None))
+                    if syntax_error is not None
+                    else None
+                ),
+                content_hash=record["content_hash"],
+            )
+            imports = record["imports"]
+            yield result, (
+                {identifier: tuple(location) for identifier, location in imports.items()}
+                if imports is not None
+                else None
+            )
+
+
+def check_shard_headers(paths: Iterable[str | os.PathLike]) -> None:
+    """
+    Check the shard outputs are every shard of the same run, once.
+
+    Parameters
+    ----------
+    paths : Iterable[str | os.PathLike]
+        The shard outputs.
+
+    Raises
+    ------
+    ValueError
+        If an output has another format version, the outputs have different
+        numbers of shards, or a shard is missing or given twice.
+    """
+    shards: set[int] = set()
+    counts: set[int] = set()
+    for path in paths:
+        header = read_shard_header(path)
+        if header.get("version") != SHARD_OUTPUT_VERSION:
+            raise ValueError(f"{os.fspath(path)} is not a shard output of this version")
+        if header["shard"] in shards:
+            raise ValueError(f"Shard {header['shard']}/{header['shards']} is given twice")
+        shards.add(header["shard"])
+        counts.add(header["shards"])
+    if len(counts) != 1:
+        raise ValueError(f"The shard outputs have different numbers of shards: {sorted(counts)}")
+    (count,) = counts
+    if missing := sorted(set(range(1, count + 1)) - shards):
+        raise ValueError(f"Missing shards: {', '.join(f'{shard}/{count}' for shard in missing)}")
+
+
+def merge_shard_outputs(
+    paths: list[str | os.PathLike],
+    settings: Settings | None = None,
+    baseline: Baseline | None = None,
+    rule_profile: RuleProfile | None = None,
+) -> Iterator[FileResult]:
+    """
+    Merge the outputs of every shard, then check the graph rules once on the merged graph.
+
+    The results of each shard are streamed back as they are read, and only
+    the import graph is kept in memory. The graph errors (import cycles and
+    restrictions reached through other modules) follow the results of the
+    shards.
+
+    Parameters
+    ----------
+    paths : list[str | os.PathLike]
+        The outputs of every shard, written by ``ShardWriter``.
+    settings : Settings | None
+        The checker settings, by default the default settings. Ignored when
+        a rule profile is given.
+    baseline : Baseline | None
+        The known violations, which are not reported by the graph rules.
+    rule_profile : RuleProfile | None
+        A compiled rule profile, e.g., from ``load_rule_profile``.
+
+    Yields
+    ------
+    FileResult
+        The result of each file of each shard, then the graph errors of each file.
+
+    Raises
+    ------
+    ValueError
+        If the outputs are not every shard of the same run, once.
+    """
+    check_shard_headers(paths)
+    graph = ImportGraph()
+    for path in paths:
+        for result, imports in read_shard_output(path):
+            if imports is not None and result.module_name is not None:
+                graph.set_module_imports(result.module_name, imports, filename=result.filename)
+            yield result
+    yield from check_graph_rules(
+        graph, rule_profile or RuleProfile.from_settings(settings), baseline
+    )
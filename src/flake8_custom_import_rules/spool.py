@@ -0,0 +1,156 @@
+""" Append-only spools of the import facts of the files checked by each flake8 worker. """
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+from collections.abc import Iterator
+from typing import TextIO
+
+from attrs import define
+from attrs import field
+
+from flake8_custom_import_rules.core.import_facts import ImportFact
+from flake8_custom_import_rules.core.import_graph import ImportGraph
+from flake8_custom_import_rules.core.import_graph import graph_imports_from_facts
+
+logger = logging.getLogger(__name__)
+
+SPOOL_PREFIX = "import-facts-"
+SPOOL_SUFFIX = ".jsonl"
+
+
+@define(slots=True)
+class FactsSpool:
+    """Append the import facts of each file checked to a spool file of the worker process.
+
+    Under ``flake8 -j``, each worker process only checks part of the files,
+    so each worker appends the compact import facts of its files to its own
+    spool file in a shared directory. No locking is needed, and the spool
+    files are reduced into the project import graph once the run is done,
+    without parsing the files again. The spool file is opened on the first
+    file a process checks, so forked workers never share the file of their
+    parent.
+
+    Attributes
+    ----------
+    directory : str
+        The shared directory of the spool files.
+    """
+
+    directory: str
+    _stream: TextIO | None = field(init=False, default=None, repr=False)
+    _pid: int | None = field(init=False, default=None, repr=False)
+
+    @property
+    def path(self) -> str:
+        """Return the spool file of the current process."""
+        return os.path.join(
+            self.directory, f"{SPOOL_PREFIX}{socket.gethostname()}-{os.getpid()}{SPOOL_SUFFIX}"
+        )
+
+    def append(self, filename: str, module_name: str, facts: list[ImportFact]) -> None:
+        """
+        Append the import facts of a file to the spool file of the current process.
+
+        Parameters
+        ----------
+        filename : str
+            The file checked.
+        module_name : str
+            The module name of the file.
+        facts : list[ImportFact]
+            The import facts of the file.
+        """
+        if self._pid != os.getpid():
+            # Each record is a single line, written as soon as it is complete
+            self._stream = open(self.path, "a", encoding="utf-8", buffering=1)
+            self._pid = os.getpid()
+        assert self._stream is not None
+        record = {
+            "filename": filename,
+            "module_name": module_name,
+            "facts": [fact.to_row() for fact in facts],
+        }
+        self._stream.write(f"{json.dumps(record, separators=(',', ':'))}\n")
+
+
+def spool_paths(directory: str | os.PathLike) -> list[str]:
+    """Return the spool files of a directory."""
+    return [
+        entry.path
+        for entry in os.scandir(os.fspath(directory))
+        if entry.name.startswith(SPOOL_PREFIX) and entry.name.endswith(SPOOL_SUFFIX)
+    ]
+
+
+def clear_spools(directory: str | os.PathLike) -> None:
+    """
+    Remove the spool files of the previous runs from a directory.
+
+    Spool files are appended to, so the spools of a run would otherwise be
+    reduced with the facts of every earlier run, including the facts of
+    modules deleted since. Other files of the directory are kept.
+
+    Parameters
+    ----------
+    directory : str | os.PathLike
+        The directory of the spool files.
+    """
+    for path in spool_paths(directory):
+        os.remove(path)
+
+
+def read_spools(directory: str | os.PathLike) -> Iterator[tuple[str, str, list[ImportFact]]]:
+    """
+    Read the import facts of the spool files of a directory.
+
+    Spool files are read from the oldest to the most recently modified, so
+    when a file was checked more than once, its latest facts come last.
+    Records that were not completely written (e.g., by a worker that was
+    killed) are skipped.
+
+    Parameters
+    ----------
+    directory : str | os.PathLike
+        The directory of the spool files.
+
+    Yields
+    ------
+    tuple[str, str, list[ImportFact]]
+        The filename, the module name and the import facts of each file.
+    """
+    paths = spool_paths(directory)
+    for path in sorted(paths, key=lambda path: (os.path.getmtime(path), path)):
+        with open(path, encoding="utf-8") as stream:
+            for line in stream:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    logger.warning("Skipping an incomplete record of %s", path)
+                    continue
+                facts = [ImportFact.from_row(row) for row in record["facts"]]
+                yield record["filename"], record["module_name"], facts
+
+
+def build_import_graph_from_spools(directory: str | os.PathLike) -> ImportGraph:
+    """
+    Build the first-party import graph of the files spooled by a flake8 run.
+
+    Parameters
+    ----------
+    directory : str | os.PathLike
+        The directory of the spool files.
+
+    Returns
+    -------
+    ImportGraph
+    """
+    graph = ImportGraph()
+    for filename, module_name, facts in read_spools(directory):
+        graph.set_module_imports(
+            module_name, graph_imports_from_facts(facts, module_name), filename=filename
+        )
+    return graph
@@ -0,0 +1,136 @@
+""" Statistics of a run of the batch checker. """
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from collections.abc import Mapping
+
+from attrs import asdict
+from attrs import define
+from attrs import field
+
+
+@define(slots=True)
+class RunStats:
+    """Counters and timings of a run, updated as files are checked.
+
+    Attributes
+    ----------
+    files : int
+        The number of files checked.
+    imports : int
+        The number of import statements and dynamic imports checked.
+    read_ahead : int
+        The number of files read ahead of the file being checked, 0 if files
+        are read one at a time.
+    read_seconds : float
+        The time spent reading and hashing files, in the reader threads when
+        files are read ahead.
+    parse_seconds : float
+        The time spent parsing files.
+    visit_seconds : float
+        The time spent visiting the trees of files for their imports.
+    check_seconds : float
+        The time spent checking the imports against the rules.
+    stall_seconds : float
+        The time spent waiting for a file to be read before it could be checked.
+    stalls : int
+        The number of files that were not read yet when they were needed.
+    fast_exits : int
+        The number of files skipped because no rule applies to them.
+    max_queue_depth : int
+        The largest number of files read and waiting to be checked.
+    queue_depth_total : int
+        The sum of the number of files waiting to be checked, taken each
+        time a file is checked.
+    errors_by_code : dict[str, int]
+        The number of errors reported for each error code.
+    cache_hits : dict[str, int]
+        The number of lookups found in each cache of the rule profile.
+    cache_misses : dict[str, int]
+        The number of lookups computed and added to each cache of the rule
+        profile.
+    """
+
+    files: int = 0
+    imports: int = 0
+    read_ahead: int = 0
+    read_seconds: float = 0.0
+    parse_seconds: float = 0.0
+    visit_seconds: float = 0.0
+    check_seconds: float = 0.0
+    stall_seconds: float = 0.0
+    stalls: int = 0
+    fast_exits: int = 0
+    max_queue_depth: int = 0
+    queue_depth_total: int = 0
+    errors_by_code: dict[str, int] = field(factory=dict)
+    cache_hits: dict[str, int] = field(factory=dict)
+    cache_misses: dict[str, int] = field(factory=dict)
+
+    @property
+    def mean_queue_depth(self) -> float:
+        """Return the mean number of files read and waiting to be checked."""
+        return self.queue_depth_total / self.files if self.files else 0.0
+
+    def record_queue_depth(self, depth: int) -> None:
+        """
+        Record the number of files waiting to be checked when a file is checked.
+
+        Parameters
+        ----------
+        depth : int
+            The number of files read and waiting to be checked.
+        """
+        self.queue_depth_total += depth
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+
+    def record_errors(self, codes: Iterable[str]) -> None:
+        """
+        Record the errors reported for a file.
+
+        Parameters
+        ----------
+        codes : Iterable[str]
+            The error code of each error.
+        """
+        for code in codes:
+            self.errors_by_code[code] = self.errors_by_code.get(code, 0) + 1
+
+    def record_cache_stats(self, cache_stats: Mapping[str, tuple[int, int]]) -> None:
+        """
+        Record the hits and misses of the caches of the rule profile.
+
+        Parameters
+        ----------
+        cache_stats : Mapping[str, tuple[int, int]]
+            The hits and the misses by cache name, from ``RuleProfile.cache_stats``.
+        """
+        for name, (hits, misses) in cache_stats.items():
+            self.cache_hits[name] = hits
+            self.cache_misses[name] = misses
+
+    def as_dict(self) -> dict[str, int | float | dict[str, int]]:
+        """Return the statistics, including the derived ones, as a dictionary."""
+        return asdict(self) | {"mean_queue_depth": self.mean_queue_depth}
+
+    def format(self) -> str:
+        """Return the statistics, one ``name: value`` line per statistic.
+
+        The statistics counted by key are written one line per key, e.g.,
+        ``errors_by_code.PIR107: 1``.
+        """
+        lines: list[str] = []
+        for name, value in self.as_dict().items():
+            if isinstance(value, dict):
+                lines.extend(
+                    _format_line(f"{name}.{key}", item) for key, item in sorted(value.items())
+                )
+            else:
+                lines.append(_format_line(name, value))
+        return "".join(lines)
+
+
+def _format_line(name: str, value: int | float) -> str:
+    """Format a statistic as a ``name: value`` line."""
+    return f"{name}: {value:.6f}\n" if isinstance(value, float) else f"{name}: {value}\n"
@@ -51,7 +51,6 @@ def find_prefix(filename: str) -> str:
     str
     """
     filename = os.path.abspath(filename)
-    logger.debug(f"filename in find_prefix: {filename}")
 
     # Find the deepest path
     matches = (path for path in sys.path if filename.startswith(path))
@@ -189,7 +188,6 @@ def get_relative_path_from_absolute_path(
     -------
     str
     """
-    logger.debug(f"absolute_path type: {type(absolute_path)}")
     if not absolute_path:
         return None
 
@@ -65,6 +65,58 @@ def root_package_name(module_name: str) -> str | None:
     )
 
 
+def resolve_relative_module(
+    module_name: str, module: str, level: int, is_package: bool = False
+) -> str | None:
+    """
+    Resolve the module of a relative import to its absolute name.
+
+    The module is resolved from the name of the importing module alone, so
+    the file system is not used.
+
+    Parameters
+    ----------
+    module_name : str
+        The name of the importing module. Modules ending with ``__init__``
+        are packages.
+    module : str
+        The module of the import, without the leading dots.
+    level : int
+        The level of the import, i.e., the number of leading dots.
+    is_package : bool
+        Whether the importing module is a package, by default False.
+
+    Returns
+    -------
+    str | None
+        The absolute module name, or None if the import goes beyond the
+        top level package.
+
+    Examples
+    --------
+    >>> resolve_relative_module("my_package.sub.file", "other", 1)
+    'my_package.sub.other'
+    >>> resolve_relative_module("my_package.sub.__init__", "", 2)
+    'my_package'
+    >>> resolve_relative_module("my_package.file", "", 2) is None
+    True
+    """
+    if level <= 0:
+        return module
+
+    parts = module_name.split(".")
+    if parts[-1] == "__init__":
+        parts.pop()
+        is_package = True
+
+    # The package of a module is its parent, while a package is its own package
+    end = len(parts) - level + is_package
+    if end <= 0:
+        return None
+    package = ".".join(parts[:end])
+    return f"{package}.{module}" if module else package
+
+
 def generate_identifier_path(node: ast.AST | ast.expr) -> Generator[str, None, None]:
     """
     Generates a path for a given node in the Abstract Syntax Tree (AST).
@@ -27,6 +27,7 @@ def check_conflicts(settings_dict: dict) -> list | None:
     first_party_only = settings_dict.get("FIRST_PARTY_ONLY", [])
     project_only = settings_dict.get("PROJECT_ONLY", [])
     base_package_only = settings_dict.get("BASE_PACKAGE_ONLY", [])
+    layers = settings_dict.get("LAYERS", [])
 
     # Extract dict from settings
     custom_restrictions = settings_dict.get("CUSTOM_RESTRICTIONS", {})
@@ -59,6 +60,14 @@ def check_conflicts(settings_dict: dict) -> list | None:
         if set(standalone_modules).intersection(packages)
     )
 
+    # Check for packages assigned to more than one layer
+    layer_packages = [package.strip() for layer in layers for package in layer.split("|")]
+    if conflict := {package for package in layer_packages if layer_packages.count(package) > 1}:
+        conflicts.append(
+            f"Conflict: {conflict}. A package cannot be assigned to more than one layer in "
+            f"--layers."
+        )
+
     # If no conflicts are detected
     return conflicts or None
 
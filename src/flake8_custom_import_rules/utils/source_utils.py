@@ -0,0 +1,190 @@
+""" Single buffer of the source of a file, shared by hashing, parsing and noqa lookups. """
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import io
+import mmap
+import os
+import re
+import tokenize
+from array import array
+
+from attrs import define
+from attrs import field
+
+# Files at least this large are memory mapped instead of read into memory
+MMAP_THRESHOLD = 1 << 16
+# The line endings of the source, like the interpreter's universal newlines
+LINE_END = re.compile(rb"\r\n?|\n")
+
+
+@define(slots=True)
+class SourceBuffer:
+    """The source of a file, read once into a single buffer.
+
+    The content hash, the syntax tree and the source lines are all computed
+    from the same buffer, and only when they are needed. Lines are looked up
+    through an index of line offsets, so no list of lines is built unless
+    ``lines`` is used.
+
+    Attributes
+    ----------
+    data : bytes | mmap.mmap
+        The raw source, memory mapped for large files.
+    """
+
+    data: bytes | mmap.mmap
+    _line_offsets: array | None = field(init=False, default=None)
+    _encoding: str | None = field(init=False, default=None)
+    _content_hash: str | None = field(init=False, default=None)
+
+    @classmethod
+    def from_file(cls, filename: str | os.PathLike) -> SourceBuffer:
+        """
+        Read a file into a buffer, memory mapping large files.
+
+        Parameters
+        ----------
+        filename : str | os.PathLike
+            The file to read.
+
+        Returns
+        -------
+        SourceBuffer
+        """
+        with open(filename, "rb") as file:
+            if os.fstat(file.fileno()).st_size < MMAP_THRESHOLD:
+                return cls(file.read())
+            return cls(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @classmethod
+    def from_text(cls, text: str) -> SourceBuffer:
+        """
+        Create a buffer from source code that is already in memory.
+
+        Parameters
+        ----------
+        text : str
+            The source code.
+
+        Returns
+        -------
+        SourceBuffer
+        """
+        return cls(text.encode("utf-8"))
+
+    @property
+    def content_hash(self) -> str:
+        """Return the SHA-256 hash of the raw source."""
+        if self._content_hash is None:
+            self._content_hash = hashlib.sha256(self.data).hexdigest()
+        return self._content_hash
+
+    @property
+    def encoding(self) -> str:
+        """Return the encoding of the source, from its BOM or encoding cookie."""
+        if self._encoding is None:
+            first_lines = io.BytesIO(self.data[: self._line_end(min(2, self.line_count))])
+            try:
+                self._encoding, _ = tokenize.detect_encoding(first_lines.readline)
+            except SyntaxError:
+                # Unknown encoding cookies are read like pycodestyle does
+                self._encoding = "latin-1"
+        return self._encoding
+
+    @property
+    def line_offsets(self) -> array:
+        """Return the offset of the start of each line, and of the end of the source."""
+        if self._line_offsets is None:
+            offsets = array("q", [0])
+            if self.data.find(b"\r") == -1:
+                find = self.data.find
+                position = find(b"\n")
+                while position != -1:
+                    offsets.append(position + 1)
+                    position = find(b"\n", position + 1)
+            else:
+                # Lines end with \r\n, \r or \n, like str.splitlines
+                offsets.extend(match.end() for match in LINE_END.finditer(self.data))
+            if offsets[-1] != len(self.data):
+                offsets.append(len(self.data))
+            self._line_offsets = offsets
+        return self._line_offsets
+
+    @property
+    def line_count(self) -> int:
+        """Return the number of lines of the source."""
+        return len(self.line_offsets) - 1
+
+    def _line_end(self, lineno: int) -> int:
+        """Return the offset of the end of a line (1-based)."""
+        return self.line_offsets[lineno]
+
+    def line(self, lineno: int) -> str:
+        """
+        Get a single line of the source, without splitting the whole source.
+
+        Parameters
+        ----------
+        lineno : int
+            The line number (1-based).
+
+        Returns
+        -------
+        str
+            The line, with a ``\\n`` line ending, or an empty string if the
+            line does not exist.
+        """
+        if not 0 < lineno <= self.line_count:
+            return ""
+        line = self.data[self.line_offsets[lineno - 1] : self._line_end(lineno)]
+        text = line.decode(self.encoding if lineno == 1 else self._codec, errors="replace")
+        if text.endswith("\r\n"):
+            return text[:-2] + "\n"
+        return text[:-1] + "\n" if text.endswith("\r") else text
+
+    @property
+    def _codec(self) -> str:
+        """Return the codec of the lines after the first (the BOM is only on the first line)."""
+        return "utf-8" if self.encoding == "utf-8-sig" else self.encoding
+
+    @property
+    def text(self) -> str:
+        """Return the decoded source, with universal newlines."""
+        text = bytes(self.data).decode(self.encoding, errors="replace")
+        return io.StringIO(text, newline=None).getvalue()
+
+    @property
+    def lines(self) -> list[str]:
+        """Return the lines of the source, like ``pycodestyle.readlines``."""
+        return self.text.splitlines(keepends=True)
+
+    def parse(self, filename: str = "<unknown>") -> ast.AST:
+        """
+        Parse the source, decoding it as the interpreter would.
+
+        Parameters
+        ----------
+        filename : str
+            The filename reported in syntax errors.
+
+        Returns
+        -------
+        ast.AST
+        """
+        return ast.parse(self.data, filename=filename)
+
+    def close(self) -> None:
+        """Release the memory map of large files."""
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+    def __enter__(self) -> SourceBuffer:
+        """Return the buffer, which is closed when the context exits."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the buffer."""
+        self.close()
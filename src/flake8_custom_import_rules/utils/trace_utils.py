@@ -0,0 +1,81 @@
+""" Opt-in structured trace of the files checked. """
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sys
+from typing import Any
+from typing import TextIO
+
+TRACE_LOGGER_NAME = "flake8_custom_import_rules.trace"
+TRACE_ENV_VAR = "FLAKE8_CUSTOM_IMPORT_RULES_TRACE"
+
+trace_logger = logging.getLogger(TRACE_LOGGER_NAME)
+# Trace events are logged at DEBUG, so they are only emitted once the trace
+# is enabled, even when the root logger is set to DEBUG
+trace_logger.setLevel(logging.INFO)
+trace_logger.propagate = False
+
+
+def trace_enabled() -> bool:
+    """Return whether trace events are emitted."""
+    return trace_logger.isEnabledFor(logging.DEBUG)
+
+
+def trace_event(event: str, **fields: Any) -> None:
+    """
+    Emit a trace event as a single line of JSON.
+
+    Callers check ``trace_enabled`` first, so the fields of the event are
+    only computed when the trace is enabled.
+
+    Parameters
+    ----------
+    event : str
+        The name of the event, e.g., "file".
+    fields : Any
+        The fields of the event.
+    """
+    trace_logger.debug(
+        "%s", json.dumps({"event": event, **fields}, separators=(",", ":"), default=str)
+    )
+
+
+def enable_trace(stream: TextIO | None = None) -> logging.Handler:
+    """
+    Enable the trace, writing one JSON line per event to a stream.
+
+    Parameters
+    ----------
+    stream : TextIO | None
+        The stream the events are written to, by default stderr.
+
+    Returns
+    -------
+    logging.Handler
+        The handler of the events, to pass to ``disable_trace``.
+    """
+    handler = logging.StreamHandler(stream if stream is not None else sys.stderr)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    trace_logger.addHandler(handler)
+    trace_logger.setLevel(logging.DEBUG)
+    return handler
+
+
+def disable_trace(handler: logging.Handler) -> None:
+    """
+    Disable the trace enabled with ``enable_trace``.
+
+    Parameters
+    ----------
+    handler : logging.Handler
+        The handler returned by ``enable_trace``.
+    """
+    trace_logger.removeHandler(handler)
+    trace_logger.setLevel(logging.INFO)
+
+
+if os.environ.get(TRACE_ENV_VAR, "").lower() not in {"", "0", "false", "no"}:
+    enable_trace()
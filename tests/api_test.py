@@ -0,0 +1,224 @@
+""" Test the library API.
+
+To run this test file only:
+poetry run python -m pytest -vvvrca tests/api_test.py
+"""
+
+import ast
+import hashlib
+import mmap
+
+import pycodestyle
+import pytest
+
+from flake8_custom_import_rules import api
+from flake8_custom_import_rules.api import FileResult
+from flake8_custom_import_rules.api import Source
+from flake8_custom_import_rules.api import check_files
+from flake8_custom_import_rules.api import iter_python_files
+from flake8_custom_import_rules.core.rule_profile import RuleProfile
+from flake8_custom_import_rules.core.rules_checker import CustomImportRulesChecker
+from flake8_custom_import_rules.defaults import Settings
+from flake8_custom_import_rules.stats import RunStats
+from flake8_custom_import_rules.utils import source_utils
+from flake8_custom_import_rules.utils.source_utils import SourceBuffer
+
+EXAMPLE_PACKAGE = "example_repos/my_base_module/my_second_base_package"
+
+
+@pytest.fixture(scope="module")
+def restricted_settings() -> Settings:
+    """Return settings with restricted packages."""
+    return Settings(
+        BASE_PACKAGES=["my_base_module", "my_second_base_package"],
+        RESTRICTED_PACKAGES=["my_base_module", "my_second_base_package.module_one"],
+    )
+
+
+def single_file_errors(filename: str, settings: Settings) -> set[str]:
+    """Check a single file with a newly compiled rule profile."""
+    lines = pycodestyle.readlines(filename)
+    checker = CustomImportRulesChecker.from_rule_profile(
+        RuleProfile.from_settings(settings),
+        tree=ast.parse("".join(lines)),
+        filename=filename,
+        lines=lines,
+    )
+    return {str(error) for error in checker.check_custom_import_rules()}
+
+
+def test_iter_python_files() -> None:
+    """Test directories are expanded into sorted Python files."""
+    files = list(iter_python_files([f"{EXAMPLE_PACKAGE}/module_one"]))
+    assert files == [
+        f"{EXAMPLE_PACKAGE}/module_one/__init__.py",
+        f"{EXAMPLE_PACKAGE}/module_one/file_one.py",
+        f"{EXAMPLE_PACKAGE}/module_one/file_two.py",
+    ]
+
+
+def test_check_files_matches_single_file_checks(restricted_settings: Settings) -> None:
+    """Test the batch API reports the same errors as checking files one at a time."""
+    results = list(check_files([EXAMPLE_PACKAGE], restricted_settings))
+
+    assert [result.filename for result in results] == list(iter_python_files([EXAMPLE_PACKAGE]))
+    assert any(result.errors for result in results)
+    for result in results:
+        actual = {str(error) for error in result.errors}
+        assert actual == single_file_errors(result.filename, restricted_settings)
+
+
+def test_check_files_in_memory_source(restricted_settings: Settings) -> None:
+    """Test in-memory sources are checked with the given module name."""
+    source = Source(
+        "import my_base_module.module_x\nfrom os import *\n",
+        filename="my_second_base_package/file.py",
+        module_name="my_second_base_package.file",
+    )
+    (result,) = check_files([source], restricted_settings)
+    assert result.module_name == "my_second_base_package.file"
+    assert {str(error) for error in result.errors} == {
+        "1:0: CIR106 Restricted Package Violation. Restricted project import. Using "
+        "'import my_base_module.module_x'. Restricted package cannot be imported into "
+        "module 'my_second_base_package.file'.",
+        "2:0: PIR107 Wildcard Imports are disabled for this project.",
+    }
+
+
+def test_check_files_syntax_error() -> None:
+    """Test a file that cannot be parsed does not stop the batch."""
+    results = list(check_files([Source("import"), Source("from os import *")]))
+    assert isinstance(results[0].syntax_error, SyntaxError)
+    assert not results[0].errors
+    assert len(results[1].errors) == 1
+
+
+def test_rule_profile_shares_restricted_identifiers(restricted_settings: Settings) -> None:
+    """Test the restricted identifiers are computed once per package."""
+    rule_profile = RuleProfile.from_settings(restricted_settings)
+    first = rule_profile.restricted_identifiers(["my_second_base_package"])
+    second = rule_profile.restricted_identifiers(["my_second_base_package"])
+    assert first is second
+    assert set(first) == {"my_base_module", "my_second_base_package.module_one"}
+
+
+def test_check_files_relative_imports(restricted_settings: Settings) -> None:
+    """Test relative imports are checked like the absolute imports they resolve to."""
+    source = Source(
+        "from .module_one import file_one\nfrom ..outside import name\n",
+        filename="my_second_base_package/file.py",
+        module_name="my_second_base_package.file",
+    )
+    settings = Settings(
+        BASE_PACKAGES=restricted_settings.BASE_PACKAGES,
+        RESTRICTED_PACKAGES=restricted_settings.RESTRICTED_PACKAGES,
+        RESTRICT_RELATIVE_IMPORTS=False,
+    )
+    (result,) = check_files([source], settings)
+    assert {str(error) for error in result.errors} == {
+        "1:0: CIR107 Restricted Package Violation. Restricted project `from import`. Using "
+        "'from .module_one import file_one'. Restricted package cannot be imported into "
+        "module 'my_second_base_package.file'.",
+    }
+
+
+def test_check_files_reads_each_file_into_one_buffer(tmp_path, monkeypatch) -> None:
+    """Test noqa comments are found in the source buffer, which is also hashed."""
+    monkeypatch.syspath_prepend(str(tmp_path))
+    filename = tmp_path / "file.py"
+    filename.write_text("from os import *  # noqa: PIR107\nfrom sys import *\n")
+    (result,) = check_files([str(filename)])
+    assert [str(error) for error in result.errors] == [
+        "2:0: PIR107 Wildcard Imports are disabled for this project."
+    ]
+    assert result.content_hash == hashlib.sha256(filename.read_bytes()).hexdigest()
+
+
+def test_check_files_finds_noqa_comments_after_lone_cr_line_endings(tmp_path, monkeypatch) -> None:
+    """Test noqa comments are found on the lines of files with lone CR line endings."""
+    monkeypatch.syspath_prepend(str(tmp_path))
+    filename = tmp_path / "file.py"
+    filename.write_bytes(b"import os\rfrom os import *  # noqa: PIR107\rfrom sys import *\r")
+    (result,) = check_files([str(filename)])
+    assert [str(error) for error in result.errors] == [
+        "3:0: PIR107 Wildcard Imports are disabled for this project."
+    ]
+
+
+@pytest.mark.parametrize("read_ahead", [0, 2])
+def test_check_files_closes_the_source_buffers(tmp_path, monkeypatch, read_ahead: int) -> None:
+    """Test the memory maps of the files are closed once the files are checked."""
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(source_utils, "MMAP_THRESHOLD", 0)
+    buffers: list[SourceBuffer] = []
+    from_file = SourceBuffer.from_file
+
+    def record_buffer(filename: str) -> SourceBuffer:
+        buffers.append(from_file(filename))
+        return buffers[-1]
+
+    monkeypatch.setattr(SourceBuffer, "from_file", record_buffer)
+    for name, source in [("file.py", "from os import *\n"), ("broken.py", "import (\n")]:
+        (tmp_path / name).write_text(source)
+    results = list(check_files([str(tmp_path)], read_ahead=read_ahead))
+    assert len(results) == len(buffers) == 2
+    assert all(isinstance(buffer.data, mmap.mmap) and buffer.data.closed for buffer in buffers)
+
+
+@pytest.mark.parametrize("read_ahead", [1, 4, 100])
+def test_check_files_read_ahead(restricted_settings: Settings, read_ahead: int) -> None:
+    """Test files read ahead in a thread pool are checked like files read one at a time."""
+    stats = RunStats()
+    expected = list(check_files([EXAMPLE_PACKAGE], restricted_settings))
+    actual = list(check_files([EXAMPLE_PACKAGE], restricted_settings, read_ahead, stats))
+    assert actual == expected
+    assert stats.files == len(expected)
+    assert stats.read_ahead == read_ahead
+    assert 0 <= stats.max_queue_depth <= read_ahead
+    assert stats.mean_queue_depth <= stats.max_queue_depth
+    assert stats.stall_seconds >= 0.0
+    assert set(stats.as_dict()) >= {"stall_seconds", "max_queue_depth", "mean_queue_depth"}
+
+
+def test_check_files_fast_exit() -> None:
+    """Test files without applicable rules are not parsed, and are counted."""
+    settings = Settings(
+        STD_LIB_ONLY=["my_package.std_lib_only"],
+        **{key: False for key in Settings().get_option_keys() if key.startswith("RESTRICT_")},
+    )
+    sources = [
+        Source("import requests\n", filename="a.py", module_name="my_package.std_lib_only"),
+        Source("import (\n", filename="b.py", module_name="my_package.other"),
+    ]
+    stats = RunStats()
+    results = list(check_files(sources, settings, stats=stats))
+    assert [error.code for error in results[0].errors] == ["CIR401"]
+    assert results[1] == FileResult(filename="b.py", module_name="my_package.other")
+    assert stats.fast_exits == 1
+
+
+@pytest.mark.parametrize("read_ahead", [1, 4])
+def test_check_files_fast_exit_read_ahead(monkeypatch, read_ahead: int) -> None:
+    """Test files without applicable rules are not read ahead."""
+    settings = Settings(
+        STD_LIB_ONLY=["my_package.std_lib_only"],
+        **{key: False for key in Settings().get_option_keys() if key.startswith("RESTRICT_")},
+    )
+    sources = [
+        Source("import requests\n", filename=f"{name}.py", module_name=f"my_package.{name}")
+        for name in ["other", "std_lib_only", "another", "std_lib_only"]
+    ]
+    expected = list(check_files(sources, settings))
+    read_files: list[str] = []
+    read_source_buffer = api.read_source_buffer
+
+    def record_read(path_or_source: Source) -> api.ReadSource:
+        read_files.append(path_or_source.filename)
+        return read_source_buffer(path_or_source)
+
+    monkeypatch.setattr(api, "read_source_buffer", record_read)
+    stats = RunStats()
+    results = list(check_files(sources, settings, read_ahead, stats))
+    assert results == expected
+    assert read_files == ["std_lib_only.py", "std_lib_only.py"]
+    assert stats.fast_exits == 2
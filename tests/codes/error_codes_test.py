@@ -8,6 +8,8 @@ from __future__ import annotations
 
 import pytest
 
+from flake8_custom_import_rules.codes.error_codes import ERROR_CODE_MEMBERS
+from flake8_custom_import_rules.codes.error_codes import ERROR_CODE_MESSAGES
 from flake8_custom_import_rules.codes.error_codes import AllCustomImportCodes
 from flake8_custom_import_rules.codes.error_codes import AllErrorCodes
 from flake8_custom_import_rules.codes.error_codes import AllProjectImportCodes
@@ -37,6 +39,7 @@ PROJECT_IMPORT_RULES = [
     "PIR210",
     "PIR301",
     "PIR302",
+    "PIR401",
 ]
 
 PROJECT_IMPORT_RULES_ENUMS = [
@@ -61,6 +64,7 @@ PROJECT_IMPORT_RULES_ENUMS = [
     ErrorCode.PIR210,
     ErrorCode.PIR301,
     ErrorCode.PIR302,
+    ErrorCode.PIR401,
 ]
 
 CUSTOM_IMPORT_RULES = [
@@ -71,6 +75,8 @@ CUSTOM_IMPORT_RULES = [
     "CIR105",
     "CIR106",
     "CIR107",
+    "CIR108",
+    "CIR109",
     "CIR201",
     "CIR202",
     "CIR203",
@@ -85,6 +91,8 @@ CUSTOM_IMPORT_RULES = [
     "CIR402",
     "CIR501",
     "CIR502",
+    "CIR601",
+    "CIR602",
 ]
 
 CUSTOM_IMPORT_RULES_ENUMS = [
@@ -95,6 +103,8 @@ CUSTOM_IMPORT_RULES_ENUMS = [
     ErrorCode.CIR105,
     ErrorCode.CIR106,
     ErrorCode.CIR107,
+    ErrorCode.CIR108,
+    ErrorCode.CIR109,
     ErrorCode.CIR201,
     ErrorCode.CIR202,
     ErrorCode.CIR203,
@@ -109,6 +119,8 @@ CUSTOM_IMPORT_RULES_ENUMS = [
     ErrorCode.CIR402,
     ErrorCode.CIR501,
     ErrorCode.CIR502,
+    ErrorCode.CIR601,
+    ErrorCode.CIR602,
 ]
 
 ALL_ERROR_CODES = PROJECT_IMPORT_RULES + CUSTOM_IMPORT_RULES
@@ -262,3 +274,11 @@ def test_membership__enum(error_code_enum):
 def test_membership__error_wrong_type(other_types):
     """Test get_error_code."""
     assert other_types not in ErrorCode
+
+
+@pytest.mark.parametrize("error_code_enum", ALL_ERROR_CODES_ENUMS)
+def test_error_code_tables(error_code_enum):
+    """Test the precomputed code to member and code to message tables."""
+    assert ERROR_CODE_MEMBERS[error_code_enum.name] is error_code_enum
+    assert ERROR_CODE_MESSAGES[error_code_enum.name] == error_code_enum.message
+    assert error_code_enum.full_message == f"{error_code_enum.name} {error_code_enum.message}"
@@ -0,0 +1,152 @@
+""" Test the hierarchical per-directory configuration.
+
+To run this test file only:
+poetry run python -m pytest -vvvrca tests/config_test.py
+"""
+
+from pathlib import Path
+
+import pytest
+
+from flake8_custom_import_rules.config import ConfigResolver
+from flake8_custom_import_rules.config import read_directory_config
+from flake8_custom_import_rules.core.rule_profile import RuleProfile
+from flake8_custom_import_rules.defaults import Settings
+from flake8_custom_import_rules.flake8_plugin import Plugin
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch) -> Path:
+    """Create a project with nested configurations."""
+    package = tmp_path / "my_package"
+    for directory in (
+        package,
+        package / "legacy",
+        package / "legacy" / "old",
+        package / "services",
+        package / "tools",
+    ):
+        directory.mkdir(exist_ok=True)
+        (directory / "__init__.py").write_text("")
+        (directory / "module.py").write_text("import my_package.module_b\n")
+    (package / "module_b.py").write_text("")
+
+    (package / "legacy" / "setup.cfg").write_text(
+        "[flake8]\n"
+        "max-line-length = 100\n\n"
+        "[flake8:custom-import-rules]\n"
+        "restricted-packages =\n"
+        "    my_package.module_b\n"
+        "restrict-relative-imports = false\n"
+    )
+    (package / "legacy" / "old" / "tox.ini").write_text(
+        "[flake8:custom-import-rules]\nrestrict_dynamic_imports = False\n"
+    )
+    (package / "services" / "pyproject.toml").write_text(
+        "[tool.flake8-custom-import-rules]\n"
+        'restricted-packages = ["my_package.module_b"]\n'
+        "restrict-relative-imports = false\n"
+    )
+    # A configuration without an import rules section does not override anything
+    (package / "tools" / "setup.cfg").write_text("[flake8]\nmax-line-length = 100\n")
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    return tmp_path
+
+
+def test_read_directory_config(project: Path) -> None:
+    """Test the nested configurations are read from ini and TOML files."""
+    package = project / "my_package"
+    assert read_directory_config(str(package / "legacy")) == {
+        "RESTRICTED_PACKAGES": "\nmy_package.module_b",
+        "RESTRICT_RELATIVE_IMPORTS": "false",
+    }
+    assert read_directory_config(str(package / "services")) == {
+        "RESTRICTED_PACKAGES": ["my_package.module_b"],
+        "RESTRICT_RELATIVE_IMPORTS": False,
+    }
+    assert read_directory_config(str(package / "tools")) == {}
+    assert read_directory_config(str(package)) == {}
+
+
+def test_nested_configurations_override_parents(project: Path) -> None:
+    """Test nested configurations are overlaid on their parent directories."""
+    rule_profile = RuleProfile.from_settings(Settings(BASE_PACKAGES=["my_package"]))
+    resolver = ConfigResolver(rule_profile, root=str(project))
+    package = project / "my_package"
+
+    legacy = resolver.profile_for(str(package / "legacy" / "module.py")).settings
+    assert legacy.BASE_PACKAGES == ("my_package",)
+    assert legacy.RESTRICTED_PACKAGES == ("my_package.module_b",)
+    assert legacy.RESTRICT_RELATIVE_IMPORTS is False
+    assert legacy.RESTRICT_DYNAMIC_IMPORTS is True
+
+    old = resolver.profile_for(str(package / "legacy" / "old" / "module.py")).settings
+    assert old.RESTRICTED_PACKAGES == ("my_package.module_b",)
+    assert old.RESTRICT_DYNAMIC_IMPORTS is False
+
+    assert resolver.profile_for(str(package / "module.py")) is rule_profile
+    assert resolver.profile_for(str(package / "tools" / "module.py")) is rule_profile
+    assert resolver.profile_for(str(project.parent / "elsewhere.py")) is rule_profile
+
+
+def test_root_configuration_overrides_the_project(project: Path) -> None:
+    """Test the nested section of the project root is overlaid on the project settings."""
+    (project / "setup.cfg").write_text(
+        "[flake8]\nmax-line-length = 100\n\n"
+        "[flake8:custom-import-rules]\nrestrict-dynamic-imports = false\n"
+    )
+    rule_profile = RuleProfile.from_settings(Settings(BASE_PACKAGES=["my_package"]))
+    resolver = ConfigResolver(rule_profile, root=str(project))
+    package = project / "my_package"
+
+    root = resolver.profile_for(str(project / "module.py"))
+    assert root is not rule_profile
+    assert root.settings.BASE_PACKAGES == ("my_package",)
+    assert root.settings.RESTRICT_DYNAMIC_IMPORTS is False
+    assert resolver.profile_for(str(package / "tools" / "module.py")) is root
+    legacy = resolver.profile_for(str(package / "legacy" / "module.py")).settings
+    assert legacy.RESTRICT_DYNAMIC_IMPORTS is False
+    assert legacy.RESTRICT_RELATIVE_IMPORTS is False
+    assert resolver.profile_for(str(project.parent / "elsewhere.py")) is rule_profile
+
+
+def test_profiles_are_compiled_once_per_effective_config(project: Path) -> None:
+    """Test directories with the same effective settings share a profile."""
+    rule_profile = RuleProfile.from_settings(Settings(BASE_PACKAGES=["my_package"]))
+    resolver = ConfigResolver(rule_profile, root=str(project))
+    package = project / "my_package"
+
+    legacy = resolver.profile_for(str(package / "legacy" / "module.py"))
+    # The ini and the TOML configurations give the same settings
+    assert resolver.profile_for(str(package / "services" / "module.py")) is legacy
+    assert resolver.profile_for(str(package / "legacy" / "__init__.py")) is legacy
+    assert legacy is not rule_profile
+    assert len(resolver.profiles) == 2
+
+    resolver.profile_for(str(package / "legacy" / "old" / "module.py"))
+    assert len(resolver.profiles) == 3
+
+
+def test_plugin_uses_nested_configurations(project: Path) -> None:
+    """Test the plugin checks each file with the profile of its directory."""
+    rule_profile = RuleProfile.from_settings(Settings(BASE_PACKAGES=["my_package"]))
+    options = {
+        **rule_profile.options,
+        "config_resolver": ConfigResolver(rule_profile, root=str(project)),
+    }
+    original_options = Plugin._options
+    Plugin._options = options
+    try:
+        package = project / "my_package"
+        errors = {
+            directory: [
+                error[2][:6]
+                for error in Plugin(filename=str(package / directory / "module.py")).run()
+            ]
+            for directory in ("", "legacy", "tools")
+        }
+    finally:
+        Plugin._options = original_options
+
+    assert errors == {"": [], "legacy": ["CIR106"], "tools": []}
@@ -0,0 +1,71 @@
+""" Test the baseline of known violations.
+
+To run this test file only:
+poetry run python -m pytest -vvvrca tests/core/baseline_test.py
+"""
+
+from pathlib import Path
+
+from flake8_custom_import_rules.api import Source
+from flake8_custom_import_rules.api import check_files
+from flake8_custom_import_rules.core.baseline import BASELINE_HEADER
+from flake8_custom_import_rules.core.baseline import Baseline
+from flake8_custom_import_rules.core.baseline import fingerprint
+from flake8_custom_import_rules.defaults import Settings
+
+SETTINGS = Settings(BASE_PACKAGES=["my_package"], RESTRICTED_PACKAGES=["my_package.legacy"])
+
+
+def errors(source: str, baseline: Baseline | None = None) -> list[str]:
+    """Return the errors of a module, as ``line:col: CODE`` strings."""
+    (result,) = check_files(
+        [Source(source, module_name="my_package.module")], SETTINGS, baseline=baseline
+    )
+    return [f"{error.lineno}:{error.col_offset}: {error.code}" for error in result.errors]
+
+
+def test_fingerprint_ignores_the_location() -> None:
+    """Test the fingerprints of errors only depend on the module, code and identifier."""
+    (before,) = next(iter(check_files([Source("import my_package.legacy")], SETTINGS))).errors
+    source = "import os\n\n\nimport my_package.legacy"
+    (after,) = next(iter(check_files([Source(source)], SETTINGS))).errors
+    assert (before.lineno, after.lineno) == (1, 4)
+    assert before.identifier == after.identifier == "my_package.legacy"
+    assert fingerprint("stdin", before.code, before.identifier) == fingerprint(
+        "stdin", after.code, after.identifier
+    )
+    assert fingerprint("my_package.a", "CIR106", "os") != fingerprint(
+        "my_package.b", "CIR106", "os"
+    )
+
+
+def test_known_violations_are_not_reported() -> None:
+    """Test the errors of the baseline are dropped, and new errors are still reported."""
+    source = "import my_package.legacy\nfrom os import *\n"
+    baseline = Baseline(
+        frozenset({fingerprint("my_package.module", "CIR106", "my_package.legacy")})
+    )
+    assert errors(source) == ["1:0: CIR106", "2:0: PIR107"]
+    assert errors(source, baseline) == ["2:0: PIR107"]
+    # the known violation is still dropped once lines are added above it
+    assert errors(f"import sys\n{source}", baseline) == ["3:0: PIR107"]
+    # the same import in another module is not a known violation
+    (result,) = check_files(
+        [Source(source, module_name="my_package.other")], SETTINGS, baseline=baseline
+    )
+    assert [error.code for error in result.errors] == ["CIR106", "PIR107"]
+
+
+def test_write_and_load(tmp_path: Path) -> None:
+    """Test a baseline is written sorted, one fingerprint per line, and loaded back."""
+    path = tmp_path / "baseline.txt"
+    baseline = Baseline(
+        frozenset({fingerprint("b", "PIR107", "os.*"), fingerprint("a", "CIR106", "x")})
+    )
+    baseline.write(path)
+
+    header, *fingerprints = path.read_text().splitlines()
+    assert header == BASELINE_HEADER
+    assert fingerprints == sorted(baseline.fingerprints)
+    assert Baseline.load(path) == baseline
+    assert len(Baseline.load(path)) == 2
@@ -0,0 +1,45 @@
+""" Test error messages.
+
+To run this test file only:
+poetry run python -m pytest -vvvrca tests/core/error_messages_test.py
+"""
+
+from flake8_custom_import_rules.codes.error_codes import ErrorCode
+from flake8_custom_import_rules.core.error_messages import IMPORT_RESTRICTION_EXPLANATION
+from flake8_custom_import_rules.core.error_messages import ErrorMessage
+from flake8_custom_import_rules.core.error_messages import import_restriction_error
+from flake8_custom_import_rules.core.error_messages import standard_error_message
+from flake8_custom_import_rules.core.nodes import HelperParsedImport
+
+
+def test_standard_error_message() -> None:
+    """Test standard error message without explanation."""
+    error = standard_error_message(HelperParsedImport(lineno=3, col_offset=4), ErrorCode.PIR107)
+    assert error == ErrorMessage(lineno=3, col_offset=4, code="PIR107")
+    assert str(error) == "3:4: PIR107 Wildcard Imports are disabled for this project."
+
+
+def test_error_message_stores_explanation_arguments() -> None:
+    """Test the error message stores the explanation arguments, not the text."""
+    node = HelperParsedImport(lineno=1, import_statement="import my_base_module")
+    error = import_restriction_error(node, ErrorCode.CIR102, "my_second_base_package.file")
+    assert error.explanation == IMPORT_RESTRICTION_EXPLANATION
+    assert error.explanation_args == ("import my_base_module", "my_second_base_package.file")
+    assert error.message == (
+        "Import Restriction Violation. Restricted project import. Using "
+        "'import my_base_module'. Restricted package/module cannot be imported into "
+        "module 'my_second_base_package.file'."
+    )
+
+
+def test_error_message_fields() -> None:
+    """Test the error message only stores the code and the explanation arguments."""
+    fields = [attribute.name for attribute in ErrorMessage.__attrs_attrs__]
+    assert fields == [
+        "lineno",
+        "col_offset",
+        "code",
+        "explanation",
+        "explanation_args",
+        "identifier",
+    ]
@@ -0,0 +1,96 @@
+""" Test checking import facts without the source AST.
+
+To run this test file only:
+poetry run python -m pytest -vvvrca tests/core/import_facts_test.py
+"""
+
+import ast
+
+import pycodestyle
+import pytest
+
+from flake8_custom_import_rules.api import check_import_facts
+from flake8_custom_import_rules.api import iter_python_files
+from flake8_custom_import_rules.core.import_facts import ImportFact
+from flake8_custom_import_rules.core.import_facts import ImportScope
+from flake8_custom_import_rules.core.import_facts import import_facts_from_visitor
+from flake8_custom_import_rules.core.import_facts import render_import_statements
+from flake8_custom_import_rules.core.rule_profile import RuleProfile
+from flake8_custom_import_rules.core.rules_checker import CustomImportRulesChecker
+from flake8_custom_import_rules.defaults import Settings
+
+EXAMPLE_REPO = "example_repos/my_base_module"
+
+SETTINGS = [
+    Settings(
+        BASE_PACKAGES=["my_base_module", "my_second_base_package"],
+        RESTRICTED_PACKAGES=["my_base_module.package_c", "my_second_base_package.module_one"],
+        STD_LIB_ONLY=["my_base_module.module_z"],
+        PROJECT_ONLY=["my_base_module.package_a"],
+        RESTRICT_CONDITIONAL_IMPORTS=True,
+        RESTRICT_ALIASED_IMPORTS=True,
+        RESTRICT_FUTURE_IMPORTS=True,
+    ),
+    Settings(
+        BASE_PACKAGES=["my_base_module"],
+        CUSTOM_RESTRICTIONS=["my_base_module.package_a:my_base_module.package_b"],
+        STANDALONE_MODULES=["my_base_module.module_x"],
+        THIRD_PARTY_ONLY=["my_base_module.package_b"],
+        FIRST_PARTY_ONLY=["my_base_module.module_y"],
+    ),
+]
+
+
+@pytest.mark.parametrize("settings", SETTINGS)
+def test_import_facts_match_ast_checks(settings: Settings) -> None:
+    """Test the facts extracted from a file are reported like the file itself."""
+    rule_profile = RuleProfile.from_settings(settings)
+    checked_errors = 0
+    for filename in iter_python_files([EXAMPLE_REPO]):
+        lines = pycodestyle.readlines(filename)
+        checker = CustomImportRulesChecker.from_rule_profile(
+            rule_profile, tree=ast.parse("".join(lines)), filename=filename, lines=lines
+        )
+        expected = {str(error) for error in checker.check_custom_import_rules()}
+        module_name = checker.visitor.file_identifier
+        if module_name is None:
+            continue
+
+        facts = import_facts_from_visitor(checker.visitor)
+        result = check_import_facts(module_name, facts, rule_profile=rule_profile)
+
+        assert {str(error) for error in result.errors} == expected, filename
+        checked_errors += len(expected)
+
+    assert checked_errors
+
+
+def test_render_import_statements() -> None:
+    """Test facts of the same statement are rendered as one statement."""
+    facts = [
+        ImportFact("a.b", asname="c"),
+        ImportFact("d"),
+        ImportFact("", name="e", level=1, lineno=2),
+        ImportFact("", name="f", asname="g", level=1, lineno=2),
+        ImportFact("os", name="path", lineno=3, col_offset=4, scope=ImportScope.LOCAL),
+    ]
+    assert list(render_import_statements(facts).values()) == [
+        "import a.b as c, d",
+        "import a.b as c, d",
+        "from . import e, f as g",
+        "from . import e, f as g",
+        "from os import path",
+    ]
+
+
+def test_scoped_import_facts() -> None:
+    """Test local, conditional and dynamic facts are reported once each."""
+    facts = [
+        ImportFact("os", name="path", lineno=2, col_offset=4, scope=ImportScope.LOCAL),
+        ImportFact("os", name="sep", lineno=2, col_offset=4, scope=ImportScope.LOCAL),
+        ImportFact("json", lineno=4, col_offset=4, scope=ImportScope.CONDITIONAL),
+        ImportFact("my_module", lineno=5, scope=ImportScope.DYNAMIC),
+    ]
+    settings = Settings(RESTRICT_CONDITIONAL_IMPORTS=True)
+    result = check_import_facts("my_package.file", facts, settings=settings)
+    assert [error.code for error in result.errors] == ["PIR103", "PIR104", "PIR105"]
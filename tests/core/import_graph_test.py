@@ -0,0 +1,206 @@
+""" Test the import graph and import cycle detection.
+
+To run this test file only:
+poetry run python -m pytest -vvvrca tests/core/import_graph_test.py
+"""
+
+import random
+
+from flake8_custom_import_rules.api import Source
+from flake8_custom_import_rules.api import build_import_graph
+from flake8_custom_import_rules.api import find_import_cycles
+from flake8_custom_import_rules.core.import_facts import ImportFact
+from flake8_custom_import_rules.core.import_facts import ImportScope
+from flake8_custom_import_rules.core.import_graph import ImportGraph
+from flake8_custom_import_rules.core.import_graph import graph_imports_from_facts
+from flake8_custom_import_rules.core.import_graph import strongly_connected_components
+from flake8_custom_import_rules.defaults import Settings
+
+
+def components(graph: ImportGraph) -> set[frozenset[str]]:
+    """Return the components of the graph as a set."""
+    return {frozenset(component) for component in graph.components()}
+
+
+def test_strongly_connected_components() -> None:
+    """Test components are found in reverse topological order."""
+    edges = {"a": ["b"], "b": ["c", "d"], "c": ["a"], "d": ["e"], "e": ["d"], "f": ["a"]}
+    result = strongly_connected_components(edges, edges.__getitem__)
+    assert [sorted(component) for component in result] == [
+        ["d", "e"],
+        ["a", "b", "c"],
+        ["f"],
+    ]
+
+
+def test_import_cycles_are_reported_once_with_the_shortest_path() -> None:
+    """Test each component is reported once, with its shortest cycle."""
+    graph = ImportGraph()
+    graph.set_module_imports("pkg.a", {"pkg.b.B": (3, 0), "os": (1, 0)}, filename="pkg/a.py")
+    graph.set_module_imports("pkg.b", {"pkg.c": (2, 0), "pkg.d.name": (4, 4)})
+    graph.set_module_imports("pkg.c", {"pkg.a": (5, 0), "pkg.d": (6, 0)})
+    graph.set_module_imports("pkg.d", {"pkg.a": (7, 0)})
+    graph.set_module_imports("pkg.e", {"pkg.e": (1, 0), "pkg.a": (1, 0)})
+
+    (cycle,) = graph.cycles()
+    assert str(cycle) == "pkg.a -> pkg.b -> pkg.c -> pkg.a"
+    assert cycle.locations == ((3, 0), (2, 0), (5, 0))
+    assert cycle.filename == "pkg/a.py"
+    assert str(cycle.error) == (
+        "3:0: PIR401 Import cycle between first-party modules. "
+        "Cycle: 'pkg.a -> pkg.b -> pkg.c -> pkg.a'."
+    )
+    assert components(graph) == {frozenset({"pkg.a", "pkg.b", "pkg.c", "pkg.d"})}
+
+
+def test_incremental_updates_match_a_full_rebuild() -> None:
+    """Test only recomputing the affected components gives the same result."""
+    rng = random.Random(0)
+    modules = [f"pkg.module_{i}" for i in range(200)]
+    graph = ImportGraph()
+    for module in modules:
+        graph.set_module_imports(module, rng.sample(modules, 2))
+    graph.cycles()
+
+    for step in range(100):
+        module = rng.choice(modules)
+        if step % 25 == 24:
+            graph.remove_module(module)
+            graph.set_module_imports(module, rng.sample(modules, 1))
+        else:
+            graph.set_module_imports(module, rng.sample(modules, rng.randint(0, 2)))
+
+        rebuilt = ImportGraph()
+        for other in modules:
+            rebuilt.set_module_imports(other, graph._imports[other])
+        assert components(graph) == components(rebuilt)
+        assert graph.cycles() == rebuilt.cycles()
+
+
+def test_updates_affecting_most_modules_rebuild_the_graph(caplog) -> None:
+    """Test the components are rebuilt when most modules are affected by a change."""
+    large = [f"pkg.large_{i}" for i in range(10)]
+    small = ["pkg.small_0", "pkg.small_1"]
+    graph = ImportGraph()
+    for cycle in (large, small):
+        for module, imported in zip(cycle, cycle[1:] + cycle[:1]):
+            graph.set_module_imports(module, [imported])
+    graph.cycles()
+
+    caplog.set_level("DEBUG", logger="flake8_custom_import_rules.core.import_graph")
+    graph.set_module_imports("pkg.small_0", ["pkg.small_1", "pkg.large_0"])
+    assert components(graph) == {frozenset(large), frozenset(small)}
+    graph.set_module_imports("pkg.large_0", ["pkg.large_1", "pkg.small_0"])
+    assert components(graph) == {frozenset(large + small)}
+    assert caplog.messages == [
+        "Recomputed components of 2 modules",
+        "Rebuilt the components of 12 modules",
+    ]
+    (cycle,) = graph.cycles()
+    assert str(cycle) == "pkg.large_0 -> pkg.small_0 -> pkg.large_0"
+
+
+def test_graph_imports_from_facts() -> None:
+    """Test local and dynamic imports, and unresolved relative imports, are left out."""
+    facts = [
+        ImportFact("pkg.a"),
+        ImportFact("pkg.b", name="B", lineno=2),
+        ImportFact("pkg.b", name="C", lineno=2),
+        ImportFact("pkg.c", lineno=3, scope=ImportScope.CONDITIONAL),
+        ImportFact("pkg.d", lineno=4, col_offset=4, scope=ImportScope.LOCAL),
+        ImportFact("pkg.e", lineno=5, scope=ImportScope.DYNAMIC),
+        ImportFact("", name="f", level=1, lineno=6),
+    ]
+    assert graph_imports_from_facts(facts) == {
+        "pkg.a": (1, 0),
+        "pkg.b.B": (2, 0),
+        "pkg.b.C": (2, 0),
+        "pkg.c": (3, 0),
+    }
+    assert graph_imports_from_facts(facts, "pkg.sub.module")["pkg.sub.f"] == (6, 0)
+    assert graph_imports_from_facts(facts, "pkg.__init__")["pkg.f"] == (6, 0)
+
+
+def test_find_import_cycles() -> None:
+    """Test import cycles are found across files, and updated incrementally."""
+    sources = [
+        Source("import pkg.b\n", filename="pkg/a.py", module_name="pkg.a"),
+        Source("from pkg.c import C\n", filename="pkg/b.py", module_name="pkg.b"),
+        Source(
+            "import os\n\n\ndef f():\n    import pkg.a\n",
+            filename="pkg/c.py",
+            module_name="pkg.c",
+        ),
+    ]
+    assert find_import_cycles(sources) == []
+
+    graph = build_import_graph(sources)
+    build_import_graph(
+        [Source("import pkg.a\n", filename="pkg/c.py", module_name="pkg.c")], graph=graph
+    )
+    assert [str(cycle) for cycle in graph.cycles()] == ["pkg.a -> pkg.b -> pkg.c -> pkg.a"]
+
+
+def test_find_import_cycles_through_packages(tmp_path, monkeypatch) -> None:
+    """Test imports of a package are edges to its __init__ module."""
+    monkeypatch.syspath_prepend(str(tmp_path))
+    package = tmp_path / "pkg"
+    (package / "sub").mkdir(parents=True)
+    (package / "__init__.py").write_text("from pkg.b import thing\n")
+    (package / "b.py").write_text("import pkg\n\nthing = 1\n")
+    (package / "sub" / "__init__.py").write_text("from pkg import thing\n")
+    (package / "c.py").write_text("import pkg.sub\nfrom pkg.sub import thing\n")
+    settings = Settings(BASE_PACKAGES=["pkg"])
+
+    graph = build_import_graph([str(package)], settings)
+    assert graph.successors("pkg.b") == {"pkg.__init__": (1, 0)}
+    assert graph.successors("pkg.sub.__init__") == {"pkg.__init__": (1, 0)}
+    assert graph.successors("pkg.c") == {"pkg.sub.__init__": (1, 0)}
+    (cycle,) = find_import_cycles([str(package)], settings)
+    assert str(cycle) == "pkg.__init__ -> pkg.b -> pkg.__init__"
+    assert cycle.filename == str(package / "__init__.py")
+
+
+def test_reachable_modules_are_bitsets() -> None:
+    """Test reachable modules include the members of cycles, but not the module itself."""
+    graph = ImportGraph()
+    graph.set_module_imports("pkg.a", ["pkg.b"])
+    graph.set_module_imports("pkg.b", ["pkg.c.C"])
+    graph.set_module_imports("pkg.c", ["pkg.b"])
+    graph.set_module_imports("pkg.d", ["os"])
+
+    def modules(bits: int) -> set[str]:
+        return {module for module in graph.modules if bits & graph.module_bit(module)}
+
+    assert modules(graph.reachable("pkg.a")) == {"pkg.b", "pkg.c"}
+    assert modules(graph.reachable("pkg.b")) == {"pkg.b", "pkg.c"}
+    assert modules(graph.reachable("pkg.d")) == set()
+    assert modules(graph.package_bits("pkg")) == set(graph.modules)
+    assert modules(graph.importer_bits("os")) == {"pkg.d"}
+    assert graph.shortest_path("pkg.a", graph.package_bits("pkg.c")) == ["pkg.a", "pkg.b", "pkg.c"]
+    assert graph.shortest_path("pkg.d", graph.package_bits("pkg.c")) is None
+
+    graph.set_module_imports("pkg.c", ["pkg.d"])
+    assert modules(graph.reachable("pkg.a")) == {"pkg.b", "pkg.c", "pkg.d"}
+    assert modules(graph.reachable("pkg.b")) == {"pkg.c", "pkg.d"}
+
+
+def test_incremental_reachable_modules_match_a_full_rebuild() -> None:
+    """Test only dropping the bitsets of the ancestors of changes gives the same result."""
+    rng = random.Random(1)
+    modules = [f"pkg.module_{i}" for i in range(100)]
+    graph = ImportGraph()
+    for module in modules:
+        graph.set_module_imports(module, rng.sample(modules, rng.randint(0, 2)))
+
+    for _ in range(50):
+        for module in modules:
+            graph.reachable(module)
+        graph.set_module_imports(rng.choice(modules), rng.sample(modules, rng.randint(0, 2)))
+
+        rebuilt = ImportGraph()
+        for other in modules:
+            rebuilt.set_module_imports(other, graph._imports[other])
+        assert [graph.reachable(module) for module in modules] == [
+            rebuilt.reachable(module) for module in modules
+        ]
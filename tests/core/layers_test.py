@@ -0,0 +1,40 @@
+""" Test layer ranks.
+
+To run this test file only:
+poetry run python -m pytest -vvvrca tests/core/layers_test.py
+"""
+
+import pytest
+
+from flake8_custom_import_rules.core.layers import compile_layer_ranks
+from flake8_custom_import_rules.core.layers import get_layer_rank
+
+LAYERS = ["app", "services | api", "domain", "utils"]
+
+
+def test_compile_layer_ranks() -> None:
+    """Test packages are ranked by their layer."""
+    assert compile_layer_ranks(LAYERS) == {
+        "app": 0,
+        "services": 1,
+        "api": 1,
+        "domain": 2,
+        "utils": 3,
+    }
+
+
+@pytest.mark.parametrize(
+    ("module", "expected"),
+    [
+        ("app", 0),
+        ("api.v1.views", 1),
+        ("utils.strings", 3),
+        ("domain.utils", 2),
+        ("os.path", None),
+        ("application", None),
+        (None, None),
+    ],
+)
+def test_get_layer_rank(module: str | None, expected: int | None) -> None:
+    """Test the most specific layer package of a module is used."""
+    assert get_layer_rank(module, compile_layer_ranks(LAYERS)) == expected
@@ -10,11 +10,16 @@ import ast
 import pytest
 
 from flake8_custom_import_rules.core.node_visitor import CustomImportRulesVisitor
+from flake8_custom_import_rules.core.nodes import ALL_NODE_KINDS
 from flake8_custom_import_rules.core.nodes import ImportType
+from flake8_custom_import_rules.core.nodes import NodeKind
 from flake8_custom_import_rules.core.nodes import ParsedClassDef
 from flake8_custom_import_rules.core.nodes import ParsedFromImport
 from flake8_custom_import_rules.core.nodes import ParsedFunctionDef
 from flake8_custom_import_rules.core.nodes import ParsedStraightImport
+from flake8_custom_import_rules.core.rule_profile import RuleProfile
+from flake8_custom_import_rules.defaults import Settings
+from flake8_custom_import_rules.utils.node_utils import get_package_names
 
 
 @pytest.fixture(scope="function")
@@ -500,6 +505,36 @@ def test_relative_imports(parsed_import, import_visitor):
     )
 
 
+@pytest.mark.parametrize(
+    ("filename", "module_name", "expected"),
+    [
+        ("my_package/sub/module.py", "my_package.sub.module", "my_package.sub"),
+        ("my_package/sub/__init__.py", "my_package.sub", "my_package.sub"),
+    ],
+)
+def test_relative_imports_are_resolved(filename: str, module_name: str, expected: str) -> None:
+    """
+    Test that relative imports are resolved from the module name of the file,
+    and classified like the absolute import they resolve to.
+    """
+    source = "from . import foo\nfrom .bar import baz\nfrom .... import qux\n"
+    visitor = CustomImportRulesVisitor(["my_package"], filename, module_name=module_name)
+    visitor.visit(ast.parse(source))
+    assert [node.identifier for node in visitor.nodes] == [
+        f"{expected}.foo",
+        f"{expected}.bar.baz",
+        ".qux",
+    ]
+    assert [node.import_type for node in visitor.nodes] == [
+        ImportType.FIRST_PARTY,
+        ImportType.FIRST_PARTY,
+        ImportType.RELATIVE,
+    ]
+    assert visitor.nodes[1].package_names == get_package_names(f"{expected}.bar")
+    assert visitor.nodes[1].module == "bar"
+    assert visitor.resolve_relative_import("..other") == f"{expected.rpartition('.')[0]}.other"
+
+
 @pytest.mark.usefixtures("parsed_import")
 def test_multiple_from_imports_same_line(parsed_import, import_visitor):
     """
@@ -592,3 +627,84 @@ def test_comments(import_visitor):
     visitor = import_visitor
     visitor.visit(tree)
     assert len(visitor.nodes) == 0
+
+
+NODE_KINDS_SOURCE = """
+import os
+from sys import path
+
+
+class A:
+    import json
+
+
+def f():
+    from os import sep
+    if path:
+        import csv
+    importlib.import_module("math")
+"""
+
+
+@pytest.mark.parametrize(
+    ("node_kinds", "expected"),
+    [
+        (
+            ALL_NODE_KINDS,
+            [
+                "ParsedStraightImport",
+                "ParsedFromImport",
+                "ParsedClassDef",
+                "ParsedLocalImport",
+                "ParsedStraightImport",
+                "ParsedFunctionDef",
+                "ParsedLocalImport",
+                "ParsedFromImport",
+                "ParsedIfImport",
+                "ParsedStraightImport",
+                "ParsedDynamicImport",
+            ],
+        ),
+        (
+            NodeKind(0),
+            [
+                "ParsedStraightImport",
+                "ParsedFromImport",
+                "ParsedStraightImport",
+                "ParsedFromImport",
+                "ParsedStraightImport",
+            ],
+        ),
+        (
+            NodeKind.LOCAL_IMPORTS | NodeKind.DYNAMIC_IMPORTS,
+            [
+                "ParsedStraightImport",
+                "ParsedFromImport",
+                "ParsedLocalImport",
+                "ParsedStraightImport",
+                "ParsedLocalImport",
+                "ParsedFromImport",
+                "ParsedStraightImport",
+                "ParsedDynamicImport",
+            ],
+        ),
+    ],
+)
+def test_visitor_only_builds_the_node_kinds_requested(
+    node_kinds: NodeKind, expected: list[str]
+) -> None:
+    """Test the visitor only builds the optional node kinds it is configured with."""
+    visitor = CustomImportRulesVisitor([], None, node_kinds=node_kinds)
+    visitor.visit(ast.parse(NODE_KINDS_SOURCE))
+    assert [type(node).__name__ for node in visitor.nodes] == expected
+    assert bool(visitor.identifiers_by_lineno) is (NodeKind.IDENTIFIERS_BY_LINENO in node_kinds)
+    assert visitor.identifiers["os"]["module"] == "os"
+
+
+def test_rule_profile_node_kinds() -> None:
+    """Test the profile only requests the node kinds of its dispatched restrictions."""
+    rule_profile = RuleProfile.from_settings(
+        Settings(RESTRICT_LOCAL_SCOPE_IMPORTS=True, RESTRICT_CONDITIONAL_IMPORTS=False)
+    )
+    assert rule_profile.node_kinds == NodeKind.LOCAL_IMPORTS | NodeKind.DYNAMIC_IMPORTS
+    assert RuleProfile.from_settings(Settings(), {"CIR106"}).node_kinds == NodeKind(0)
@@ -0,0 +1,286 @@
+""" Test the compiled rule profile.
+
+To run this test file only:
+poetry run python -m pytest -vvvrca tests/core/rule_profile_test.py
+"""
+
+import ast
+import pickle
+
+import attrs
+import pytest
+
+from flake8_custom_import_rules.core.import_rules import CustomImportRules
+from flake8_custom_import_rules.core.import_rules import FileRule
+from flake8_custom_import_rules.core.nodes import ImportType
+from flake8_custom_import_rules.core.nodes import ParsedFromImport
+from flake8_custom_import_rules.core.nodes import ParsedNode
+from flake8_custom_import_rules.core.restricted_import_visitor import get_restricted_identifiers
+from flake8_custom_import_rules.core.rule_profile import RuleProfile
+from flake8_custom_import_rules.core.rules_checker import CustomImportRulesChecker
+from flake8_custom_import_rules.defaults import Settings
+from flake8_custom_import_rules.utils.node_utils import get_package_names
+from flake8_custom_import_rules.utils.parse_utils import does_file_match_custom_rule
+
+SETTINGS = Settings(
+    BASE_PACKAGES=["my_base_module", "my_second_base_package"],
+    RESTRICTED_PACKAGES=["my_base_module.package_a", "my_second_base_package.module_one"],
+    CUSTOM_RESTRICTIONS=[
+        "my_base_module.package_b:my_base_module.package_c,os",
+        "my_second_base_package:my_base_module.package_a.module_a",
+    ],
+    RESTRICT_RELATIVE_IMPORTS=True,
+    RESTRICT_DYNAMIC_IMPORTS=False,
+)
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "my_base_module.package_b.module_b",
+        "my_base_module.package_a.module_a",
+        "my_second_base_package.module_one.file_one",
+        "my_third_base_package",
+    ],
+)
+def test_compiled_restricted_identifiers(module: str) -> None:
+    """Test the compiled restricted identifiers match the restricted import visitor."""
+    file_packages = get_package_names(module)
+    assert RuleProfile.from_settings(SETTINGS).restricted_identifiers(
+        file_packages
+    ) == get_restricted_identifiers(
+        base_packages=SETTINGS.BASE_PACKAGES,
+        restricted_packages=SETTINGS.RESTRICTED_PACKAGES,
+        custom_restrictions=SETTINGS.CUSTOM_RESTRICTIONS,
+        file_packages=file_packages,
+    )
+
+
+def test_standard_restrictions_dispatch_table() -> None:
+    """Test only the enabled project level restrictions are dispatched."""
+    check_names = [name for _, name in RuleProfile.from_settings(SETTINGS).standard_restrictions]
+    assert "_check_for_pir102" in check_names
+    assert "_check_for_pir105" not in check_names
+    assert RuleProfile.from_settings(SETTINGS).standard_restrictions[0] == (
+        (ParsedFromImport,),
+        "_check_for_pir102",
+    )
+
+
+def test_rule_profile_is_frozen_and_picklable() -> None:
+    """Test the profile cannot be changed, and pickles without its caches."""
+    rule_profile = RuleProfile.from_settings(SETTINGS)
+    with pytest.raises(attrs.exceptions.FrozenInstanceError):
+        rule_profile.layer_ranks = {}  # type: ignore[misc]
+
+    file_packages = get_package_names("my_base_module.package_b.module_b")
+    expected = rule_profile.restricted_identifiers(file_packages)
+    rule_profile.classify(["my_base_module"])
+
+    assert rule_profile.settings_hash == SETTINGS.freeze().content_hash
+
+    unpickled = pickle.loads(pickle.dumps(rule_profile))
+    assert unpickled.options["rule_profile"] is unpickled
+    assert unpickled._restricted_identifiers == {}
+    assert unpickled.standard_restrictions == rule_profile.standard_restrictions
+    assert unpickled.restricted_identifiers(file_packages) == expected
+    assert unpickled.classify(["my_base_module"]) == ImportType.FIRST_PARTY
+
+
+NO_PROJECT_LEVEL_RESTRICTIONS = {
+    key: False for key in Settings().get_option_keys() if key.startswith("RESTRICT_")
+}
+
+
+@pytest.mark.parametrize(
+    ("settings", "module", "expected"),
+    [
+        (Settings(BASE_PACKAGES=["my_package"]), "my_package.module", True),
+        (Settings(**NO_PROJECT_LEVEL_RESTRICTIONS), "my_package.module", False),
+        (Settings(**NO_PROJECT_LEVEL_RESTRICTIONS), None, False),
+        (
+            Settings(PROJECT_ONLY=["my_package.sub"], **NO_PROJECT_LEVEL_RESTRICTIONS),
+            "my_package.sub.module",
+            True,
+        ),
+        (
+            Settings(PROJECT_ONLY=["my_package.sub"], **NO_PROJECT_LEVEL_RESTRICTIONS),
+            "my_package.module",
+            False,
+        ),
+        (
+            Settings(LAYERS=["my_package.api", "my_package.db"], **NO_PROJECT_LEVEL_RESTRICTIONS),
+            "my_package.db.models",
+            True,
+        ),
+        (
+            Settings(RESTRICTED_PACKAGES=["my_package.sub"], **NO_PROJECT_LEVEL_RESTRICTIONS),
+            "my_package.sub.module",
+            False,
+        ),
+        (
+            Settings(RESTRICTED_PACKAGES=["my_package.sub"], **NO_PROJECT_LEVEL_RESTRICTIONS),
+            None,
+            True,
+        ),
+        (
+            Settings(
+                CUSTOM_RESTRICTIONS=["my_package.a:my_package.b"], **NO_PROJECT_LEVEL_RESTRICTIONS
+            ),
+            "my_package.a.module",
+            True,
+        ),
+        (
+            Settings(
+                CUSTOM_RESTRICTIONS=["my_package.a:my_package.b"], **NO_PROJECT_LEVEL_RESTRICTIONS
+            ),
+            "my_package.c.module",
+            False,
+        ),
+    ],
+)
+def test_has_applicable_rules(settings: Settings, module: str | None, expected: bool) -> None:
+    """Test applicability is computed from the module name alone."""
+    rule_profile = RuleProfile.from_settings(settings)
+    assert rule_profile.has_applicable_rules(module) is expected
+    assert rule_profile.has_applicable_rules(module) is expected
+
+
+def test_checker_fast_exit_does_not_visit_the_tree() -> None:
+    """Test the checker returns before visiting files without applicable rules."""
+    rule_profile = RuleProfile.from_settings(Settings(**NO_PROJECT_LEVEL_RESTRICTIONS))
+    checker = CustomImportRulesChecker.from_rule_profile(
+        rule_profile,
+        tree=ast.parse("from os import *\n"),
+        filename="my_package/module.py",
+        lines=["from os import *\n"],
+        module_name="my_package.module",
+    )
+    assert list(checker.check_custom_import_rules()) == []
+    assert checker._visitor is None
+
+
+@pytest.mark.parametrize(
+    ("active_codes", "module", "expected"),
+    [
+        ({"PIR102"}, "my_package.module", True),
+        ({"CIR201", "CIR202"}, "my_package.module", False),
+        ({"CIR201", "CIR202"}, "my_package.sub.module", True),
+        ({"CIR401"}, "my_package.sub.module", False),
+        ({"CIR601"}, "my_package.db.models", True),
+        ({"CIR106"}, "my_package.db.models", False),
+    ],
+)
+def test_inactive_rules_are_not_applicable(
+    active_codes: set[str], module: str, expected: bool
+) -> None:
+    """Test only the rules that can report an active code are applicable."""
+    settings = Settings(
+        PROJECT_ONLY=["my_package.sub"],
+        LAYERS=["my_package.api", "my_package.db"],
+        **{**NO_PROJECT_LEVEL_RESTRICTIONS, "RESTRICT_RELATIVE_IMPORTS": True},
+    )
+    rule_profile = RuleProfile.from_settings(settings, active_codes)
+    assert rule_profile.has_applicable_rules(module) is expected
+
+
+def test_inactive_checks_are_not_dispatched() -> None:
+    """Test the dispatch tables only hold the checks of the active codes."""
+    rule_profile = RuleProfile.from_settings(FILE_RULE_SETTINGS, {"PIR107", "PIR207", "CIR401"})
+    assert [name for _, name in rule_profile.standard_restrictions] == [
+        "_check_for_pir107",
+        "_check_for_pir207",
+    ]
+    assert rule_profile.file_rules(["my_base_module", "my_base_module.package_a"]) == (
+        FileRule.STD_LIB_ONLY
+    )
+    assert pickle.loads(pickle.dumps(rule_profile)).active_codes == rule_profile.active_codes
+
+
+@pytest.mark.parametrize(("active_codes", "expected"), [({"CIR102"}, []), ({"CIR104"}, ["CIR104"])])
+def test_inactive_checks_are_not_computed(
+    monkeypatch, active_codes: set[str], expected: list[str]
+) -> None:
+    """Test the condition of a check is only computed when its code is active."""
+    calls = []
+    check_if_import_restriction = CustomImportRules._check_if_import_restriction
+
+    def record_call(self: CustomImportRules, node: ParsedNode) -> bool:
+        calls.append(node.identifier)
+        return check_if_import_restriction(self, node)
+
+    monkeypatch.setattr(CustomImportRules, "_check_if_import_restriction", record_call)
+    settings = Settings(
+        CUSTOM_RESTRICTIONS=["my_base_module.package_b:os"], **NO_PROJECT_LEVEL_RESTRICTIONS
+    )
+    checker = CustomImportRulesChecker.from_rule_profile(
+        RuleProfile.from_settings(settings, active_codes),
+        tree=ast.parse("import os\n"),
+        filename="my_base_module/package_b/module.py",
+        lines=["import os\n"],
+        module_name="my_base_module.package_b.module",
+    )
+    assert [error.code for error in checker.check_custom_import_rules()] == expected
+    assert calls == (["os"] if expected else [])
+
+
+FILE_RULE_SETTINGS = Settings(
+    BASE_PACKAGES=["my_base_module"],
+    PROJECT_ONLY=["my_base_module"],
+    STD_LIB_ONLY=["my_base_module.package_a", "my_base_module.package_b.module_b"],
+    STANDALONE_MODULES=["my_base_module.package_a.module_a", "my_base_module.package_c"],
+    THIRD_PARTY_ONLY=["my_base_module.package_b.module_b"],
+    RESTRICTED_PACKAGES=["my_base_module.package_c"],
+)
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "my_base_module",
+        "my_base_module.module_x",
+        "my_base_module.package_a",
+        "my_base_module.package_a.module_a",
+        "my_base_module.package_a.module_a.__init__",
+        "my_base_module.package_b.module_a",
+        "my_base_module.package_b.module_b",
+        "my_base_module.package_c.module_c",
+        "my_second_base_package.package_a",
+        None,
+    ],
+)
+def test_file_rule_index_matches_custom_rules(module: str | None) -> None:
+    """Test the file rules of a module are the custom rules its packages are in."""
+    rule_profile = RuleProfile.from_settings(FILE_RULE_SETTINGS)
+    file_packages = get_package_names(module) if module else None
+    expected = {
+        file_rule
+        for file_rule in FileRule
+        if file_packages
+        and does_file_match_custom_rule(
+            file_packages, getattr(FILE_RULE_SETTINGS, str(file_rule.name))
+        )
+    }
+    file_rules = rule_profile.file_rules(file_packages)
+    assert {file_rule for file_rule in FileRule if file_rule in file_rules} == expected
+
+
+def test_file_rule_index_inherits_parent_rules() -> None:
+    """Test subpackages in the index hold the rules of their parent packages."""
+    index = RuleProfile.from_settings(FILE_RULE_SETTINGS).file_rule_index
+    assert index["my_base_module"] == FileRule.PROJECT_ONLY
+    assert index["my_base_module.package_a.module_a"] == (
+        FileRule.PROJECT_ONLY | FileRule.STD_LIB_ONLY | FileRule.STANDALONE_MODULES
+    )
+    assert "my_base_module.package_b" not in index
+
+
+def test_cache_stats() -> None:
+    """Test the hits and misses of the caches are counted."""
+    rule_profile = RuleProfile.from_settings(SETTINGS)
+    for _ in range(3):
+        rule_profile.classify(["os"])
+    rule_profile.classify(["my_base_module"])
+    assert rule_profile.cache_stats()["import_types"] == (2, 2)
+    assert rule_profile.cache_stats()["module_names"] == (0, 0)
+    assert pickle.loads(pickle.dumps(rule_profile)).cache_stats()["import_types"] == (0, 0)
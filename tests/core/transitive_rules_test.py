@@ -0,0 +1,110 @@
+""" Test restrictions enforced through the project import graph.
+
+To run this test file only:
+poetry run python -m pytest -vvvrca tests/core/transitive_rules_test.py
+"""
+
+from flake8_custom_import_rules.api import Source
+from flake8_custom_import_rules.api import build_import_graph
+from flake8_custom_import_rules.api import find_transitive_violations
+from flake8_custom_import_rules.core.rule_profile import RuleProfile
+from flake8_custom_import_rules.core.transitive_rules import check_transitive_restrictions
+from flake8_custom_import_rules.defaults import Settings
+
+SETTINGS = Settings(
+    BASE_PACKAGES=["my_base_module"],
+    RESTRICTED_PACKAGES=["my_base_module.app"],
+    CUSTOM_RESTRICTIONS=["my_base_module.common:requests"],
+)
+
+SOURCES = [
+    Source(
+        "import my_base_module.helpers\n",
+        filename="my_base_module/common.py",
+        module_name="my_base_module.common",
+    ),
+    Source(
+        "from my_base_module.app import App\nimport requests\n",
+        filename="my_base_module/helpers.py",
+        module_name="my_base_module.helpers",
+    ),
+    Source("App = None\n", filename="my_base_module/app.py", module_name="my_base_module.app"),
+    Source(
+        "import my_base_module.common\n",
+        filename="my_base_module/utils.py",
+        module_name="my_base_module.utils",
+    ),
+]
+
+
+def test_find_transitive_violations() -> None:
+    """Test restricted packages and custom restrictions are enforced transitively."""
+    violations = find_transitive_violations(SOURCES, SETTINGS)
+    assert [(v.module, v.error_code.name, str(v)) for v in violations] == [
+        (
+            "my_base_module.common",
+            "CIR108",
+            "my_base_module.common -> my_base_module.helpers -> my_base_module.app",
+        ),
+        (
+            "my_base_module.common",
+            "CIR109",
+            "my_base_module.common -> my_base_module.helpers -> requests",
+        ),
+        (
+            "my_base_module.utils",
+            "CIR108",
+            "my_base_module.utils -> my_base_module.common -> my_base_module.helpers "
+            "-> my_base_module.app",
+        ),
+    ]
+    assert violations[0].filename == "my_base_module/common.py"
+    assert str(violations[0].error) == (
+        "1:0: CIR108 Restricted Package Violation. Restricted package imported transitively. "
+        "Using 'my_base_module.app' through "
+        "'my_base_module.common -> my_base_module.helpers -> my_base_module.app'. "
+        "Restricted package/module cannot be imported into module 'my_base_module.common'."
+    )
+
+
+def test_find_transitive_violations_through_packages(tmp_path, monkeypatch) -> None:
+    """Test restricted packages are reached through the __init__ modules of packages."""
+    monkeypatch.syspath_prepend(str(tmp_path))
+    project = tmp_path / "proj"
+    for package in (project, project / "app", project / "helpers"):
+        package.mkdir()
+        (package / "__init__.py").write_text("")
+    (project / "app" / "__init__.py").write_text("App = None\n")
+    (project / "helpers" / "__init__.py").write_text("from proj.app import App\n")
+    (project / "common.py").write_text("import proj.helpers\n")
+    settings = Settings(BASE_PACKAGES=["proj"], RESTRICTED_PACKAGES=["proj.app"])
+
+    (violation,) = find_transitive_violations([str(project)], settings)
+    assert violation.module == "proj.common"
+    assert violation.error_code.name == "CIR108"
+    assert str(violation) == "proj.common -> proj.helpers.__init__ -> proj.app.__init__"
+
+
+def test_transitive_violations_are_updated_with_the_graph() -> None:
+    """Test direct imports are not reported again, and changes update the results."""
+    rule_profile = RuleProfile.from_settings(SETTINGS)
+    graph = build_import_graph(SOURCES, SETTINGS)
+    assert len(check_transitive_restrictions(graph, rule_profile)) == 3
+
+    build_import_graph(
+        [
+            Source(
+                "import my_base_module.app\n",
+                filename="my_base_module/utils.py",
+                module_name="my_base_module.utils",
+            ),
+            Source(
+                "import os\n",
+                filename="my_base_module/helpers.py",
+                module_name="my_base_module.helpers",
+            ),
+        ],
+        SETTINGS,
+        graph=graph,
+    )
+    assert check_transitive_restrictions(graph, rule_profile) == []
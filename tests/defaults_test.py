@@ -5,8 +5,13 @@ poetry run python -m pytest -vvvrca tests/defaults_test.py
 """
 
 import optparse
+import os
+import pickle
+import subprocess
+import sys
 from collections import defaultdict
 
+import attrs
 import pytest
 from flake8.options.manager import OptionManager
 
@@ -137,6 +142,65 @@ def test_key_not_present():
     with pytest.raises(KeyError):
         settings = Settings()
         settings.get_settings_value("some_not_present_key")
+    with pytest.raises(KeyError):
+        Settings().freeze().get_settings_value("some_not_present_key")
+
+
+def test_convert_to_dict__copies_mappings():
+    """Test the restrictions of other settings are copied."""
+    restrictions = {"my_base_module": ["os", "sys"]}
+    actual = convert_to_dict(restrictions)
+    assert actual == restrictions
+    assert actual["my_base_module"] is not restrictions["my_base_module"]
+
+
+FROZEN_SETTINGS_HASH_SCRIPT = (
+    "from flake8_custom_import_rules.defaults import Settings; "
+    "print(Settings(LAYERS=['utils', 'app']).freeze().content_hash)"
+)
+
+
+def test_frozen_settings():
+    """Test frozen settings are hashed by content, and cannot be changed."""
+    settings = Settings(
+        BASE_PACKAGES=["my_base_module"],
+        CUSTOM_RESTRICTIONS=["my_base_module.package_a:os,sys"],
+        LAYERS=["app", "utils"],
+    )
+    frozen = settings.freeze()
+    assert frozen.freeze() is frozen
+    assert frozen.dict == settings.dict
+    assert list(frozen.get_settings_value("LAYERS")) == settings.get_settings_value("LAYERS")
+    assert list(frozen.field_map) == Settings().get_option_keys()
+    with pytest.raises(TypeError):
+        frozen.field_map["LAYERS"] = []  # type: ignore[index]
+    with pytest.raises(attrs.exceptions.FrozenInstanceError):
+        frozen.LAYERS = []  # type: ignore[misc]
+    # the values are frozen too, so the content hash keeps describing them
+    assert frozen.LAYERS == ("app", "utils")
+    with pytest.raises(AttributeError):
+        frozen.BASE_PACKAGES.append("other")  # type: ignore[attr-defined]
+    with pytest.raises(TypeError):
+        frozen.CUSTOM_RESTRICTIONS["other"] = ["os"]  # type: ignore[index]
+    with pytest.raises(AttributeError):
+        frozen.CUSTOM_RESTRICTIONS["my_base_module.package_a"].append("re")
+    frozen.dict["LAYERS"].append("other")
+    assert frozen.LAYERS == ("app", "utils")
+
+    same = Settings(**settings.dict).freeze()
+    assert hash(same) == hash(frozen)
+    assert same.content_hash == frozen.content_hash
+    assert len({frozen, same, Settings(LAYERS=["utils", "app"]).freeze()}) == 2
+    assert pickle.loads(pickle.dumps(frozen)).content_hash == frozen.content_hash
+    # the content hash does not depend on the hash seed of the process
+    content_hash = subprocess.run(
+        [sys.executable, "-c", FROZEN_SETTINGS_HASH_SCRIPT],
+        env={**os.environ, "PYTHONHASHSEED": "1"},
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.strip()
+    assert content_hash == Settings(LAYERS=["utils", "app"]).freeze().content_hash
 
 
 @pytest.mark.parametrize(
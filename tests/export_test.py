@@ -0,0 +1,134 @@
+""" Test the streaming exports of the import facts.
+
+To run this test file only:
+poetry run python -m pytest -vvvrca tests/export_test.py
+"""
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from flake8_custom_import_rules.api import Source
+from flake8_custom_import_rules.core.import_facts import ImportFact
+from flake8_custom_import_rules.defaults import Settings
+from flake8_custom_import_rules.export import COLUMNAR_HEADER
+from flake8_custom_import_rules.export import EXPORT_COLUMNS
+from flake8_custom_import_rules.export import NULL_CODE
+from flake8_custom_import_rules.export import ColumnarFactsWriter
+from flake8_custom_import_rules.export import JsonLinesFactsWriter
+from flake8_custom_import_rules.export import export_import_facts
+from flake8_custom_import_rules.export import read_columnar_facts
+
+SETTINGS = Settings(BASE_PACKAGES=["my_package"])
+HEADER_NAMES_SIZE = sum(len(column) + 1 for column in EXPORT_COLUMNS)
+SOURCES = [
+    Source("import os\nfrom my_package import b as c\n", "my_package/a.py", "my_package.a"),
+    Source("def f():\n    from . import a\n", "my_package/b.py", "my_package.b"),
+    Source("x = 1\n", "my_package/c.py", "my_package.c"),
+]
+ROWS = [
+    {
+        "filename": "my_package/a.py",
+        "module_name": "my_package.a",
+        "module": "os",
+        "name": None,
+        "level": 0,
+        "lineno": 1,
+        "col_offset": 0,
+        "asname": None,
+        "scope": "TOP_LEVEL",
+    },
+    {
+        "filename": "my_package/a.py",
+        "module_name": "my_package.a",
+        "module": "my_package",
+        "name": "b",
+        "level": 0,
+        "lineno": 2,
+        "col_offset": 0,
+        "asname": "c",
+        "scope": "TOP_LEVEL",
+    },
+    {
+        "filename": "my_package/b.py",
+        "module_name": "my_package.b",
+        "module": "",
+        "name": "a",
+        "level": 1,
+        "lineno": 2,
+        "col_offset": 4,
+        "asname": None,
+        "scope": "LOCAL",
+    },
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 1000])
+def test_columnar_round_trip(tmp_path: Path, chunk_size: int) -> None:
+    """Test the columnar export is read back whatever the size of its chunks."""
+    path = tmp_path / "facts.bin"
+    with path.open("wb") as stream:
+        writer = ColumnarFactsWriter(stream, chunk_size)
+        assert export_import_facts(SOURCES, writer, SETTINGS) == 3
+
+    columns = read_columnar_facts(path)
+    assert len(columns) == 3
+    assert list(columns.rows()) == ROWS
+    # the strings are stored once, and the codes of every chunk share one dictionary
+    assert len(columns.dictionary) == len(set(columns.dictionary))
+    assert list(columns.columns["name"]) == [
+        NULL_CODE,
+        columns.dictionary.index("b"),
+        columns.dictionary.index("a"),
+    ]
+    assert columns.decode("filename") == [row["filename"] for row in ROWS]
+
+
+def test_columnar_chunks_are_written_as_rows_stream() -> None:
+    """Test each full chunk is written as soon as it is full, so memory stays bounded."""
+    stream = io.BytesIO()
+    writer = ColumnarFactsWriter(stream, chunk_size=2)
+    writer.write("my_package/a.py", "my_package.a", [ImportFact("os")])
+    assert (writer.rows, len(stream.getvalue())) == (0, COLUMNAR_HEADER.size + HEADER_NAMES_SIZE)
+
+    writer.write("my_package/b.py", "my_package.b", [ImportFact("os"), ImportFact("sys")])
+    assert writer.rows == 2
+    chunk_end = len(stream.getvalue())
+    writer.close()
+    assert writer.rows == 3
+    assert len(stream.getvalue()) > chunk_end
+
+
+def test_invalid_columnar_export(tmp_path: Path) -> None:
+    """Test other files and truncated exports are rejected."""
+    path = tmp_path / "facts.bin"
+    path.write_bytes(b"not an export of import facts")
+    with pytest.raises(ValueError, match="not a columnar export"):
+        read_columnar_facts(path)
+
+    with path.open("wb") as stream:
+        export_import_facts(SOURCES, ColumnarFactsWriter(stream), SETTINGS)
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(ValueError, match="truncated"):
+        read_columnar_facts(path)
+
+
+def test_to_numpy(tmp_path: Path) -> None:
+    """Test the columns are decoded with NumPy."""
+    numpy = pytest.importorskip("numpy")
+    path = tmp_path / "facts.bin"
+    with path.open("wb") as stream:
+        export_import_facts(SOURCES, ColumnarFactsWriter(stream), SETTINGS)
+
+    arrays = read_columnar_facts(path).to_numpy()
+    assert arrays["lineno"].dtype == numpy.int32
+    assert list(arrays["dictionary"][arrays["module"]]) == ["os", "my_package", ""]
+
+
+def test_json_lines_export() -> None:
+    """Test the JSON Lines fallback writes one object per import fact."""
+    stream = io.StringIO()
+    assert export_import_facts(SOURCES, JsonLinesFactsWriter(stream), SETTINGS) == 3
+    assert [json.loads(line) for line in stream.getvalue().splitlines()] == ROWS
@@ -0,0 +1,84 @@
+""" Test the cache of the import facts.
+
+To run this test file only:
+poetry run python -m pytest -vvvrca tests/facts_cache_test.py
+"""
+
+from pathlib import Path
+
+import pytest
+
+from flake8_custom_import_rules.api import check_cached_import_facts
+from flake8_custom_import_rules.api import check_files
+from flake8_custom_import_rules.core.import_facts import ImportFact
+from flake8_custom_import_rules.core.import_facts import ImportScope
+from flake8_custom_import_rules.defaults import Settings
+from flake8_custom_import_rules.facts_cache import FactsCache
+
+SETTINGS = Settings(BASE_PACKAGES=["my_project"], RESTRICT_ALIASED_IMPORTS=True)
+
+
+@pytest.fixture
+def project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Write a project with a few modules."""
+    monkeypatch.syspath_prepend(str(tmp_path))
+    package = tmp_path / "my_project"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "module_a.py").write_text("import os as o\nfrom . import module_b\n")
+    (package / "module_b.py").write_text("def f():\n    from os import *\n")
+    return package
+
+
+def test_save_and_load(tmp_path: Path) -> None:
+    """Test the facts are cached by filename, while the content hash matches."""
+    path = tmp_path / "facts.json"
+    facts = [ImportFact("os", asname="o"), ImportFact("a", "b", 1, 2, 4, None, ImportScope.LOCAL)]
+    cache = FactsCache(path=str(path))
+    cache.set("module.py", "hash", facts)
+    cache.save()
+
+    cache = FactsCache.load(path)
+    assert len(cache) == 1
+    assert cache.get("module.py", "hash") == facts
+    assert cache.get("module.py", "changed") is None
+    assert cache.get("other.py", "hash") is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_missing_or_invalid_cache(tmp_path: Path) -> None:
+    """Test a missing, unreadable or outdated cache is replaced by an empty cache."""
+    path = tmp_path / "facts.json"
+    assert len(FactsCache.load(path)) == 0
+    path.write_text("{")
+    assert len(FactsCache.load(path)) == 0
+    path.write_text('{"version": 0, "files": {"module.py": ["hash", []]}}')
+    assert len(FactsCache.load(path)) == 0
+
+
+def test_check_cached_import_facts(project: Path, tmp_path: Path) -> None:
+    """Test only the files that changed are parsed, with the same errors as the checker."""
+    path = tmp_path / "facts.json"
+    expected = {
+        result.filename: [str(error) for error in result.errors]
+        for result in check_files([project], SETTINGS)
+    }
+
+    for hits, misses in ((0, 3), (3, 0)):
+        cache = FactsCache.load(path)
+        results = {
+            result.filename: [str(error) for error in result.errors]
+            for result in check_cached_import_facts([project], cache, SETTINGS)
+        }
+        cache.save()
+        assert results == expected
+        assert (cache.hits, cache.misses) == (hits, misses)
+
+    (project / "module_b.py").write_text("import os\n")
+    cache = FactsCache.load(path)
+    results = {
+        result.filename: [str(error) for error in result.errors]
+        for result in check_cached_import_facts([project], cache, SETTINGS)
+    }
+    assert results[str(project / "module_b.py")] == []
+    assert (cache.hits, cache.misses) == (2, 1)
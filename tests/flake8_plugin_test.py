@@ -7,6 +7,7 @@ poetry run python -m pytest -vvvrca tests/flake8_plugin_test.py
 import ast
 from contextlib import contextmanager
 from functools import partial
+from pathlib import Path
 from typing import Callable
 from unittest.mock import patch
 
@@ -21,6 +22,9 @@ from flake8.options import manager
 
 from flake8_custom_import_rules import __version__
 from flake8_custom_import_rules import show_versions
+from flake8_custom_import_rules.core.baseline import Baseline
+from flake8_custom_import_rules.core.baseline import fingerprint
+from flake8_custom_import_rules.core.import_rules import get_check_code
 from flake8_custom_import_rules.flake8_plugin import Plugin
 
 
@@ -187,6 +191,7 @@ def test_linter(get_plugin_with_parsed_options: Callable[..., type[Plugin]]):
         checker = plugin(tree, lines=data.splitlines(True))
         results = {"{}:{}: {}".format(*r) for r in checker.run()}
         assert results == {"3:0: PIR107 Wildcard Imports are disabled for this project."}
+        assert checker.rule_profile is plugin._options["rule_profile"]
 
 
 def test_linter__local_imports_enabled(get_plugin_with_parsed_options: Callable[..., type[Plugin]]):
@@ -225,6 +230,64 @@ def test_linter__local_imports_disabled(
         assert results == {"1:0: PIR102 Relative Imports are disabled for this project."}
 
 
+@pytest.mark.parametrize(
+    ("select", "expected"),
+    [
+        (
+            [],
+            {
+                "1:0: PIR107 Wildcard Imports are disabled for this project.",
+                "2:0: PIR203 Importing 'conftest' is restricted.",
+            },
+        ),
+        (["--select=PIR1"], {"1:0: PIR107 Wildcard Imports are disabled for this project."}),
+        (
+            ["--select=PIR", "--extend-ignore=PIR107"],
+            {"2:0: PIR203 Importing 'conftest' is restricted."},
+        ),
+    ],
+)
+def test_linter__selected_codes(
+    get_plugin_with_parsed_options: Callable[..., type[Plugin]], select: list[str], expected: set
+):
+    """Test only the checks of the selected and not ignored codes are run."""
+    with options_context(Plugin, {"test_env": True}):
+        plugin = get_plugin_with_parsed_options(
+            plugin_argv=["--base-packages=my_base_module", *select]
+        )
+        data = "from os import *\nimport conftest"
+        pycodestyle.stdin_get_value = lambda: data
+        tree = ast.parse(data)
+
+        checker = plugin(tree, lines=data.splitlines(True))
+        results = {"{}:{}: {}".format(*r) for r in checker.run()}
+        assert results == expected
+
+        rule_profile = plugin._options["rule_profile"]
+        check_codes = {get_check_code(name) for _, name in rule_profile.standard_restrictions}
+        assert check_codes <= rule_profile.active_codes
+
+
+def test_linter__baseline(
+    get_plugin_with_parsed_options: Callable[..., type[Plugin]], tmp_path: Path
+):
+    """Test the violations of the baseline are not reported."""
+    baseline = tmp_path / "baseline.txt"
+    Baseline(frozenset({fingerprint("stdin", "PIR107", "os.*")})).write(baseline)
+    with options_context(Plugin, {"test_env": True}):
+        plugin = get_plugin_with_parsed_options(
+            plugin_argv=["--base-packages=my_base_module", f"--import-rules-baseline={baseline}"]
+        )
+        # the known violation moved to another line
+        data = "import conftest\nfrom os import *"
+        pycodestyle.stdin_get_value = lambda: data
+        tree = ast.parse(data)
+
+        checker = plugin(tree, lines=data.splitlines(True))
+        results = {"{}:{}: {}".format(*r) for r in checker.run()}
+        assert results == {"1:0: PIR203 Importing 'conftest' is restricted."}
+
+
 @patch("builtins.print")
 def test_show_versions(mock_print):
     """Test show_versions from __init__.py file"""
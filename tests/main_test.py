@@ -0,0 +1,300 @@
+""" Test the command line interface.
+
+To run this test file only:
+poetry run python -m pytest -vvvrca tests/main_test.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from flake8_custom_import_rules.__main__ import app
+from flake8_custom_import_rules.export import read_columnar_facts
+from flake8_custom_import_rules.utils.trace_utils import disable_trace
+from flake8_custom_import_rules.utils.trace_utils import trace_logger
+
+runner = CliRunner()
+
+
+def write_project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Write a project with a flake8 configuration and a file with an error."""
+    monkeypatch.syspath_prepend(str(tmp_path))
+    (tmp_path / "setup.cfg").write_text(
+        "[flake8]\nselect = CIR,PIR\nbase-packages = my_project\nrestrict-aliased-imports = True\n"
+    )
+    package = tmp_path / "my_project"
+    package.mkdir()
+    (package / "module.py").write_text("import os as o\n")
+    return tmp_path
+
+
+def test_check_writes_the_report(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test errors are reported in the requested format, and the exit code is set."""
+    project = write_project(tmp_path, monkeypatch)
+    report = project / "report.sarif"
+    result = runner.invoke(
+        app,
+        [
+            "check",
+            str(project / "my_project"),
+            "--config",
+            str(project / "setup.cfg"),
+            "--format",
+            "sarif",
+            "--output",
+            str(report),
+        ],
+    )
+    assert result.exit_code == 1
+    (run,) = json.loads(report.read_text())["runs"]
+    assert [result["ruleId"] for result in run["results"]] == ["PIR108"]
+
+
+def test_check_without_errors(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the exit code is zero when no error is reported."""
+    project = write_project(tmp_path, monkeypatch)
+    (project / "my_project" / "module.py").write_text("import os\n")
+    result = runner.invoke(
+        app,
+        ["check", str(project / "my_project"), "--config", str(project / "setup.cfg")],
+    )
+    assert result.exit_code == 0
+    assert result.stdout == ""
+
+
+def test_check_only_reports_the_codes_flake8_reports(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test the select and ignore options of the configuration are applied, like in flake8."""
+    project = write_project(tmp_path, monkeypatch)
+    with (project / "setup.cfg").open("a") as stream:
+        stream.write("extend-ignore = PIR108\n")
+    result = runner.invoke(
+        app,
+        ["check", str(project / "my_project"), "--config", str(project / "setup.cfg")],
+    )
+    assert result.exit_code == 0
+    assert result.stdout == ""
+
+
+def test_check_fails_on_syntax_errors(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the exit code is set when a file cannot be parsed, even without other errors."""
+    project = write_project(tmp_path, monkeypatch)
+    (project / "my_project" / "module.py").write_text("import (\n")
+    result = runner.invoke(
+        app,
+        ["check", str(project / "my_project"), "--config", str(project / "setup.cfg")],
+    )
+    assert result.exit_code == 1
+    assert "E999 SyntaxError" in result.stdout
+
+
+def test_check_reads_files_ahead(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test files read ahead are reported in order, with the statistics of the run."""
+    project = write_project(tmp_path, monkeypatch)
+    for index in range(5):
+        (project / "my_project" / f"module_{index}.py").write_text("import os as o\n")
+    result = runner.invoke(
+        app,
+        [
+            "check",
+            str(project / "my_project"),
+            "--config",
+            str(project / "setup.cfg"),
+            "--read-ahead",
+            "2",
+            "--stats",
+        ],
+    )
+    assert result.exit_code == 1
+    filenames = [line.partition(":")[0] for line in result.stdout.splitlines()]
+    assert filenames == sorted(filenames) and len(filenames) == 6
+    assert "files: 6\n" in result.stderr
+    assert "read_ahead: 2\n" in result.stderr
+
+
+def test_check_writes_metrics(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the statistics of the run are written to a Prometheus textfile."""
+    project = write_project(tmp_path, monkeypatch)
+    metrics = project / "checks.prom"
+    arguments = ["check", str(project / "my_project"), "--config", str(project / "setup.cfg")]
+    result = runner.invoke(
+        app, [*arguments, "--metrics", str(metrics), "--metrics-label", "repo=my_project"]
+    )
+    assert result.exit_code == 1
+    text = metrics.read_text()
+    assert 'custom_import_rules_files_checked{repo="my_project"} 1\n' in text
+    assert 'custom_import_rules_errors{repo="my_project",code="PIR108"} 1\n' in text
+
+    result = runner.invoke(app, [*arguments, "--metrics", str(metrics), "--metrics-label", "repo"])
+    assert result.exit_code == 2
+
+
+def test_check_writes_trace_events(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test one trace event per file is written to stderr."""
+    project = write_project(tmp_path, monkeypatch)
+    handlers = list(trace_logger.handlers)
+    try:
+        result = runner.invoke(
+            app,
+            [
+                "check",
+                str(project / "my_project"),
+                "--config",
+                str(project / "setup.cfg"),
+                "--trace",
+            ],
+        )
+    finally:
+        for handler in set(trace_logger.handlers) - set(handlers):
+            disable_trace(handler)
+    assert result.exit_code == 1
+    (event,) = [json.loads(line) for line in result.stderr.splitlines()]
+    assert (event["module"], event["errors"]) == ("my_project.module", ["PIR108"])
+
+
+def test_baseline(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the baseline is written from the facts cache, and known violations are dropped."""
+    project = write_project(tmp_path, monkeypatch)
+    baseline = project / "baseline.txt"
+    facts_cache = project / "facts.json"
+    arguments = [
+        str(project / "my_project"),
+        "--config",
+        str(project / "setup.cfg"),
+    ]
+    for parsed in (1, 0):
+        result = runner.invoke(
+            app,
+            ["baseline", *arguments, "-o", str(baseline), "--facts-cache", str(facts_cache)],
+        )
+        assert result.exit_code == 0
+        assert f"Wrote 1 known violations to {baseline}" in result.stderr
+        assert f"{parsed} parsed" in result.stderr
+
+    result = runner.invoke(app, ["check", *arguments, "--baseline", str(baseline)])
+    assert result.exit_code == 0
+    assert result.stdout == ""
+
+    # known violations survive edits, new violations are reported
+    (project / "my_project" / "module.py").write_text("import sys as s\nimport os as o\n")
+    result = runner.invoke(app, ["check", *arguments, "--baseline", str(baseline)])
+    assert result.exit_code == 1
+    assert result.stdout.splitlines() == [
+        f"{project / 'my_project' / 'module.py'}:1:1: PIR108 Aliased Imports are disabled for "
+        "this project."
+    ]
+
+
+def test_shard_and_merge(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test each shard checks part of the files, and the merge reports the import cycles."""
+    project = write_project(tmp_path, monkeypatch)
+    package = project / "my_project"
+    (package / "module_a.py").write_text("import my_project.module_b\n")
+    (package / "module_b.py").write_text("import my_project.module_a\n")
+    config = ["--config", str(project / "setup.cfg")]
+
+    shard_outputs = []
+    checked = []
+    for shard in (1, 2):
+        shard_output = project / f"shard-{shard}.jsonl"
+        result = runner.invoke(
+            app,
+            ["check", str(package), *config, "--shard", f"{shard}/2"]
+            + ["--shard-output", str(shard_output), "--format", "jsonl"],
+        )
+        assert result.exit_code in {0, 1}
+        shard_outputs.append(str(shard_output))
+        checked.extend(
+            json.loads(line)["filename"] for line in shard_output.read_text().splitlines()[1:]
+        )
+    assert sorted(checked) == sorted(str(path) for path in package.glob("*.py"))
+
+    result = runner.invoke(app, ["merge", *shard_outputs, *config])
+    assert result.exit_code == 1
+    assert sorted(line.split(": ", 1)[1][:6] for line in result.stdout.splitlines()) == [
+        "PIR108",
+        "PIR401",
+    ]
+
+    result = runner.invoke(app, ["merge", shard_outputs[0], *config])
+    assert result.exit_code == 2
+    assert "Missing shards: 2/2" in result.stderr
+
+
+def test_invalid_shard(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test an invalid shard is rejected."""
+    project = write_project(tmp_path, monkeypatch)
+    result = runner.invoke(app, ["check", str(project / "my_project"), "--shard", "3/2"])
+    assert result.exit_code == 2
+    assert "Expected a shard as INDEX/COUNT" in result.stderr
+
+
+def test_reduce_flake8_spools(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the import graph is built from the spools of the flake8 workers of the last run."""
+    project = write_project(tmp_path, monkeypatch)
+    with (project / "setup.cfg").open("a") as stream:
+        stream.write("import-facts-spool = spool\n")
+    package = project / "my_project"
+    for index in range(4):
+        (package / f"module_{index}.py").write_text(f"import my_project.module_{(index + 1) % 4}\n")
+    spool = project / "spool"
+    spool.mkdir()
+    # the spool of an earlier run, with a module deleted since
+    stale_spool = spool / "import-facts-host-1.jsonl"
+    stale_spool.write_text(
+        '{"filename":"my_project/deleted.py","module_name":"my_project.deleted",'
+        '"facts":[["my_project.module_0",null,0,1,0,null,"TOP_LEVEL"]]}\n'
+    )
+    subprocess.run(
+        [sys.executable, "-m", "flake8", "-j", "2", "my_project"],
+        cwd=project,
+        env={**os.environ, "PYTHONPATH": str(project)},
+        capture_output=True,
+        check=False,
+    )
+    assert not stale_spool.exists()
+    assert len(list(spool.iterdir())) >= 1
+
+    # loading the configuration with the spool option does not clear the spools
+    result = runner.invoke(app, ["reduce", str(spool), "--config", str(project / "setup.cfg")])
+    assert result.exit_code == 1
+    assert result.stdout.splitlines() == [
+        f"{os.path.join('my_project', 'module_0.py')}:1:1: PIR401 Import cycle between "
+        "first-party modules. Cycle: 'my_project.module_0 -> my_project.module_1 -> "
+        "my_project.module_2 -> my_project.module_3 -> my_project.module_0'."
+    ]
+    assert len(list(spool.iterdir())) >= 1
+
+
+def test_export(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the import facts are exported in the columnar format and as JSON Lines."""
+    project = write_project(tmp_path, monkeypatch)
+    config = str(project / "setup.cfg")
+    columnar = project / "facts.bin"
+    result = runner.invoke(
+        app, ["export", str(project / "my_project"), "--config", config, "-o", str(columnar)]
+    )
+    assert result.exit_code == 0
+    assert list(read_columnar_facts(columnar).rows())[0]["asname"] == "o"
+
+    jsonl = project / "facts.jsonl"
+    result = runner.invoke(
+        app,
+        ["export", str(project / "my_project"), "--config", config]
+        + ["-o", str(jsonl), "--format", "jsonl"],
+    )
+    assert result.exit_code == 0
+    assert json.loads(jsonl.read_text())["module"] == "os"
+
+
+def test_missing_config(tmp_path: Path) -> None:
+    """Test a configuration file that does not exist is a usage error, not a traceback."""
+    result = runner.invoke(app, ["check", str(tmp_path), "--config", str(tmp_path / "setup.cfg")])
+    assert result.exit_code == 2
+    assert result.exception is None or isinstance(result.exception, SystemExit)
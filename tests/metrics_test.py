@@ -0,0 +1,60 @@
+""" Test the Prometheus textfile metrics.
+
+To run this test file only:
+poetry run python -m pytest -vvvrca tests/metrics_test.py
+"""
+
+import pytest
+
+from flake8_custom_import_rules.api import Source
+from flake8_custom_import_rules.api import check_files
+from flake8_custom_import_rules.metrics import format_metrics
+from flake8_custom_import_rules.metrics import get_peak_rss_bytes
+from flake8_custom_import_rules.metrics import write_metrics
+from flake8_custom_import_rules.stats import RunStats
+
+
+def parse_samples(text: str) -> dict[str, float]:
+    """Parse the samples of a text exposition, by metric name and labels."""
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+def test_format_metrics() -> None:
+    """Test the statistics of a run are exposed as gauges."""
+    stats = RunStats()
+    sources = [Source("from os import *\nimport os.path\n"), Source("from sys import *\n")]
+    results = list(check_files(sources, stats=stats))
+    text = format_metrics(stats, {"repo": 'my "repo"'}, timestamp=1.5)
+    samples = parse_samples(text)
+
+    labels = 'repo="my \\"repo\\""'
+    assert samples[f"custom_import_rules_files_checked{{{labels}}}"] == len(results) == 2
+    assert samples[f"custom_import_rules_imports_processed{{{labels}}}"] == 3
+    assert samples[f'custom_import_rules_errors{{{labels},code="PIR107"}}'] == 2
+    assert samples[f'custom_import_rules_errors{{{labels},code="PIR108"}}'] == 0
+    assert samples[f'custom_import_rules_phase_seconds{{{labels},phase="parse"}}'] >= 0
+    assert samples[f'custom_import_rules_cache_misses{{{labels},cache="import_types"}}'] > 0
+    assert samples[f"custom_import_rules_fast_exits{{{labels}}}"] == 0
+    assert samples[f"custom_import_rules_last_run_timestamp_seconds{{{labels}}}"] == 1.5
+    assert "# TYPE custom_import_rules_errors gauge\n" in text
+    if get_peak_rss_bytes() is not None:
+        assert samples[f"custom_import_rules_peak_rss_bytes{{{labels}}}"] > 0
+
+
+def test_invalid_label_name() -> None:
+    """Test label names are checked."""
+    with pytest.raises(ValueError, match="Invalid Prometheus label name"):
+        format_metrics(RunStats(), {"my-repo": "value"})
+
+
+def test_write_metrics(tmp_path) -> None:
+    """Test the textfile is written without leaving the temporary file behind."""
+    path = tmp_path / "checks.prom"
+    write_metrics(RunStats(files=3), path)
+    assert "custom_import_rules_files_checked 3\n" in path.read_text()
+    assert [file.name for file in tmp_path.iterdir()] == ["checks.prom"]
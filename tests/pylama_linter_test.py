@@ -0,0 +1,87 @@
+""" Test the pylama linter.
+
+To run this test file only:
+poetry run python -m pytest -vvvrca tests/pylama_linter_test.py
+"""
+
+from pathlib import Path
+
+import pytest
+from pylama.config import CURDIR
+from pylama.config import parse_options
+from pylama.lint import LINTERS
+from pylama.main import check_paths
+
+from flake8_custom_import_rules.pylama_linter import LINTER_NAME
+from flake8_custom_import_rules.pylama_linter import Linter
+from flake8_custom_import_rules.pylama_linter import get_linter_params
+from flake8_custom_import_rules.pylama_linter import get_rule_profile
+from flake8_custom_import_rules.pylama_linter import settings_from_params
+
+LINTER_PARAMS = {
+    "base-packages": "my_package",
+    "restricted_packages": "my_package.module_b",
+    "restrict-relative-imports": "false",
+    "select": {"CIR"},
+}
+
+
+def test_linter_is_registered() -> None:
+    """Test the linter is registered with pylama."""
+    assert LINTERS[LINTER_NAME] is Linter
+
+
+def test_settings_from_params() -> None:
+    """Test the pylama params are parsed like the flake8 options."""
+    linter_params = get_linter_params(LINTER_PARAMS)
+    assert [option_key for option_key, _ in linter_params] == [
+        "BASE_PACKAGES",
+        "RESTRICTED_PACKAGES",
+        "RESTRICT_RELATIVE_IMPORTS",
+    ]
+    settings = settings_from_params(linter_params)
+    assert settings.BASE_PACKAGES == ["my_package"]
+    assert settings.RESTRICTED_PACKAGES == ["my_package.module_b"]
+    assert settings.RESTRICT_RELATIVE_IMPORTS is False
+
+    # TOML configurations give lists and booleans
+    toml_settings = settings_from_params(
+        get_linter_params({"base_packages": ["my_package", "other"], "restrict_dynamic_imports": 0})
+    )
+    assert toml_settings.BASE_PACKAGES == ["my_package", "other"]
+    assert toml_settings.RESTRICT_DYNAMIC_IMPORTS is False
+
+
+def test_rule_profile_is_compiled_once_per_configuration() -> None:
+    """Test every file checked with the same configuration shares the profile."""
+    linter_params = get_linter_params(LINTER_PARAMS)
+    assert get_rule_profile(linter_params) is get_rule_profile(get_linter_params(LINTER_PARAMS))
+    assert get_rule_profile(linter_params) is not get_rule_profile(())
+
+
+@pytest.mark.parametrize("concurrent", [False, True])
+def test_pylama_checks_import_rules(tmp_path, monkeypatch, concurrent: bool) -> None:
+    """Test pylama reports the import rules errors, with and without concurrency."""
+    package = tmp_path / "my_package"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "module_a.py").write_text("import my_package.module_b\nfrom os import *\n")
+    (package / "module_b.py").write_text("import os  # noqa: PIR107\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    options = parse_options(
+        ["--linters", LINTER_NAME],
+        config=False,
+        concurrent=concurrent,
+        linters_params={LINTER_NAME: LINTER_PARAMS},
+    )
+    errors = check_paths([str(package)], options=options, rootdir=CURDIR)
+
+    reported = [
+        (Path(error.filename).name, error.lnum, error.col, error.number) for error in errors
+    ]
+    assert sorted(reported) == [
+        ("module_a.py", 1, 1, "CIR106"),
+        ("module_a.py", 2, 1, "PIR107"),
+    ]
+    assert {error.source for error in errors} == {LINTER_NAME}
@@ -0,0 +1,95 @@
+""" Test the streaming reporters.
+
+To run this test file only:
+poetry run python -m pytest -vvvrca tests/reporters_test.py
+"""
+
+import io
+import json
+
+import pytest
+
+from flake8_custom_import_rules.api import FileResult
+from flake8_custom_import_rules.api import Source
+from flake8_custom_import_rules.api import check_files
+from flake8_custom_import_rules.codes.error_codes import ErrorCode
+from flake8_custom_import_rules.reporters import Reporter
+from flake8_custom_import_rules.reporters import get_sarif_rules
+from flake8_custom_import_rules.reporters import write_report
+
+SOURCES = [
+    Source("from os import *\nimport os as o\n", filename="stdin"),
+    Source("import json\n", filename="stdin"),
+    Source("import (\n", filename="stdin"),
+]
+
+
+def get_report(output_format: str) -> tuple[str, int]:
+    """Write the report of the sources, returning the output and number of errors."""
+    stream = io.StringIO()
+    reporter = write_report(check_files(SOURCES), stream, output_format)
+    assert reporter.files == 3
+    assert reporter.syntax_errors == 1
+    return stream.getvalue(), reporter.errors
+
+
+def test_text_report() -> None:
+    """Test errors are written in the same format as flake8."""
+    output, errors = get_report("text")
+    assert errors == 1
+    assert output.splitlines()[0] == (
+        "stdin:1:1: PIR107 Wildcard Imports are disabled for this project."
+    )
+    assert output.splitlines()[1].startswith("stdin:1:")
+    assert "E999 SyntaxError" in output.splitlines()[1]
+
+
+def test_json_lines_report() -> None:
+    """Test each error is written as a JSON object."""
+    output, _ = get_report("jsonl")
+    records = [json.loads(line) for line in output.splitlines()]
+    assert records[0] == {
+        "filename": "stdin",
+        "module_name": None,
+        "line": 1,
+        "column": 0,
+        "code": "PIR107",
+        "message": "Wildcard Imports are disabled for this project.",
+    }
+    assert "syntax_error" in records[1]
+
+
+def test_sarif_report() -> None:
+    """Test the SARIF log holds the rules once, and results refer to them by index."""
+    output, _ = get_report("sarif")
+    (run,) = json.loads(output)["runs"]
+    rules = run["tool"]["driver"]["rules"]
+    assert [rule["id"] for rule in rules] == [error_code.name for error_code in ErrorCode]
+    (result,) = run["results"]
+    assert rules[result["ruleIndex"]]["id"] == result["ruleId"] == "PIR107"
+    assert result["locations"][0]["physicalLocation"]["region"] == {
+        "startLine": 1,
+        "startColumn": 1,
+    }
+    (notification,) = run["invocations"][0]["toolExecutionNotifications"]
+    assert notification["message"]["text"].startswith("SyntaxError")
+    assert get_sarif_rules() is get_sarif_rules()
+
+
+def test_sarif_report_without_results() -> None:
+    """Test the SARIF log is valid when nothing is reported, or checking stops early."""
+    stream = io.StringIO()
+    write_report([FileResult(filename="a.py")], stream, "sarif")
+    assert json.loads(stream.getvalue())["runs"][0]["results"] == []
+
+
+def test_unknown_output_format() -> None:
+    """Test an unknown output format raises an error."""
+    with pytest.raises(ValueError, match="Unknown output format"):
+        write_report([], io.StringIO(), "xml")
+
+
+def test_reporter_is_abstract() -> None:
+    """Test reporters must implement how the result of a file is written."""
+    with pytest.raises(TypeError, match="_write_result"):
+        Reporter(io.StringIO())  # type: ignore[abstract]
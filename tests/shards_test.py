@@ -0,0 +1,196 @@
+""" Test the sharding of the files checked and the merging of the shard outputs.
+
+To run this test file only:
+poetry run python -m pytest -vvvrca tests/shards_test.py
+"""
+
+import io
+from pathlib import Path
+
+import pytest
+
+from flake8_custom_import_rules.api import Source
+from flake8_custom_import_rules.api import check_files
+from flake8_custom_import_rules.core.baseline import Baseline
+from flake8_custom_import_rules.core.baseline import fingerprint
+from flake8_custom_import_rules.core.rule_profile import RuleProfile
+from flake8_custom_import_rules.defaults import Settings
+from flake8_custom_import_rules.shards import FILE_WEIGHT_OVERHEAD
+from flake8_custom_import_rules.shards import ShardWriter
+from flake8_custom_import_rules.shards import merge_shard_outputs
+from flake8_custom_import_rules.shards import parse_shard
+from flake8_custom_import_rules.shards import partition_files
+from flake8_custom_import_rules.shards import read_shard_output
+from flake8_custom_import_rules.shards import shard_files
+
+SETTINGS = Settings(
+    BASE_PACKAGES=["my_package"],
+    CUSTOM_RESTRICTIONS=["my_package.a:my_package.c"],
+    RESTRICT_ALIASED_IMPORTS=True,
+    TRANSITIVE_RESTRICTIONS=True,
+)
+SOURCES = [
+    Source(source, filename=f"my_package/{name}.py", module_name=f"my_package.{name}")
+    for name, source in [
+        ("a", "import my_package.b\nimport os as o\n"),
+        ("b", "import my_package.c\n"),
+        ("broken", "import my_package.a\nimport"),
+        ("c", "import my_package.b\n"),
+        ("d", "x = 1\n" * 100),
+    ]
+]
+
+
+@pytest.mark.parametrize("shard", ["1/4", "4/4", "1/1"])
+def test_parse_shard(shard: str) -> None:
+    """Test shards are parsed as a 1-based index and a count."""
+    index, count = shard.split("/")
+    assert parse_shard(shard) == (int(index), int(count))
+
+
+@pytest.mark.parametrize("shard", ["0/4", "5/4", "1", "a/b", "1/0", ""])
+def test_parse_invalid_shard(shard: str) -> None:
+    """Test invalid shards are rejected."""
+    with pytest.raises(ValueError, match="INDEX/COUNT"):
+        parse_shard(shard)
+
+
+def test_partition_files_is_balanced_and_deterministic() -> None:
+    """Test the shards are disjoint, balanced by size, and independent of the file order."""
+    rule_profile = RuleProfile.from_settings(SETTINGS)
+    sources = [
+        Source("x = 1\n" * size, filename=f"m{index}.py", module_name=f"my_package.m{index}")
+        for index, size in enumerate([500, 100, 400, 200, 300, 300, 100, 100])
+    ]
+    shards = partition_files(sources, 3, rule_profile)
+
+    assert sorted(source.filename for shard in shards for source in shard) == sorted(
+        source.filename for source in sources
+    )
+    loads = [sum(len(s.source) + FILE_WEIGHT_OVERHEAD for s in shard) for shard in shards]
+    assert max(loads) - min(loads) <= 600 + FILE_WEIGHT_OVERHEAD
+    # each shard keeps the order the files are given in
+    for shard in shards:
+        assert shard == [source for source in sources if source in shard]
+
+    reversed_shards = partition_files(sources[::-1], 3, rule_profile)
+    assert [{s.filename for s in shard} for shard in reversed_shards] == [
+        {s.filename for s in shard} for shard in shards
+    ]
+
+
+def write_shards(tmp_path: Path, shards: int) -> list[Path]:
+    """Check the sources in shards, writing the output of each shard."""
+    paths = []
+    for shard in range(1, shards + 1):
+        path = tmp_path / f"shard-{shard}.jsonl"
+        with path.open("w", encoding="utf-8") as stream:
+            writer = ShardWriter(stream, shard, shards)
+            for result in check_files(
+                shard_files(SOURCES, shard, shards, SETTINGS), SETTINGS, collect_facts=True
+            ):
+                writer.write(result)
+        paths.append(path)
+    return paths
+
+
+def test_shard_output_round_trip(tmp_path: Path) -> None:
+    """Test the results and the import graph fragment of a shard are read back."""
+    (path,) = write_shards(tmp_path, 1)
+    expected = list(check_files(SOURCES, SETTINGS))
+    read = list(read_shard_output(path))
+
+    assert [result.filename for result, _ in read] == [result.filename for result in expected]
+    for (result, _), expected_result in zip(read, expected):
+        assert [str(error) for error in result.errors] == [
+            str(error) for error in expected_result.errors
+        ]
+    imports = {result.module_name: imports for result, imports in read}
+    assert imports["my_package.a"] == {"my_package.b": (1, 0), "os": (2, 0)}
+    assert imports["my_package.broken"] is None
+    broken, _ = read[2]
+    assert broken.syntax_error is not None
+    assert broken.syntax_error.lineno == 2
+
+
+@pytest.mark.parametrize("shards", [1, 2, 3])
+def test_merge_shard_outputs(tmp_path: Path, shards: int) -> None:
+    """Test the merged results are the same whatever the number of shards."""
+    paths = write_shards(tmp_path, shards)
+    results = list(merge_shard_outputs(paths, SETTINGS))
+
+    file_errors = sorted(
+        f"{result.filename}:{error}" for result in results[:-2] for error in result.errors
+    )
+    assert file_errors == sorted(
+        f"{result.filename}:{error}"
+        for result in check_files(SOURCES, SETTINGS)
+        for error in result.errors
+    )
+    # the graph rules are checked once, on the merged graph
+    cycle, transitive = results[-2:]
+    assert [str(error) for error in cycle.errors] == [
+        "1:0: PIR401 Import cycle between first-party modules. "
+        "Cycle: 'my_package.b -> my_package.c -> my_package.b'."
+    ]
+    assert (transitive.module_name, [error.code for error in transitive.errors]) == (
+        "my_package.a",
+        ["CIR109"],
+    )
+
+
+def test_merge_drops_known_graph_violations(tmp_path: Path) -> None:
+    """Test the graph errors of the baseline are not reported."""
+    paths = write_shards(tmp_path, 2)
+    cycle = "my_package.b -> my_package.c -> my_package.b"
+    baseline = Baseline(frozenset({fingerprint("my_package.b", "PIR401", cycle)}))
+    results = list(merge_shard_outputs(paths, SETTINGS, baseline))
+    assert "PIR401" not in {error.code for result in results for error in result.errors}
+
+
+def test_merge_only_checks_the_active_graph_rules(tmp_path: Path) -> None:
+    """Test the graph rules of the codes a project does not select are not reported."""
+    paths = write_shards(tmp_path, 2)
+    rule_profile = RuleProfile.from_settings(SETTINGS, {"CIR109", "PIR108"})
+    results = list(merge_shard_outputs(paths, rule_profile=rule_profile))
+    assert {error.code for result in results for error in result.errors} <= {"CIR109", "PIR108"}
+    assert "CIR109" in {error.code for result in results for error in result.errors}
+
+    rule_profile = RuleProfile.from_settings(SETTINGS, {"PIR108"})
+    results = list(merge_shard_outputs(paths, rule_profile=rule_profile))
+    assert {error.code for result in results for error in result.errors} == {"PIR108"}
+
+
+def test_transitive_restrictions_are_opt_in(tmp_path: Path) -> None:
+    """Test the restrictions reached through other modules are only checked when enabled."""
+    paths = write_shards(tmp_path, 2)
+    settings = Settings(**{**SETTINGS.dict, "TRANSITIVE_RESTRICTIONS": False})
+    results = merge_shard_outputs(paths, settings)
+    codes = {error.code for result in results for error in result.errors}
+    assert "PIR401" in codes
+    assert "CIR109" not in codes
+
+
+def test_merge_checks_the_shards(tmp_path: Path) -> None:
+    """Test every shard of the same run must be merged, once."""
+    first, second, third = write_shards(tmp_path, 3)
+    with pytest.raises(ValueError, match="Missing shards: 2/3"):
+        list(merge_shard_outputs([first, third], SETTINGS))
+    with pytest.raises(ValueError, match="given twice"):
+        list(merge_shard_outputs([first, second, third, second], SETTINGS))
+    other = tmp_path / "other.jsonl"
+    with other.open("w", encoding="utf-8") as stream:
+        ShardWriter(stream, 4, 4)
+    with pytest.raises(ValueError, match="different numbers of shards"):
+        list(merge_shard_outputs([first, second, third, other], SETTINGS))
+    not_a_shard = tmp_path / "report.jsonl"
+    not_a_shard.write_text('{"filename": "stdin"}\n')
+    with pytest.raises(ValueError, match="not a shard output"):
+        list(merge_shard_outputs([not_a_shard], SETTINGS))
+
+
+def test_shard_writer_header() -> None:
+    """Test the shard output starts with its header."""
+    stream = io.StringIO()
+    ShardWriter(stream, 2, 3)
+    assert stream.getvalue() == '{"version": 1, "shard": 2, "shards": 3}\n'
@@ -0,0 +1,92 @@
+""" Test the spools of the import facts of the files checked by each flake8 worker.
+
+To run this test file only:
+poetry run python -m pytest -vvvrca tests/spool_test.py
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from flake8_custom_import_rules.core.import_facts import ImportFact
+from flake8_custom_import_rules.core.import_facts import ImportScope
+from flake8_custom_import_rules.core.rule_profile import RuleProfile
+from flake8_custom_import_rules.defaults import Settings
+from flake8_custom_import_rules.flake8_plugin import Plugin
+from flake8_custom_import_rules.spool import FactsSpool
+from flake8_custom_import_rules.spool import build_import_graph_from_spools
+from flake8_custom_import_rules.spool import clear_spools
+from flake8_custom_import_rules.spool import read_spools
+
+
+def test_spool_round_trip(tmp_path: Path) -> None:
+    """Test the facts appended to a spool are read back, skipping incomplete records."""
+    spool = FactsSpool(str(tmp_path))
+    facts = [ImportFact("os"), ImportFact("a", "b", 1, 2, 4, "c", ImportScope.CONDITIONAL)]
+    spool.append("my_package/a.py", "my_package.a", facts)
+    spool.append("my_package/b.py", "my_package.b", [])
+    with open(spool.path, "a", encoding="utf-8") as stream:
+        stream.write('{"filename": "my_package/c.py", "mod')
+
+    assert list(read_spools(tmp_path)) == [
+        ("my_package/a.py", "my_package.a", facts),
+        ("my_package/b.py", "my_package.b", []),
+    ]
+
+
+def test_clear_spools(tmp_path: Path) -> None:
+    """Test the spool files of earlier runs are removed, and other files are kept."""
+    spool = FactsSpool(str(tmp_path))
+    spool.append("my_package/a.py", "my_package.a", [ImportFact("os")])
+    (tmp_path / "notes.txt").write_text("kept")
+    clear_spools(tmp_path)
+    assert [path.name for path in tmp_path.iterdir()] == ["notes.txt"]
+    assert list(read_spools(tmp_path)) == []
+
+
+def test_each_worker_appends_to_its_own_spool(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test a forked worker opens its own spool file instead of sharing its parent's."""
+    spool = FactsSpool(str(tmp_path))
+    spool.append("my_package/a.py", "my_package.a", [ImportFact("my_package.b")])
+    monkeypatch.setattr(os, "getpid", lambda: -1)
+    spool.append("my_package/b.py", "my_package.b", [ImportFact("my_package.a")])
+
+    assert len(list(tmp_path.iterdir())) == 2
+    graph = build_import_graph_from_spools(tmp_path)
+    assert [str(cycle) for cycle in graph.cycles()] == [
+        "my_package.a -> my_package.b -> my_package.a"
+    ]
+    assert graph.filenames == {"my_package.a": "my_package/a.py", "my_package.b": "my_package/b.py"}
+
+
+def test_plugin_spools_every_import_fact(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the plugin spools the scope of imports, even when the rules do not need it."""
+    monkeypatch.syspath_prepend(str(tmp_path))
+    package = tmp_path / "my_package"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "module.py").write_text("def f():\n    import my_package.other\n")
+
+    # only the restricted packages are checked, so local scopes are not needed by the rules
+    rule_profile = RuleProfile.from_settings(
+        Settings(BASE_PACKAGES=["my_package"], RESTRICTED_PACKAGES=["my_package.other"]),
+        active_codes=frozenset({"CIR106", "CIR107"}),
+    )
+    spool_directory = tmp_path / "spool"
+    spool_directory.mkdir()
+    original_options = Plugin._options
+    Plugin._options = {**rule_profile.options, "facts_spool": FactsSpool(str(spool_directory))}
+    try:
+        errors = [error[2][:6] for error in Plugin(filename=str(package / "module.py")).run()]
+    finally:
+        Plugin._options = original_options
+
+    assert errors == ["CIR106"]
+    ((filename, module_name, facts),) = read_spools(spool_directory)
+    assert (filename, module_name) == (str(package / "module.py"), "my_package.module")
+    assert facts == [
+        ImportFact("my_package.other", lineno=2, col_offset=4, scope=ImportScope.LOCAL)
+    ]
@@ -0,0 +1,124 @@
+""" Layers test cases.
+
+- CIR601
+- CIR602
+
+To run this test file only:
+poetry run python -m pytest -vvvrca tests/test_cases/custom_import_rules/layers_test.py
+"""
+
+from functools import partial
+
+import pycodestyle
+import pytest
+from flake8.utils import normalize_path
+
+from flake8_custom_import_rules.codes.error_codes import ErrorCode
+from flake8_custom_import_rules.core.error_messages import layer_error
+from flake8_custom_import_rules.core.nodes import HelperParsedImport
+from flake8_custom_import_rules.defaults import Settings
+
+HPI = partial(HelperParsedImport, col_offset=0)
+
+MODULE_A = "my_base_module.package_a.module_a"
+PACKAGE_A = "my_base_module.package_a"
+PACKAGE_C = "my_base_module.package_c"
+MODULES_Y_Z = "my_base_module.module_y|my_base_module.module_z"
+
+CIR601 = partial(
+    layer_error, error_code=ErrorCode.CIR601, file_identifier=MODULE_A, file_layer=PACKAGE_A
+)
+CIR602 = partial(
+    layer_error, error_code=ErrorCode.CIR602, file_identifier=MODULE_A, file_layer=PACKAGE_A
+)
+
+PACKAGE_C_ERRORS = [
+    CIR602(
+        node=HPI(lineno=16, import_statement="from my_base_module.package_c.module_c import C"),
+        import_layer=PACKAGE_C,
+    ),
+    CIR602(
+        node=HPI(
+            lineno=17,
+            import_statement="from my_base_module.package_c.package_d.module_d import D as DEE",
+        ),
+        import_layer=PACKAGE_C,
+    ),
+    CIR602(
+        node=HPI(
+            lineno=22,
+            col_offset=4,
+            import_statement="from my_base_module.package_c.package_e.module_e "
+            "import OldE as VersionedE",
+        ),
+        import_layer=PACKAGE_C,
+    ),
+    CIR602(
+        node=HPI(
+            lineno=24,
+            col_offset=4,
+            import_statement="from my_base_module.package_c.package_e.module_e "
+            "import EUpdated as VersionedE",
+        ),
+        import_layer=PACKAGE_C,
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    ("layers", "expected"),
+    [
+        ([PACKAGE_A, PACKAGE_C, MODULES_Y_Z], []),
+        ([PACKAGE_C, PACKAGE_A], PACKAGE_C_ERRORS),
+        ([f"{PACKAGE_C}|{PACKAGE_A}"], []),
+        (
+            [PACKAGE_C, MODULES_Y_Z, PACKAGE_A],
+            [
+                CIR601(
+                    node=HPI(lineno=13, import_statement="import my_base_module.module_y"),
+                    import_layer=MODULES_Y_Z,
+                ),
+                CIR602(
+                    node=HPI(lineno=14, import_statement="from my_base_module import module_z"),
+                    import_layer=MODULES_Y_Z,
+                ),
+                *PACKAGE_C_ERRORS,
+            ],
+        ),
+    ],
+)
+def test_layers(
+    layers: list[str],
+    expected: list,
+    get_flake8_linter_results: callable,
+) -> None:
+    """Test upward imports between layers."""
+    filename = normalize_path("example_repos/my_base_module/my_base_module/package_a/module_a.py")
+    lines = pycodestyle.readlines(filename)
+    options = {
+        "base_packages": ["my_base_module"],
+        "checker_settings": Settings(
+            **{
+                "LAYERS": layers,
+                "RESTRICT_DYNAMIC_IMPORTS": False,
+                "RESTRICT_LOCAL_SCOPE_IMPORTS": False,
+                "RESTRICT_RELATIVE_IMPORTS": False,
+            }
+        ),
+    }
+    actual = get_flake8_linter_results(
+        s="".join(lines), options=options, delimiter="\n", filename=filename
+    )
+    assert actual == {str(error) for error in expected}, sorted(actual)
+
+
+def test_layer_settings_do_not_error(
+    valid_custom_import_rules_imports: str,
+    get_flake8_linter_results: callable,
+) -> None:
+    """Test layers do not have an effect on regular import methods."""
+    options = {"checker_settings": Settings(**{"LAYERS": []})}
+    actual = get_flake8_linter_results(
+        s=valid_custom_import_rules_imports, options=options, delimiter="\n"
+    )
+    assert actual == set()
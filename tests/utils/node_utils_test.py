@@ -14,6 +14,7 @@ from flake8_custom_import_rules.utils.node_utils import check_private_module_imp
 from flake8_custom_import_rules.utils.node_utils import generate_identifier_path
 from flake8_custom_import_rules.utils.node_utils import get_module_info_from_import_node
 from flake8_custom_import_rules.utils.node_utils import get_name_info_from_import_node
+from flake8_custom_import_rules.utils.node_utils import resolve_relative_module
 
 
 @pytest.fixture(scope="function", autouse=True)
@@ -136,3 +137,25 @@ def test_get_name_info_from_import_node(get_import_node: callable) -> None:
     assert name_dict["private_identifier_import"] is False
     assert name_dict["private_module_import"] is False
     assert name_dict["import_statement"] == "from sys import modules"
+
+
+@pytest.mark.parametrize(
+    ("module_name", "module", "level", "is_package", "expected"),
+    [
+        ("package.module", "other", 0, False, "other"),
+        ("package.module", "", 1, False, "package"),
+        ("package.sub.module", "other.name", 1, False, "package.sub.other.name"),
+        ("package.sub.module", "other", 2, False, "package.other"),
+        ("package.sub", "other", 1, True, "package.sub.other"),
+        ("package.sub.__init__", "other", 1, False, "package.sub.other"),
+        ("package.sub.__init__", "", 2, False, "package"),
+        ("package.module", "", 2, False, None),
+        ("module", "other", 1, False, None),
+        ("package", "other", 2, True, None),
+    ],
+)
+def test_resolve_relative_module(
+    module_name: str, module: str, level: int, is_package: bool, expected: str | None
+) -> None:
+    """Test relative imports are resolved from the module name alone."""
+    assert resolve_relative_module(module_name, module, level, is_package) == expected
@@ -67,3 +67,12 @@ def test_get_bool_value_invalid_inputs(value):
     with pytest.raises(ValueError) as e:
         get_bool_value(value)
     assert f'Cannot interpret value "{value}" as boolean' in str(e.value)
+
+
+def test_check_conflicts__layers():
+    """Test a package cannot be assigned to more than one layer."""
+    sample_settings = Settings(LAYERS=["app", "services|utils", "utils"])
+    conflicts = check_conflicts(sample_settings.dict)
+    assert conflicts == [
+        "Conflict: {'utils'}. A package cannot be assigned to more than one layer in --layers."
+    ]
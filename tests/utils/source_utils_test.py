@@ -0,0 +1,53 @@
+""" Tests for source_utils.py
+
+To run this test file only:
+poetry run python -m pytest -vvvrca tests/utils/source_utils_test.py
+"""
+
+import ast
+import hashlib
+import mmap
+
+import pycodestyle
+import pytest
+
+from flake8_custom_import_rules.utils import source_utils
+from flake8_custom_import_rules.utils.source_utils import SourceBuffer
+
+SOURCES = [
+    b"import os\nfrom sys import path  # noqa: PIR107\n",
+    b"import os\r\nimport sys\r\n\r\nx = 1",
+    b"import os\rfrom sys import path  # noqa: PIR107\r\rx = 1\r",
+    b"import os\r\nimport sys\rx = 1\n\ry = 2",
+    b"\xef\xbb\xbfimport os\nname = '\xc3\xa9'\n",
+    b"# -*- coding: latin-1 -*-\nname = '\xe9'  # noqa\n",
+]
+
+
+@pytest.mark.parametrize("mmap_threshold", [source_utils.MMAP_THRESHOLD, 0])
+@pytest.mark.parametrize("data", SOURCES)
+def test_source_buffer_matches_reading_lines(
+    tmp_path, monkeypatch, data: bytes, mmap_threshold: int
+) -> None:
+    """Test the buffer is hashed, parsed and split into lines like the file itself."""
+    monkeypatch.setattr(source_utils, "MMAP_THRESHOLD", mmap_threshold)
+    filename = tmp_path / "file.py"
+    filename.write_bytes(data)
+    expected_lines = pycodestyle.readlines(str(filename))
+
+    source = SourceBuffer.from_file(filename)
+    assert isinstance(source.data, mmap.mmap) is (mmap_threshold == 0)
+    assert source.content_hash == hashlib.sha256(data).hexdigest()
+    assert ast.dump(source.parse()) == ast.dump(ast.parse("".join(expected_lines)))
+    assert [source.line(lineno) for lineno in range(1, source.line_count + 1)] == expected_lines
+    assert source.line(0) == source.line(source.line_count + 1) == ""
+    assert source.lines == expected_lines
+    source.close()
+
+
+def test_source_buffer_from_text() -> None:
+    """Test in-memory sources are buffered without splitting them into lines."""
+    source = SourceBuffer.from_text("import os\nname = 'é'\n")
+    assert source.line(2) == "name = 'é'\n"
+    assert source.line_count == 2
+    assert list(source.line_offsets) == [0, 10, 22]
@@ -0,0 +1,58 @@
+""" Tests for trace_utils.py
+
+To run this test file only:
+poetry run python -m pytest -vvvrca tests/utils/trace_utils_test.py
+"""
+
+import io
+import json
+import logging
+
+from flake8_custom_import_rules.api import Source
+from flake8_custom_import_rules.api import check_files
+from flake8_custom_import_rules.utils.trace_utils import disable_trace
+from flake8_custom_import_rules.utils.trace_utils import enable_trace
+from flake8_custom_import_rules.utils.trace_utils import trace_enabled
+from flake8_custom_import_rules.utils.trace_utils import trace_event
+
+
+def test_trace_is_opt_in(caplog) -> None:
+    """Test trace events are not emitted when only the root logger is at DEBUG."""
+    with caplog.at_level(logging.DEBUG):
+        assert not trace_enabled()
+        trace_event("file", filename="file.py")
+    assert caplog.records == []
+
+
+def test_trace_event() -> None:
+    """Test trace events are written as compact JSON lines."""
+    stream = io.StringIO()
+    handler = enable_trace(stream)
+    try:
+        assert trace_enabled()
+        trace_event("file", filename="file.py", errors=["PIR107"])
+    finally:
+        disable_trace(handler)
+    assert not trace_enabled()
+    assert stream.getvalue() == '{"event":"file","filename":"file.py","errors":["PIR107"]}\n'
+
+
+def test_checker_emits_one_event_per_file() -> None:
+    """Test the checker emits a file event with the imports and errors of the file."""
+    stream = io.StringIO()
+    handler = enable_trace(stream)
+    try:
+        sources = [
+            Source("from os import *\nimport sys\n", module_name="my_package.module_a"),
+            Source("import os\n", module_name="my_package.module_b"),
+        ]
+        list(check_files(sources))
+    finally:
+        disable_trace(handler)
+
+    events = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [(event["module"], event["imports"], event["errors"]) for event in events] == [
+        ("my_package.module_a", 2, ["PIR107"]),
+        ("my_package.module_b", 1, []),
+    ]
+    assert all(event["event"] == "file" and event["applicable"] for event in events)